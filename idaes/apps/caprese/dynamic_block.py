@@ -17,6 +17,8 @@ by time.
 
 from collections import OrderedDict
 
+import numpy as np
+
 import idaes.logger as idaeslog
 from idaes.apps.caprese.util import initialize_by_element_in_range
 from idaes.apps.caprese.common.config import (
@@ -597,20 +599,80 @@ class _DynamicBlockData(BlockData):
         """Set values for the variables of the specified ctypes
         to their values `t_shift` in the future.
         """
+        dest, src = self._get_time_shift_indices(t_shift, tolerance)
+        if not len(dest):
+            return
+        vardata = self._get_time_indexed_vardata(ctype)
+        if t_shift >= 0:
+            # Sources lie ahead of their destinations, so every source
+            # value can be read before any destination is overwritten.
+            values = [v.value for v in vardata[:, src].ravel()]
+            for v, val in zip(vardata[:, dest].ravel(), values):
+                v.set_value(val, skip_validation=True)
+        else:
+            # Preserve the point-by-point semantics, in which values
+            # shifted earlier in time are propagated.
+            for i, j in zip(dest, src):
+                for v_dest, v_src in zip(vardata[:, i], vardata[:, j]):
+                    v_dest.set_value(v_src.value, skip_validation=True)
+
+    def _get_time_shift_indices(self, t_shift, tolerance):
+        """Get arrays of the (zero-based) positions in time of the points
+        to be set when shifting by `t_shift`, and of the points from which
+        their values are taken. These are cached for each shift, as
+        looking up time points with `find_nearest_index` is slow, and
+        recomputed if the number of time points has changed.
+        """
+        try:
+            cache = self._time_shift_cache
+        except AttributeError:
+            cache = self._time_shift_cache = {}
+        key = (t_shift, tolerance)
         time = self.time
-        # The outer loop is over time so we don't have to call
-        # `find_nearest_index` for every variable.
-        # I am assuming that `find_nearest_index` is slower than
-        # accessing `component_objects`
-        for t in time:
-            ts = t + t_shift
-            idx = time.find_nearest_index(ts, tolerance)
-            if idx is None:
-                # t + sample_time is outside the model's "horizon"
-                continue
-            ts = time.at(idx)
-            for var in self.component_objects(ctype):
-                var[t].set_value(var[ts].value)
+        if key not in cache or cache[key][0] != len(time):
+            dest = []
+            src = []
+            for i, t in enumerate(time):
+                idx = time.find_nearest_index(t + t_shift, tolerance)
+                if idx is None:
+                    # t + t_shift is outside the model's "horizon"
+                    continue
+                dest.append(i)
+                src.append(idx - 1)
+            cache[key] = (
+                len(time),
+                np.array(dest, dtype=int),
+                np.array(src, dtype=int),
+            )
+        return cache[key][1:]
+
+    def _get_time_indexed_vardata(self, ctype):
+        """Get a 2-D array of the data objects of the time-indexed
+        variables with the specified ctypes, with one row per variable
+        and one column per time point. This is cached for each
+        combination of ctypes, and rebuilt if variables of these ctypes
+        have been added or deleted or the number of time points has
+        changed.
+        """
+        key = (ctype,) if isinstance(ctype, type) else tuple(ctype)
+        try:
+            cache = self._time_indexed_vardata_cache
+        except AttributeError:
+            cache = self._time_indexed_vardata_cache = {}
+        time = self.time
+        variables = list(self.component_objects(key))
+        cached = cache.get(key, None)
+        if (
+            cached is None
+            or cached[1].shape[1] != len(time)
+            or len(cached[0]) != len(variables)
+            or any(v is not c for v, c in zip(variables, cached[0]))
+        ):
+            vardata = np.empty((len(variables), len(time)), dtype=object)
+            for i, var in enumerate(variables):
+                vardata[i, :] = [var[t] for t in time]
+            cached = cache[key] = (variables, vardata)
+        return cached[1]
 
     def advance_one_sample(
         self,
@@ -936,6 +936,74 @@ class TestDynamicBlock(object):
                 for v in blk.component_objects(ctypes_to_not_shift):
                     assert v[t].value == t
 
+    @pytest.mark.unit
+    def test_advance_by_caches_shift(self):
+        blk = self.make_block()
+        time = blk.time
+        t0 = time.first()
+        tl = time.last()
+        ctypes = (DiffVar, DerivVar, AlgVar, InputVar, FixedVar)
+
+        shift = (tl - t0) / 2
+        for _ in range(2):
+            for t in time:
+                for v in blk.component_objects(ctypes):
+                    v[t].set_value(t)
+            blk.advance_by_time(shift)
+            for t in time:
+                expected = t + shift if t + shift <= tl else t
+                for v in blk.component_objects(ctypes):
+                    assert v[t].value == expected
+
+        assert list(blk._time_shift_cache) == [(shift, 1e-8)]
+        assert list(blk._time_indexed_vardata_cache) == [ctypes]
+        _, dest, src = blk._time_shift_cache[shift, 1e-8]
+        assert [time.at(i + 1) + shift for i in dest] == [time.at(j + 1) for j in src]
+
+    @pytest.mark.unit
+    def test_advance_by_var_added(self):
+        blk = self.make_block()
+        time = blk.time
+        t0 = time.first()
+        tl = time.last()
+        shift = (tl - t0) / 2
+        blk.advance_by_time(shift, ctype=AlgVar)
+
+        # Variables added after the first shift are shifted as well
+        blk.new_alg = AlgVar(time, initialize={t: t for t in time})
+        blk.advance_by_time(shift, ctype=AlgVar)
+        for t in time:
+            expected = t + shift if t + shift <= tl else t
+            assert blk.new_alg[t].value == expected
+
+        del blk.new_alg
+        blk.advance_by_time(shift, ctype=AlgVar)
+        variables, _ = blk._time_indexed_vardata_cache[AlgVar,]
+        assert variables == list(blk.component_objects(AlgVar))
+
+    @pytest.mark.unit
+    def test_advance_by_negative(self):
+        blk = self.make_block()
+        time = blk.time
+        t0 = time.first()
+        tl = time.last()
+
+        for t in time:
+            blk.vectors.differential[:, t].set_value(t)
+            blk.vectors.derivative[:, t].set_value(t)
+
+        # Values are propagated point by point, as the earliest values are
+        # shifted into all later samples
+        shift = -(tl - t0) / 2
+        blk.advance_by_time(shift, ctype=DiffVar)
+        points = list(time)
+        n_shift = points.index(time.at(time.find_nearest_index(t0 - shift)))
+        for i, t in enumerate(points):
+            for v in blk.component_objects(DiffVar):
+                assert v[t].value == points[i % n_shift]
+            for v in blk.component_objects(DerivVar):
+                assert v[t].value == t
+
     @pytest.mark.unit
     def test_generate_time_in_sample(self):
         blk = self.make_block()
@@ -10,12 +10,18 @@
 # All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
 # for full copyright and license information.
 #################################################################################
-import pandas as pd
 import pyomo.environ as pyo
 from pyomo.opt.base.solvers import OptSolver
 import os
 from abc import ABC, abstractmethod
-from idaes.apps.grid_integration.utils import convert_marginal_costs_to_actual_costs
+from pyomo.common.deprecation import deprecated
+from idaes.apps.grid_integration.utils import (
+    ResultBuffer,
+    ResultList,
+    convert_marginal_costs_to_actual_costs,
+    copy_persistent_solver,
+    is_persistent_solver,
+)
 import datetime
 from pyomo.common.dependencies import attempt_import
 
@@ -207,7 +213,9 @@ class AbstractBidder(ABC):
         Check if provides solver is a valid Pyomo solver object.
         """
 
-        if not isinstance(self.solver, OptSolver):
+        if not (
+            isinstance(self.solver, OptSolver) or is_persistent_solver(self.solver)
+        ):
             raise TypeError(
                 f"The provided solver {self.solver} is not a valid Pyomo solver."
             )
@@ -240,7 +248,11 @@ class StochasticProgramBidder(AbstractBidder):
 
             n_scenario: number of uncertain LMP scenarios
 
-            solver: a Pyomo mathematical programming solver object
+            solver: a Pyomo mathematical programming solver object. If an
+            APPSI persistent solver is given (e.g., SolverFactory("appsi_highs")),
+            a copy of it is kept attached to each of the day-ahead and real-time
+            bidding models and only the changes to the models are passed to it
+            before each solve.
 
             forecaster: an initialized LMP forecaster object
 
@@ -266,8 +278,17 @@ class StochasticProgramBidder(AbstractBidder):
         self.day_ahead_model = self.formulate_DA_bidding_problem()
         self.real_time_model = self.formulate_RT_bidding_problem()
 
-        # declare a list to store results
-        self.bids_result_list = []
+        # persistent solvers can only be attached to one model each
+        if is_persistent_solver(self.solver):
+            self._persistent_solvers = {
+                self.day_ahead_model: copy_persistent_solver(self.solver),
+                self.real_time_model: copy_persistent_solver(self.solver),
+            }
+        else:
+            self._persistent_solvers = None
+
+        # declare a buffer to store results
+        self.bids_result_buffer = ResultBuffer()
 
     def _set_up_bidding_problem(self, horizon):
         """
@@ -489,7 +510,10 @@ class StochasticProgramBidder(AbstractBidder):
         # update the price forecasts
         self._pass_price_forecasts(model, day_ahead_price, real_time_energy_price)
 
-        self.solver.solve(model, tee=True)
+        if self._persistent_solvers is None:
+            self.solver.solve(model, tee=True)
+        else:
+            self._persistent_solvers[model].solve(model, tee=True)
 
         bids = self._assemble_bids(
             model,
@@ -744,6 +768,21 @@ class StochasticProgramBidder(AbstractBidder):
 
         return
 
+    @property
+    @deprecated(
+        "bids_result_list has been replaced by bids_result_buffer. Use "
+        "bids_result_buffer.to_dataframe() to get the recorded results.",
+        version="2.6.0",
+    )
+    def bids_result_list(self):
+        """
+        List holding a DataFrame of the recorded bidding results, for
+        backward compatibility. Results can not be added to this list.
+        """
+        return ResultList(
+            [self.bids_result_buffer.to_dataframe()], buffer_name="bids_result_buffer"
+        )
+
     def write_results(self, path):
         """
         This methods writes the saved operation stats into an csv file.
@@ -757,7 +796,7 @@ class StochasticProgramBidder(AbstractBidder):
 
         print("")
         print("Saving bidding results to disk...")
-        pd.concat(self.bids_result_list).to_csv(
+        self.bids_result_buffer.to_dataframe().to_csv(
             os.path.join(path, "bidder_detail.csv"), index=False
         )
         self.bidding_model_object.write_results(
@@ -954,9 +993,9 @@ class SelfScheduler(StochasticProgramBidder):
 
     def _record_bids(self, bids, date, hour, **kwargs):
         """
-        This function records the bids (schedule) we computed for the given date into a
-        DataFrame and temporarily stores the DataFrame in an instance attribute
-        list called bids_result_list.
+        This function records the bids (schedule) we computed for the given date into
+        the ResultBuffer in the instance attribute bids_result_buffer, which is
+        converted to a DataFrame when the results are written.
 
         Arguments:
             bids: the obtained bids (schedule) for this date.
@@ -970,7 +1009,6 @@ class SelfScheduler(StochasticProgramBidder):
 
         """
 
-        df_list = []
         for t in bids:
             for g in bids[t]:
 
@@ -987,12 +1025,9 @@ class SelfScheduler(StochasticProgramBidder):
                 for k, v in kwargs.items():
                     result_dict[k] = v
 
-                result_df = pd.DataFrame.from_dict(result_dict, orient="index")
-                df_list.append(result_df.T)
-
-        # save the result to object property
-        # wait to be written when simulation ends
-        self.bids_result_list.append(pd.concat(df_list))
+                # save the result to object property
+                # wait to be written when simulation ends
+                self.bids_result_buffer.append(result_dict)
 
 
 class Bidder(StochasticProgramBidder):
@@ -1239,12 +1274,11 @@ class Bidder(StochasticProgramBidder):
 
     def _record_bids(self, bids, date, hour, **kwargs):
         """
-        This method records the bids we computed for the given date into a
-        DataFrame. This DataFrame has the following columns: gen, date, hour,
-        power 1, ..., power n, price 1, ..., price n. And concatenate the
-        DataFrame into a class property 'bids_result_list'. The methods then
-        temporarily stores the DataFrame in an instance attribute list called
-        bids_result_list.
+        This method records the bids we computed for the given date into the
+        ResultBuffer in the instance attribute bids_result_buffer. The results
+        have the following columns: gen, date, hour, power 1, ..., power n,
+        price 1, ..., price n, and are converted to a DataFrame when they are
+        written.
 
         Arguments:
             bids: the obtained bids for this date.
@@ -1258,7 +1292,6 @@ class Bidder(StochasticProgramBidder):
 
         """
 
-        df_list = []
         for t in bids:
             for gen in bids[t]:
 
@@ -1283,11 +1316,8 @@ class Bidder(StochasticProgramBidder):
 
                     pair_cnt += 1
 
-                result_df = pd.DataFrame.from_dict(result_dict, orient="index")
-                df_list.append(result_df.T)
-
-        # save the result to object property
-        # wait to be written when simulation ends
-        self.bids_result_list.append(pd.concat(df_list))
+                # save the result to object property
+                # wait to be written when simulation ends
+                self.bids_result_buffer.append(result_dict)
 
         return
@@ -10,14 +10,39 @@
 # All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
 # for full copyright and license information.
 #################################################################################
+from collections import deque
 import pyomo.environ as pyo
 from idaes.core.solvers import get_solver
-from idaes.core.util.exceptions import InitializationError
+from idaes.core.base.property_base import PhysicalParameterBlock
+from idaes.core.base.reaction_base import ReactionParameterBlock
+from idaes.core.initialization.model_state import ModelStateSnapshot
+from idaes.core.util.exceptions import ConfigurationError, InitializationError
 import matplotlib.pyplot as plt
 import logging
 
 _logger = logging.getLogger(__name__)
 
+
+def _ancestors(blk):
+    """
+    Yield a block and all of its parent blocks
+    """
+    while blk is not None:
+        yield blk
+        blk = blk.parent_block()
+
+
+def _has_mutable_params(blk):
+    """
+    Whether a (possibly indexed) block holds any mutable Params
+    """
+    return any(
+        p.mutable
+        for b in blk.values()
+        for p in b.component_objects(pyo.Param, descend_into=True)
+    )
+
+
 no_init_func_message = "initialization_func argument was not provided. Returning the multiperiod model without initialization."
 
 
@@ -45,6 +70,15 @@ class MultiPeriodModel(pyo.ConcreteModel):
         unfix_dof_options: dictionary containing the arguments needed for `unfix_dof_func`
         solver: pyomo solver object
         outlvl: logging level
+        recycle_periods: if True, `advance_time` recycles the block of the period
+                         leaving the horizon for the new period (as a ring buffer)
+                         instead of building a new flowsheet instance, so the
+                         size of the model stays constant
+        update_process_model_func: function that loads the data for a new time
+                                   period into a recycled flowsheet instance,
+                                   called as `update_process_model_func(blk,
+                                   **model_data_kwargs)` by `advance_time` when
+                                   `recycle_periods` is True
 
     Returns:
         (stochastic) multi-period optimization model
@@ -67,6 +101,8 @@ class MultiPeriodModel(pyo.ConcreteModel):
         unfix_dof_options=None,
         solver=None,
         outlvl=logging.WARNING,
+        recycle_periods=False,
+        update_process_model_func=None,
     ):  # , state_variable_func=None):
         super().__init__()
 
@@ -84,11 +120,18 @@ class MultiPeriodModel(pyo.ConcreteModel):
         self.get_periodic_variable_pairs = periodic_variable_func
         self.initialization_func = initialization_func
         self.unfix_dof_func = unfix_dof_func
+        self.update_process_model = update_process_model_func
         # self.get_state_variable_pairs = state_variable_func
 
         # populated on 'build_multi_period_model'
         self._first_active_time = None
 
+        # ring buffer of time indices of the period blocks in horizon order,
+        # and their states after construction (used if recycle_periods is True)
+        self.recycle_periods = recycle_periods
+        self._period_order = None
+        self._period_states = None
+
         # Create sets
         if use_stochastic_build:
             self.set_time = pyo.RangeSet(n_time_points)
@@ -139,6 +182,7 @@ class MultiPeriodModel(pyo.ConcreteModel):
         initialization_options=None,
         unfix_dof_options=None,
         solver=None,
+        share_parameter_blocks=False,
     ):
         """
         Build a multi-period capable model using user-provided functions
@@ -147,11 +191,27 @@ class MultiPeriodModel(pyo.ConcreteModel):
             model_data_kwargs: a dict of dicts with {time:{"key",value}}
                                where `time` is the time in the horizon. each
                                `time` dictionary is passed to the
-                               `create_process_model` function
+                               `create_process_model` function (or
+                               `update_process_model_func` if
+                               `share_parameter_blocks` is True)
             flowsheet_options: dict containing the arguments needed to build an instance of flowsheet
             initialization_options: dict containing the arguments needed for `initialization_func`
             unfix_dof_options: dict containing the arguments needed for `unfix_dof_func`
             solver: pyomo solver object
+            share_parameter_blocks: if True, the flowsheet is built (and
+                                    initialized) once as a template, its property
+                                    and reaction parameter blocks without mutable
+                                    Params are moved to `shared_parameters` so
+                                    that all periods share them instead of
+                                    holding copies, and the rest of the template
+                                    is cloned for each period. Shared blocks are
+                                    no longer found in the period blocks (e.g.
+                                    `fs.properties` becomes
+                                    `shared_parameters.fs_properties`), and any
+                                    Vars in them are common to all periods. If
+                                    `model_data_kwargs` is provided, the data for
+                                    each period is loaded into its clone using
+                                    `update_process_model_func`.
         """
         if flowsheet_options is None:
             flowsheet_options = {}
@@ -174,7 +234,16 @@ class MultiPeriodModel(pyo.ConcreteModel):
         m.TIME = pyo.Set(initialize=range(self.n_time_points))
         m.blocks = pyo.Block(m.TIME)
 
-        if model_data_kwargs is None:
+        if share_parameter_blocks:
+            self._build_periods_from_template(
+                model_data_kwargs=model_data_kwargs,
+                flowsheet_options=flowsheet_options,
+                initialization_options=initialization_options,
+                unfix_dof_options=unfix_dof_options,
+                solver=solver,
+            )
+
+        elif model_data_kwargs is None:
             blk = self._construct_flowsheet_instance(
                 flowsheet_options=flowsheet_options,
                 initialization_options=initialization_options,
@@ -203,6 +272,13 @@ class MultiPeriodModel(pyo.ConcreteModel):
                 _logger.info(f"Constructing flowsheet model for time index {t}")
                 m.blocks[t].process = self.create_process_model(**model_data_kwargs[t])
 
+        if self.recycle_periods:
+            # record the state of each period block so it can be reset when
+            # the block is recycled
+            self._period_states = {
+                t: ModelStateSnapshot(m.blocks[t].process) for t in m.TIME
+            }
+
         # link blocks together. loop over every time index except the last one
         for t in m.TIME.data()[: self.n_time_points - 1]:
             link_variable_pairs = self.get_linking_variable_pairs(
@@ -220,16 +296,95 @@ class MultiPeriodModel(pyo.ConcreteModel):
             )
 
         self._first_active_time = m.TIME.first()
+        self._period_order = deque(m.TIME)
         return m
 
+    def _build_periods_from_template(
+        self,
+        model_data_kwargs,
+        flowsheet_options,
+        initialization_options,
+        unfix_dof_options,
+        solver,
+    ):
+        """
+        Populate the period blocks by cloning a single flowsheet instance whose
+        parameter blocks have been moved to `shared_parameters`. Components
+        outside the block being cloned are kept as references by Pyomo, so
+        each period refers to the shared parameter blocks.
+
+        Parameter blocks holding mutable Params are left in the template, and
+        thus copied for each period, as their values may be set differently
+        for each period (e.g. by `update_process_model_func`). The rest of the
+        template is still cloned for every period, so memory is only saved on
+        the shared parameter blocks.
+        """
+        m = self
+        if model_data_kwargs is not None:
+            if self.update_process_model is None:
+                raise ConfigurationError(
+                    "model_data_kwargs was provided with share_parameter_blocks, "
+                    "but update_process_model_func was not provided. "
+                    "update_process_model_func is required to load data into the "
+                    "period blocks."
+                )
+            if len(model_data_kwargs) != self.n_time_points:
+                raise ConfigurationError(
+                    f"len(model_data_kwargs) = {len(model_data_kwargs)} does not "
+                    f"match n_time_points = {self.n_time_points}."
+                )
+
+        template = self._construct_flowsheet_instance(
+            flowsheet_options=flowsheet_options,
+            initialization_options=initialization_options,
+            unfix_dof_options=unfix_dof_options,
+            solver=solver,
+        )
+
+        # Move the parameter blocks (outermost only) out of the template
+        param_blocks = [
+            b.parent_component()
+            for b in template.component_data_objects(pyo.Block, descend_into=True)
+            if isinstance(b, (PhysicalParameterBlock, ReactionParameterBlock))
+        ]
+        param_ids = set(id(b) for b in param_blocks)
+        m.shared_parameters = pyo.Block()
+        for blk in param_blocks:
+            parent = blk.parent_block()
+            if any(id(p) in param_ids for p in _ancestors(parent)):
+                continue
+            if _has_mutable_params(blk):
+                _logger.info(
+                    f"{blk.name} holds mutable Params, so it is not shared "
+                    f"between periods."
+                )
+                continue
+            name = blk.getname(fully_qualified=True, relative_to=template)
+            parent.del_component(blk)
+            m.shared_parameters.add_component(
+                name.replace(".", "_").replace("[", "_").replace("]", ""), blk
+            )
+
+        for t in m.TIME:
+            _logger.info(f"Constructing flowsheet model for time index {t}")
+            m.blocks[t].process = template.clone()
+            if model_data_kwargs is not None:
+                self.update_process_model(m.blocks[t].process, **model_data_kwargs[t])
+
     def advance_time(self, **model_data_kwargs):
         """
         Advance the current model instance to the next time period
 
         Arguments:
             model_data_kwargs: keyword arguments passed to user provided
-                               `create_process_model` function
+                               `create_process_model` function (or
+                               `update_process_model_func` if
+                               `recycle_periods` is True)
         """
+        if self.recycle_periods:
+            self._recycle_first_period(**model_data_kwargs)
+            return
+
         m = self
         previous_time = self._first_active_time
         current_time = m.TIME.next(previous_time)
@@ -276,6 +431,52 @@ class MultiPeriodModel(pyo.ConcreteModel):
         #                       m.blocks[current_time].process,
         #                       state_variable_pairs)
 
+    def _recycle_first_period(self, **model_data_kwargs):
+        """
+        Advance the model to the next time period by moving the block of the
+        first period in the horizon to the end of the horizon, resetting it to
+        its state after construction and loading the data for the new period.
+        """
+        if model_data_kwargs and self.update_process_model is None:
+            raise ConfigurationError(
+                "model_data_kwargs were provided to advance_time, but "
+                "update_process_model_func was not provided. When recycle_periods "
+                "is True, update_process_model_func is required to load data into "
+                "recycled period blocks."
+            )
+
+        m = self
+        order = self._period_order
+        last_time = order[-1]
+        new_time = order.popleft()
+        first_time = order[0] if order else new_time
+        blk = m.blocks[new_time].process
+        last_blk = m.blocks[last_time].process
+
+        # the recycled block becomes the last period, so it no longer links
+        # forward to the next period
+        blk.del_component("link_constraints")
+        self._period_states[new_time].restore(all_values=True)
+        if self.update_process_model is not None:
+            self.update_process_model(blk, **model_data_kwargs)
+        order.append(new_time)
+
+        # sequential time coupling
+        if last_time != new_time:
+            link_variable_pairs = self.get_linking_variable_pairs(last_blk, blk)
+            self._create_linking_constraints(last_blk, link_variable_pairs)
+
+        # periodic time coupling
+        if self.get_periodic_variable_pairs is not None:
+            last_blk.del_component("periodic_constraints")
+            periodic_variable_pairs = self.get_periodic_variable_pairs(
+                blk, m.blocks[first_time].process
+            )
+            self._create_periodic_constraints(blk, periodic_variable_pairs)
+
+        # track the first time in the problem horizon
+        self._first_active_time += 1
+
     @property
     def pyomo_model(self):
         """
@@ -294,6 +495,9 @@ class MultiPeriodModel(pyo.ConcreteModel):
         """
         Retrieve the active time blocks of the pyomo model
         """
+        if self.recycle_periods and self._period_order is not None:
+            # blocks are stored in a ring buffer, so return them in horizon order
+            return [self.blocks[t].process for t in self._period_order]
         return [b.process for b in self.blocks.values() if b.process.active]
 
     def _create_linking_constraints(self, b1, variable_pairs):
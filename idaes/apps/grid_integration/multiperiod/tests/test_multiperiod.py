@@ -15,13 +15,22 @@
 
 __author__ = "Radhakrishna Tumbalam Gooty"
 
+import time
+import tracemalloc
+
 import pytest
 import matplotlib.pyplot as plt
 import pyomo.environ as pyo
 from idaes.core import FlowsheetBlock
+from idaes.core.util.testing import PhysicalParameterTestBlock
 from idaes.apps.grid_integration.multiperiod.multiperiod import MultiPeriodModel
-from idaes.core.util.model_statistics import degrees_of_freedom
-from idaes.core.util.exceptions import InitializationError
+from pyomo.core.expr.visitor import identify_variables
+from idaes.core.util.model_statistics import (
+    degrees_of_freedom,
+    number_total_constraints,
+    number_variables,
+)
+from idaes.core.util.exceptions import ConfigurationError, InitializationError
 import idaes.logger as idaeslog
 
 
@@ -60,6 +69,16 @@ def get_linking_variable_pairs(m1, m2):
     return [(m1.fs.y, m2.fs.y)]
 
 
+def get_periodic_variable_pairs(m1, m2):
+    """This function returns pairs of periodic variables"""
+    return [(m1.fs.x, m2.fs.x)]
+
+
+def update_flowsheet(m, x_ub=None):
+    """This function loads data for a new time period"""
+    m.fs.x.setub(x_ub)
+
+
 @pytest.fixture(scope="module")
 def build_multi_period_model():
     m = MultiPeriodModel(
@@ -594,3 +613,241 @@ def test_multi_period_model_manual(build_multi_period_model_manual):
     assert len(m.blocks) == 5
 
     assert degrees_of_freedom(m) == 1
+
+
+def build_recycled_model():
+    m = MultiPeriodModel(
+        n_time_points=3,
+        process_model_func=build_flowsheet,
+        linking_variable_func=get_linking_variable_pairs,
+        periodic_variable_func=get_periodic_variable_pairs,
+        unfix_dof_func=unfix_dof,
+        recycle_periods=True,
+        update_process_model_func=update_flowsheet,
+    )
+    m.build_multi_period_model()
+    return m
+
+
+def linked_variables(con):
+    return {id(v) for v in identify_variables(con.body)}
+
+
+@pytest.mark.unit
+def test_advance_time_recycle_periods():
+    m = build_recycled_model()
+    n_vars = number_variables(m)
+    n_cons = number_total_constraints(m)
+
+    for i in range(1, 7):
+        first = m.get_active_process_blocks()[0]
+        first.fs.x.fix(0.9)
+
+        m.advance_time(x_ub=i)
+
+        assert m.current_time == i
+        assert len(m.blocks) == 3
+        assert number_variables(m) == n_vars
+        assert number_total_constraints(m) == n_cons
+
+        blocks = m.get_active_process_blocks()
+        assert len(blocks) == 3
+        assert blocks[-1] is first
+        # recycled block is reset to its initial state before loading new data
+        assert not first.fs.x.fixed
+        assert first.fs.x.value is None
+        assert first.fs.x.ub == i
+
+        for b1, b2 in zip(blocks[:-1], blocks[1:]):
+            assert linked_variables(b1.link_constraints[0]) == {
+                id(b1.fs.y),
+                id(b2.fs.y),
+            }
+            assert not hasattr(b1, "periodic_constraints")
+        assert not hasattr(blocks[-1], "link_constraints")
+        assert linked_variables(blocks[-1].periodic_constraints[0]) == {
+            id(blocks[-1].fs.x),
+            id(blocks[0].fs.x),
+        }
+
+
+@pytest.mark.unit
+def test_advance_time_recycle_periods_no_update_func():
+    m = MultiPeriodModel(
+        n_time_points=2,
+        process_model_func=build_flowsheet,
+        linking_variable_func=get_linking_variable_pairs,
+        unfix_dof_func=unfix_dof,
+        recycle_periods=True,
+    )
+    m.build_multi_period_model()
+
+    with pytest.raises(
+        ConfigurationError, match="update_process_model_func was not provided"
+    ):
+        m.advance_time(x_ub=2)
+
+    # Without data, recycled blocks are only reset
+    m.advance_time()
+    blocks = m.get_active_process_blocks()
+    assert blocks[0] is m.blocks[1].process
+    assert linked_variables(blocks[0].link_constraints[0]) == {
+        id(blocks[0].fs.y),
+        id(blocks[1].fs.y),
+    }
+
+
+def build_flowsheet_with_properties(m=None):
+    """This function builds a dummy flowsheet with a property package"""
+    m = build_flowsheet(m)
+    m.fs.properties = PhysicalParameterTestBlock()
+    m.fs.state = m.fs.properties.build_state_block([0], defined_state=True)
+
+    return m
+
+
+def update_flowsheet_with_properties(m, temperature=None):
+    """This function loads data for a time period"""
+    m.fs.state[0].temperature.fix(temperature)
+
+
+@pytest.mark.unit
+def test_share_parameter_blocks():
+    m = MultiPeriodModel(
+        n_time_points=3,
+        process_model_func=build_flowsheet_with_properties,
+        linking_variable_func=get_linking_variable_pairs,
+        periodic_variable_func=get_periodic_variable_pairs,
+        unfix_dof_func=unfix_dof,
+        update_process_model_func=update_flowsheet_with_properties,
+    )
+    data = {t: {"temperature": 300 + t} for t in range(3)}
+    m.build_multi_period_model(model_data_kwargs=data, share_parameter_blocks=True)
+
+    params = m.shared_parameters.fs_properties
+    assert isinstance(params, PhysicalParameterTestBlock)
+    assert params.parent_block() is m.shared_parameters
+
+    for t in m.TIME:
+        process = m.blocks[t].process
+        assert process.fs.component("properties") is None
+        assert process.fs.state[0].params is params
+        assert process.fs.state[0].config.parameters is params
+        assert process.fs.state[0].temperature.value == 300 + t
+        assert process.fs.state[0].temperature.fixed
+
+    # Period blocks hold distinct state variables
+    assert m.blocks[0].process.fs.state[0].flow_vol is not (
+        m.blocks[1].process.fs.state[0].flow_vol
+    )
+    assert linked_variables(m.blocks[0].process.link_constraints[0]) == {
+        id(m.blocks[0].process.fs.y),
+        id(m.blocks[1].process.fs.y),
+    }
+    assert linked_variables(m.blocks[2].process.periodic_constraints[0]) == {
+        id(m.blocks[2].process.fs.x),
+        id(m.blocks[0].process.fs.x),
+    }
+    # Parameter variables are only counted once
+    assert number_variables(m.shared_parameters) + 3 * number_variables(
+        m.blocks[0].process
+    ) == number_variables(m)
+
+
+@pytest.mark.unit
+def test_share_parameter_blocks_mutable_params():
+    def build_flowsheet_with_mutable_params(m=None):
+        m = build_flowsheet_with_properties(m)
+        m.fs.properties.k = pyo.Param(initialize=1, mutable=True)
+        return m
+
+    def update(m, k=None):
+        m.fs.properties.k.set_value(k)
+
+    m = MultiPeriodModel(
+        n_time_points=3,
+        process_model_func=build_flowsheet_with_mutable_params,
+        linking_variable_func=get_linking_variable_pairs,
+        unfix_dof_func=unfix_dof,
+        update_process_model_func=update,
+    )
+    data = {t: {"k": t} for t in range(3)}
+    m.build_multi_period_model(model_data_kwargs=data, share_parameter_blocks=True)
+
+    # Each period keeps its own copy of a parameter block with mutable Params
+    assert len(list(m.shared_parameters.component_objects())) == 0
+    for t in m.TIME:
+        process = m.blocks[t].process
+        assert process.fs.state[0].params is process.fs.properties
+        assert pyo.value(process.fs.properties.k) == t
+
+
+@pytest.mark.unit
+def test_share_parameter_blocks_no_parameters():
+    def build(share_parameter_blocks):
+        m = MultiPeriodModel(
+            n_time_points=2,
+            process_model_func=build_flowsheet,
+            linking_variable_func=get_linking_variable_pairs,
+            unfix_dof_func=unfix_dof,
+        )
+        m.build_multi_period_model(share_parameter_blocks=share_parameter_blocks)
+        return m
+
+    m = build(True)
+    # No parameter blocks to share, so the model matches the default build
+    assert len(list(m.shared_parameters.component_objects())) == 0
+    m_clone = build(False)
+    assert number_variables(m) == number_variables(m_clone)
+    assert number_total_constraints(m) == number_total_constraints(m_clone)
+    assert degrees_of_freedom(m) == degrees_of_freedom(m_clone) == 1
+
+
+@pytest.mark.unit
+def test_share_parameter_blocks_data_without_update_func():
+    m = MultiPeriodModel(
+        n_time_points=2,
+        process_model_func=build_flowsheet_with_properties,
+        linking_variable_func=get_linking_variable_pairs,
+        unfix_dof_func=unfix_dof,
+    )
+
+    with pytest.raises(
+        ConfigurationError, match="update_process_model_func was not provided"
+    ):
+        m.build_multi_period_model(
+            model_data_kwargs={0: {}, 1: {}}, share_parameter_blocks=True
+        )
+
+
+@pytest.mark.performance
+class TestPeriodConstructionPerformance:
+    @staticmethod
+    def build(n_time_points, share_parameter_blocks):
+        m = MultiPeriodModel(
+            n_time_points=n_time_points,
+            process_model_func=build_flowsheet_with_properties,
+            linking_variable_func=get_linking_variable_pairs,
+            unfix_dof_func=unfix_dof,
+        )
+        tracemalloc.start()
+        start = time.perf_counter()
+        m.build_multi_period_model(share_parameter_blocks=share_parameter_blocks)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("n_time_points", [24, 168, 8760])
+    def test_benchmark_template_vs_clone(self, n_time_points):
+        t_clone, mem_clone = self.build(n_time_points, False)
+        t_template, mem_template = self.build(n_time_points, True)
+
+        print(
+            f"{n_time_points} periods: clone {t_clone:.2f} s, "
+            f"{mem_clone / 2**20:.1f} MiB; template {t_template:.2f} s, "
+            f"{mem_template / 2**20:.1f} MiB"
+        )
+
+        assert mem_template < mem_clone
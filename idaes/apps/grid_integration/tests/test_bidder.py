@@ -156,6 +156,29 @@ def test_solver_checker():
             )
 
 
+@pytest.mark.unit
+def test_persistent_solver():
+    solver = pyo.SolverFactory("appsi_highs")
+    bidder_object = Bidder(
+        bidding_model_object=ExampleModel(model_data=testing_model_data),
+        day_ahead_horizon=day_ahead_horizon,
+        real_time_horizon=real_time_horizon,
+        n_scenario=n_scenario,
+        solver=solver,
+        forecaster=ExampleForecaster(prediction=30),
+    )
+
+    # each bidding model gets its own copy of the solver
+    day_ahead_solver = bidder_object._persistent_solvers[bidder_object.day_ahead_model]
+    real_time_solver = bidder_object._persistent_solvers[bidder_object.real_time_model]
+    assert day_ahead_solver is not real_time_solver
+    assert solver not in (day_ahead_solver, real_time_solver)
+    for s in (day_ahead_solver, real_time_solver):
+        assert not s.update_config.check_for_new_or_removed_constraints
+        assert s.update_config.update_params
+        assert s.update_config.update_vars
+
+
 @pytest.fixture
 def bidder_object():
 
@@ -191,3 +191,127 @@ def test_track_deviation_penalty(tracker_object):
         assert pytest.approx(
             large_penalty / (horizon - tracker_object.n_tracking_hour)
         ) == pyo.value(tracker_object.model.deviation_penalty[t])
+
+
+class RecordingPersistentSolver(type(pyo.SolverFactory("appsi_highs"))):
+    """
+    APPSI persistent solver which records the changes passed to it, and sets
+    all variables without values to zero instead of solving the model.
+    """
+
+    def __init__(self, **kwds):
+        super().__init__(**kwds)
+        self.solved_models = []
+        self.added = []
+        self.removed = []
+
+    def solve(self, model, tee=False, **kwds):
+        self.solved_models.append(model)
+        for v in model.component_data_objects(pyo.Var):
+            if v.value is None:
+                v.set_value(0)
+
+    def add_constraints(self, cons):
+        self.added.extend(cons)
+
+    def remove_constraints(self, cons):
+        self.removed.extend(cons)
+
+
+@pytest.mark.unit
+def test_persistent_solver():
+    solver = RecordingPersistentSolver()
+    tracker_object = Tracker(
+        tracking_model_object=ExampleModel(model_data=testing_model_data),
+        tracking_horizon=horizon,
+        n_tracking_hour=1,
+        solver=solver,
+    )
+
+    # the tracker keeps its own copy of the solver
+    persistent_solver = tracker_object._persistent_solver
+    assert persistent_solver is not solver
+    assert not persistent_solver.update_config.check_for_new_or_removed_constraints
+    assert not persistent_solver.update_config.update_constraints
+    assert persistent_solver.update_config.update_params
+    assert solver.update_config.check_for_new_or_removed_constraints
+
+    cons = tracker_object.model.tracking_dispatch_constraints
+    tracker_object.track_market_dispatch(
+        market_dispatch=[30, 40], date="2021-07-26", hour="17:00"
+    )
+    # before the first solve, the solver reads the constraints from the model
+    assert persistent_solver.added == []
+    assert persistent_solver.removed == []
+
+    tracker_object.track_market_dispatch(
+        market_dispatch=[30, 40, 50], date="2021-07-26", hour="18:00"
+    )
+    assert persistent_solver.added == [cons[2]]
+    assert persistent_solver.removed == []
+
+    tracker_object.track_market_dispatch(
+        market_dispatch=[30], date="2021-07-26", hour="19:00"
+    )
+    assert persistent_solver.added == [cons[2]]
+    assert persistent_solver.removed == [cons[1], cons[2]]
+
+    assert persistent_solver.solved_models == [tracker_object.model] * 3
+    assert solver.solved_models == []
+    assert pyo.value(tracker_object.model.power_dispatch[0]) == 30
+
+    results = tracker_object.result_buffer.to_dataframe()
+    assert len(results) == 3 * horizon
+    assert list(results["Hour"].unique()) == ["17:00", "18:00", "19:00"]
+    assert list(results["Horizon [hr]"][:horizon]) == list(range(horizon))
+
+
+@pytest.mark.unit
+def test_result_list_deprecated(caplog):
+    tracker_object = Tracker(
+        tracking_model_object=ExampleModel(model_data=testing_model_data),
+        tracking_horizon=horizon,
+        n_tracking_hour=1,
+        solver=RecordingPersistentSolver(),
+    )
+    tracker_object.track_market_dispatch(
+        market_dispatch=[30, 40], date="2021-07-26", hour="17:00"
+    )
+
+    result_list = tracker_object.result_list
+    assert "DEPRECATED: result_list has been replaced by result_buffer" in (
+        caplog.text.replace("\n", " ")
+    )
+    assert len(result_list) == 1
+    assert result_list[0].to_csv(index=False) == (
+        tracker_object.result_buffer.to_dataframe().to_csv(index=False)
+    )
+
+    # results can not be recorded through the list any more
+    with pytest.raises(TypeError, match="Use result_buffer.append()"):
+        result_list.append(result_list[0])
+
+
+@pytest.mark.component
+@pytest.mark.skipif(
+    not pyo.SolverFactory("appsi_highs").available(False),
+    reason="solver not available",
+)
+def test_track_market_dispatch_persistent_solver():
+    tracker_object = Tracker(
+        tracking_model_object=ExampleModel(model_data=testing_model_data),
+        tracking_horizon=horizon,
+        n_tracking_hour=1,
+        solver=pyo.SolverFactory("appsi_highs"),
+    )
+
+    for market_dispatch in ([30, 40, 50, 70], [30, 40], [30, 40, 50, 70]):
+        tracker_object.track_market_dispatch(
+            market_dispatch=market_dispatch, date="2021-07-26", hour="17:00"
+        )
+
+        for t, dispatch in enumerate(market_dispatch):
+            assert (
+                pytest.approx(pyo.value(tracker_object.power_output[t]), abs=1e-3)
+                == dispatch
+            )
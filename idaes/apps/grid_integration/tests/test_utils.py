@@ -0,0 +1,148 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from idaes.apps.grid_integration.utils import ResultBuffer, ResultList
+
+
+@pytest.mark.unit
+def test_result_buffer_matches_concat():
+    rows = [
+        {"Date": "2021-07-26", "Hour": 17, "Horizon": 0, "Power [MW]": 30.0},
+        {"Date": "2021-07-26", "Hour": 17, "Horizon": 1, "Power [MW]": 40.5},
+        # missing and new columns
+        {"Date": "2021-07-26", "Hour": "18:00", "Horizon": 0, "Market": "RT"},
+        {"Date": "2021-07-26", "Hour": 18, "Horizon": 1, "Power [MW]": None},
+        # mixed integers and floats
+        {"Date": "2021-07-26", "Hour": 19, "Horizon": 0, "Cost [$]": 1},
+        {"Date": "2021-07-26", "Hour": 19, "Horizon": 1, "Cost [$]": 2.5},
+        {"Date": "2021-07-26", "Hour": 20, "Power [MW]": 2},
+    ]
+
+    buffer = ResultBuffer(initial_capacity=1)
+    for row in rows:
+        buffer.append(row)
+
+    assert len(buffer) == 7
+    assert buffer.columns == [
+        "Date",
+        "Hour",
+        "Horizon",
+        "Power [MW]",
+        "Market",
+        "Cost [$]",
+    ]
+
+    df = buffer.to_dataframe()
+    expected = pd.concat(
+        [pd.DataFrame.from_dict(row, orient="index").T for row in rows]
+    )
+    assert list(df.columns) == list(expected.columns)
+    assert df.to_csv(index=False) == expected.to_csv(index=False)
+
+
+@pytest.mark.unit
+def test_result_buffer_dtypes():
+    buffer = ResultBuffer(initial_capacity=2)
+    for i in range(5):
+        buffer.append({"int": i, "float": i / 2, "str": str(i)})
+
+    df = buffer.to_dataframe()
+    assert df["int"].dtype == np.int64
+    assert df["float"].dtype == float
+    assert df["str"].dtype == object
+    assert list(df["int"]) == [0, 1, 2, 3, 4]
+
+    # values are kept as recorded when a float or a missing value is recorded
+    buffer.append({"int": 0.5, "float": 5, "str": "5"})
+    buffer.append({"str": "6"})
+    df = buffer.to_dataframe()
+    assert df["int"].dtype == object
+    assert df["float"].dtype == object
+    assert list(df["int"].iloc[:-1]) == [0, 1, 2, 3, 4, 0.5]
+    assert type(df["int"].iloc[0]) is int
+    assert type(df["float"].iloc[-2]) is int
+    assert np.isnan(df["int"].iloc[-1])
+    assert np.isnan(df["float"].iloc[-1])
+    assert df.to_csv(index=False).splitlines()[-3:] == ["4,2.0,4", "0.5,5,5", ",,6"]
+
+
+@pytest.mark.unit
+def test_result_buffer_empty():
+    df = ResultBuffer().to_dataframe()
+    assert len(df) == 0
+    assert len(df.columns) == 0
+
+
+@pytest.mark.unit
+def test_result_list_read_only():
+    df = pd.DataFrame({"a": [1]})
+    result_list = ResultList([df], buffer_name="bids_result_buffer")
+    assert len(result_list) == 1
+    assert pd.concat(result_list).equals(df)
+
+    msg = "Use bids_result_buffer.append()"
+    with pytest.raises(TypeError, match=msg):
+        result_list.append(df)
+    with pytest.raises(TypeError, match=msg):
+        result_list.extend([df])
+    with pytest.raises(TypeError, match=msg):
+        result_list.insert(0, df)
+    with pytest.raises(TypeError, match=msg):
+        result_list += [df]
+    with pytest.raises(TypeError, match=msg):
+        result_list[0] = df
+    assert len(result_list) == 1
+
+
+@pytest.mark.performance
+def test_benchmark_result_buffer():
+    n_hours = 8760
+    horizon = 4
+
+    def rows(hour):
+        for t in range(horizon):
+            yield {
+                "Date": "2021-07-26",
+                "Hour": hour,
+                "Horizon [hr]": t,
+                "Power Dispatch [MW]": 30.0,
+                "Power Output [MW]": 30.0,
+            }
+
+    start = time.perf_counter()
+    df_list = []
+    for hour in range(n_hours):
+        df_list.append(
+            pd.concat(
+                [pd.DataFrame.from_dict(row, orient="index").T for row in rows(hour)]
+            )
+        )
+    expected = pd.concat(df_list)
+    t_concat = time.perf_counter() - start
+
+    start = time.perf_counter()
+    buffer = ResultBuffer()
+    for hour in range(n_hours):
+        for row in rows(hour):
+            buffer.append(row)
+    df = buffer.to_dataframe()
+    t_buffer = time.perf_counter() - start
+
+    print(f"DataFrame per row: {t_concat:.2f} s, ResultBuffer: {t_buffer:.2f} s")
+
+    assert df.to_csv(index=False) == expected.to_csv(index=False)
@@ -10,10 +10,16 @@
 # All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
 # for full copyright and license information.
 #################################################################################
-import pandas as pd
 import pyomo.environ as pyo
 from pyomo.opt.base.solvers import OptSolver
 import os
+from pyomo.common.deprecation import deprecated
+from idaes.apps.grid_integration.utils import (
+    ResultBuffer,
+    ResultList,
+    copy_persistent_solver,
+    is_persistent_solver,
+)
 
 
 class Tracker:
@@ -35,7 +41,10 @@ class Tracker:
 
             n_tracking_hour: number of implemented hours after each solve
 
-            solver: a Pyomo mathematical programming solver object
+            solver: a Pyomo mathematical programming solver object. If an
+            APPSI persistent solver is given (e.g., SolverFactory("appsi_highs")),
+            a copy of it is kept attached to the tracking model and only the
+            changes to the model are passed to it before each solve.
 
         Returns:
             None
@@ -62,10 +71,16 @@ class Tracker:
 
         self.formulate_tracking_problem()
 
+        if is_persistent_solver(self.solver):
+            self._persistent_solver = copy_persistent_solver(self.solver)
+        else:
+            self._persistent_solver = None
+        self._persistent_solver_attached = False
+
         self.daily_stats = None
         self.projection = None
 
-        self.result_list = []
+        self.result_buffer = ResultBuffer()
 
     def _check_inputs(self):
         """
@@ -137,7 +152,9 @@ class Tracker:
         Check if provides solver is a valid Pyomo solver object.
         """
 
-        if not isinstance(self.solver, OptSolver):
+        if not (
+            isinstance(self.solver, OptSolver) or is_persistent_solver(self.solver)
+        ):
             raise TypeError(
                 "The provided solver {} is not a valid Pyomo solver.".format(
                     self.solver
@@ -299,7 +316,7 @@ class Tracker:
         self._pass_market_dispatch(market_dispatch)
 
         # solve the model
-        self.solver.solve(self.model, tee=False)
+        self._solve_tracking_model()
 
         self.record_results(date=date, hour=hour)
 
@@ -312,6 +329,26 @@ class Tracker:
 
         return profiles
 
+    def _solve_tracking_model(self):
+        """
+        Solve the tracking model, using the persistent solver if there is one.
+
+        Arguments:
+            None
+
+        Returns:
+            None
+        """
+
+        if self._persistent_solver is None:
+            self.solver.solve(self.model, tee=False)
+        else:
+            # the first solve attaches the model to the persistent solver
+            self._persistent_solver.solve(self.model, tee=False)
+            self._persistent_solver_attached = True
+
+        return
+
     def _record_daily_stats(self, profiles):
         """
         Record the stats that are used to update the model in the past 24 hours.
@@ -346,15 +383,30 @@ class Tracker:
             None
         """
 
+        activated = []
+        deactivated = []
+
         for t in self.time_set:
 
+            con = self.model.tracking_dispatch_constraints[t]
             try:
                 dispatch = market_dispatch[t]
             except IndexError:
-                self.model.tracking_dispatch_constraints[t].deactivate()
+                if con.active:
+                    deactivated.append(con)
+                con.deactivate()
             else:
                 self.model.power_dispatch[t] = dispatch
-                self.model.tracking_dispatch_constraints[t].activate()
+                if not con.active:
+                    activated.append(con)
+                con.activate()
+
+        # the persistent solver does not look for (de)activated constraints
+        if self._persistent_solver_attached:
+            if deactivated:
+                self._persistent_solver.remove_constraints(deactivated)
+            if activated:
+                self._persistent_solver.add_constraints(activated)
 
         return
 
@@ -384,7 +436,6 @@ class Tracker:
 
         """
 
-        df_list = []
         for t in self.time_set:
 
             result_dict = {}
@@ -405,11 +456,7 @@ class Tracker:
                 pyo.value(self.model.power_overdelivered[t]), 2
             )
 
-            result_df = pd.DataFrame.from_dict(result_dict, orient="index")
-            df_list.append(result_df.T)
-
-        # append to result list
-        self.result_list.append(pd.concat(df_list))
+            self.result_buffer.append(result_dict)
 
     def record_results(self, **kwargs):
         """
@@ -429,6 +476,21 @@ class Tracker:
         # tracking model details
         self.tracking_model_object.record_results(self.model.fs, **kwargs)
 
+    @property
+    @deprecated(
+        "result_list has been replaced by result_buffer. Use "
+        "result_buffer.to_dataframe() to get the recorded results.",
+        version="2.6.0",
+    )
+    def result_list(self):
+        """
+        List holding a DataFrame of the recorded tracking results, for
+        backward compatibility. Results can not be added to this list.
+        """
+        return ResultList(
+            [self.result_buffer.to_dataframe()], buffer_name="result_buffer"
+        )
+
     def write_results(self, path):
         """
         This methods writes the saved operation stats into an csv file.
@@ -443,7 +505,7 @@ class Tracker:
         print("")
         print("Saving tracking results to disk...")
 
-        pd.concat(self.result_list).to_csv(
+        self.result_buffer.to_dataframe().to_csv(
             os.path.join(path, "tracker_detail.csv"), index=False
         )
         self.tracking_model_object.write_results(
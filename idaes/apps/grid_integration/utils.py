@@ -10,6 +10,60 @@
 # All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
 # for full copyright and license information.
 #################################################################################
+import copy
+from numbers import Integral, Real
+
+import numpy as np
+import pandas as pd
+from pyomo.contrib.appsi.base import LegacySolverInterface, PersistentSolver
+
+
+def is_persistent_solver(solver):
+    """
+    Check if a solver is an APPSI persistent solver created through the Pyomo
+    SolverFactory, e.g., SolverFactory("appsi_highs").
+
+    Args:
+        solver: a Pyomo solver object
+
+    Returns:
+        bool: True if the solver is an APPSI persistent solver.
+    """
+
+    return isinstance(solver, LegacySolverInterface) and isinstance(
+        solver, PersistentSolver
+    )
+
+
+def copy_persistent_solver(solver):
+    """
+    Make a copy of an APPSI persistent solver to be attached to a single model.
+
+    The copy only checks the values of the parameters, the variables (bounds,
+    values of fixed variables and fixed status) and the objective for changes
+    before each solve, rather than looking for added or removed components and
+    modified constraints. The caller is responsible for telling the solver
+    about constraints that are activated or deactivated once it has been
+    attached to a model.
+
+    Args:
+        solver: an APPSI persistent solver which is not attached to a model
+
+    Returns:
+        an APPSI persistent solver.
+    """
+
+    solver = copy.deepcopy(solver)
+
+    config = solver.update_config
+    config.check_for_new_or_removed_constraints = False
+    config.check_for_new_or_removed_vars = False
+    config.check_for_new_or_removed_params = False
+    config.check_for_new_objective = False
+    config.update_constraints = False
+    config.update_named_expressions = False
+
+    return solver
 
 
 def convert_marginal_costs_to_actual_costs(power_marginal_cost_pairs):
@@ -42,3 +96,165 @@ def convert_marginal_costs_to_actual_costs(power_marginal_cost_pairs):
         pre_cost += marginal_cost * delta_p
 
     return actual_costs
+
+
+def _is_int(value):
+    return isinstance(value, Integral) and not isinstance(value, bool)
+
+
+def _is_float(value):
+    return isinstance(value, Real) and not isinstance(value, (Integral, bool))
+
+
+class ResultBuffer:
+    """
+    Store rows of results in one NumPy array per column, and build a pandas
+    DataFrame from them once all the results have been recorded.
+
+    The arrays are preallocated and their capacity is doubled whenever it is
+    reached. Columns holding only integers or only floats are stored in integer
+    or float arrays, and other columns (including those mixing integers, floats
+    and missing values) in object arrays, so that every value is written out
+    as it was recorded. This gives the same CSV output as concatenating a
+    one-row DataFrame per row of mixed type results. Columns which are not
+    given a value in a row hold NaN for that row.
+    """
+
+    def __init__(self, initial_capacity=64):
+        """
+        Initializes the result buffer.
+
+        Arguments:
+            initial_capacity: number of rows to preallocate
+
+        Returns:
+            None
+        """
+
+        self._capacity = max(int(initial_capacity), 1)
+        self._n_rows = 0
+        self._columns = {}
+
+    def __len__(self):
+        return self._n_rows
+
+    @property
+    def columns(self):
+        """
+        List of the column names, in the order they were first recorded.
+        """
+        return list(self._columns)
+
+    def append(self, row):
+        """
+        Add a row of results.
+
+        Arguments:
+            row: a dict of {column name: value}
+
+        Returns:
+            None
+        """
+
+        if self._n_rows == self._capacity:
+            self._grow()
+
+        i = self._n_rows
+        for name, value in row.items():
+            column = self._columns.get(name, None)
+            if column is None:
+                column = self._add_column(name, value)
+            elif not self._fits(column, value):
+                column = self._promote(name)
+            column[i] = value
+
+        if len(row) < len(self._columns):
+            for name, column in self._columns.items():
+                if name not in row:
+                    if column.dtype.kind == "i":
+                        column = self._columns[name] = column.astype(object)
+                    column[i] = np.nan
+
+        self._n_rows += 1
+
+    def to_dataframe(self):
+        """
+        Build a pandas DataFrame holding all the recorded rows.
+
+        Arguments:
+            None
+
+        Returns:
+            pandas.DataFrame: the recorded results
+        """
+
+        return pd.DataFrame(
+            {name: column[: self._n_rows] for name, column in self._columns.items()},
+            columns=self.columns,
+        )
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            new_column = np.empty(self._capacity, dtype=column.dtype)
+            new_column[: self._n_rows] = column[: self._n_rows]
+            self._columns[name] = new_column
+
+    def _add_column(self, name, value):
+        # earlier rows hold NaN for a new column, which only a float column
+        # can store without changing how the other values are written
+        if _is_int(value) and self._n_rows == 0:
+            column = np.empty(self._capacity, dtype=np.int64)
+        elif _is_float(value):
+            column = np.empty(self._capacity, dtype=float)
+        else:
+            column = np.empty(self._capacity, dtype=object)
+        if self._n_rows > 0:
+            column[: self._n_rows] = np.nan
+        self._columns[name] = column
+        return column
+
+    @staticmethod
+    def _fits(column, value):
+        if column.dtype.kind == "i":
+            return _is_int(value)
+        if column.dtype.kind == "f":
+            return _is_float(value)
+        return True
+
+    def _promote(self, name):
+        # integers and floats are kept as they were recorded once mixed
+        column = self._columns[name] = self._columns[name].astype(object)
+        return column
+
+
+class ResultList(list):
+    """
+    List of DataFrames of recorded results, returned by the deprecated
+    result_list attributes. Results are now recorded in a ResultBuffer, so
+    adding to this list raises an error rather than silently losing data.
+    """
+
+    def __init__(self, iterable=(), buffer_name="result_buffer"):
+        """
+        Initializes the result list.
+
+        Arguments:
+            iterable: DataFrames of recorded results
+            buffer_name: name of the ResultBuffer attribute recording results
+
+        Returns:
+            None
+        """
+
+        super().__init__(iterable)
+        self._buffer_name = buffer_name
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "Results are now recorded in a ResultBuffer and can not be added "
+            f"to this list. Use {self._buffer_name}.append() to record rows "
+            "of results instead."
+        )
+
+    append = extend = insert = __iadd__ = __setitem__ = _read_only
@@ -14,6 +14,7 @@
 # pylint: disable=missing-module-docstring
 
 from .block_triangularization import BlockTriangularizationInitializer
+from .flowsheet_initializer import FlowsheetInitializer
 from .general_hierarchical import SingleControlVolumeUnitInitializer
 from .initialize_from_data import FromDataInitializer
 from .initializer_base import (
@@ -21,3 +22,4 @@ from .initializer_base import (
     InitializerBase,
     InitializationStatus,
 )
+from .model_state import ModelStateSnapshot
@@ -14,7 +14,7 @@
 Initializer class for implementing Block Triangularization initialization
 """
 from pyomo.environ import SolverFactory
-from pyomo.common.config import ConfigDict, ConfigValue
+from pyomo.common.config import Bool, ConfigDict, ConfigValue
 from pyomo.contrib.incidence_analysis import (
     IncidenceGraphInterface,
     solve_strongly_connected_components,
@@ -25,6 +25,7 @@ from idaes.core.initialization.initializer_base import (
     InitializationStatus,
 )
 from idaes.core.util.exceptions import InitializationError
+from idaes.core.util.initialization import batch_solve_strongly_connected_components
 from idaes.core.solvers import get_solver
 
 __author__ = "Andrew Lee"
@@ -77,6 +78,20 @@ class BlockTriangularizationInitializer(InitializerBase):
             "solve_strongly_connected_components method.",
         ),
     )
+    CONFIG.declare(
+        "batch_identical_blocks",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Whether to solve blocks with identical structure together",
+            doc="If True and the model is indexed, BlockDatas with identical "
+            "incidence structure are solved together, with each strongly connected "
+            "component of all blocks solved with a single call to the block solver "
+            "(see batch_solve_strongly_connected_components). Blocks which fail to "
+            "converge in the combined solve are re-solved individually. If False, "
+            "each BlockData is solved separately.",
+        ),
+    )
 
     def precheck(self, model):
         """
@@ -117,7 +132,14 @@ class BlockTriangularizationInitializer(InitializerBase):
         else:
             solver = get_solver(options=self.config.block_solver_options)
 
-        if model.is_indexed():
+        if model.is_indexed() and self.config.batch_identical_blocks:
+            batch_solve_strongly_connected_components(
+                model,
+                solver=solver,
+                solve_kwds=self.config.block_solver_call_options,
+                calc_var_kwds=self.config.calculate_variable_options,
+            )
+        elif model.is_indexed():
             for d in model.values():
                 self._solve_block_data(d, solver)
         else:
@@ -0,0 +1,548 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Initializer class for flowsheets, which initializes the unit models in a
+flowsheet in sequence following the Arcs connecting them.
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import copy
+import multiprocessing
+import pickle
+from time import perf_counter
+
+import networkx as nx
+from pandas import DataFrame
+
+from pyomo.environ import Block, ComponentMap, check_optimal_termination, value
+from pyomo.network import SequentialDecomposition
+from pyomo.common.config import Bool, ConfigValue, In, PositiveInt, NonNegativeFloat
+
+from idaes.core.initialization.initializer_base import (
+    InitializationStatus,
+    ModularInitializerBase,
+)
+from idaes.core.initialization.model_state import ModelStateSnapshot
+from idaes.core.util.exceptions import InitializationError
+from idaes.core.util.initialization import propagate_state
+import idaes.logger as idaeslog
+
+__author__ = "Andrew Lee"
+
+
+# Copy of the flowsheet held by each worker process
+_worker_model = None
+
+
+def _initialize_worker(model):
+    """Set the copy of the flowsheet used by worker processes."""
+    global _worker_model  # pylint: disable=global-statement
+    _worker_model = model
+
+
+def _load_worker_model(model_pickle):
+    """Load the copy of the flowsheet used by a worker process."""
+    _initialize_worker(pickle.loads(model_pickle))
+
+
+def _initialize_unit_in_worker(unit_name, state_arrays, initializer):
+    """
+    Initialize a unit model in the copy of the flowsheet held by a worker
+    process.
+
+    The state of the unit in the main process is loaded into the copy before
+    initialization, and the state after initialization is returned so that it
+    can be merged back into the main process.
+    """
+    unit = _worker_model.find_component(unit_name)
+
+    snapshot = ModelStateSnapshot(unit)
+    snapshot.set_arrays(state_arrays)
+    snapshot.restore(all_values=True)
+
+    status, time, message = _run_unit_initializer(initializer, unit)
+
+    return status, time, message, ModelStateSnapshot(unit).get_arrays()
+
+
+def _run_unit_initializer(initializer, unit):
+    """
+    Run an Initializer on a unit model, returning the status, run time and
+    error message (if initialization failed).
+    """
+    start = perf_counter()
+    message = None
+    try:
+        status = initializer.initialize(unit)
+    except InitializationError as err:
+        status = initializer.summary.get(unit, {}).get(
+            "status", InitializationStatus.Failed
+        )
+        if status == InitializationStatus.none:
+            status = InitializationStatus.Failed
+        message = str(err)
+
+    return status, perf_counter() - start, message
+
+
+class FlowsheetInitializer(ModularInitializerBase):
+    """
+    Initializer for flowsheets, which initializes each unit model in turn
+    following the Arcs connecting them.
+
+    The routine is:
+
+        1. build a graph of the unit models and (expanded) Arcs in the flowsheet,
+        2. select a set of tear streams which makes the graph acyclic,
+        3. initialize each unit model in topological order using its Initializer
+           (see get_submodel_initializer), calling propagate_state on its inlet
+           Arcs first,
+        4. propagate values across the tear streams and repeat step 3 until the
+           tear streams converge or max_tear_iterations is reached, and
+        5. solve the full flowsheet (if solve_flowsheet is True).
+
+    When max_workers is greater than 1, unit models whose upstream units have all
+    been initialized are initialized concurrently in worker processes, each of
+    which holds a copy of the flowsheet. The state of each unit is sent to the
+    worker before initialization and merged back afterwards using
+    ModelStateSnapshots.
+
+    The status and run time of the Initializer for each unit model are stored in
+    the summary and can be retrieved using unit_summary.
+
+    Guesses for tear streams can be provided using set_guesses_for.
+
+    """
+
+    CONFIG = ModularInitializerBase.CONFIG()
+    CONFIG.declare(
+        "max_workers",
+        ConfigValue(
+            default=None,
+            domain=PositiveInt,
+            description="Number of worker processes to use",
+            doc="Number of worker processes used to initialize independent unit "
+            "models concurrently. If None or 1, unit models are initialized "
+            "sequentially in the main process.",
+        ),
+    )
+    CONFIG.declare(
+        "tear_method",
+        ConfigValue(
+            default="heuristic",
+            domain=In(["heuristic", "mip"]),
+            description="Method to use to select tear streams",
+            doc="Method used by Pyomo's SequentialDecomposition to select tear "
+            "streams. Note that 'mip' requires a MIP solver.",
+        ),
+    )
+    CONFIG.declare(
+        "max_tear_iterations",
+        ConfigValue(
+            default=1,
+            domain=PositiveInt,
+            description="Maximum number of passes through the flowsheet",
+            doc="Maximum number of passes through the flowsheet when tear streams "
+            "are present. Values are propagated across the tear streams after each "
+            "pass.",
+        ),
+    )
+    CONFIG.declare(
+        "tear_tolerance",
+        ConfigValue(
+            default=1e-5,
+            domain=NonNegativeFloat,
+            description="Convergence tolerance for tear streams",
+            doc="Tolerance on the maximum relative change in the values of "
+            "variables in tear streams between passes through the flowsheet.",
+        ),
+    )
+    CONFIG.declare(
+        "solve_flowsheet",
+        ConfigValue(
+            default=True,
+            domain=Bool,
+            description="Whether to solve the full flowsheet",
+            doc="Whether to solve the full flowsheet after initializing the unit "
+            "models.",
+        ),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.tear_guesses = ComponentMap()
+
+    def set_guesses_for(self, port, guesses: dict):
+        """
+        Set guesses for the variables in a Port at the destination of a tear stream.
+
+        Guesses should be a dict with the names of the members of the Port as
+        keys, and either a value for all indices of the member or a dict of
+        values keyed by index.
+
+        Args:
+            port: Port to set guesses for.
+            guesses: dict of guesses for members of the Port.
+
+        Returns:
+            None
+        """
+        self.tear_guesses[port] = guesses
+
+    def initialization_routine(self, model: Block):
+        """
+        Initialization routine for flowsheets.
+
+        Args:
+            model: flowsheet to be initialized
+
+        Returns:
+            Pyomo solver results object from solving the full flowsheet, or None
+            if solve_flowsheet is False.
+        """
+        _log = self.get_logger(model)
+
+        graph, tears = self.get_flowsheet_graph(model)
+        order = self.get_initialization_order(graph)
+        self._update_summary(model, "unit_order", order)
+        self._update_summary(model, "tear_streams", tears)
+        _log.info_high(
+            f"Step 1: flowsheet graph built with {len(order)} units and "
+            f"{len(tears)} tear streams."
+        )
+
+        self.load_tear_guesses(tears)
+        for iteration in range(1, self.config.max_tear_iterations + 1):
+            self.initialize_units(model, graph, order)
+
+            if len(tears) == 0:
+                break
+
+            change = self.propagate_tear_streams(tears)
+            _log.info_high(
+                f"Pass {iteration}: maximum relative change in tear streams "
+                f"{change:.3e}."
+            )
+            if change <= self.config.tear_tolerance:
+                break
+        self._update_summary(model, "iterations", iteration)
+        _log.info_high("Step 2: unit model initialization complete.")
+
+        results = None
+        if self.config.solve_flowsheet:
+            solve_log = idaeslog.getSolveLogger(
+                model.name, self.get_output_level(), tag="unit"
+            )
+            with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
+                results = self._get_solver().solve(model, tee=slc.tee)
+            _log.info_high(f"Step 3: flowsheet solve {idaeslog.condition(results)}.")
+            if not check_optimal_termination(results):
+                _log.warning(f"Solve of flowsheet {model.name} was not optimal.")
+
+        return results
+
+    def get_flowsheet_graph(self, model: Block):
+        """
+        Build a graph of the unit models and Arcs in a flowsheet and select tear
+        streams.
+
+        Args:
+            model: flowsheet to build graph for. All Arcs must have been expanded.
+
+        Returns:
+            networkx MultiDiGraph with unit models as nodes and an edge (with the
+            Arc as the arc attribute) for each Arc, and list of tear Arcs.
+
+        Raises:
+            InitializationError if the Arcs have not been expanded.
+        """
+        # Avoid circular import, as unit_model uses initializers
+        # pylint: disable-next=import-outside-toplevel
+        from idaes.core.base.unit_model import UnitModelBlockData
+
+        sd = SequentialDecomposition()
+        try:
+            graph = sd.create_graph(model)
+        except ValueError as err:
+            self._update_summary(model, "status", InitializationStatus.Error)
+            raise InitializationError(
+                f"Could not build graph for flowsheet {model.name}: {err}. Arcs "
+                "must be expanded (using network.expand_arcs) before initialization."
+            ) from err
+
+        # Include unit models that are not connected to any Arcs
+        for blk in model.component_data_objects(Block, descend_into=False):
+            if isinstance(blk, UnitModelBlockData) and blk not in graph:
+                graph.add_node(blk)
+
+        if nx.is_directed_acyclic_graph(graph):
+            tears = []
+        else:
+            tears = sd.tear_set_arcs(graph, method=self.config.tear_method)
+
+        tear_set = set(id(a) for a in tears)
+        graph.remove_edges_from(
+            [
+                (u, v, k)
+                for u, v, k, arc in graph.edges(keys=True, data="arc")
+                if id(arc) in tear_set
+            ]
+        )
+
+        return graph, tears
+
+    def get_initialization_order(self, graph):
+        """
+        Get a topological order of the unit models in a flowsheet graph (with tear
+        streams removed). Ties are broken by the order in which units were added
+        to the graph, so the order is stable.
+
+        Args:
+            graph: flowsheet graph from get_flowsheet_graph
+
+        Returns:
+            list of unit models
+        """
+        position = {node: i for i, node in enumerate(graph.nodes)}
+        return list(
+            nx.lexicographical_topological_sort(graph, key=lambda n: position[n])
+        )
+
+    def load_tear_guesses(self, tears):
+        """
+        Load guesses provided via set_guesses_for into the destination Ports of
+        tear streams. Values of fixed variables are not changed.
+
+        Args:
+            tears: list of tear Arcs
+
+        Returns:
+            None
+        """
+        for arc in tears:
+            port = arc.dest
+            if port not in self.tear_guesses:
+                _log = idaeslog.getLogger(__name__)
+                _log.info_high(
+                    f"No guesses provided for tear stream {arc.name}, using "
+                    "current values."
+                )
+                continue
+
+            for name, guess in self.tear_guesses[port].items():
+                member = port.vars[name]
+                for idx, var in member.items():
+                    if not var.is_variable_type() or var.fixed:
+                        continue
+                    if isinstance(guess, dict):
+                        if idx in guess:
+                            var.set_value(guess[idx])
+                    else:
+                        var.set_value(guess)
+
+    def propagate_tear_streams(self, tears):
+        """
+        Propagate values across tear streams.
+
+        Args:
+            tears: list of tear Arcs
+
+        Returns:
+            maximum relative change in the values of the destination variables.
+        """
+        max_change = 0.0
+        for arc in tears:
+            dest_vars = [
+                v for v in arc.dest.iter_vars(names=False) if v.is_variable_type()
+            ]
+            old_values = [v.value for v in dest_vars]
+
+            propagate_state(arc=arc)
+
+            for v, old in zip(dest_vars, old_values):
+                new = value(v, exception=False)
+                if old is None or new is None:
+                    if old is not new:
+                        max_change = float("inf")
+                    continue
+                max_change = max(max_change, abs(new - old) / max(1.0, abs(old)))
+
+        return max_change
+
+    def initialize_units(self, model: Block, graph, order: list):
+        """
+        Initialize the unit models in a flowsheet following the flowsheet graph.
+
+        Args:
+            model: flowsheet being initialized
+            graph: flowsheet graph from get_flowsheet_graph
+            order: list of unit models from get_initialization_order
+
+        Returns:
+            None
+        """
+        initializers = {unit: self.get_submodel_initializer(unit) for unit in order}
+
+        n_workers = self.config.max_workers
+        executor = None
+        if n_workers is not None and n_workers > 1 and len(order) > 1:
+            executor = self._get_executor(model)
+
+        if executor is None:
+            for unit in order:
+                self._propagate_inlets(graph, unit)
+                self._record_unit(
+                    model,
+                    unit,
+                    *self._initialize_unit(unit, initializers[unit]),
+                )
+        else:
+            try:
+                with executor:
+                    self._initialize_units_in_parallel(
+                        model, graph, order, initializers, executor
+                    )
+            finally:
+                _initialize_worker(None)
+
+    def unit_summary(self, model: Block):
+        """
+        Summary of the status and run time of the Initializer for each unit model
+        in the last initialization of a flowsheet.
+
+        Args:
+            model: flowsheet to get summary for
+
+        Returns:
+            pandas DataFrame indexed by unit model name
+        """
+        units = self.summary[model]["unit_order"]
+        return DataFrame(
+            {
+                "Status": [self.summary[u]["status"].name for u in units],
+                "Time [s]": [self.summary[u]["time"] for u in units],
+                "Message": [self.summary[u]["message"] for u in units],
+            },
+            index=[u.name for u in units],
+        )
+
+    def _get_executor(self, model):
+        """
+        Create a pool of worker processes each holding a copy of the flowsheet,
+        or return None if the flowsheet cannot be copied to worker processes.
+        """
+        if "fork" in multiprocessing.get_all_start_methods():
+            # Forked workers inherit the flowsheet from the main process, which
+            # avoids pickling it (IDAES process blocks cannot be pickled)
+            _initialize_worker(model.model())
+            return ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+
+        try:
+            model_pickle = pickle.dumps(model.model())
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self.get_logger(model).warning(
+                f"Could not copy flowsheet {model.name} to worker processes "
+                f"({err}); initializing units sequentially."
+            )
+            return None
+        return ProcessPoolExecutor(
+            max_workers=self.config.max_workers,
+            initializer=_load_worker_model,
+            initargs=(model_pickle,),
+        )
+
+    def _initialize_units_in_parallel(
+        self, model, graph, order, initializers, executor
+    ):
+        position = {unit: i for i, unit in enumerate(order)}
+        # Count upstream units rather than Arcs, as units may share several Arcs
+        remaining = {unit: len(set(graph.predecessors(unit))) for unit in order}
+        ready = deque(unit for unit in order if remaining[unit] == 0)
+
+        running = {}
+        while ready or running:
+            while ready:
+                unit = ready.popleft()
+                self._propagate_inlets(graph, unit)
+                initializer = initializers[unit]
+                if initializer is None:
+                    self._record_unit(model, unit, InitializationStatus.none, 0.0)
+                    ready.extend(self._release_successors(graph, unit, remaining))
+                    continue
+                running[
+                    executor.submit(
+                        _initialize_unit_in_worker,
+                        unit.name,
+                        ModelStateSnapshot(unit).get_arrays(),
+                        _detach_initializer(initializer),
+                    )
+                ] = unit
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            # Merge results in a stable order
+            for future in sorted(done, key=lambda f: position[running[f]]):
+                unit = running.pop(future)
+                status, time, message, state_arrays = future.result()
+
+                snapshot = ModelStateSnapshot(unit)
+                snapshot.set_arrays(state_arrays)
+                snapshot.restore(all_values=True)
+
+                self._record_unit(model, unit, status, time, message)
+                ready.extend(self._release_successors(graph, unit, remaining))
+
+    @staticmethod
+    def _release_successors(graph, unit, remaining):
+        released = []
+        for successor in graph.successors(unit):
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                released.append(successor)
+        return released
+
+    @staticmethod
+    def _propagate_inlets(graph, unit):
+        for _, _, arc in graph.in_edges(unit, data="arc"):
+            propagate_state(arc=arc)
+
+    @staticmethod
+    def _initialize_unit(unit, initializer):
+        if initializer is None:
+            return InitializationStatus.none, 0.0, None
+        return _run_unit_initializer(initializer, unit)
+
+    def _record_unit(self, model, unit, status, time, message=None):
+        self._update_summary(unit, "status", status)
+        self._update_summary(unit, "time", time)
+        self._update_summary(unit, "message", message)
+
+        _log = self.get_logger(model)
+        if message is not None:
+            _log.warning(f"Initialization of {unit.name} failed: {message}")
+        _log.info(f"Unit {unit.name}: {status.name} ({time:.3f} s).")
+
+
+def _detach_initializer(initializer):
+    """
+    Shallow copy of an Initializer without any stored states or summaries, so
+    that sending it to a worker process does not copy any models.
+    """
+    initializer = copy.copy(initializer)
+    initializer.initial_state = {}
+    initializer._initial_snapshots = {}  # pylint: disable=protected-access
+    initializer.summary = {}
+    return initializer
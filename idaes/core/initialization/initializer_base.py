@@ -26,6 +26,7 @@ from pyomo.core.base.var import VarData
 from pyomo.common.config import ConfigDict, ConfigValue, String_ConfigFormatter
 
 from idaes.core.util.model_serializer import to_json, from_json, StoreSpec, _only_fixed
+from idaes.core.initialization.model_state import ModelStateSnapshot
 from idaes.core.util.exceptions import InitializationError
 from idaes.core.util.model_statistics import (
     degrees_of_freedom,
@@ -105,6 +106,7 @@ class InitializerBase:
         self.config = self.CONFIG(kwargs)
 
         self.initial_state = {}
+        self._initial_snapshots = {}
         self.summary = {}
         self._local_logger_level = (
             None  # To allow calls to initialize to override global setting
@@ -214,6 +216,11 @@ class InitializerBase:
             dict serializing current model state.
         """
         self.initial_state[model] = to_json(model, wts=StoreState, return_dict=True)
+        # A snapshot of the same state is restored faster than the dict
+        self._initial_snapshots[model] = (
+            self.initial_state[model],
+            ModelStateSnapshot(model),
+        )
 
         return self.initial_state[model]
 
@@ -342,7 +349,12 @@ class InitializerBase:
             ValueError if no initial state is stored.
         """
         if model in self.initial_state:
-            from_json(model, sd=self.initial_state[model], wts=StoreState)
+            state, snapshot = self._initial_snapshots.get(model, (None, None))
+            if state is self.initial_state[model]:
+                snapshot.restore()
+            else:
+                # State was stored without get_current_state
+                from_json(model, sd=self.initial_state[model], wts=StoreState)
         else:
             self._update_summary(model, "status", InitializationStatus.Error)
             raise ValueError("No initial state stored.")
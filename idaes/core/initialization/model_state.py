@@ -0,0 +1,341 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+In-memory snapshots of model state for use by initializers.
+
+A ModelStateSnapshot records the same information as serializing a model with
+the StoreState spec (fixed status and values of variables, active status of
+Blocks and Constraints), plus variable bounds, but holds it in flat NumPy
+arrays rather than nested dicts keyed by component names. The component
+order used for the arrays is stored on the model, so repeated snapshots of the
+same model do not need to rebuild it.
+"""
+import numpy as np
+
+from pyomo.environ import Block, BooleanVar, Constraint, Var
+from pyomo.core.base.component import ActiveComponent
+
+__author__ = "Andrew Lee"
+
+
+class _ComponentOrder:
+    """
+    Stable ordering of the component data objects of a model.
+
+    Holds the VarData, BooleanVarData, ConstraintData and BlockData objects of
+    a model (including the model itself and any deactivated sub-blocks), along
+    with the indexed Block and Constraint components, whose active flags are
+    tracked separately from those of their data objects.
+
+    The order is stored on the model it describes, so it is freed along with
+    the model. It is not copied when the model is cloned or pickled.
+    """
+
+    def __init__(self, model=None):
+        self.signature = None
+        if model is None:
+            return
+        self.variables = _unique_data(model, Var)
+        self.boolean_variables = _unique_data(model, BooleanVar)
+        self.constraints = _unique_data(model, Constraint)
+        self.blocks = [model] + _unique_data(model, Block)
+        self.indexed_components = [
+            c
+            for c in model.component_objects(
+                (Block, Constraint), active=None, descend_into=True
+            )
+            if c.is_indexed()
+        ]
+        self._indexed_variables = [
+            c
+            for c in model.component_objects(
+                (Var, BooleanVar), active=None, descend_into=True
+            )
+            if c.is_indexed()
+        ]
+        self.signature = self.get_signature()
+
+    def __reduce__(self):
+        return (self.__class__, ())
+
+    def get_signature(self):
+        """
+        Summary of model structure used to detect when the cached order is out
+        of date, i.e. when components or indices are added to or deleted from
+        any of the blocks.
+        """
+        # pylint: disable=protected-access
+        return (
+            tuple((len(b._decl), len(b._decl_order)) for b in self.blocks),
+            tuple(len(c) for c in self.indexed_components),
+            tuple(len(c) for c in self._indexed_variables),
+        )
+
+
+def _unique_data(model, ctype):
+    """
+    List of the component data objects of ctype in model (descending into all
+    sub-blocks, active or not), with duplicates from References removed.
+    """
+    seen = set()
+    data = []
+    for d in model.component_data_objects(ctype, active=None, descend_into=True):
+        if id(d) not in seen:
+            seen.add(id(d))
+            data.append(d)
+    return data
+
+
+def _get_component_order(model):
+    """
+    Get the cached component order for model, rebuilding it if the model
+    structure has changed since it was cached.
+    """
+    order = getattr(model, "_model_state_order", None)
+    if (
+        not isinstance(order, _ComponentOrder)
+        or order.signature is None
+        or order.signature != order.get_signature()
+    ):
+        # Snapshots keep the order they were taken with, so build a new one
+        order = _ComponentOrder(model)
+        model._model_state_order = order
+    return order
+
+
+def _values_array(components):
+    """
+    Get the values of a list of variables as a float array with NaN for None,
+    along with a boolean array indicating which variables have a value.
+    """
+    values = [c.value for c in components]
+    has_value = np.fromiter((v is not None for v in values), bool, len(values))
+    return (
+        np.fromiter((np.nan if v is None else v for v in values), float, len(values)),
+        has_value,
+    )
+
+
+def _bounds_arrays(components):
+    """
+    Get the lower and upper bounds of a list of variables as float arrays,
+    with -inf and inf for missing bounds.
+    """
+    bounds = [(c.lb, c.ub) for c in components]
+    lb = np.fromiter(
+        (-np.inf if l is None else l for l, _ in bounds), float, len(bounds)
+    )
+    ub = np.fromiter(
+        (np.inf if u is None else u for _, u in bounds), float, len(bounds)
+    )
+    return lb, ub
+
+
+def _flags_array(components, attr):
+    """
+    Get a boolean attribute from a list of components as a boolean array.
+    """
+    return np.fromiter((getattr(c, attr) for c in components), bool, len(components))
+
+
+# Names of the state arrays held by a ModelStateSnapshot
+_STATE_ARRAYS = (
+    "var_fixed",
+    "var_value",
+    "var_has_value",
+    "var_lb",
+    "var_ub",
+    "boolean_var_fixed",
+    "boolean_var_value",
+    "boolean_var_has_value",
+    "constraint_active",
+    "block_active",
+    "indexed_component_active",
+)
+
+
+class ModelStateSnapshot:
+    """
+    Snapshot of the state of a model stored in flat NumPy arrays.
+
+    The snapshot records:
+
+        - fixed status, values and bounds of all variables,
+        - fixed status and values of all Boolean variables,
+        - active status of all Constraints and Blocks.
+
+    Calling restore writes back only the entries which differ from the
+    snapshot, following the same rules as loading a state serialized with
+    StoreState: values are only restored for variables which were fixed when
+    the snapshot was taken. Bounds are reset only for variables whose bounds
+    have changed.
+
+    Args:
+        model: Pyomo Block to take a snapshot of.
+    """
+
+    def __init__(self, model: Block):
+        self.model = model
+        self._order = order = _get_component_order(model)
+
+        self.var_fixed = _flags_array(order.variables, "fixed")
+        self.var_value, self.var_has_value = _values_array(order.variables)
+        self.var_lb, self.var_ub = _bounds_arrays(order.variables)
+
+        self.boolean_var_fixed = _flags_array(order.boolean_variables, "fixed")
+        (
+            self.boolean_var_value,
+            self.boolean_var_has_value,
+        ) = _values_array(order.boolean_variables)
+
+        self.constraint_active = _flags_array(order.constraints, "active")
+        self.block_active = _flags_array(order.blocks, "active")
+        self.indexed_component_active = _flags_array(order.indexed_components, "active")
+
+    @property
+    def variables(self):
+        """List of variables in the order used for the variable arrays."""
+        return self._order.variables
+
+    @property
+    def boolean_variables(self):
+        """List of Boolean variables in the order used for their arrays."""
+        return self._order.boolean_variables
+
+    @property
+    def constraints(self):
+        """List of constraints in the order used for constraint_active."""
+        return self._order.constraints
+
+    @property
+    def blocks(self):
+        """List of blocks in the order used for block_active."""
+        return self._order.blocks
+
+    def get_arrays(self):
+        """
+        Get the state arrays of the snapshot.
+
+        The arrays do not reference any Pyomo components, and so can be sent
+        to another process and loaded into a snapshot of a copy of the model
+        using set_arrays.
+
+        Returns:
+            dict of NumPy arrays, keyed by attribute name.
+        """
+        return {name: getattr(self, name) for name in _STATE_ARRAYS}
+
+    def set_arrays(self, arrays: dict):
+        """
+        Replace the state arrays of the snapshot, e.g. with those taken from a
+        copy of the model using get_arrays. The state is not written to the
+        model until restore is called.
+
+        Args:
+            arrays: dict of NumPy arrays, keyed by attribute name.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError if the arrays do not match the structure of the model.
+        """
+        for name in _STATE_ARRAYS:
+            if arrays[name].shape != getattr(self, name).shape:
+                raise ValueError(
+                    f"Cannot load state into {self.model.name}: shape of {name} "
+                    f"{arrays[name].shape} does not match the model "
+                    f"{getattr(self, name).shape}."
+                )
+        for name in _STATE_ARRAYS:
+            setattr(self, name, np.array(arrays[name]))
+
+    def restore(self, all_values: bool = False):
+        """
+        Restore the state of the model to that stored in the snapshot.
+
+        Components added to the model after the snapshot was taken are left
+        unchanged.
+
+        Args:
+            all_values: if True, restore the values of all variables rather
+                than only those of fixed variables (default=False).
+
+        Returns:
+            None
+        """
+        order = self._order
+        self._restore_variables(
+            order.variables,
+            self.var_fixed,
+            self.var_value,
+            self.var_has_value,
+            float,
+            all_values,
+        )
+        self._restore_variables(
+            order.boolean_variables,
+            self.boolean_var_fixed,
+            self.boolean_var_value,
+            self.boolean_var_has_value,
+            bool,
+            all_values,
+        )
+        self._restore_bounds()
+
+        # Data objects first, as activating data also activates its parent
+        self._restore_active(order.constraints, self.constraint_active)
+        self._restore_active(order.blocks, self.block_active)
+        for i in np.flatnonzero(
+            _flags_array(order.indexed_components, "active")
+            != self.indexed_component_active
+        ):
+            # Only set the flag on the indexed component, not all its data
+            if self.indexed_component_active[i]:
+                ActiveComponent.activate(order.indexed_components[i])
+            else:
+                ActiveComponent.deactivate(order.indexed_components[i])
+
+    @staticmethod
+    def _restore_variables(components, fixed, values, has_value, cast, all_values):
+        current_fixed = _flags_array(components, "fixed")
+        current_values, current_has_value = _values_array(components)
+
+        changed_value = (has_value != current_has_value) | (
+            has_value & (current_values != values)
+        )
+        if not all_values:
+            # Values are restored only for variables that were fixed
+            changed_value &= fixed
+        for i in np.flatnonzero(changed_value):
+            components[i].set_value(cast(values[i]) if has_value[i] else None)
+        for i in np.flatnonzero(fixed & ~current_fixed):
+            components[i].fix()
+        for i in np.flatnonzero(~fixed & current_fixed):
+            components[i].unfix()
+
+    def _restore_bounds(self):
+        components = self._order.variables
+        current_lb, current_ub = _bounds_arrays(components)
+        for i in np.flatnonzero(current_lb != self.var_lb):
+            components[i].setlb(None if np.isinf(self.var_lb[i]) else self.var_lb[i])
+        for i in np.flatnonzero(current_ub != self.var_ub):
+            components[i].setub(None if np.isinf(self.var_ub[i]) else self.var_ub[i])
+
+    @staticmethod
+    def _restore_active(components, active):
+        for i in np.flatnonzero(_flags_array(components, "active") != active):
+            if active[i]:
+                components[i].activate()
+            else:
+                components[i].deactivate()
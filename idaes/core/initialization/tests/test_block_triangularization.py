@@ -16,7 +16,7 @@ Tests for Block Triangularization initialization
 import pytest
 import types
 
-from pyomo.environ import ConcreteModel, Constraint, units, value, Var
+from pyomo.environ import Block, ConcreteModel, Constraint, units, value, Var
 
 from idaes.core import FlowsheetBlock
 from idaes.core.initialization.block_triangularization import (
@@ -45,6 +45,25 @@ class TestBTSubMethods:
         assert "block_solver_options" in initializer.config
         assert "block_solver_call_options" in initializer.config
         assert "calculate_variable_options" in initializer.config
+        assert not initializer.config.batch_identical_blocks
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("batch", [True, False])
+    def test_initialization_routine_indexed_dag(self, batch):
+        m = ConcreteModel()
+        m.b = Block([1, 2, 3])
+        for i, b in m.b.items():
+            b.v1 = Var(initialize=0)
+            b.v2 = Var(initialize=0)
+            b.c1 = Constraint(expr=b.v1 == 2 * i)
+            b.c2 = Constraint(expr=b.v2 == b.v1**2)
+
+        initializer = BlockTriangularizationInitializer(batch_identical_blocks=batch)
+        initializer.initialization_routine(m.b)
+
+        for i, b in m.b.items():
+            assert value(b.v1) == pytest.approx(2 * i)
+            assert value(b.v2) == pytest.approx(4 * i**2)
 
     # TODO: Tests for prechecks and initialization_routine stand alone
 
@@ -0,0 +1,237 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for FlowsheetInitializer
+"""
+import pytest
+
+from pyomo.environ import (
+    Block,
+    ConcreteModel,
+    Constraint,
+    TransformationFactory,
+    Var,
+    value,
+)
+from pyomo.network import Arc, Port
+
+from idaes.core import FlowsheetBlock
+from idaes.core.initialization import FlowsheetInitializer, InitializerBase
+from idaes.core.initialization.initializer_base import InitializationStatus
+from idaes.core.util.exceptions import InitializationError
+
+__author__ = "Andrew Lee"
+
+
+def add_unit(fs, name, gain, n_inlets=1):
+    """Add a unit with outlet = gain * sum(inlets)"""
+    unit = Block()
+    fs.add_component(name, unit)
+    unit.gain = gain
+    unit.x_in = []
+    for i in range(n_inlets):
+        unit.add_component(f"x_in{i}", Var(initialize=0))
+        unit.x_in.append(unit.component(f"x_in{i}"))
+        unit.add_component(f"inlet{i}", Port(initialize={"x": unit.x_in[i]}))
+    unit.x_out = Var()
+    unit.eq = Constraint(expr=unit.x_out == gain * sum(unit.x_in))
+    unit.outlet = Port(initialize={"x": unit.x_out})
+    return unit
+
+
+class DummyInitializer(InitializerBase):
+    """Initializer which calculates the outlet without a solver"""
+
+    def fix_initialization_states(self, model):
+        for v in model.x_in:
+            v.fix()
+
+    def initialization_routine(self, model):
+        model.x_out.set_value(model.gain * sum(v.value for v in model.x_in))
+
+
+class FailingInitializer(DummyInitializer):
+    """Initializer which sets an incorrect value for the outlet"""
+
+    def initialization_routine(self, model):
+        model.x_out.set_value(-1000)
+
+
+def build_tree():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+
+    add_unit(m.fs, "a", 2)
+    add_unit(m.fs, "b", 3)
+    add_unit(m.fs, "c", 5)
+    add_unit(m.fs, "d", 1, n_inlets=2)
+    m.fs.a.x_in0.fix(1)
+
+    m.fs.s01 = Arc(source=m.fs.a.outlet, destination=m.fs.b.inlet0)
+    m.fs.s02 = Arc(source=m.fs.a.outlet, destination=m.fs.c.inlet0)
+    m.fs.s03 = Arc(source=m.fs.b.outlet, destination=m.fs.d.inlet0)
+    m.fs.s04 = Arc(source=m.fs.c.outlet, destination=m.fs.d.inlet1)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+
+    return m
+
+
+def build_recycle():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+
+    add_unit(m.fs, "mix", 1, n_inlets=2)
+    add_unit(m.fs, "split", 0.5)
+    m.fs.mix.x_in0.fix(1)
+
+    m.fs.s01 = Arc(source=m.fs.mix.outlet, destination=m.fs.split.inlet0)
+    m.fs.s02 = Arc(source=m.fs.split.outlet, destination=m.fs.mix.inlet1)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+
+    return m
+
+
+def get_initializer(m, **kwargs):
+    initializer = FlowsheetInitializer(solve_flowsheet=False, **kwargs)
+    for unit in m.fs.component_data_objects(Block, descend_into=False):
+        initializer.add_submodel_initializer(unit, DummyInitializer)
+    return initializer
+
+
+class TestFlowsheetInitializer:
+    @pytest.mark.unit
+    def test_config(self):
+        initializer = FlowsheetInitializer()
+
+        assert initializer.config.max_workers is None
+        assert initializer.config.tear_method == "heuristic"
+        assert initializer.config.max_tear_iterations == 1
+        assert initializer.config.tear_tolerance == 1e-5
+        assert initializer.config.solve_flowsheet
+        assert len(initializer.tear_guesses) == 0
+
+    @pytest.mark.unit
+    def test_graph_and_order(self):
+        m = build_tree()
+        initializer = FlowsheetInitializer()
+
+        graph, tears = initializer.get_flowsheet_graph(m.fs)
+        assert tears == []
+        assert graph.number_of_nodes() == 4
+        assert graph.number_of_edges() == 4
+
+        order = initializer.get_initialization_order(graph)
+        assert [u.local_name for u in order] == ["a", "b", "c", "d"]
+
+    @pytest.mark.unit
+    def test_graph_unexpanded_arcs(self):
+        m = ConcreteModel()
+        m.fs = FlowsheetBlock(dynamic=False)
+        add_unit(m.fs, "a", 2)
+        add_unit(m.fs, "b", 3)
+        m.fs.s01 = Arc(source=m.fs.a.outlet, destination=m.fs.b.inlet0)
+
+        initializer = FlowsheetInitializer()
+        with pytest.raises(InitializationError, match="Arcs must be expanded"):
+            initializer.get_flowsheet_graph(m.fs)
+
+    @pytest.mark.unit
+    def test_initialize_sequential(self):
+        m = build_tree()
+        initializer = get_initializer(m)
+
+        status = initializer.initialize(m.fs)
+
+        assert status == InitializationStatus.Ok
+        assert value(m.fs.a.x_out) == 2
+        assert value(m.fs.b.x_out) == 6
+        assert value(m.fs.c.x_out) == 10
+        assert value(m.fs.d.x_out) == 16
+        # Unit inlets are unfixed afterwards
+        assert not m.fs.d.x_in0.fixed
+        assert m.fs.a.x_in0.fixed
+
+        summary = initializer.unit_summary(m.fs)
+        assert list(summary.index) == ["fs.a", "fs.b", "fs.c", "fs.d"]
+        assert all(s == "Ok" for s in summary["Status"])
+        assert all(t >= 0 for t in summary["Time [s]"])
+        assert initializer.summary[m.fs]["iterations"] == 1
+
+    @pytest.mark.component
+    def test_initialize_parallel(self):
+        m = build_tree()
+        initializer = get_initializer(m, max_workers=2)
+
+        status = initializer.initialize(m.fs)
+
+        assert status == InitializationStatus.Ok
+        assert value(m.fs.a.x_out) == 2
+        assert value(m.fs.b.x_out) == 6
+        assert value(m.fs.c.x_out) == 10
+        assert value(m.fs.d.x_out) == 16
+        # State merged back from workers, including fixed status
+        assert not m.fs.d.x_in0.fixed
+        assert m.fs.a.x_in0.fixed
+
+        summary = initializer.unit_summary(m.fs)
+        assert list(summary.index) == ["fs.a", "fs.b", "fs.c", "fs.d"]
+        assert all(s == "Ok" for s in summary["Status"])
+
+    @pytest.mark.unit
+    def test_initialize_recycle(self):
+        m = build_recycle()
+        initializer = get_initializer(m, max_tear_iterations=100, tear_tolerance=1e-10)
+        initializer.set_guesses_for(m.fs.mix.inlet1, {"x": 0.5})
+
+        graph, tears = initializer.get_flowsheet_graph(m.fs)
+        assert len(tears) == 1
+        assert graph.number_of_edges() == 1
+
+        status = initializer.initialize(m.fs)
+
+        assert status == InitializationStatus.Ok
+        assert value(m.fs.split.x_out) == pytest.approx(1, rel=1e-8)
+        assert value(m.fs.mix.x_out) == pytest.approx(2, rel=1e-8)
+        assert 1 < initializer.summary[m.fs]["iterations"] < 100
+
+    @pytest.mark.unit
+    def test_load_tear_guesses(self):
+        m = build_recycle()
+        initializer = FlowsheetInitializer()
+        _, tears = initializer.get_flowsheet_graph(m.fs)
+        port = tears[0].dest
+
+        initializer.set_guesses_for(port, {"x": {None: 7}})
+        initializer.load_tear_guesses(tears)
+        assert value(port.x) == 7
+
+        initializer.set_guesses_for(port, {"x": 3})
+        initializer.load_tear_guesses(tears)
+        assert value(port.x) == 3
+
+    @pytest.mark.unit
+    def test_failed_unit(self):
+        m = build_tree()
+        initializer = get_initializer(m)
+        initializer.add_submodel_initializer(m.fs.b, FailingInitializer)
+
+        # Flowsheet is not converged as unit b failed
+        with pytest.raises(InitializationError):
+            initializer.initialize(m.fs)
+
+        summary = initializer.unit_summary(m.fs)
+        assert list(summary["Status"]) == ["Ok", "Failed", "Ok", "Ok"]
+        assert summary["Message"]["fs.b"] is not None
+        assert summary["Message"]["fs.a"] is None
+        # Downstream units are still initialized from the available values
+        assert value(m.fs.d.x_out) == pytest.approx(-1000 + 10)
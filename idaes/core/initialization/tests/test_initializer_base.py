@@ -282,6 +282,27 @@ class TestSubMethods:
         assert model.c3.active
         assert not model.c4.active
 
+    @pytest.mark.unit
+    def test_restore_initial_state_set_directly(self, model):
+        model.v1.fix(10)
+        model.c4.deactivate()
+
+        initializer = InitializerBase()
+        state = initializer.get_current_state(model)
+
+        model.v1.fix(15)
+        model.c4.activate()
+        initializer.get_current_state(model)
+
+        # A state dict stored without get_current_state is used to restore
+        initializer.initial_state[model] = state
+        model.v1.unfix()
+        initializer.restore_model_state(model)
+
+        assert model.v1.value == 10
+        assert model.v1.fixed
+        assert not model.c4.active
+
     @pytest.mark.unit
     def test_load_value_from_file(self):
         m = ConcreteModel()
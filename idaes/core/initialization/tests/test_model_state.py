@@ -0,0 +1,366 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for ModelStateSnapshot
+"""
+import gc
+import time
+import weakref
+
+import numpy as np
+import pytest
+
+from pyomo.environ import (
+    Block,
+    BooleanVar,
+    ConcreteModel,
+    Constraint,
+    Integers,
+    NonNegativeReals,
+    Reference,
+    Set,
+    Var,
+)
+
+from idaes.core.initialization.initializer_base import StoreState
+from idaes.core.initialization.model_state import ModelStateSnapshot
+from idaes.core.util.model_serializer import to_json, from_json
+
+__author__ = "Andrew Lee"
+
+
+def build_model():
+    m = ConcreteModel()
+    m.s = Set(initialize=[1, 2, 3])
+
+    m.x = Var(m.s, initialize=1, bounds=(0, 10))
+    m.y = Var(domain=NonNegativeReals)
+    m.z = Var(domain=Integers, initialize=3)
+    m.flag = BooleanVar(m.s, initialize=True)
+
+    m.c = Constraint(m.s, rule=lambda m, i: m.x[i] == i)
+    m.c2 = Constraint(expr=m.y == m.x[1])
+
+    m.b = Block(m.s)
+    for i in m.s:
+        m.b[i].v = Var(initialize=i)
+        m.b[i].e = Constraint(expr=m.b[i].v == 2 * i)
+        m.b[i].sub = Block()
+        m.b[i].sub.w = Var()
+        m.b[i].sub.e = Constraint(expr=m.b[i].sub.w == m.b[i].v)
+
+    m.ref = Reference(m.b[:].v)
+
+    return m
+
+
+def state_of(m):
+    """Collect state of a model which is restored by StoreState and bounds"""
+    state = {}
+    for v in m.component_data_objects((Var, BooleanVar), descend_into=True):
+        state[v.name] = (v.fixed, v.value if v.fixed else None)
+        if v.ctype is Var:
+            state[v.name + ".bounds"] = (v.lb, v.ub)
+    for c in m.component_data_objects(
+        (Block, Constraint), active=None, descend_into=True
+    ):
+        state[c.name] = c.active
+    for c in m.component_objects((Block, Constraint), active=None, descend_into=True):
+        state[c.name + ".component"] = c.active
+    return state
+
+
+def modify(m):
+    m.x[1].fix(4)
+    m.x[2].fix()
+    m.y.fix(7)
+    m.z.fix(5)
+    m.flag[2].fix(False)
+    m.x[3].setlb(-1)
+    m.y.setub(100)
+    m.c.deactivate()
+    m.c2.deactivate()
+    m.b[2].deactivate()
+    m.b[3].sub.e.deactivate()
+
+
+class TestModelStateSnapshot:
+    @pytest.mark.unit
+    def test_snapshot_contents(self):
+        m = build_model()
+        m.x[2].fix(2)
+        m.c[3].deactivate()
+
+        state = ModelStateSnapshot(m)
+
+        assert state.model is m
+        # References do not introduce duplicates
+        assert [v.name for v in state.variables] == [
+            m.x[1].name,
+            m.x[2].name,
+            m.x[3].name,
+            m.y.name,
+            m.z.name,
+            m.b[1].v.name,
+            m.b[2].v.name,
+            m.b[3].v.name,
+            m.b[1].sub.w.name,
+            m.b[2].sub.w.name,
+            m.b[3].sub.w.name,
+        ]
+        np.testing.assert_array_equal(
+            state.var_fixed, [v is m.x[2] for v in state.variables]
+        )
+        np.testing.assert_array_equal(
+            state.var_value, [1, 2, 1, np.nan, 3, 1, 2, 3, np.nan, np.nan, np.nan]
+        )
+        np.testing.assert_array_equal(
+            state.var_has_value, [v.value is not None for v in state.variables]
+        )
+        np.testing.assert_array_equal(state.var_lb, [0, 0, 0, 0] + [-np.inf] * 7)
+        np.testing.assert_array_equal(state.var_ub, [10, 10, 10] + [np.inf] * 8)
+
+        assert [v.name for v in state.boolean_variables] == [
+            "flag[1]",
+            "flag[2]",
+            "flag[3]",
+        ]
+        np.testing.assert_array_equal(state.boolean_var_value, [1, 1, 1])
+
+        assert [c.name for c in state.constraints[:4]] == ["c[1]", "c[2]", "c[3]", "c2"]
+        np.testing.assert_array_equal(
+            state.constraint_active, [c is not m.c[3] for c in state.constraints]
+        )
+        assert state.blocks[0] is m
+        assert len(state.blocks) == 7
+        assert all(state.block_active)
+
+    @pytest.mark.unit
+    def test_restore(self):
+        m = build_model()
+        m.x[3].fix(9)
+        m.b[1].sub.deactivate()
+
+        expected = state_of(m)
+        state = ModelStateSnapshot(m)
+
+        modify(m)
+        # Changes to values of unfixed variables are not reverted
+        m.b[1].v.set_value(42)
+        assert state_of(m) != expected
+
+        state.restore()
+
+        assert state_of(m) == expected
+        assert m.x[3].value == 9
+        assert m.b[1].v.value == 42
+        # Values are restored with the appropriate type
+        assert isinstance(m.flag[2].value, bool)
+
+    @pytest.mark.unit
+    def test_restore_matches_store_state(self):
+        m1 = build_model()
+        m2 = build_model()
+        for m in (m1, m2):
+            m.x[3].fix(9)
+            m.flag[1].fix(False)
+            m.b[1].sub.deactivate()
+
+        json_state = to_json(m1, wts=StoreState, return_dict=True)
+        state = ModelStateSnapshot(m2)
+
+        for m in (m1, m2):
+            modify(m)
+            m.x[3].unfix()
+            m.flag[1].unfix()
+            m.b[1].sub.activate()
+
+        from_json(m1, sd=json_state, wts=StoreState)
+        state.restore()
+
+        state_1 = state_of(m1)
+        state_2 = state_of(m2)
+        # StoreState does not restore bounds
+        for k in list(state_1):
+            if k.endswith(".bounds"):
+                del state_1[k]
+                del state_2[k]
+        assert state_1 == state_2
+
+    @pytest.mark.unit
+    def test_restore_indexed_component_flags(self):
+        m = build_model()
+        m.c.deactivate()
+        m.c[1].activate()
+        state = ModelStateSnapshot(m)
+
+        m.c.activate()
+        m.b.deactivate()
+        state.restore()
+
+        assert m.c.active
+        assert [m.c[i].active for i in m.s] == [True, False, False]
+        assert m.b.active
+        assert all(m.b[i].active for i in m.s)
+
+    @pytest.mark.unit
+    def test_component_order_cached(self):
+        m = build_model()
+        state1 = ModelStateSnapshot(m)
+        state2 = ModelStateSnapshot(m)
+
+        assert m._model_state_order is state1._order
+        assert state1._order is state2._order
+
+    @pytest.mark.unit
+    def test_model_freed(self):
+        m = build_model()
+        state = ModelStateSnapshot(m)
+        ref = weakref.ref(m)
+
+        del m, state
+        gc.collect()
+        assert ref() is None
+
+    @pytest.mark.unit
+    def test_component_order_not_cloned(self):
+        m = build_model()
+        ModelStateSnapshot(m)
+
+        m2 = m.clone()
+        state = ModelStateSnapshot(m2)
+        assert state._order is not m._model_state_order
+        assert all(v.model() is m2 for v in state.variables)
+
+    @pytest.mark.unit
+    def test_component_order_rebuilt_on_change(self):
+        m = build_model()
+        state1 = ModelStateSnapshot(m)
+
+        m.b[2].sub.new_var = Var()
+        state2 = ModelStateSnapshot(m)
+        assert state2._order is not state1._order
+        assert any(v is m.b[2].sub.new_var for v in state2.variables)
+
+        m.s.add(4)
+        m.x.add(4)
+        state3 = ModelStateSnapshot(m)
+        assert state3._order is not state2._order
+        assert any(v is m.x[4] for v in state3.variables)
+
+        m.b[1].del_component(m.b[1].e)
+        state4 = ModelStateSnapshot(m)
+        assert state4._order is not state3._order
+        assert len(state4.constraints) == len(state3.constraints) - 1
+
+    @pytest.mark.unit
+    def test_restore_after_components_added(self):
+        m = build_model()
+        state = ModelStateSnapshot(m)
+
+        m.x[1].fix(5)
+        m.new_var = Var()
+        m.new_var.fix(3)
+        m.new_con = Constraint(expr=m.new_var == 3)
+        m.new_con.deactivate()
+
+        state.restore()
+
+        assert not m.x[1].fixed
+        # New components are left untouched
+        assert m.new_var.fixed
+        assert not m.new_con.active
+
+    @pytest.mark.unit
+    def test_restore_unchanged_model_is_noop(self):
+        m = build_model()
+        m.x[1].fix(2)
+        state = ModelStateSnapshot(m)
+
+        m.x[1].set_value(2)
+        state.restore()
+
+        assert m.x[1].fixed
+        assert m.x[1].value == 2
+        assert m.x[1].ub == 10
+
+    @pytest.mark.unit
+    def test_restore_all_values(self):
+        m = build_model()
+        state = ModelStateSnapshot(m)
+
+        m.b[1].v.set_value(42)
+        m.y.set_value(3)
+        state.restore(all_values=True)
+
+        assert m.b[1].v.value == 1
+        assert m.y.value is None
+
+    @pytest.mark.unit
+    def test_transfer_arrays(self):
+        m1 = build_model()
+        m2 = build_model()
+        modify(m1)
+        m1.b[1].v.set_value(42)
+
+        arrays = ModelStateSnapshot(m1).get_arrays()
+        assert all(isinstance(a, np.ndarray) for a in arrays.values())
+
+        state = ModelStateSnapshot(m2)
+        state.set_arrays(arrays)
+        state.restore(all_values=True)
+
+        assert state_of(m2) == state_of(m1)
+        assert m2.b[1].v.value == 42
+
+    @pytest.mark.unit
+    def test_set_arrays_wrong_structure(self):
+        m1 = build_model()
+        m1.extra = Var()
+        m2 = build_model()
+
+        state = ModelStateSnapshot(m2)
+        with pytest.raises(ValueError, match="shape of var_fixed"):
+            state.set_arrays(ModelStateSnapshot(m1).get_arrays())
+
+
+@pytest.mark.performance
+class TestModelStateSnapshotPerformance:
+    def test_snapshot_and_restore(self):
+        m = ConcreteModel()
+        m.s = Set(initialize=range(200))
+        m.b = Block(m.s)
+        for i in m.s:
+            m.b[i].x = Var(range(50), initialize=1)
+            m.b[i].c = Constraint(range(50), rule=lambda b, j: b.x[j] == j)
+
+        start = time.perf_counter()
+        json_state = to_json(m, wts=StoreState, return_dict=True)
+        m.b[0].x[0].fix(2)
+        m.b[1].c.deactivate()
+        from_json(m, sd=json_state, wts=StoreState)
+        json_time = time.perf_counter() - start
+
+        assert not m.b[0].x[0].fixed
+        assert m.b[1].c[0].active
+
+        start = time.perf_counter()
+        state = ModelStateSnapshot(m)
+        m.b[0].x[0].fix(2)
+        m.b[1].c.deactivate()
+        state.restore()
+        snapshot_time = time.perf_counter() - start
+
+        print(f"to_json/from_json: {json_time:.3f} s, snapshot: {snapshot_time:.3f} s")
+        assert not m.b[0].x[0].fixed
+        assert m.b[1].c[0].active
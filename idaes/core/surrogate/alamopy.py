@@ -24,7 +24,7 @@ import json
 import numpy as np
 import pandas as pd
 
-from pyomo.environ import Constraint, Expression, value, sin, cos, log, exp, Set, Reals
+from pyomo.environ import Constraint, Expression, sin, cos, log, exp, Set, Reals
 from pyomo.common.config import ConfigValue, In, Path, ListOf, Bool
 from pyomo.common.tee import TeeStream
 from pyomo.common.fileutils import Executable
@@ -44,6 +44,8 @@ alamo = Executable("alamo")
 
 # Define mapping of Pyomo function names for expression evaluation
 GLOBAL_FUNCS = {"sin": sin, "cos": cos, "ln": log, "exp": exp}
+# Define mapping of NumPy function names for vectorized evaluation of expressions
+NUMPY_FUNCS = {"sin": np.sin, "cos": np.cos, "ln": np.log, "exp": np.exp}
 
 
 # The values associated with these must match those expected in the .alm file
@@ -1224,31 +1226,41 @@ class AlamoSurrogate(SurrogateBase):
               Returns a dataframe of the output values evaluated at the provided inputs.
               The index of the output dataframe should match the index of the provided inputs.
         """
-        # Create a set of lambda functions for evaluating the surrogate.
         if self._fcn is None:
-            fcn = dict()
-            for o in self._output_labels:
-                # We need to evaluate the string returned by ALAMO
-                # pylint: disable=W0123
-                fcn[o] = eval(
-                    f"lambda {', '.join(self._input_labels)}: "
-                    f"{self._surrogate_expressions[o].split('==')[1]}",
-                    GLOBAL_FUNCS,
-                )
-            self._fcn = fcn
+            self._fcn = self._compile_surrogate_functions()
 
-        # Use numpy to do the calculations as it is faster
-        inputdata = inputs[self._input_labels].to_numpy()
+        # Evaluate each output on whole columns of input data at once
+        inputdata = inputs[self._input_labels].to_numpy(dtype=float)
+        columns = list(inputdata.T)
         outputs = np.zeros(shape=(inputs.shape[0], len(self._output_labels)))
 
-        for i in range(inputdata.shape[0]):
-            for o, o_name in enumerate(self._output_labels):
-                outputs[i, o] = value(self._fcn[o_name](*inputdata[i, :]))
+        for o, o_name in enumerate(self._output_labels):
+            # Broadcast in case the expression does not depend on any input
+            outputs[:, o] = self._fcn[o_name](*columns)
 
         return pd.DataFrame(
             data=outputs, index=inputs.index, columns=self._output_labels
         )
 
+    def _compile_surrogate_functions(self):
+        """
+        Compile the ALAMO expression for each output into a function which takes
+        one NumPy array per input and returns an array of output values.
+
+        Returns:
+            dict of compiled functions indexed by output label
+        """
+        fcn = dict()
+        for o in self._output_labels:
+            # We need to evaluate the string returned by ALAMO
+            # pylint: disable=W0123
+            fcn[o] = eval(
+                f"lambda {', '.join(self._input_labels)}: "
+                f"{self._surrogate_expressions[o].split('==')[1]}",
+                dict(NUMPY_FUNCS),
+            )
+        return fcn
+
     def populate_block(self, block, additional_options=None):
         """
         Method to populate a Pyomo Block with surrogate model constraints
@@ -1339,9 +1351,13 @@ class AlamoSurrogate(SurrogateBase):
         for k, v in d["input_bounds"].items():
             input_bounds[k] = tuple(v)
 
-        return AlamoSurrogate(
+        surrogate = AlamoSurrogate(
             surrogate_expressions=surrogate_expressions,
             input_labels=input_labels,
             output_labels=output_labels,
             input_bounds=input_bounds,
         )
+        # Compile evaluation functions up front so the loaded surrogate is ready to use
+        surrogate._fcn = surrogate._compile_surrogate_functions()
+
+        return surrogate
@@ -24,6 +24,7 @@ import pickle
 from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
+from scipy.linalg import cho_factor, cho_solve
 from scipy.optimize import basinhopping
 import scipy.optimize as opt
 
@@ -32,6 +33,14 @@ from pyomo.core import Param, exp
 # Imports from IDAES namespace
 from idaes.core.surrogate.pysmo.sampling import FeatureScaling as fs
 
+# Upper bound (in bytes) on the size of the intermediate correlation block
+# evaluated at once when predicting outputs for many points
+PREDICTION_BLOCK_BYTES = 2**26
+
+# Largest diagonal perturbation (relative to the mean of the diagonal) tried
+# before a co-variance matrix is declared not positive definite
+MAX_FACTORIZATION_JITTER = 1e-6
+
 
 class MyBounds(object):
     """
@@ -215,7 +224,35 @@ class KrigingModel:
         self.training_rmse = None
 
     @staticmethod
-    def covariance_matrix_generator(x, theta, reg_param, p):
+    def distance_matrix_generator(x1, x2, theta, p):
+        r"""
+        The distance_matrix_generator method computes the weighted distances :math:`\sum_{j}\theta_{j}\left|x_{1,j}-x_{2,j}\right|^{p}` between every row of x1 and every row of x2.
+
+        The distances are accumulated one feature at a time, so the largest intermediate array is of the size of the returned matrix.
+
+        Args:
+            x1                      : scaled features data, one design per row
+            x2                      : scaled features data, one design per row
+            theta                   : Kriging weights
+            p                       : Kriging exponent
+
+        Returns:
+            distance_matrix         : Array of shape (x1.shape[0], x2.shape[0]) containing the weighted distances
+
+        """
+        theta = np.asarray(theta).reshape(-1)
+        distance_matrix = np.zeros((x1.shape[0], x2.shape[0]))
+        for j in range(0, x1.shape[1]):
+            difference = np.abs(x1[:, j, np.newaxis] - x2[np.newaxis, :, j])
+            if p == 2:
+                np.multiply(difference, difference, out=difference)
+            else:
+                np.power(difference, p, out=difference)
+            distance_matrix += theta[j] * difference
+        return distance_matrix
+
+    @classmethod
+    def covariance_matrix_generator(cls, x, theta, reg_param, p):
         """
         The covariance_matrix_generator method generates the regularized co-variance matrix for a Kriging model
 
@@ -229,22 +266,55 @@ class KrigingModel:
             cov_matrix              : Regularized co-variance matrix
 
         """
-        distance_matrix = np.zeros((x.shape[0], x.shape[0]))
-        for i in range(0, x.shape[0]):
-            distance_matrix[i, :] = (
-                np.matmul(((np.abs(x[i, :] - x)) ** p), theta)
-            ).transpose()
-        cov_matrix = np.exp(-1 * distance_matrix)
-        cov_matrix = cov_matrix + reg_param * np.eye(
-            cov_matrix.shape[0]
-        )  # Regularization parameter addition, see Forrester book
+        cov_matrix = cls.distance_matrix_generator(x, x, theta, p)
+        np.negative(cov_matrix, out=cov_matrix)
+        np.exp(cov_matrix, out=cov_matrix)
+        # Regularization parameter addition, see Forrester book
+        cov_matrix[np.diag_indices_from(cov_matrix)] += reg_param
         return cov_matrix
 
     @staticmethod
-    def covariance_inverse_generator(x):
+    def covariance_factorization(x):
+        """
+        The covariance_factorization method computes the Cholesky factorization of a regularized co-variance matrix.
+
+        When the matrix is not numerically positive definite, increasingly large perturbations (up to MAX_FACTORIZATION_JITTER times the mean of the diagonal) are added to its diagonal before the factorization is attempted again.
+
+        Args:
+            x                       : Regularized co-variance matrix
+
+        Returns:
+            tuple                   : Cholesky factor of the matrix, in the format expected by scipy.linalg.cho_solve
+
+        Raises:
+            LinAlgError: The matrix could not be factorized even after perturbation
+
+        """
+        try:
+            return cho_factor(x, lower=True)
+        except np.linalg.LinAlgError:
+            pass
+        scale = np.mean(np.abs(np.diag(x)))
+        if not np.isfinite(scale) or scale == 0:
+            raise np.linalg.LinAlgError("Co-variance matrix is not positive definite.")
+        jitter = 1e-12
+        diagonal = np.diag_indices_from(x)
+        while jitter <= MAX_FACTORIZATION_JITTER:
+            perturbed = np.array(x, dtype=float)
+            perturbed[diagonal] += jitter * scale
+            try:
+                return cho_factor(perturbed, lower=True)
+            except np.linalg.LinAlgError:
+                jitter *= 100
+        raise np.linalg.LinAlgError("Co-variance matrix is not positive definite.")
+
+    @classmethod
+    def covariance_inverse_generator(cls, x):
         """
         The covariance_inverse_generator method generates the inverse of the regularized co-variance matrix for a Kriging model
 
+        The inverse is obtained from the Cholesky factorization of the matrix; the pseudo-inverse is used when the matrix cannot be factorized.
+
         Args:
             x                       : Regularized co-variance matrix
 
@@ -253,10 +323,35 @@ class KrigingModel:
 
         """
         try:
-            inverse_x = np.linalg.inv(x)
+            factor = cls.covariance_factorization(x)
         except np.linalg.LinAlgError:
-            inverse_x = np.linalg.pinv(x)
-        return inverse_x
+            return np.linalg.pinv(x)
+        inverse_x = cho_solve(factor, np.eye(x.shape[0]))
+        # Remove round-off asymmetry
+        return 0.5 * (inverse_x + inverse_x.transpose())
+
+    @staticmethod
+    def concentrated_likelihood_terms(factor, y):
+        """
+        The concentrated_likelihood_terms method evaluates the MLE estimates of the Kriging mean and variance from the Cholesky factor of the co-variance matrix, without forming its inverse.
+
+        Args:
+            factor (tuple)                  : Cholesky factor returned by covariance_factorization
+            y (NumPy Array)                 : Output values of the training data
+
+        Returns:
+            tuple                           : MLE estimate of the mean, deviation of y from the mean (y-mean) and MLE estimate of the variance
+
+        """
+        ns = y.shape[0]
+        rhs = np.hstack((np.ones((ns, 1)), y))
+        solves = cho_solve(factor, rhs)
+        mean = np.sum(solves[:, 1:], axis=0, keepdims=True) / np.sum(solves[:, :1])
+        y_mu = y - mean
+        # cov_inv * y_mu, obtained from the two solves above
+        cov_inv_y_mu = solves[:, 1:] - mean * solves[:, :1]
+        variance = np.matmul(y_mu.transpose(), cov_inv_y_mu) / ns
+        return mean, y_mu, variance
 
     @staticmethod
     def kriging_mean(cov_inv, y):
@@ -329,7 +424,7 @@ class KrigingModel:
             p(float)                      : Kriging model exponent (fixed to 2) to ensure model smoothness
 
         Returns:
-            conc_log_like(float)          : Concentrated likelihood value. Function incurs a large penalty (10000) when co-variance matrix is non-positive definite
+            conc_log_like(float)          : Concentrated likelihood value. Function incurs a large penalty (10000) when co-variance matrix is non-positive definite, even after the diagonal perturbation applied by covariance_factorization
 
         Reference:
             [1] Forrester et al.'s book "Engineering Design via Surrogate Modelling: A Practical Guide",
@@ -341,18 +436,15 @@ class KrigingModel:
         theta = 10**theta  # Assumes log(theta) provided
         ns = y.shape[0]
         cov_mat = self.covariance_matrix_generator(x, theta, reg_param, p)
-        try:  # Check Cholesky factorization
-            L = np.linalg.cholesky(cov_mat)
-            lndetcov = 2 * np.sum(
-                np.log(np.abs(np.diag(L)))
-            )  # Approximation to 2nd term from Forrester book, making use of the Ch. factorization
-            cov_inv = self.covariance_inverse_generator(cov_mat)
-            km = self.kriging_mean(cov_inv, y)
-            y_mu = self.y_mu_calculation(y, km)
-            ssd = self.kriging_sd(cov_inv, y_mu, ns)
-            # log_like = (0.5 * ns * np.log(ssd)) + (0.5 * np.log(np.abs(np.linalg.det(cov_mat))))
+        try:
+            factor = self.covariance_factorization(cov_mat)
+            # 2nd term from Forrester book, making use of the Ch. factorization
+            lndetcov = 2 * np.sum(np.log(np.abs(np.diag(factor[0]))))
+            _, _, ssd = self.concentrated_likelihood_terms(factor, y)
             log_like = (0.5 * ns * np.log(ssd)) + (0.5 * lndetcov)
             conc_log_like = log_like[0, 0]
+            if not np.isfinite(conc_log_like):
+                conc_log_like = 1e4
         except Exception:  # pylint: disable=W0703
             # When Cholesky fails - non-positive definite covariance matrix
             conc_log_like = 1e4
@@ -470,7 +562,7 @@ class KrigingModel:
         For an input set of Kriging parameters var_vector and p, it:
 
             (1) Generates the covariance matrix by calling covariance_matrix_generator
-            (2) Finds the co-variance matrix inverse
+            (2) Computes the Cholesky factorization of the co-variance matrix and, from it, the co-variance matrix inverse
             (3) Evaluates the Kriging mean and variance
             (4) Evaluates the deviation of each training point from the Kriging mean
 
@@ -497,10 +589,19 @@ class KrigingModel:
         cov_mat = self.covariance_matrix_generator(
             self.x_data_scaled, theta, reg_param, p
         )
-        cov_inv = self.covariance_inverse_generator(cov_mat)
-        mean = self.kriging_mean(cov_inv, self.y_data)
-        y_mu = self.y_mu_calculation(self.y_data, mean)
-        variance = self.kriging_sd(cov_inv, y_mu, ns)
+        try:
+            factor = self.covariance_factorization(cov_mat)
+        except np.linalg.LinAlgError:
+            cov_inv = np.linalg.pinv(cov_mat)
+            mean = self.kriging_mean(cov_inv, self.y_data)
+            y_mu = self.y_mu_calculation(self.y_data, mean)
+            variance = self.kriging_sd(cov_inv, y_mu, ns)
+        else:
+            mean, y_mu, variance = self.concentrated_likelihood_terms(
+                factor, self.y_data
+            )
+            cov_inv = cho_solve(factor, np.eye(ns))
+            cov_inv = 0.5 * (cov_inv + cov_inv.transpose())
         print(
             "\nFinal results\n================\nTheta:",
             theta,
@@ -533,13 +634,10 @@ class KrigingModel:
             y_prediction    : Predicted values of y
 
         """
-        y_prediction = np.zeros((x.shape[0], 1))
-        for i in range(0, x.shape[0]):
-            cmt = (np.matmul(((np.abs(x[i, :] - x)) ** p), theta)).transpose()
-            cov_matrix_tests = np.exp(-1 * cmt)
-            y_prediction[i, 0] = mean + np.matmul(
-                np.matmul(cov_matrix_tests.transpose(), cov_inv), y_mu
-            )
+        cov_matrix_tests = KrigingModel.distance_matrix_generator(x, x, theta, p)
+        np.negative(cov_matrix_tests, out=cov_matrix_tests)
+        np.exp(cov_matrix_tests, out=cov_matrix_tests)
+        y_prediction = mean + np.matmul(cov_matrix_tests, np.matmul(cov_inv, y_mu))
         ss_error = (1 / y_data.shape[0]) * (np.sum((y_data - y_prediction) ** 2))
         rmse_error = np.sqrt(ss_error)
         return ss_error, rmse_error, y_prediction
@@ -580,18 +678,28 @@ class KrigingModel:
         x_pred = x_pred_scaled.reshape(x_pred.shape)
         if x_pred.ndim == 1:
             x_pred = x_pred.reshape(1, len(x_pred))
-        y_pred = np.zeros((x_pred.shape[0], 1))
-        for i in range(0, x_pred.shape[0]):
-            cmt = (
-                np.matmul(
-                    ((np.abs(x_pred[i, :] - self.x_data_scaled)) ** self.optimal_p),
-                    self.optimal_weights,
-                )
-            ).transpose()
-            cov_matrix_tests = np.exp(-1 * cmt)
-            y_pred[i, 0] = self.optimal_mean + np.matmul(
-                np.matmul(cov_matrix_tests.transpose(), self.covariance_matrix_inverse),
-                self.optimal_y_mu,
+        weighted_y_mu = np.matmul(self.covariance_matrix_inverse, self.optimal_y_mu)
+        n_rows = x_pred.shape[0]
+        block_rows = max(
+            1,
+            min(
+                n_rows,
+                PREDICTION_BLOCK_BYTES // (8 * max(self.x_data_scaled.shape[0], 1)),
+            ),
+        )
+        y_pred = np.zeros((n_rows, 1))
+        for start in range(0, n_rows, block_rows):
+            stop = min(start + block_rows, n_rows)
+            cov_matrix_tests = self.distance_matrix_generator(
+                x_pred[start:stop, :],
+                self.x_data_scaled,
+                self.optimal_weights,
+                self.optimal_p,
+            )
+            np.negative(cov_matrix_tests, out=cov_matrix_tests)
+            np.exp(cov_matrix_tests, out=cov_matrix_tests)
+            y_pred[start:stop, :] = self.optimal_mean + np.matmul(
+                cov_matrix_tests, weighted_y_mu
             )
         return y_pred
 
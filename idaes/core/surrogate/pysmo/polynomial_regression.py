@@ -24,6 +24,7 @@ import numpy as np
 import pandas as pd
 import scipy.optimize as opt
 from scipy import stats
+from scipy.linalg import qr, qr_insert, solve_triangular
 
 from pyomo.environ import (
     ConcreteModel,
@@ -514,6 +515,33 @@ class PolynomialRegression:
         """
         training_data = {}
         cross_val_data = {}
+        splits = self.training_test_index_creation()
+        for i, (training_rows, test_rows) in enumerate(splits, start=1):
+            training_data["training_set_" + str(i)] = self.regression_data[
+                training_rows, :
+            ]
+            cross_val_data["test_set_" + str(i)] = self.regression_data[test_rows, :]
+            if additional_features is not None:
+                training_data["training_extras_" + str(i)] = additional_features[
+                    training_rows, :
+                ]
+                cross_val_data["test_extras_" + str(i)] = additional_features[
+                    test_rows, :
+                ]
+        return training_data, cross_val_data
+
+    def training_test_index_creation(self):
+        """
+
+        The training_test_index_creation generates the row indices of the training and test data sets used by training_test_data_creation.
+
+        The rows of self.regression_data are shuffled number_of_crossvalidations times with the same seeds as training_test_data_creation.
+        Working with row indices allows arrays derived from self.regression_data (e.g. the polynomial features) to be split without being regenerated.
+
+        Returns:
+            splits(list): List of (training_rows, test_rows) tuples, one for each cross-validation.
+
+        """
         num_training = int(np.around(self.number_of_samples * self.fraction_training))
         if num_training == 0:
             # PYLINT-TODO
@@ -523,43 +551,13 @@ class PolynomialRegression:
             # PYLINT-TODO
             # pylint: disable-next=broad-exception-raised
             raise Exception("The inputted of fraction_training is too high.")
+        splits = []
         for i in range(1, self.number_of_crossvalidations + 1):
             np.random.seed(i)
-            if additional_features is None:
-                A = np.zeros(
-                    (self.regression_data.shape[0], self.regression_data.shape[1])
-                )
-                A[:, :] = self.regression_data
-                np.random.shuffle(
-                    A
-                )  # Shuffles the rows of the regression data randomly
-                training_data["training_set_" + str(i)] = A[0:num_training, :]
-                cross_val_data["test_set_" + str(i)] = A[num_training:, :]
-            elif additional_features is not None:
-                A = np.zeros(
-                    (
-                        self.regression_data.shape[0],
-                        self.regression_data.shape[1] + additional_features.shape[1],
-                    )
-                )
-                A[:, 0 : self.regression_data.shape[1]] = self.regression_data
-                A[:, self.regression_data.shape[1] :] = additional_features
-                np.random.shuffle(
-                    A
-                )  # Shuffles the rows of the regression data randomly
-                training_data["training_set_" + str(i)] = A[
-                    0:num_training, : self.regression_data.shape[1]
-                ]
-                training_data["training_extras_" + str(i)] = A[
-                    0:num_training, self.regression_data.shape[1] :
-                ]
-                cross_val_data["test_set_" + str(i)] = A[
-                    num_training:, : self.regression_data.shape[1]
-                ]
-                cross_val_data["test_extras_" + str(i)] = A[
-                    num_training:, self.regression_data.shape[1] :
-                ]
-        return training_data, cross_val_data
+            rows = np.arange(self.regression_data.shape[0])
+            np.random.shuffle(rows)  # Shuffles the rows of the regression data randomly
+            splits.append((rows[0:num_training], rows[num_training:]))
+        return splits
 
     @classmethod
     def polygeneration(
@@ -596,37 +594,72 @@ class PolynomialRegression:
             x_train_data = [1, x1, x2, x3, x1^2, x2^2, x3^2, x1.x2, x1.x3, x2.x3, sin(x1), tanh(x3)]
 
         """
-        N = x_input_train_data.shape[0]
-        x_train_data = x_input_train_data
-        # Generate the constant and pure power terms
-        for i in range(2, polynomial_order + 1):
-            x_train_data = np.concatenate((x_train_data, x_input_train_data**i), axis=1)
+        N, n_features = x_input_train_data.shape
+        n_multinomials = n_features * (n_features - 1) // 2 if multinomials == 1 else 0
+        n_additional = (
+            0
+            if additional_x_training_data is None
+            else additional_x_training_data.shape[1]
+        )
+
+        # Preallocate the full feature array and fill it in place. Object arrays (e.g. of Pyomo variables) are preserved.
+        dtypes = [x_input_train_data.dtype, float]
+        if n_additional > 0:
+            dtypes.append(additional_x_training_data.dtype)
+        x_train_data = np.empty(
+            (N, 1 + polynomial_order * n_features + n_multinomials + n_additional),
+            dtype=np.result_type(*dtypes),
+        )
+        # Constant term
+        x_train_data[:, 0] = 1.0
+        # Pure power terms
+        for i in range(1, polynomial_order + 1):
+            x_train_data[:, 1 + (i - 1) * n_features : 1 + i * n_features] = (
+                x_input_train_data**i
+            )
 
+        column = 1 + polynomial_order * n_features
         if multinomials == 1:
             # Next, generate first order multinomials
-            for i in range(0, x_input_train_data.shape[1]):
+            for i in range(0, n_features):
                 for j in range(0, i):
-                    x_train_data = np.concatenate(
-                        (
-                            x_train_data,
-                            (
-                                x_input_train_data[:, i] * x_input_train_data[:, j]
-                            ).reshape(N, 1),
-                        ),
-                        axis=1,
+                    x_train_data[:, column] = (
+                        x_input_train_data[:, i] * x_input_train_data[:, j]
                     )
-
-        # Concatenate to generate full dataset.
-        x_train_data = np.concatenate((np.ones((N, 1)), x_train_data), axis=1)
+                    column += 1
 
         # Add additional features if they have been provided:
-        if additional_x_training_data is not None:
-            x_train_data = np.concatenate(
-                (x_train_data, additional_x_training_data), axis=1
-            )
+        if n_additional > 0:
+            x_train_data[:, column:] = additional_x_training_data
 
         return x_train_data
 
+    @staticmethod
+    def polynomial_feature_columns(
+        polynomial_order, maximum_polynomial_order, number_of_features, total_columns
+    ):
+        """
+
+        This function returns the column indices of the features of a given polynomial order within a feature array generated by polygeneration at a higher order.
+
+        Since polygeneration orders the features as [constant, mononomials, multinomials, extra terms], the features of any order up to
+        maximum_polynomial_order form a subset of the columns of the maximum order array. This allows the feature array to be generated once and reused for every order.
+
+        Args:
+            polynomial_order(int):            The polynomial order whose features are required
+            maximum_polynomial_order(int):    The polynomial order used to generate the feature array
+            number_of_features(int):          The number of input features (x variables)
+            total_columns(int):               The number of columns in the feature array
+
+        Returns:
+            columns(NumPy Array):             Column indices of the features for polynomial_order
+
+        """
+        return np.r_[
+            0 : 1 + polynomial_order * number_of_features,
+            1 + maximum_polynomial_order * number_of_features : total_columns,
+        ]
+
     @staticmethod
     def cost_function(theta, x, y, reg_parameter):
         """
@@ -923,6 +956,194 @@ class PolynomialRegression:
 
         return phi_vector, training_error, crossval_error
 
+    @staticmethod
+    def qr_least_squares(q_matrix, r_matrix, y):
+        """
+
+        Solves the least squares problem min ||x.phi - y|| from the thin QR decomposition x = QR:
+
+                phi = inv(R) * Q' * y
+
+        Since Q has orthonormal columns, the Moore-Penrose inverse of x is pinv(R) * Q'. When R is numerically singular (i.e. x is rank deficient),
+        the pseudoinverse of R is used instead, giving the same minimum-norm solution as MLE_estimate at the cost of an (n x n) rather than (m x n) decomposition.
+
+        Args:
+            q_matrix     : orthonormal factor of x, (m x n) in size
+            r_matrix     : upper triangular factor of x, (n x n) in size
+            y            : actual output vector, size (m x 1)
+
+        Returns:
+            phi: The optimal linear regression weights found
+
+        """
+        qty = q_matrix.T @ y
+        singular_values = np.linalg.svd(r_matrix, compute_uv=False)
+        if singular_values[-1] <= 1e-15 * singular_values[0]:
+            return np.matmul(np.linalg.pinv(r_matrix), qty)
+        return solve_triangular(r_matrix, qty)
+
+    def polyregression_path(
+        self, x_polynomial_data, y_training_data, x_polynomial_data_test, y_test_data
+    ):
+        """
+
+        Function that performs polynomial regression for every polynomial order between 1 and self.max_polynomial_order on a single training/test split.
+
+        The feature arrays are generated once at the maximum polynomial order (see polygeneration) and the features of each order are taken as a column subset.
+        For the maximum likelihood method (solution_method="mle"), the least squares problem is solved by QR decomposition which is updated incrementally:
+        increasing the polynomial order by one inserts the new power columns into the existing factorization rather than re-solving from scratch.
+        The BFGS and Pyomo methods are solved for each order as in polyregression.
+
+        Args:
+            x_polynomial_data(NumPy Array)      : Training features generated by polygeneration at self.max_polynomial_order
+            y_training_data(NumPy Array)        : Training output values, size (m x 1)
+            x_polynomial_data_test(NumPy Array) : Test features generated by polygeneration at self.max_polynomial_order
+            y_test_data(NumPy Array)            : Test output values
+
+        Returns:
+            fits(list): List of (phi_vector, training_error, crossval_error) tuples for polynomial orders 1 to self.max_polynomial_order. The entries are as returned by polyregression.
+
+        """
+        n_features = self.regression_data.shape[1] - 1
+        y_training_data = y_training_data.reshape(y_training_data.shape[0], 1)
+        y_test_data = y_test_data.reshape(y_test_data.shape[0], 1)
+        q_matrix = r_matrix = None
+        fits = []
+        for poly_order in range(1, self.max_polynomial_order + 1):
+            columns = self.polynomial_feature_columns(
+                poly_order,
+                self.max_polynomial_order,
+                n_features,
+                x_polynomial_data.shape[1],
+            )
+            x_order_data = x_polynomial_data[:, columns]
+
+            # Check that the problem has more samples than features - necessary for fitting. If not, return Infinity.
+            if x_order_data.shape[0] < x_order_data.shape[1]:
+                phi_vector = np.zeros((x_order_data.shape[1], 1))
+                phi_vector[:, 0] = np.Inf
+                fits.append((phi_vector, np.Inf, np.Inf))
+                continue
+
+            if self.solution_method == "mle":
+                factorization = None
+                if q_matrix is not None:
+                    # Insert the new power columns ahead of the multinomial and extra terms
+                    new_columns = slice(
+                        1 + (poly_order - 1) * n_features, 1 + poly_order * n_features
+                    )
+                    try:
+                        factorization = qr_insert(
+                            q_matrix,
+                            r_matrix,
+                            x_polynomial_data[:, new_columns],
+                            new_columns.start,
+                            which="col",
+                        )
+                    except np.linalg.LinAlgError:
+                        # New columns are numerically dependent on the existing ones
+                        factorization = None
+                if factorization is None:
+                    factorization = qr(x_order_data, mode="economic")
+                q_matrix, r_matrix = factorization
+                phi_vector = self.qr_least_squares(q_matrix, r_matrix, y_training_data)
+            elif self.solution_method == "bfgs":
+                phi_vector = self.bfgs_parameter_optimization(
+                    x_order_data, y_training_data[:, 0]
+                )
+            elif self.solution_method == "pyomo":
+                phi_vector = self.pyomo_optimization(
+                    x_order_data, y_training_data[:, 0]
+                )
+            phi_vector = phi_vector.reshape(phi_vector.shape[0], 1)
+
+            training_error = self.cross_validation_error_calculation(
+                phi_vector, x_order_data, y_training_data
+            )
+            crossval_error = self.cross_validation_error_calculation(
+                phi_vector, x_polynomial_data_test[:, columns], y_test_data
+            )
+            fits.append((phi_vector, training_error, crossval_error))
+        return fits
+
+    def feature_data_update(self, feature_data=None, rows_filled=0):
+        """
+
+        Function that appends the polynomial features of newly added rows of self.regression_data to a preallocated feature array.
+
+        The feature array holds the features generated by polygeneration at self.max_polynomial_order for every row of self.regression_data.
+        Only the rows beyond rows_filled are generated, so the features of existing samples are not recomputed when adaptive samples are added.
+        The array is allocated with space for all the samples in self.original_data and is only reallocated when that space is exhausted.
+
+        Keyword Args:
+            feature_data(NumPy Array)   : The feature array to be updated. A new array is allocated when None.
+            rows_filled(int)            : The number of rows of feature_data already filled.
+
+        Returns:
+            feature_data(NumPy Array)   : Feature array whose first self.regression_data.shape[0] rows hold the features of self.regression_data.
+
+        """
+        number_of_rows = self.regression_data.shape[0]
+        new_features = self.polygeneration(
+            self.max_polynomial_order,
+            self.multinomials,
+            self.regression_data[rows_filled:number_of_rows, :-1],
+        )
+        if feature_data is None or feature_data.shape[0] < number_of_rows:
+            capacity = max(number_of_rows, self.original_data.shape[0])
+            new_feature_data = np.empty((capacity, new_features.shape[1]))
+            if feature_data is not None:
+                new_feature_data[:rows_filled, :] = feature_data[:rows_filled, :]
+            feature_data = new_feature_data
+        feature_data[rows_filled:number_of_rows, :] = new_features
+        return feature_data
+
+    def polynomial_order_search(self, feature_data):
+        """
+
+        Function that determines the best polynomial fit to self.regression_data over all polynomial orders and cross-validation sets.
+
+        The training and test sets are created with training_test_index_creation and each is regressed with polyregression_path.
+        The best fit is the one with the lowest cross-validation error; ties are resolved in favour of the lowest polynomial order and cross-validation number.
+
+        Args:
+            feature_data(NumPy Array): Features of self.regression_data generated by polygeneration at self.max_polynomial_order. Only the first self.regression_data.shape[0] rows are used.
+
+        Returns:
+            Tuple(phi_best, order_best, train_error_fit, best_error)
+
+            - phi_best: the optimal weight vector for the best fit
+            - order_best: the polynomial order of the best fit
+            - train_error_fit: the average SSE of the best fit on its training dataset
+            - best_error: the average SSE of the best fit on its cross-validation dataset
+
+        """
+        y_data = self.regression_data[:, -1]
+        fits = []
+        for training_rows, test_rows in self.training_test_index_creation():
+            fits.append(
+                self.polyregression_path(
+                    feature_data[training_rows, :],
+                    y_data[training_rows],
+                    feature_data[test_rows, :],
+                    y_data[test_rows],
+                )
+            )
+
+        best_error = 1e20
+        train_error_fit = 1e20
+        phi_best = 0
+        order_best = 0
+        for poly_order in range(1, self.max_polynomial_order + 1):
+            for cv_fits in fits:
+                phi, train_error, cv_error = cv_fits[poly_order - 1]
+                if cv_error < best_error:
+                    best_error = cv_error
+                    phi_best = phi
+                    order_best = poly_order
+                    train_error_fit = train_error
+        return phi_best, order_best, train_error_fit, best_error
+
     def surrogate_performance(
         self, phi_best, order_best, additional_features_array=None
     ):
@@ -1179,12 +1400,6 @@ class PolynomialRegression:
                                                         See information on ResultReport class for details on contents.
 
         """
-        # Parameters that represent the best solution found at each iteration based on the cross-validation error
-        best_error = 1e20
-        train_error_fit = 1e20
-        phi_best = 0
-        order_best = 0
-
         if (additional_regression_features is None) or (
             len(additional_regression_features) == 0
         ):
@@ -1198,19 +1413,14 @@ class PolynomialRegression:
             )
             print("Maximum number of iterations (Max_iter) set at: ", self.max_iter)
 
-            training_data, cross_val_data = self.training_test_data_creation()
-            for poly_order in range(1, self.max_polynomial_order + 1):
-                for cv_number in range(1, self.number_of_crossvalidations + 1):
-                    phi, train_error, cv_error = self.polyregression(
-                        poly_order,
-                        training_data["training_set_" + str(cv_number)],
-                        cross_val_data["test_set_" + str(cv_number)],
-                    )
-                    if cv_error < best_error:
-                        best_error = cv_error
-                        phi_best = phi
-                        order_best = poly_order
-                        train_error_fit = train_error
+            # Features are generated once at the maximum order and extended as adaptive samples are added
+            feature_data = self.feature_data_update()
+            (
+                phi_best,
+                order_best,
+                train_error_fit,
+                best_error,
+            ) = self.polynomial_order_search(feature_data)
             print(
                 "\nInitial surrogate model is of order",
                 order_best,
@@ -1276,7 +1486,6 @@ class PolynomialRegression:
             ):
                 print("\n-------------------------------------------------")
                 print("\nIteration ", iteration_number)
-                best_error = 1e20
 
                 # Select n_adaptive_samples worst fitting points to be added to the dataset used in the previous evaluation.
                 scv_input_data = sorted_comparison_vector[:, :-2]
@@ -1295,6 +1504,7 @@ class PolynomialRegression:
                     :,
                     # pylint: enable=invalid-unary-operand-type
                 ]
+                rows_filled = self.regression_data.shape[0]
                 self.regression_data = np.concatenate(
                     (self.regression_data, adaptive_samples), axis=0
                 )
@@ -1308,20 +1518,13 @@ class PolynomialRegression:
                     self.regression_data.shape[0],
                 )
 
-                training_data, cross_val_data = self.training_test_data_creation()
-
-                for poly_order in range(1, self.max_polynomial_order + 1):
-                    for cv_number in range(1, self.number_of_crossvalidations + 1):
-                        phi, train_error, cv_error = self.polyregression(
-                            poly_order,
-                            training_data["training_set_" + str(cv_number)],
-                            cross_val_data["test_set_" + str(cv_number)],
-                        )
-                        if cv_error < best_error:
-                            best_error = cv_error
-                            phi_best = phi
-                            order_best = poly_order
-                            train_error_fit = train_error
+                feature_data = self.feature_data_update(feature_data, rows_filled)
+                (
+                    phi_best,
+                    order_best,
+                    train_error_fit,
+                    best_error,
+                ) = self.polynomial_order_search(feature_data)
                 print(
                     "\nThe best regression model is of order",
                     order_best,
@@ -1465,23 +1668,15 @@ class PolynomialRegression:
                 additional_regression_features
             )
 
-            training_data, cross_val_data = self.training_test_data_creation(
-                additional_features_array
+            feature_data = self.polygeneration(
+                self.max_polynomial_order,
+                self.multinomials,
+                self.regression_data[:, :-1],
+                additional_features_array,
+            )
+            phi_best, order_best, _, best_error = self.polynomial_order_search(
+                feature_data
             )
-            for poly_order in range(1, self.max_polynomial_order + 1):
-                for cv_number in range(1, self.number_of_crossvalidations + 1):
-                    phi, train_error, cv_error = self.polyregression(
-                        poly_order,
-                        training_data["training_set_" + str(cv_number)],
-                        cross_val_data["test_set_" + str(cv_number)],
-                        training_data["training_extras_" + str(cv_number)],
-                        cross_val_data["test_extras_" + str(cv_number)],
-                    )
-                    if cv_error < best_error:
-                        best_error = cv_error
-                        phi_best = phi
-                        order_best = poly_order
-                        train_error_fit = train_error
             print(
                 "\nBest surrogate model is of order",
                 order_best,
@@ -17,6 +17,8 @@
 # pylint: disable=consider-using-enumerate
 
 # Imports from the python standard library
+from concurrent.futures import ProcessPoolExecutor
+import itertools
 import os.path
 import warnings
 import pickle
@@ -26,6 +28,7 @@ from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
 import scipy.optimize as opt
+from scipy.spatial.distance import cdist
 
 from pyomo.environ import (
     ConcreteModel,
@@ -50,6 +53,46 @@ __author__ = "Oluwamayowa Amusat"
 The purpose of this file is to perform radial basis functions in Pyomo.
 """
 
+# Maximum size (in bytes) of the distance matrix block used when generating predictions
+PREDICTION_BLOCK_BYTES = 2**26
+
+# Model used by the worker processes of a parallel leave-one-out search
+_loo_worker_model = None
+
+
+def _set_loo_worker_model(model):
+    """
+    Initializer for the worker processes of a parallel leave-one-out search.
+    """
+    global _loo_worker_model  # pylint: disable=global-statement
+    _loo_worker_model = model
+
+
+def _loo_worker(sigma, reg_parameters):
+    """
+    Evaluate the leave-one-out errors for one shape parameter in a worker process.
+    """
+    return _loo_worker_model.loo_errors_for_shape_parameter(sigma, reg_parameters)
+
+
+def pairwise_distances(x, centres, out=None):
+    """
+    Euclidean distances between each row of x and each row of centres.
+
+    Args:
+        x(NumPy Array)      : Array of points (one point per row)
+        centres(NumPy Array): Array of centres (one centre per row)
+        out(NumPy Array)    : (optional) C-contiguous array of shape (x.shape[0], centres.shape[0]) to store the result in
+
+    Returns:
+        NumPy Array: Array of distances, with element [i, j] being the distance between x[i, :] and centres[j, :]
+    """
+    x = np.asarray(x, dtype=float)
+    centres = np.asarray(centres, dtype=float)
+    if out is None:
+        return cdist(x, centres, "euclidean")
+    return cdist(x, centres, "euclidean", out=out)
+
 
 class FeatureScaling:
     """
@@ -197,6 +240,7 @@ class RadialBasisFunctions:
         regularization=None,
         fname=None,
         overwrite=False,
+        max_workers=None,
     ):
         r"""
 
@@ -229,6 +273,8 @@ class RadialBasisFunctions:
 
             regularization(bool): This option determines whether or not the regularization parameter :math:`\lambda` is considered during RBF fitting. Default setting is True.
 
+            max_workers(int): Number of worker processes used to evaluate the shape parameters of the leave-one-out hyperparameter search in parallel. Default is None, for which the search is carried out in the current process.
+
 
         Returns:
             **self** object with the input information
@@ -242,6 +288,8 @@ class RadialBasisFunctions:
                 * **solution_method** is not 'algebraic', 'pyomo' or 'bfgs'.
             Exception:
                 - :math:`\lambda` is not boolean.
+            Exception:
+                - **max_workers** is not a positive integer.
 
         **Example:**
 
@@ -374,6 +422,14 @@ class RadialBasisFunctions:
             self.regularization = regularization
         print("Regularization done: ", self.regularization)
 
+        if max_workers is not None and (
+            not isinstance(max_workers, int) or max_workers <= 0
+        ):
+            # PYLINT-TODO
+            # pylint: disable-next=broad-exception-raised
+            raise Exception("max_workers must be a positive integer.")
+        self.max_workers = max_workers
+
         # Results
         self.weights = None
         self.sigma = None
@@ -393,8 +449,8 @@ class RadialBasisFunctions:
         The function r2_distance calculates Euclidean distance from the point or array c.
 
         """
-        dist = self.x_data - c
-        l2_distance = np.sqrt(np.sum((dist**2), axis=1))
+        c = np.asarray(c, dtype=float).reshape(1, -1)
+        l2_distance = pairwise_distances(self.x_data, c)[:, 0]
         return l2_distance
 
     @staticmethod
@@ -586,27 +642,32 @@ class RadialBasisFunctions:
 
         """
 
-        basis_functions = np.zeros((self.x_data.shape[0], self.centres.shape[0]))
-        for i in range(0, self.centres.shape[0]):
-            basis_functions[:, i] = self.r2_distance(self.centres[i, :])
+        # Distances between data points and centres do not depend on r, so
+        # reuse them if they have been cached during training
+        basis_functions = getattr(self, "_distance_cache", None)
+        if basis_functions is None:
+            basis_functions = pairwise_distances(self.x_data, self.centres)
 
-        # Initialization of x_transformed
-        x_transformed = np.zeros((basis_functions.shape[0], basis_functions.shape[1]))
+        return self._basis_transformation(basis_functions, r)
 
+    def _basis_transformation(self, distances, r):
+        """
+        Transform an array of distances to the basis selected by the user.
+        """
         if self.basis_function == "gaussian":
-            x_transformed = self.gaussian_basis_transformation(basis_functions, r)
+            x_transformed = self.gaussian_basis_transformation(distances, r)
         elif self.basis_function == "linear":
-            x_transformed = self.linear_transformation(basis_functions)
+            x_transformed = self.linear_transformation(distances)
         elif self.basis_function == "cubic":
-            x_transformed = self.cubic_transformation(basis_functions)
+            x_transformed = self.cubic_transformation(distances)
         elif self.basis_function == "mq":
-            x_transformed = self.multiquadric_basis_transformation(basis_functions, r)
+            x_transformed = self.multiquadric_basis_transformation(distances, r)
         elif self.basis_function == "imq":
-            x_transformed = self.inverse_multiquadric_basis_transformation(
-                basis_functions, r
-            )
+            x_transformed = self.inverse_multiquadric_basis_transformation(distances, r)
         elif self.basis_function == "spline":
-            x_transformed = self.thin_plate_spline_transformation(basis_functions)
+            x_transformed = self.thin_plate_spline_transformation(distances)
+        else:
+            x_transformed = np.zeros(distances.shape)
         return x_transformed
 
     @staticmethod
@@ -908,11 +969,95 @@ class RadialBasisFunctions:
         loo_error_estimate = np.linalg.norm(error_vector)
         return condition_number_pure, condition_number_regularized, loo_error_estimate
 
+    def loo_errors_for_shape_parameter(self, sigma, reg_parameters):
+        """
+        The function loo_errors_for_shape_parameter evaluates the leave-one-out cross-validation (LOOCV) error of every regularization parameter in reg_parameters for a single shape parameter sigma.
+
+        Since the RBF centres coincide with the training data, the transformed matrix A is symmetric, and regularization only shifts its eigenvalues:
+            A + lambda I = V (D + lambda I) V',
+
+        where A = V D V' is the eigendecomposition of A. A single eigendecomposition therefore provides, for every regularization parameter, the condition number, the radial weights and the diagonal of the inverse required by Rippa's equation.
+
+        When the radial weights are not obtained algebraically (or A is not symmetric), and for regularization parameters giving a numerically singular system, the errors are evaluated by calling the function loo_error_estimation_with_rippa_method instead.
+
+        Args:
+            self                          : contains, among other things, the input data
+            sigma(float)                  : shape parameter for the parametric bases (Gaussian, Multiquadric, Inverse multiquadric)
+            reg_parameters(list)          : regularization parameters to be evaluated
+
+        Returns:
+            NumPy Array                   : Array with one row per regularization parameter, containing the condition numbers of the transformed matrix before and after regularization and the norm of the leave-one-out cross-validation error.
+
+        """
+        x_transformed = self.basis_generation(sigma)
+        if self.solution_method != "algebraic" or not np.array_equal(
+            x_transformed, x_transformed.transpose()
+        ):
+            return np.array(
+                [
+                    self.loo_error_estimation_with_rippa_method(sigma, lambda_reg)
+                    for lambda_reg in reg_parameters
+                ]
+            ).reshape(len(reg_parameters), 3)
+
+        eigenvalues, eigenvectors = np.linalg.eigh(x_transformed)
+        y_train = self.y_data.reshape(self.y_data.shape[0], 1)
+        projected_y = np.matmul(eigenvectors.transpose(), y_train)
+        squared_eigenvectors = eigenvectors**2
+        condition_number_pure = self._condition_number(eigenvalues)
+
+        results = np.zeros((len(reg_parameters), 3))
+        for j, lambda_reg in enumerate(reg_parameters):
+            shifted_eigenvalues = eigenvalues + lambda_reg
+            abs_eigenvalues = np.abs(shifted_eigenvalues)
+            condition_number_regularized = self._condition_number(shifted_eigenvalues)
+            if condition_number_regularized >= 1 / np.finfo(float).eps:
+                # Numerically singular system: the error estimate is dominated by
+                # round-off, so use the same factorizations as the direct method
+                results[j, :] = self.loo_error_estimation_with_rippa_method(
+                    sigma, lambda_reg
+                )
+                continue
+            with np.errstate(divide="ignore"):
+                inverse_eigenvalues = np.where(
+                    shifted_eigenvalues != 0, 1 / shifted_eigenvalues, 0
+                )
+            radial_weights = np.matmul(
+                eigenvectors, inverse_eigenvalues[:, np.newaxis] * projected_y
+            )
+            # Diagonal of the pseudo-inverse, with numpy's default cut-off
+            pseudo_inverse_eigenvalues = np.where(
+                abs_eigenvalues > 1e-15 * np.max(abs_eigenvalues),
+                inverse_eigenvalues,
+                0,
+            )
+            inverse_diagonal = np.matmul(
+                squared_eigenvectors, pseudo_inverse_eigenvalues
+            )
+            error_vector = radial_weights[:, 0] / inverse_diagonal
+            results[j, :] = [
+                condition_number_pure,
+                condition_number_regularized,
+                np.linalg.norm(error_vector),
+            ]
+        return results
+
+    @staticmethod
+    def _condition_number(eigenvalues):
+        """
+        Condition number of a symmetric matrix from its eigenvalues.
+        """
+        abs_eigenvalues = np.abs(eigenvalues)
+        smallest = np.min(abs_eigenvalues)
+        if smallest == 0:
+            return np.inf
+        return np.max(abs_eigenvalues) / smallest
+
     def leave_one_out_crossvalidation(self):
         """
         The function leave_one_out_crossvalidation determines the best hyperparameters (shape and regularization parameters) for a given RBF fitting problem.
         The function cycles through a set of predefined sets to determine the shape parameter and regularization parameter combination which yields the lowest LOOCV error.
-        The LOOCV error for each (shape_parameter, regulkarization parameter) pair is evaluated by calling the function loo_error_estimation_with_rippa_method
+        The LOOCV errors for all the regularization parameters of a given shape parameter are evaluated together by calling the function loo_errors_for_shape_parameter. When **max_workers** is larger than one, the shape parameters are distributed over a pool of worker processes.
         The pre-defined shape parameter set considers 24 irregularly spaced values ranging between 0.001 - 1000, while the regularization parameter set considers 21 values ranging between 0.00001 - 1.
 
         Args:
@@ -991,6 +1136,23 @@ class RadialBasisFunctions:
 
         machine_precision = np.finfo(float).eps
 
+        # One eigendecomposition per shape parameter serves all regularization parameters
+        max_workers = getattr(self, "max_workers", None)
+        if max_workers is not None and max_workers > 1 and len(r_set) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(max_workers, len(r_set)),
+                initializer=_set_loo_worker_model,
+                initargs=(self,),
+            ) as executor:
+                grid_results = list(
+                    executor.map(_loo_worker, r_set, itertools.repeat(reg_parameter))
+                )
+        else:
+            grid_results = [
+                self.loo_errors_for_shape_parameter(sigma, reg_parameter)
+                for sigma in r_set
+            ]
+
         error_vector = np.zeros((len(r_set) * len(reg_parameter), 3))
         counter = 0
         print(
@@ -1000,11 +1162,7 @@ class RadialBasisFunctions:
             sigma = r_set[i]
             for j in range(0, len(reg_parameter)):
                 lambda_reg = reg_parameter[j]
-                (
-                    cond_no_pure,
-                    cond_no_reg,
-                    cv_error,
-                ) = self.loo_error_estimation_with_rippa_method(sigma, lambda_reg)
+                cond_no_pure, cond_no_reg, cv_error = grid_results[i][j, :]
                 error_vector[counter, :] = [sigma, lambda_reg, cv_error]
                 counter += 1
                 print(
@@ -1054,6 +1212,14 @@ class RadialBasisFunctions:
 
         """
 
+        # Distances between data points and centres are shared by all basis evaluations
+        self._distance_cache = pairwise_distances(self.x_data, self.centres)
+        try:
+            return self._training()
+        finally:
+            del self._distance_cache
+
+    def _training(self):
         # Determine best r value
         best_r_value, best_lambda_param, _ = self.leave_one_out_crossvalidation()
 
@@ -1133,45 +1299,29 @@ class RadialBasisFunctions:
         x_pred_scaled = (x_data - self.x_data_min) / scale
         x_data = x_pred_scaled.reshape(x_data.shape)
 
-        basis_vector = np.zeros((x_data.shape[0], centres_matrix.shape[0]))
-        # Calculate distances from centres
-        for i in range(0, centres_matrix.shape[0]):
-            basis_vector[:, i] = np.sqrt(
-                np.sum(((x_data - centres_matrix[i, :]) ** 2), axis=1)
-            )
-        # Initialization of x_transformed
-        x_transformed = np.zeros((basis_vector.shape[0], basis_vector.shape[1]))
-
-        # Transform X
-        if self.basis_function == "gaussian":
-            x_transformed = RadialBasisFunctions.gaussian_basis_transformation(
-                basis_vector, r
-            )
-        elif self.basis_function == "linear":
-            x_transformed = RadialBasisFunctions.linear_transformation(basis_vector)
-        elif self.basis_function == "cubic":
-            x_transformed = RadialBasisFunctions.cubic_transformation(basis_vector)
-        elif self.basis_function == "mq":
-            x_transformed = RadialBasisFunctions.multiquadric_basis_transformation(
-                basis_vector, r
-            )
-        elif self.basis_function == "imq":
-            x_transformed = (
-                RadialBasisFunctions.inverse_multiquadric_basis_transformation(
-                    basis_vector, r
-                )
+        # Evaluate predictions in blocks of rows to bound the size of the distance matrix
+        n_rows = x_data.shape[0]
+        n_centres = centres_matrix.shape[0]
+        block_rows = max(
+            1, min(n_rows, PREDICTION_BLOCK_BYTES // (8 * max(n_centres, 1)))
+        )
+        distance_buffer = np.empty((block_rows, n_centres))
+
+        y_prediction_scaled = np.zeros((n_rows, radial_weights.shape[1]))
+        for start in range(0, n_rows, block_rows):
+            stop = min(start + block_rows, n_rows)
+            # Calculate distances from centres
+            basis_vector = pairwise_distances(
+                x_data[start:stop, :],
+                centres_matrix,
+                out=distance_buffer[: stop - start, :],
             )
-        elif self.basis_function == "spline":
-            x_transformed = RadialBasisFunctions.thin_plate_spline_transformation(
-                basis_vector
+            # Transform X
+            x_transformed = self._basis_transformation(basis_vector, r)
+            y_prediction_scaled[start:stop, :] = np.matmul(
+                x_transformed, radial_weights
             )
 
-        # Add regularization shifting?
-        x_transformed = x_transformed + (
-            0 * np.eye(x_transformed.shape[0], x_transformed.shape[1])
-        )
-        # x_transformed = x_transformed + (lambda_reg * np.eye(x_transformed.shape[0], x_transformed.shape[1]))
-        y_prediction_scaled = np.matmul(x_transformed, radial_weights)
         y_prediction_unscaled = self.y_data_min + y_prediction_scaled * (
             self.y_data_max - self.y_data_min
         )
@@ -20,6 +20,7 @@ import itertools
 
 import numpy as np
 import pandas as pd
+from scipy.spatial import cKDTree
 
 __author__ = "Oluwamayowa Amusat"
 
@@ -125,9 +126,8 @@ class SamplingMethods:
         This is done by determining the input data with the smallest L2 distance from a.
 
         The function:
-        1. Calculates the L2 distance between all the input data points and a,
-        2. Sorts the input data based on the calculated L2-distances, and
-        3. Selects the sample point in the first row (after sorting) as the closest sample point.
+        1. Calculates the L2 distance between all the input data points and a, and
+        2. Selects the sample point with the smallest L2-distance as the closest sample point.
 
         Args:
             self: contains, among other things, the input data.
@@ -140,40 +140,72 @@ class SamplingMethods:
         no_y_vars = self.x_data.shape[1] - full_data.shape[1]
         dist = full_data[:, :no_y_vars] - a
         l2_norm = np.sqrt(np.sum((dist**2), axis=1))
-        l2_norm = l2_norm.reshape(l2_norm.shape[0], 1)
-        distances = np.append(full_data, l2_norm, 1)
-        sorted_distances = distances[distances[:, -1].argsort()]
-        closest_point = sorted_distances[0, :-1]
+        closest_point = full_data[np.argmin(l2_norm), :]
         return closest_point
 
-    def points_selection(self, full_data, generated_sample_points):
+    def points_selection(self, full_data, generated_sample_points, unique=False):
         """
-        Uses L2-distance evaluation (implemented in nearest_neighbour) to find closest available points in original data to those generated by the sampling technique.
-        Calls the nearest_neighbour function for each row in the input data.
+        Finds the closest available points in original data to those generated by the sampling technique, based on the L2-distance.
+
+        A KD-tree is built over the input variables of the data once, and the nearest neighbours of all the generated points are found in a single batch query.
 
         Args:
             full_data: refers to the input dataset supplied by the user.
             generated_sample_points(NumPy Array): The vector of points (number_of_sample rows) for which the closest points in the original data are to be found. Each row represents a sample point.
+            unique(bool): Whether each row of the input data may be selected at most once. When True, the generated points are matched greedily (closest pairs first) and a point whose nearest neighbour is already taken receives the closest row still available. Default is False.
 
         Returns:
             equivalent_points: Array containing the points (in rows) most similar to those in generated_sample_points
         """
-
-        equivalent_points = np.zeros(
-            (generated_sample_points.shape[0], len(self.data_headers))
-        )
-        for i in range(0, generated_sample_points.shape[0]):
-            closest_point = self.nearest_neighbour(
-                full_data, generated_sample_points[i, :]
+        no_x_vars = self.x_data.shape[1]
+        n_data = full_data.shape[0]
+        n_points = generated_sample_points.shape[0]
+        if unique and n_points > n_data:
+            raise ValueError(
+                "Unique selection requires the number of samples to be no greater than the number of entries in the input data set."
             )
-            equivalent_points[i, :] = closest_point
-        return equivalent_points
+        if no_x_vars == 0:
+            # All points are equidistant: take the rows in order
+            indices = np.arange(n_points) if unique else np.zeros(n_points, dtype=int)
+            return full_data[indices, :]
+
+        tree = cKDTree(full_data[:, :no_x_vars])
+        if not unique:
+            _, indices = tree.query(generated_sample_points, k=1)
+            return full_data[indices, :]
+
+        # Query a few neighbours for all points at once; points whose candidates
+        # are all taken are re-queried with progressively more neighbours
+        k = min(n_data, 8)
+        distances, candidates = tree.query(generated_sample_points, k=k)
+        distances = distances.reshape(n_points, k)
+        candidates = candidates.reshape(n_points, k)
+        used = np.zeros(n_data, dtype=bool)
+        indices = np.zeros(n_points, dtype=int)
+        for i in np.argsort(distances[:, 0], kind="stable"):
+            point_candidates = candidates[i, :]
+            free = point_candidates[~used[point_candidates]]
+            n_neighbours = k
+            while free.size == 0:
+                n_neighbours = min(2 * n_neighbours, n_data)
+                _, point_candidates = tree.query(
+                    generated_sample_points[i, :], k=n_neighbours
+                )
+                point_candidates = np.atleast_1d(point_candidates)
+                free = point_candidates[~used[point_candidates]]
+            indices[i] = free[0]
+            used[free[0]] = True
+        return full_data[indices, :]
 
     def sample_point_selection(self, full_data, sample_points, sampling_type):
         if sampling_type == "selection":
             sd = FeatureScaling()
             scaled_data, data_min, data_max = sd.data_scaling_minmax(full_data)
-            points_closest_scaled = self.points_selection(scaled_data, sample_points)
+            points_closest_scaled = self.points_selection(
+                scaled_data,
+                sample_points,
+                unique=getattr(self, "unique_selection", False),
+            )
             points_closest_unscaled = sd.data_unscaling_minmax(
                 points_closest_scaled, data_min, data_max
             )
@@ -196,6 +228,20 @@ class SamplingMethods:
 
         return unique_sample_points
 
+    def unique_selection_check(self, unique_selection):
+        """
+        Validates and stores the option controlling whether rows of the input data may be selected more than once in "selection" mode.
+
+        Args:
+            unique_selection(bool): Whether each row of the input data may be selected at most once.
+
+        Raises:
+            TypeError: When **unique_selection** is not Boolean
+        """
+        if not isinstance(unique_selection, bool):
+            raise TypeError("unique_selection must be Boolean.")
+        self.unique_selection = unique_selection
+
     def prime_number_generator(self, n):
         """
         Function generates a list of the first n prime numbers
@@ -481,6 +527,7 @@ class LatinHypercubeSampling(SamplingMethods):
         xlabels=None,
         ylabels=None,
         rand_seed=None,
+        unique_selection=False,
     ):
         """
         Initialization of **LatinHypercubeSampling** class. Two inputs are required.
@@ -498,6 +545,7 @@ class LatinHypercubeSampling(SamplingMethods):
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
             rand_seed (int): Option that allows users to fix the numpy random seed generator for reproducibility (if required).
+            unique_selection (bool): Only used in "selection" mode. When True, each row of **data_input** is selected at most once, so that the number of samples returned is not reduced by repeated nearest neighbours. Default is False.
 
         Returns:
             **self** function containing the input information
@@ -527,6 +575,7 @@ class LatinHypercubeSampling(SamplingMethods):
                 'Invalid sampling type requirement entered. Enter "creation" for sampling from a range or "selection" for selecting samples from a dataset.'
             )
         print("Sampling type: ", self.sampling_type, "\n")
+        self.unique_selection_check(unique_selection)
 
         if self.sampling_type == "selection":
             if isinstance(data_input, (pd.DataFrame, np.ndarray)):
@@ -730,6 +779,7 @@ class UniformSampling(SamplingMethods):
         xlabels=None,
         ylabels=None,
         edges=None,
+        unique_selection=False,
     ):
         """
         Initialization of UniformSampling class. Three inputs are required.
@@ -747,6 +797,7 @@ class UniformSampling(SamplingMethods):
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
             edges (bool): Boolean variable representing how the points should be selected. A value of True (default) indicates the points should be equally spaced edge to edge, otherwise they will be in the centres of the bins filling the unit cube
+            unique_selection (bool): Only used in "selection" mode. When True, each row of **data_input** is selected at most once, so that the number of samples returned is not reduced by repeated nearest neighbours. Default is False.
 
         Returns:
             **self** function containing the input information
@@ -775,6 +826,7 @@ class UniformSampling(SamplingMethods):
                 'Invalid sampling type requirement entered. Enter "creation" for sampling from a range or "selection" for selecting samples from a dataset.'
             )
         print("Sampling type: ", self.sampling_type, "\n")
+        self.unique_selection_check(unique_selection)
 
         if self.sampling_type == "selection":
             if isinstance(data_input, (pd.DataFrame, np.ndarray)):
@@ -913,6 +965,7 @@ class HaltonSampling(SamplingMethods):
         sampling_type=None,
         xlabels=None,
         ylabels=None,
+        unique_selection=False,
     ):
         """
 
@@ -930,6 +983,7 @@ class HaltonSampling(SamplingMethods):
         Keyword Args:
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
+            unique_selection (bool): Only used in "selection" mode. When True, each row of **data_input** is selected at most once, so that the number of samples returned is not reduced by repeated nearest neighbours. Default is False.
 
         Returns:
             **self** function containing the input information.
@@ -958,6 +1012,7 @@ class HaltonSampling(SamplingMethods):
                 'Invalid sampling type requirement entered. Enter "creation" for sampling from a range or "selection" for selecting samples from a dataset.'
             )
         print("Sampling type: ", self.sampling_type, "\n")
+        self.unique_selection_check(unique_selection)
 
         if self.sampling_type == "selection":
             if isinstance(data_input, (pd.DataFrame, np.ndarray)):
@@ -1097,6 +1152,7 @@ class HammersleySampling(SamplingMethods):
         sampling_type=None,
         xlabels=None,
         ylabels=None,
+        unique_selection=False,
     ):
         """
         Initialization of **HammersleySampling** class. Two inputs are required.
@@ -1113,6 +1169,7 @@ class HammersleySampling(SamplingMethods):
         Keyword Args:
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
+            unique_selection (bool): Only used in "selection" mode. When True, each row of **data_input** is selected at most once, so that the number of samples returned is not reduced by repeated nearest neighbours. Default is False.
 
             Returns:
                 **self** function containing the input information.
@@ -1141,6 +1198,7 @@ class HammersleySampling(SamplingMethods):
                 'Invalid sampling type requirement entered. Enter "creation" for sampling from a range or "selection" for selecting samples from a dataset.'
             )
         print("Sampling type: ", self.sampling_type, "\n")
+        self.unique_selection_check(unique_selection)
 
         if self.sampling_type == "selection":
             if isinstance(data_input, (pd.DataFrame, np.ndarray)):
@@ -1283,6 +1341,8 @@ class CVTSampling(SamplingMethods):
         xlabels=None,
         ylabels=None,
         rand_seed=None,
+        unique_selection=False,
+        batch_size=None,
     ):
         """
         Initialization of CVTSampling class. Two inputs are required, while an optional option to control the solution accuracy may be specified.
@@ -1303,6 +1363,8 @@ class CVTSampling(SamplingMethods):
             tolerance(float): Maximum allowable Euclidean distance between centres from consecutive iterations of the algorithm. Termination condition for algorithm.
 
                 - The smaller the value of tolerance, the better the solution but the longer the algorithm requires to converge. Default value is :math:`10^{-7}`.
+            unique_selection (bool): Only used in "selection" mode. When True, each row of **data_input** is selected at most once, so that the number of samples returned is not reduced by repeated nearest neighbours. Default is False.
+            batch_size (int): Number of random points drawn at each iteration of the algorithm to update the centres (mini-batch). Smaller batches reduce the memory requirement and the cost of each iteration at the expense of noisier updates. Default is 1000 times **number_of_samples**.
 
         Returns:
                 **self** function containing the input information.
@@ -1313,7 +1375,9 @@ class CVTSampling(SamplingMethods):
 
                 ValueError: When the tolerance specified is too loose (tolerance > 0.1)
 
-                TypeError: When **number_of_samples** is not the right type, or **sampling_type** entry is not a string
+                ValueError: When **batch_size** is zero or negative
+
+                TypeError: When **number_of_samples** or **batch_size** is not the right type, or **sampling_type** entry is not a string
 
                 IndexError: When invalid column names are supplied in **xlabels** or **ylabels**
 
@@ -1338,6 +1402,7 @@ class CVTSampling(SamplingMethods):
                 'Invalid sampling type requirement entered. Enter "creation" for sampling from a range or "selection" for selecting samples from a dataset.'
             )
         print("Sampling type: ", self.sampling_type, "\n")
+        self.unique_selection_check(unique_selection)
 
         if self.sampling_type == "selection":
             if isinstance(data_input, (pd.DataFrame, np.ndarray)):
@@ -1429,6 +1494,14 @@ class CVTSampling(SamplingMethods):
             raise Exception("Invalid tolerance input")
         self.eps = tolerance
 
+        if batch_size is None:
+            batch_size = 1000 * self.number_of_centres
+        elif not isinstance(batch_size, int):
+            raise TypeError("batch_size must be an integer.")
+        elif batch_size <= 0:
+            raise ValueError("batch_size must a positive, non-zero integer.")
+        self.batch_size = batch_size
+
         if rand_seed is not None:
             try:
                 self.seed_value = int(rand_seed)
@@ -1477,6 +1550,24 @@ class CVTSampling(SamplingMethods):
         euc_d = np.sqrt(np.sum(d_sq, axis=1))
         return euc_d
 
+    @staticmethod
+    def nearest_centres(points, centres):
+        """
+        The function nearest_centres classifies each point based on the mass centroid closest to it (in the Euclidean sense).
+
+        A KD-tree is built over the centres, so that no points x centres distance matrix needs to be stored.
+
+        Args:
+            points(NumPy Array): A 2-D array containing the points to be classified, one point per row.
+            centres(NumPy Array): A 2-D array containing the current mass centroids, size no_samples x no_features.
+
+        Returns:
+            closest_centres(NumPy Array): Array of size (points.shape[0],) containing the index number of the closest mass centroid of each point.
+
+        """
+        _, closest_centres = cKDTree(centres).query(points, k=1)
+        return np.atleast_1d(closest_centres)
+
     @staticmethod
     def create_centres(
         initial_centres, current_random_points, current_centres, counter
@@ -1496,19 +1587,23 @@ class CVTSampling(SamplingMethods):
 
         The steps carried out in the function at each iteration are:
         (1) Classify the current random points in current_random_points based on their centres
-        (2) Evaluate the mean of the random points in each class
+        (2) Evaluate the mean of the random points in each class (for all classes at once, using bin counts)
         (3) Create the new centres as the weighted average of the current centres (initial_centres) and the mean data calculated in the second step. The weighting is done based on the number of iterations (counter).
 
         """
-        centres = np.zeros((initial_centres.shape[0], initial_centres.shape[1]))
-        current_centres = current_centres.reshape(current_centres.shape[0], 1)
-        for i in range(0, initial_centres.shape[0]):
-            data_matrix = current_random_points[current_centres[:, 0] == i]
-            m_prime, n_prime = data_matrix.shape  # pylint: disable=unused-variable
-            if m_prime == 0:
-                centres[i, :] = np.mean(initial_centres, axis=0)
-            else:
-                centres[i, :] = np.mean(data_matrix, axis=0)
+        no_centres, no_features = initial_centres.shape
+        current_centres = np.asarray(current_centres, dtype=int).reshape(-1)
+        class_sizes = np.bincount(current_centres, minlength=no_centres)
+        centres = np.zeros((no_centres, no_features))
+        for j in range(0, no_features):
+            centres[:, j] = np.bincount(
+                current_centres,
+                weights=current_random_points[:, j],
+                minlength=no_centres,
+            )
+        occupied = class_sizes > 0
+        centres[occupied, :] /= class_sizes[occupied, np.newaxis]
+        centres[~occupied, :] = np.mean(initial_centres, axis=0)
 
         # Weighted average based on previous number of iterations
         centres = ((counter * initial_centres) + centres) / (counter + 1)
@@ -1519,14 +1614,13 @@ class CVTSampling(SamplingMethods):
         The ``sample_points`` method determines the best/optimal centre points (centroids) for a data set based on the minimization of the total distance between points and centres.
 
         Procedure based on McQueen's algorithm: iteratively minimize distance, and re-position centroids.
-        Centre re-calculation done as the mean of each data cluster around each centre.
+        At each iteration, a mini-batch of **batch_size** random points is classified based on the closest centre, and the centres are re-calculated from the mean of each data cluster around each centre.
 
         Returns:
             NumPy Array or Pandas Dataframe:     A numpy array or Pandas dataframe containing the final **number_of_samples** centroids obtained by the CVT algorithm.
 
         """
         _, n = self.x_data.shape
-        size_multiple = 1000
         initial_centres = self.random_sample_selection(self.number_of_centres, n)
         # Iterative optimization process
         cost_old = 0
@@ -1535,22 +1629,12 @@ class CVTSampling(SamplingMethods):
         counter = 1
         while (cost_change > self.eps) and (counter <= 1000):
             cost_old = cost_new
-            current_random_points = self.random_sample_selection(
-                self.number_of_centres * size_multiple, n
+            current_random_points = self.random_sample_selection(self.batch_size, n)
+
+            # Find the centre closest to each random point and estimate new centres
+            current_centres = self.nearest_centres(
+                current_random_points, initial_centres
             )
-            distance_matrix = np.zeros(
-                (current_random_points.shape[0], initial_centres.shape[0])
-            )  # Vector to store distances from centroids
-            current_centres = np.zeros(
-                (current_random_points.shape[0], 1)
-            )  # Vector containing the centroid each point belongs to
-
-            # Calculate distance between random points and centres, sort and estimate new centres
-            for i in range(0, self.number_of_centres):
-                distance_matrix[:, i] = self.eucl_distance(
-                    current_random_points, initial_centres[i, :]
-                )
-            current_centres = np.argmin(distance_matrix, axis=1)
             new_centres = self.create_centres(
                 initial_centres, current_random_points, current_centres, counter
             )
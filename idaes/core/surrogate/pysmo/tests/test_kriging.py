@@ -13,15 +13,25 @@
 import sys
 import os
 import io
+import time
 from unittest.mock import patch
 
 sys.path.append(os.path.abspath(".."))  # current folder is ~/tests
+from idaes.core.surrogate.pysmo import kriging
 from idaes.core.surrogate.pysmo.kriging import KrigingModel
 import numpy as np
 import pandas as pd
 import pytest
 
 
+@pytest.fixture(scope="module", autouse=True)
+def run_in_tmp_path(tmp_path_factory):
+    # PySMO saves its results to files in the working directory
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("pysmo"))
+        yield
+
+
 class TestKrigingModel:
     y = np.array(
         [
@@ -174,6 +184,79 @@ class TestKrigingModel:
         inverse_x = KrigingClass.covariance_inverse_generator(cov_matrix)
         np.testing.assert_array_equal(np.round(inverse_x, 7), np.round(cov_matrix, 7))
 
+    @pytest.mark.unit
+    def test_distance_matrix_generator(self):
+        rng = np.random.default_rng(1)
+        x1 = rng.random((7, 3))
+        x2 = rng.random((4, 3))
+        theta = np.array([0.5, 2.0, 10.0])
+        for p in [1, 1.5, 2]:
+            expected = np.array(
+                [
+                    [np.sum(theta * np.abs(x1[i, :] - x2[j, :]) ** p) for j in range(4)]
+                    for i in range(7)
+                ]
+            )
+            distances = KrigingModel.distance_matrix_generator(x1, x2, theta, p)
+            assert distances.shape == (7, 4)
+            np.testing.assert_allclose(distances, expected, rtol=1e-12)
+
+    @pytest.mark.unit
+    def test_covariance_factorization(self):
+        cov_matrix = np.array(
+            [
+                [1.000001, 0.60653066, 0.13533528],
+                [0.60653066, 1.000001, 0.60653066],
+                [0.13533528, 0.60653066, 1.000001],
+            ]
+        )
+        factor, lower = KrigingModel.covariance_factorization(cov_matrix)
+        assert lower
+        L = np.tril(factor)
+        np.testing.assert_allclose(np.matmul(L, L.transpose()), cov_matrix)
+
+    @pytest.mark.unit
+    def test_covariance_factorization_jitter(self):
+        # Duplicated samples give a singular correlation matrix
+        x = np.array([[0.0], [0.0], [1.0]])
+        cov_matrix = KrigingModel.covariance_matrix_generator(x, [1.0], 0, 2)
+        factor, _ = KrigingModel.covariance_factorization(cov_matrix)
+        L = np.tril(factor)
+        np.testing.assert_allclose(
+            np.matmul(L, L.transpose()), cov_matrix, rtol=0, atol=1e-6
+        )
+
+    @pytest.mark.unit
+    def test_covariance_factorization_fails(self):
+        cov_matrix = np.array([[1.0, 2.0], [2.0, 1.0]])
+        with pytest.raises(np.linalg.LinAlgError):
+            KrigingModel.covariance_factorization(cov_matrix)
+        with pytest.raises(np.linalg.LinAlgError):
+            KrigingModel.covariance_factorization(np.zeros((2, 2)))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
+    def test_concentrated_likelihood_terms(self, array_type):
+        input_array = array_type(self.training_data)
+        KrigingClass = KrigingModel(input_array, regularization=True)
+        cov_matrix = KrigingClass.covariance_matrix_generator(
+            KrigingClass.x_data_scaled, np.array([1, 2]), 1e-6, 2
+        )
+        cov_inv = np.linalg.inv(cov_matrix)
+        mean_exp = KrigingClass.kriging_mean(cov_inv, KrigingClass.y_data)
+        y_mu_exp = KrigingClass.y_mu_calculation(KrigingClass.y_data, mean_exp)
+        variance_exp = KrigingClass.kriging_sd(
+            cov_inv, y_mu_exp, KrigingClass.y_data.shape[0]
+        )
+
+        factor = KrigingClass.covariance_factorization(cov_matrix)
+        mean, y_mu, variance = KrigingClass.concentrated_likelihood_terms(
+            factor, KrigingClass.y_data
+        )
+        np.testing.assert_allclose(mean, mean_exp, rtol=1e-8)
+        np.testing.assert_allclose(y_mu, y_mu_exp, rtol=1e-8)
+        np.testing.assert_allclose(variance, variance_exp, rtol=1e-8)
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
     def test_kriging_mean(self, array_type):
@@ -420,6 +503,28 @@ class TestKrigingModel:
         y_pred = KrigingClass.predict_output(np.array([0.1, 0.2]))
         assert y_pred.shape[0] == 1
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
+    def test_predict_output_blocks(self, array_type):
+        input_array = array_type(self.training_data)
+        np.random.seed(0)
+        KrigingClass = KrigingModel(input_array)
+        KrigingClass.training()
+        x_test = np.array(self.full_data["x1"]), np.array(self.full_data["x2"])
+        x_test = np.column_stack(x_test)
+        full = KrigingClass.predict_output(x_test)
+        n_train = KrigingClass.x_data_scaled.shape[0]
+        # Force evaluation in blocks of three rows
+        with patch.object(kriging, "PREDICTION_BLOCK_BYTES", 3 * 8 * n_train):
+            blocked = KrigingClass.predict_output(x_test)
+        np.testing.assert_allclose(blocked, full, rtol=1e-9)
+        for i in [0, 17, x_test.shape[0] - 1]:
+            np.testing.assert_allclose(
+                KrigingClass.predict_output(x_test[i, :]),
+                full[i : i + 1, :],
+                rtol=1e-9,
+            )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
     def test_training(self, array_type):
@@ -537,3 +642,57 @@ class TestKrigingModel:
 
 if __name__ == "__main__":
     pytest.main()
+
+
+@pytest.mark.performance
+class TestKrigingPerformance:
+    @pytest.fixture(scope="class")
+    def kriging_data(self):
+        rng = np.random.default_rng(42)
+        x = rng.random((2000, 4))
+        y = np.sum(np.sin(3 * x), axis=1) + x[:, 0] * x[:, 1]
+        return np.column_stack((x, y))
+
+    def test_objective_function_timing(self, kriging_data, tmp_path):
+        KrigingClass = KrigingModel(
+            kriging_data, fname=str(tmp_path / "kriging_perf.pickle")
+        )
+        var_vector = np.array([0.5, 0.5, 0.5, 0.5, 1e-4])
+        start = time.perf_counter()
+        for _ in range(5):
+            conc_log_like = KrigingClass.objective_function(
+                var_vector, KrigingClass.x_data_scaled, KrigingClass.y_data, 2
+            )
+        elapsed = (time.perf_counter() - start) / 5
+        print(f"\nKriging likelihood evaluation (2000 samples): {elapsed:.3f} s")
+        assert np.isfinite(conc_log_like)
+        assert conc_log_like < 1e4
+
+    def test_predict_output_timing(self, kriging_data, tmp_path):
+        KrigingClass = KrigingModel(
+            kriging_data, fname=str(tmp_path / "kriging_perf.pickle")
+        )
+        p = 2
+        (
+            theta,
+            reg_param,
+            mean,
+            variance,
+            cov_mat,
+            cov_inv,
+            y_mu,
+        ) = KrigingClass.optimal_parameter_evaluation(
+            np.array([0.5, 0.5, 0.5, 0.5, 1e-4]), p
+        )
+        KrigingClass.optimal_weights = theta
+        KrigingClass.optimal_p = p
+        KrigingClass.optimal_mean = mean
+        KrigingClass.covariance_matrix_inverse = cov_inv
+        KrigingClass.optimal_y_mu = y_mu
+        start = time.perf_counter()
+        y_pred = KrigingClass.predict_output(KrigingClass.x_data)
+        elapsed = time.perf_counter() - start
+        print(f"\nKriging prediction (2000 points): {elapsed:.3f} s")
+        np.testing.assert_allclose(
+            y_pred, KrigingClass.y_data, rtol=0, atol=1e-2 * np.ptp(KrigingClass.y_data)
+        )
@@ -22,6 +22,14 @@ import pandas as pd
 import pytest
 
 
+@pytest.fixture(scope="module", autouse=True)
+def run_in_tmp_path(tmp_path_factory):
+    # PySMO saves its results to files in the working directory
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("pysmo"))
+        yield
+
+
 class TestFeatureScaling:
     test_data_1d = [[x] for x in range(10)]
     test_data_2d = [[x, (x + 1) ** 2] for x in range(10)]
@@ -911,6 +919,36 @@ class TestPolynomialRegression:
             ]
             np.testing.assert_equal(additional_data_sorted, concat_02_sorted)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type1", [pd.DataFrame])
+    @pytest.mark.parametrize("array_type2", [np.array])
+    def test_training_test_index_creation(self, array_type1, array_type2):
+        original_data_input = array_type1(self.full_data)
+        regression_data_input = array_type2(self.training_data)
+        data_feed = PolynomialRegression(
+            original_data_input,
+            regression_data_input,
+            maximum_polynomial_order=2,
+            number_of_crossvalidations=3,
+        )
+        training_data, cross_val_data = data_feed.training_test_data_creation()
+        splits = data_feed.training_test_index_creation()
+        assert len(splits) == 3
+        for i, (training_rows, test_rows) in enumerate(splits, start=1):
+            assert len(training_rows) == 19
+            assert len(test_rows) == 6
+            np.testing.assert_array_equal(
+                np.sort(np.concatenate((training_rows, test_rows))), np.arange(25)
+            )
+            np.testing.assert_array_equal(
+                data_feed.regression_data[training_rows],
+                training_data["training_set_" + str(i)],
+            )
+            np.testing.assert_array_equal(
+                data_feed.regression_data[test_rows],
+                cross_val_data["test_set_" + str(i)],
+            )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type1", [pd.DataFrame])
     @pytest.mark.parametrize("array_type2", [np.array])
@@ -1071,6 +1109,23 @@ class TestPolynomialRegression:
         expected_output[:, 5] = additional_term[:, 1]
         np.testing.assert_equal(output_1, expected_output)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("multinomials", [0, 1])
+    def test_polynomial_feature_columns(self, multinomials):
+        x_input_train_data = np.array(self.training_data)[:, :-1]
+        additional_term = np.sqrt(x_input_train_data)
+        full_features = PolynomialRegression.polygeneration(
+            4, multinomials, x_input_train_data, additional_term
+        )
+        for poly_order in range(1, 5):
+            columns = PolynomialRegression.polynomial_feature_columns(
+                poly_order, 4, 2, full_features.shape[1]
+            )
+            expected_output = PolynomialRegression.polygeneration(
+                poly_order, multinomials, x_input_train_data, additional_term
+            )
+            np.testing.assert_array_equal(full_features[:, columns], expected_output)
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array])
     def test_cost_function_01(self, array_type):
@@ -1347,6 +1402,37 @@ class TestPolynomialRegression:
         output_1 = PolynomialRegression.MLE_estimate(x_vector, y)
         np.testing.assert_array_equal(expected_value, np.round(output_1, 4))
 
+    @pytest.mark.unit
+    def test_qr_least_squares_01(self):
+        regression_data_input = np.array(self.training_data)
+        x_vector = PolynomialRegression.polygeneration(
+            2, 1, regression_data_input[:, :-1]
+        )
+        y = regression_data_input[:, -1].reshape(-1, 1)
+        q_matrix, r_matrix = np.linalg.qr(x_vector)
+        output_1 = PolynomialRegression.qr_least_squares(q_matrix, r_matrix, y)
+        expected_value = np.array([[2.0], [2.0], [2.0], [1.0], [1.0], [0.0]])
+        np.testing.assert_allclose(output_1, expected_value, atol=1e-10)
+        np.testing.assert_allclose(
+            output_1, PolynomialRegression.MLE_estimate(x_vector, y), atol=1e-10
+        )
+
+    @pytest.mark.unit
+    def test_qr_least_squares_02(self):
+        # Rank deficient problem: duplicated column, minimum norm solution expected
+        regression_data_input = np.array(self.training_data)
+        x_vector = PolynomialRegression.polygeneration(
+            1, 0, regression_data_input[:, :-1]
+        )
+        x_vector = np.concatenate((x_vector, x_vector[:, 1:2]), axis=1)
+        y = regression_data_input[:, -1].reshape(-1, 1)
+        q_matrix, r_matrix = np.linalg.qr(x_vector)
+        output_1 = PolynomialRegression.qr_least_squares(q_matrix, r_matrix, y)
+        np.testing.assert_allclose(
+            output_1, PolynomialRegression.MLE_estimate(x_vector, y), rtol=1e-8
+        )
+        np.testing.assert_allclose(output_1[1], output_1[3], rtol=1e-8)
+
     @pytest.mark.unit
     def test_pyomo_optimization_01(self):
         x_vector = np.array([[i**2, i, 1] for i in range(10)])
@@ -1524,6 +1610,138 @@ class TestPolynomialRegression:
         np.testing.assert_array_equal(expected_output, output_2)
         np.testing.assert_array_equal(expected_output, output_3)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("multinomials", [0, 1])
+    def test_polyregression_path_01(self, multinomials):
+        original_data_input = pd.DataFrame(self.full_data)
+        regression_data_input = np.array(self.training_data)
+        regression_data_input[:, -1] += np.sin(3 * regression_data_input[:, 0])
+        data_feed = PolynomialRegression(
+            original_data_input,
+            regression_data_input,
+            maximum_polynomial_order=5,
+            solution_method="mle",
+            multinomials=multinomials,
+        )
+        training_data = regression_data_input[0:20, :]
+        test_data = regression_data_input[20:, :]
+        feature_data = data_feed.feature_data_update()
+        fits = data_feed.polyregression_path(
+            feature_data[0:20, :],
+            regression_data_input[0:20, -1],
+            feature_data[20:25, :],
+            regression_data_input[20:, -1],
+        )
+        assert len(fits) == 5
+        for poly_order, (phi, train_error, cv_error) in enumerate(fits, start=1):
+            expected_phi, expected_train_error, expected_cv_error = (
+                data_feed.polyregression(poly_order, training_data, test_data)
+            )
+            assert phi.shape == expected_phi.shape
+            if np.isinf(expected_train_error):
+                assert np.all(np.isinf(phi))
+                assert np.isinf(train_error) and np.isinf(cv_error)
+            else:
+                np.testing.assert_allclose(phi, expected_phi, rtol=1e-6, atol=1e-8)
+                assert train_error == pytest.approx(
+                    expected_train_error, rel=1e-6, abs=1e-12
+                )
+                assert cv_error == pytest.approx(expected_cv_error, rel=1e-6, abs=1e-12)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type1", [pd.DataFrame])
+    @pytest.mark.parametrize("array_type2", [np.array])
+    @patch.object(
+        PolynomialRegression, "bfgs_parameter_optimization", mock_optimization
+    )
+    def test_polyregression_path_02(self, array_type1, array_type2):
+        original_data_input = array_type1(self.full_data)
+        regression_data_input = array_type2(self.training_data)
+        data_feed = PolynomialRegression(
+            original_data_input,
+            regression_data_input,
+            maximum_polynomial_order=5,
+            solution_method="bfgs",
+        )
+        feature_data = data_feed.feature_data_update()
+        fits = data_feed.polyregression_path(
+            feature_data[0:20, :],
+            regression_data_input[0:20, -1],
+            feature_data[20:25, :],
+            regression_data_input[20:, -1],
+        )
+        for poly_order, (phi, _, _) in enumerate(fits, start=1):
+            np.testing.assert_array_equal(phi, 10 * np.ones((2 * poly_order + 2, 1)))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type1", [pd.DataFrame])
+    @pytest.mark.parametrize("array_type2", [np.array])
+    def test_feature_data_update(self, array_type1, array_type2):
+        original_data_input = array_type1(self.full_data)
+        regression_data_input = array_type2(self.training_data)
+        data_feed = PolynomialRegression(
+            original_data_input,
+            regression_data_input[:20],
+            maximum_polynomial_order=3,
+        )
+        feature_data = data_feed.feature_data_update()
+        # Space is reserved for all the samples in original_data
+        assert feature_data.shape == (441, 8)
+        np.testing.assert_array_equal(
+            feature_data[:20],
+            data_feed.polygeneration(3, 1, regression_data_input[:20, :-1]),
+        )
+
+        # Appending rows only generates features for the new samples
+        data_feed.regression_data = regression_data_input
+        with patch.object(
+            PolynomialRegression,
+            "polygeneration",
+            wraps=PolynomialRegression.polygeneration,
+        ) as mock_polygeneration:
+            updated_feature_data = data_feed.feature_data_update(feature_data, 20)
+        assert mock_polygeneration.call_args[0][2].shape[0] == 5
+        assert updated_feature_data is feature_data
+        np.testing.assert_array_equal(
+            updated_feature_data[:25],
+            data_feed.polygeneration(3, 1, regression_data_input[:, :-1]),
+        )
+
+        # The array is reallocated when it runs out of space
+        small_feature_data = feature_data[:22].copy()
+        updated_feature_data = data_feed.feature_data_update(small_feature_data, 20)
+        assert updated_feature_data.shape == (441, 8)
+        np.testing.assert_array_equal(
+            updated_feature_data[:25],
+            data_feed.polygeneration(3, 1, regression_data_input[:, :-1]),
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type1", [pd.DataFrame])
+    @pytest.mark.parametrize("array_type2", [np.array])
+    def test_polynomial_order_search(self, array_type1, array_type2):
+        original_data_input = array_type1(self.full_data)
+        regression_data_input = array_type2(self.training_data)
+        data_feed = PolynomialRegression(
+            original_data_input,
+            regression_data_input,
+            maximum_polynomial_order=3,
+            solution_method="mle",
+        )
+        feature_data = data_feed.feature_data_update()
+        phi_best, order_best, train_error, cv_error = data_feed.polynomial_order_search(
+            feature_data
+        )
+        # The data is quadratic: the lowest order giving a (near) exact fit is selected
+        assert order_best == 2
+        np.testing.assert_allclose(
+            phi_best,
+            np.array([[2.0], [2.0], [2.0], [1.0], [1.0], [0.0]]),
+            atol=1e-8,
+        )
+        assert train_error < 1e-15
+        assert cv_error < 1e-15
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
     def test_surrogate_performance_01(self, array_type):
@@ -1983,6 +2201,36 @@ class TestPolynomialRegression:
         results = data_feed.polynomial_regression_fitting()
         assert results.fit_status == "ok"
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type1", [pd.DataFrame])
+    @pytest.mark.parametrize("array_type2", [np.array])
+    @patch("matplotlib.pyplot.show")
+    def test_polynomial_regression_fitting_05(
+        self, mock_show, array_type1, array_type2
+    ):
+        # Adaptive sampling with the incremental maximum likelihood solution
+        y = self.y.copy()
+        y[:, -1] += np.sin(3 * y[:, 0])
+        original_data_input = array_type1(y)
+        regression_data_input = array_type2(self.training_data)
+        regression_data_input[:, -1] += np.sin(3 * regression_data_input[:, 0])
+        mock_show.return_value = None
+        data_feed = PolynomialRegression(
+            original_data_input,
+            regression_data_input,
+            maximum_polynomial_order=3,
+            solution_method="mle",
+            max_iter=4,
+        )
+        data_feed.get_feature_vector()
+        results = data_feed.polynomial_regression_fitting()
+        assert results.fit_status == "ok"
+        assert results.number_of_iterations == 4
+        assert results.final_training_data.shape == (25 + 3 * 4, 3)
+        np.testing.assert_array_equal(
+            results.final_training_data[:25], regression_data_input
+        )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type1", [pd.DataFrame])
     @pytest.mark.parametrize("array_type2", [np.array])
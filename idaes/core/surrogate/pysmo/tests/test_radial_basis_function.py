@@ -11,13 +11,16 @@
 # for full copyright and license information.
 #################################################################################
 import sys
+import time
 import os
 from unittest.mock import patch
 
 sys.path.append(os.path.abspath(".."))  # current folder is ~/tests\
+from idaes.core.surrogate.pysmo import radial_basis_function
 from idaes.core.surrogate.pysmo.radial_basis_function import (
     RadialBasisFunctions,
     FeatureScaling,
+    pairwise_distances,
 )
 import numpy as np
 import pandas as pd
@@ -25,6 +28,14 @@ from scipy.spatial import distance
 import pytest
 
 
+@pytest.fixture(scope="module", autouse=True)
+def run_in_tmp_path(tmp_path_factory):
+    # PySMO saves its results to files in the working directory
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("pysmo"))
+        yield
+
+
 class TestFeatureScaling:
     test_data_1d = [[x] for x in range(10)]
     test_data_2d = [[x, (x + 1) ** 2] for x in range(10)]
@@ -1094,7 +1105,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1171,7 +1183,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1248,7 +1261,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1325,7 +1339,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1402,7 +1417,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1476,7 +1492,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1553,7 +1570,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1630,7 +1648,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1707,7 +1726,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1784,7 +1804,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1858,7 +1879,8 @@ class TestRadialBasisFunction:
         )
         assert (r_best in r_set) == True
         assert (lambda_best in reg_parameter) == True
-        assert error_best == expected_errors
+        # The search uses one eigendecomposition per shape parameter
+        assert error_best == pytest.approx(expected_errors, rel=1e-3)
 
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -1951,6 +1973,132 @@ class TestRadialBasisFunction:
             data_feed.training()
             assert data_feed.solution_status == "unstable solution"
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("basis_function", ["gaussian", "cubic", "mq", "spline"])
+    def test_loo_errors_for_shape_parameter(self, basis_function):
+        input_array = np.array(self.training_data)
+        data_feed = RadialBasisFunctions(
+            input_array, basis_function=basis_function, solution_method="algebraic"
+        )
+        reg_parameters = [0, 1e-5, 1e-3, 0.1, 1]
+        for sigma in [0.001, 0.5, 2.0]:
+            results = data_feed.loo_errors_for_shape_parameter(sigma, reg_parameters)
+            assert results.shape == (5, 3)
+            for j, lambda_reg in enumerate(reg_parameters):
+                expected = data_feed.loo_error_estimation_with_rippa_method(
+                    sigma, lambda_reg
+                )
+                if expected[1] < 1e10:
+                    # The unregularized condition number is only reported, and
+                    # is not meaningful when that matrix is singular
+                    np.testing.assert_allclose(results[j, 1:], expected[1:], rtol=1e-5)
+                elif expected[1] >= 1 / np.finfo(float).eps:
+                    # Numerically singular systems use the direct method
+                    np.testing.assert_array_equal(results[j, :], expected)
+
+    @pytest.mark.unit
+    def test_loo_errors_for_shape_parameter_bfgs(self):
+        input_array = np.array(self.test_data)
+        data_feed = RadialBasisFunctions(
+            input_array, basis_function="cubic", solution_method="bfgs"
+        )
+        with patch.object(
+            data_feed,
+            "loo_error_estimation_with_rippa_method",
+            return_value=(1.0, 2.0, 3.0),
+        ) as direct:
+            results = data_feed.loo_errors_for_shape_parameter(0, [0.1, 1])
+        assert direct.call_count == 2
+        np.testing.assert_array_equal(results, [[1, 2, 3], [1, 2, 3]])
+
+    @pytest.mark.unit
+    def test__init__max_workers(self):
+        input_array = np.array(self.training_data)
+        data_feed = RadialBasisFunctions(input_array)
+        assert data_feed.max_workers is None
+        data_feed = RadialBasisFunctions(input_array, max_workers=2)
+        assert data_feed.max_workers == 2
+        for max_workers in [0, 1.5]:
+            with pytest.raises(Exception, match="max_workers must be a positive"):
+                RadialBasisFunctions(input_array, max_workers=max_workers)
+
+    @pytest.mark.component
+    def test_leave_one_out_crossvalidation_parallel(self):
+        input_array = np.array(self.training_data)
+        serial = RadialBasisFunctions(
+            input_array, basis_function="gaussian", solution_method="algebraic"
+        )
+        parallel = RadialBasisFunctions(
+            input_array,
+            basis_function="gaussian",
+            solution_method="algebraic",
+            max_workers=2,
+        )
+        assert (
+            parallel.leave_one_out_crossvalidation()
+            == serial.leave_one_out_crossvalidation()
+        )
+
+    @pytest.mark.unit
+    def test_pairwise_distances(self):
+        x = np.array([[0, 0], [1, 1], [3, 4]])
+        c = np.array([[0, 0], [0, 1]])
+        expected = np.array(
+            [
+                [0, 1],
+                [np.sqrt(2), 1],
+                [5, np.sqrt(18)],
+            ]
+        )
+        np.testing.assert_allclose(pairwise_distances(x, c), expected)
+
+        out = np.empty((3, 2))
+        res = pairwise_distances(x, c, out=out)
+        assert res is out
+        np.testing.assert_allclose(out, expected)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
+    def test_rbf_training_clears_distance_cache(self, array_type):
+        input_array = array_type(self.training_data)
+        data_feed = RadialBasisFunctions(
+            input_array, basis_function="gaussian", regularization=False
+        )
+        data_feed.training()
+        assert not hasattr(data_feed, "_distance_cache")
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("basis_function", ["linear", "gaussian", "spline"])
+    def test_rbf_predict_output_blocks(self, basis_function):
+        input_array = np.array(self.training_data)
+        data_feed = RadialBasisFunctions(
+            input_array, basis_function=basis_function, regularization=False
+        )
+        results = data_feed.training()
+
+        rng = np.random.default_rng(0)
+        x_test = rng.uniform(0, 10, size=(50, 2))
+        full = data_feed.predict_output(x_test)
+        assert full.shape == (50, 1)
+
+        # Force predictions to be evaluated in blocks of a few rows
+        with patch.object(
+            radial_basis_function,
+            "PREDICTION_BLOCK_BYTES",
+            8 * 3 * results.centres.shape[0],
+        ):
+            blocked = data_feed.predict_output(x_test)
+        # Weights can be large, so allow for differences in summation order
+        np.testing.assert_allclose(blocked, full, rtol=1e-6)
+
+        # Compare against one point at a time
+        for i in range(x_test.shape[0]):
+            np.testing.assert_allclose(
+                data_feed.predict_output(x_test[i : i + 1, :]),
+                full[i : i + 1, :],
+                rtol=1e-6,
+            )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
     def test_rbf_predict_output_01(self, array_type):
@@ -2261,3 +2409,23 @@ class TestRadialBasisFunction:
 
 if __name__ == "__main__":
     pytest.main()
+
+
+@pytest.mark.performance
+class TestRadialBasisFunctionPerformance:
+    def test_rbf_training_timing(self, tmp_path):
+        rng = np.random.default_rng(7)
+        x = rng.random((1000, 3))
+        y = np.sum(np.sin(3 * x), axis=1)
+        data_feed = RadialBasisFunctions(
+            np.column_stack((x, y)),
+            basis_function="gaussian",
+            solution_method="algebraic",
+            regularization=True,
+            fname=str(tmp_path / "rbf_perf.pickle"),
+        )
+        start = time.perf_counter()
+        data_feed.training()
+        elapsed = time.perf_counter() - start
+        print(f"\nRBF training with LOOCV search (1000 samples): {elapsed:.1f} s")
+        assert data_feed.R2 > 0.99
@@ -261,6 +261,71 @@ class TestSamplingMethods:
                 input_array, generated_sample_points
             )
 
+    @pytest.mark.unit
+    def test_points_selection_matches_brute_force(self):
+        rng = np.random.default_rng(3)
+        input_array = rng.random((500, 4))
+        generated_sample_points = rng.random((60, 3))
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points
+        )
+        expected = np.array(
+            [
+                sampling_methods.nearest_neighbour(input_array, point)
+                for point in generated_sample_points
+            ]
+        )
+        np.testing.assert_array_equal(equivalent_points, expected)
+
+    @pytest.mark.unit
+    def test_points_selection_unique(self):
+        input_array = np.array(self.test_data_2d)
+        # All points are closest to the first row
+        generated_sample_points = np.array([[-0.5], [-1], [-3], [0.2]])
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points
+        )
+        assert np.unique(equivalent_points, axis=0).shape[0] == 1
+
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points, unique=True
+        )
+        # Closest pairs are matched first
+        np.testing.assert_array_equal(equivalent_points[3], input_array[0, :])
+        np.testing.assert_array_equal(equivalent_points[0], input_array[1, :])
+        np.testing.assert_array_equal(
+            np.sort(equivalent_points[:, 0]), input_array[:4, 0]
+        )
+
+    @pytest.mark.unit
+    def test_points_selection_unique_requery(self):
+        rng = np.random.default_rng(5)
+        input_array = rng.random((50, 3))
+        # More points at the same location than neighbours in the first query
+        generated_sample_points = np.zeros((30, 2))
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points, unique=True
+        )
+        assert np.unique(equivalent_points, axis=0).shape[0] == 30
+        distances = np.sqrt(np.sum(input_array[:, :2] ** 2, axis=1))
+        np.testing.assert_array_equal(
+            np.sort(np.sqrt(np.sum(equivalent_points[:, :2] ** 2, axis=1))),
+            np.sort(distances)[:30],
+        )
+
+    @pytest.mark.unit
+    def test_points_selection_unique_too_many_points(self):
+        input_array = np.array(self.test_data_2d)
+        generated_sample_points = np.zeros((11, 1))
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        with pytest.raises(ValueError, match="Unique selection requires"):
+            sampling_methods.points_selection(
+                input_array, generated_sample_points, unique=True
+            )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array])
     def test_sample_point_selection_01(self, array_type):
@@ -907,6 +972,34 @@ class TestLatinHypercubeSampling:
             )
             np.testing.assert_array_equal(expected_testing, out_testing)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
+    def test_sample_points_unique_selection(self, array_type):
+        input_array = array_type(
+            self.full_data if array_type is pd.DataFrame else self.y
+        )
+        LHSClass = LatinHypercubeSampling(
+            input_array,
+            number_of_samples=200,
+            sampling_type="selection",
+            rand_seed=20,
+            unique_selection=True,
+        )
+        unique_sample_points = np.array(LHSClass.sample_points())
+        assert unique_sample_points.shape == (200, 3)
+        for point in unique_sample_points:
+            assert np.isclose(np.array(input_array), point).all(axis=1).any()
+
+    @pytest.mark.unit
+    def test__init__unique_selection_invalid(self):
+        with pytest.raises(TypeError, match="unique_selection must be Boolean"):
+            LatinHypercubeSampling(
+                np.array(self.input_array),
+                number_of_samples=5,
+                sampling_type="selection",
+                unique_selection=1,
+            )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [list])
     def test_sample_points_equality_fixed_seed(self, array_type):
@@ -2662,6 +2755,82 @@ class TestCVTSampling:
         )
         np.testing.assert_array_equal(expected_output, output)
 
+    @pytest.mark.unit
+    def test_create_centres_empty_class(self):
+        initial_centres = np.array([[0, 0], [1, 1], [0.5, 0.2]])
+        current_random_points = np.array([[0.6, 0.6], [0.8, 0.8]])
+        current_centres = np.array([1, 1])
+        counter = 1
+        expected_output = np.array(
+            [[0.25, 0.2], [0.85, 0.85], [0.5, 0.3]]
+        )  # Empty classes move towards the mean of all centres
+        output = CVTSampling.create_centres(
+            initial_centres, current_random_points, current_centres, counter
+        )
+        np.testing.assert_allclose(expected_output, output, rtol=1e-12)
+
+    @pytest.mark.unit
+    def test_nearest_centres(self):
+        rng = np.random.default_rng(0)
+        centres = rng.random((7, 3))
+        points = rng.random((200, 3))
+        distances = np.array(
+            [CVTSampling.eucl_distance(points, centre) for centre in centres]
+        ).T
+        np.testing.assert_array_equal(
+            CVTSampling.nearest_centres(points, centres), np.argmin(distances, axis=1)
+        )
+        np.testing.assert_array_equal(
+            CVTSampling.nearest_centres(points[:1, :], centres[:1, :]), [0]
+        )
+
+    @pytest.mark.unit
+    def test__init__batch_size(self):
+        CVTClass = CVTSampling(
+            self.input_array_list, number_of_samples=4, sampling_type="creation"
+        )
+        assert CVTClass.batch_size == 4000
+        CVTClass = CVTSampling(
+            self.input_array_list,
+            number_of_samples=4,
+            sampling_type="creation",
+            batch_size=50,
+        )
+        assert CVTClass.batch_size == 50
+        with pytest.raises(TypeError, match="batch_size must be an integer"):
+            CVTSampling(
+                self.input_array_list,
+                number_of_samples=4,
+                sampling_type="creation",
+                batch_size=5.5,
+            )
+        with pytest.raises(ValueError, match="batch_size must a positive"):
+            CVTSampling(
+                self.input_array_list,
+                number_of_samples=4,
+                sampling_type="creation",
+                batch_size=0,
+            )
+
+    @pytest.mark.unit
+    def test_sample_points_mini_batch(self):
+        samples = []
+        for _ in range(2):
+            CVTClass = CVTSampling(
+                self.input_array_list,
+                number_of_samples=20,
+                sampling_type="creation",
+                rand_seed=12,
+                batch_size=64,
+            )
+            samples.append(CVTClass.sample_points())
+        np.testing.assert_array_equal(samples[0], samples[1])
+        bounds = np.array(self.input_array_list)
+        assert samples[0].shape == (20, 3)
+        assert (samples[0] >= bounds[0, :]).all()
+        assert (samples[0] <= bounds[1, :]).all()
+        assert np.unique(samples[0], axis=0).shape[0] == 20
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array])
     def test_sample_points_01(self, array_type):
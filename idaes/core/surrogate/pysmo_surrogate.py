@@ -401,6 +401,17 @@ class PysmoRBFTrainer(PysmoTrainer):
         ),
     )
 
+    CONFIG.declare(
+        "max_workers",
+        ConfigValue(
+            default=None,
+            domain=PositiveInt,
+            description="Number of worker processes used to evaluate the shape parameters "
+            "of the leave-one-out hyperparameter search in parallel. "
+            "By default, the search runs in the current process.",
+        ),
+    )
+
     def __init__(self, **settings):
         super().__init__(**settings)
         self.model_type = f"{self.config.basis_function} {self.base_model_type}"
@@ -412,6 +423,7 @@ class PysmoRBFTrainer(PysmoTrainer):
             solution_method=self.config.solution_method,
             regularization=self.config.regularization,
             overwrite=True,
+            max_workers=self.config.max_workers,
         )
         model.get_feature_vector()
         return model
@@ -494,26 +506,40 @@ class PysmoSurrogate(SurrogateBase):
             input_bounds,
         )
 
-    def evaluate_surrogate(self, inputs: pd.DataFrame) -> pd.DataFrame:
+    def evaluate_surrogate(
+        self, inputs: pd.DataFrame, batch_size: int = None
+    ) -> pd.DataFrame:
         """Evaluate the surrogate model at a set of user-provided values.
 
+        Each output is evaluated for blocks of rows at a time using the
+        ``predict_output`` method of the underlying PySMO model.
+
         Args:
             inputs: The dataframe of input values to be used in the evaluation.
                 The dataframe needs to contain a column corresponding to each of the input labels.
                 Additional columns are fine, but are not used.
+            batch_size: (optional) Maximum number of rows to evaluate in a single call to
+                ``predict_output``, which can be used to bound memory use for large datasets.
+                Default is None, evaluating all rows at once.
 
         Returns:
             output: A dataframe of the the output values evaluated at the provided inputs.
                 The index of the output dataframe should match the index of the provided inputs.
         """
-        inputdata = inputs[self._input_labels].to_numpy()
-        outputs = np.zeros(shape=(inputs.shape[0], len(self._output_labels)))
-
-        for i in range(inputdata.shape[0]):
-            row_data = inputdata[i, :].reshape(1, len(self._input_labels))
-            for j, output_label in enumerate(self._output_labels):
-                result = self._trained.get_result(output_label)
-                outputs[i, j] = result.model.predict_output(row_data)
+        inputdata = inputs[self._input_labels].to_numpy(dtype=float)
+        n_rows = inputdata.shape[0]
+        outputs = np.zeros(shape=(n_rows, len(self._output_labels)))
+
+        if batch_size is None or batch_size <= 0:
+            batch_size = max(n_rows, 1)
+
+        for j, output_label in enumerate(self._output_labels):
+            model = self._trained.get_result(output_label).model
+            for start in range(0, n_rows, batch_size):
+                stop = min(start + batch_size, n_rows)
+                outputs[start:stop, j] = np.asarray(
+                    model.predict_output(inputdata[start:stop, :])
+                ).reshape(stop - start)
 
         return pd.DataFrame(
             data=outputs, index=inputs.index, columns=self._output_labels
@@ -1375,6 +1375,42 @@ class TestAlamoSurrogate:
                 + 5 * exp(inputs["x2"][i] ** 5)
             )
 
+    @pytest.mark.unit
+    def test_evaluate_surrogate_vectorized(self, alm_surr3):
+        rng = np.random.default_rng(0)
+        inputs = pd.DataFrame(
+            rng.uniform(0.2, 1.0, size=(10000, 2)), columns=["x1", "x2"]
+        )
+
+        out = alm_surr3.evaluate_surrogate(inputs)
+
+        # Compiled functions should be cached and operate on whole columns
+        assert "z1" in alm_surr3._fcn
+        res = alm_surr3._fcn["z1"](inputs["x1"].to_numpy(), inputs["x2"].to_numpy())
+        assert isinstance(res, np.ndarray)
+        assert res.shape == (10000,)
+
+        expected = (
+            2 * np.sin(inputs["x1"] ** 2)
+            - 3 * np.cos(inputs["x2"] ** 3)
+            - 4 * np.log(inputs["x1"] ** 4)
+            + 5 * np.exp(inputs["x2"] ** 5)
+        )
+        np.testing.assert_allclose(out["z1"].to_numpy(), expected, rtol=1e-12)
+
+    @pytest.mark.unit
+    def test_evaluate_surrogate_constant(self):
+        surr = AlamoSurrogate(
+            {"z1": " z1 == 3.5", "z2": " z2 == 2 * x1"}, ["x1"], ["z1", "z2"]
+        )
+
+        inputs = pd.DataFrame({"x1": [1, 2, 3]}, index=[4, 5, 6])
+        out = surr.evaluate_surrogate(inputs)
+
+        assert list(out.index) == [4, 5, 6]
+        assert list(out["z1"]) == [3.5, 3.5, 3.5]
+        assert list(out["z2"]) == [2.0, 4.0, 6.0]
+
     @pytest.mark.unit
     def test_populate_block_funcs(self, alm_surr3):
         blk = SurrogateBlock(concrete=True)
@@ -1413,6 +1449,10 @@ class TestAlamoSurrogate:
         model = alm_surr._surrogate_expressions["z1"].split("==")[1]
         model_value = eval(model)
         assert z1 == pytest.approx(model_value)
+        # Evaluation functions are compiled on load
+        assert alm_surr._fcn["z1"](np.array([x1]), np.array([x2]))[0] == pytest.approx(
+            z1
+        )
         assert alm_surr._input_labels == ["x1", "x2"]
         assert alm_surr._output_labels == ["z1"]
         assert alm_surr._input_bounds == {"x1": (0, 5), "x2": (0, 10)}
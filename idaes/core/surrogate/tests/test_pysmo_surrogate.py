@@ -17,6 +17,7 @@ import pytest
 import numpy as np
 import pandas as pd
 import os
+import time
 from math import sin, cos, log, exp
 
 from pathlib import Path
@@ -228,6 +229,14 @@ jstring_krg = (
 )
 
 
+@pytest.fixture(scope="module", autouse=True)
+def run_in_tmp_path(tmp_path_factory):
+    # PySMO saves its results to files in the working directory
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("pysmo"))
+        yield
+
+
 class TestSurrogateTrainingResult:
     @pytest.fixture
     def pysmo_output_pr(self):
@@ -788,6 +797,23 @@ class TestPysmoRBFTrainer:
         with pytest.raises(ValueError):
             pysmo_rbf_trainer.config.regularization = 2
 
+    @pytest.mark.unit
+    def test_set_max_workers(self, pysmo_rbf_trainer):
+        assert pysmo_rbf_trainer.config.max_workers is None
+        pysmo_rbf_trainer.config.max_workers = 4
+        assert pysmo_rbf_trainer.config.max_workers == 4
+        with pytest.raises(ValueError):
+            pysmo_rbf_trainer.config.max_workers = 0
+
+    @pytest.mark.unit
+    def test_create_model_max_workers(self, pysmo_rbf_trainer):
+        pysmo_rbf_trainer.config.max_workers = 2
+        data = pd.DataFrame(
+            {"x1": [1, 2, 3, 4], "x2": [5, 6, 7, 8], "z1": [1, 2, 3, 4]}
+        )
+        model = pysmo_rbf_trainer._create_model(data, "z1")
+        assert model.max_workers == 2
+
     @pytest.mark.unit
     def test_create_model_defaults(self, pysmo_rbf_trainer):
         pysmo_rbf_trainer.config.basis_function = None
@@ -1766,6 +1792,29 @@ class TestPysmoSurrogate:
             )
         )
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("batch_size", [1, 7, 1000])
+    def test_evaluate_multisurrogate_rbf_batch_size(self, pysmo_surr2_rbf, batch_size):
+        x = np.linspace(-2, 2, 21)
+        inputs = np.array([np.tile(x, len(x)), np.repeat(x, len(x))])
+        inputs = pd.DataFrame(inputs.transpose(), columns=["x1", "x2"])
+
+        sol, rbf_trained = pysmo_surr2_rbf
+        out = rbf_trained.evaluate_surrogate(inputs)
+        out_batch = rbf_trained.evaluate_surrogate(inputs, batch_size=batch_size)
+
+        pd.testing.assert_frame_equal(out, out_batch, rtol=1e-6, atol=1e-8)
+
+        # Compare against evaluating each row separately
+        for i in range(0, inputs.shape[0], 50):
+            row = inputs.to_numpy()[i : i + 1, :]
+            for o in ["z1", "z2"]:
+                assert out_batch[o][i] == pytest.approx(
+                    sol.get_result(o).model.predict_output(row)[0, 0],
+                    rel=1e-6,
+                    abs=1e-8,
+                )
+
     @pytest.mark.unit
     def test_evaluate_multisurrogate_rbf(self, pysmo_surr2_rbf):
         # Test ``evaluate_surrogate`` for RBF with two inputs/outputs
@@ -3339,3 +3388,62 @@ class TestKrigingWorkflow:
         assert metrics["z1"]["RMSE"] == pytest.approx(
             pysmo_trainer_krg._data["z1"].metrics["RMSE"], rel=1e-8
         )
+
+
+@pytest.mark.performance
+class TestEvaluateSurrogatePerformance:
+    @pytest.fixture(scope="class")
+    def rbf_surrogate(self):
+        rng = np.random.default_rng(42)
+        x = rng.uniform(0, 1, size=(200, 2))
+        training_data = pd.DataFrame(
+            {
+                "x1": x[:, 0],
+                "x2": x[:, 1],
+                "z1": np.sin(3 * x[:, 0]) + x[:, 1] ** 2,
+                "z2": np.cos(2 * x[:, 1]) * x[:, 0],
+            }
+        )
+        input_labels = ["x1", "x2"]
+        output_labels = ["z1", "z2"]
+
+        trainer = PysmoRBFTrainer(
+            input_labels=input_labels,
+            output_labels=output_labels,
+            training_dataframe=training_data,
+            basis_function="gaussian",
+        )
+        trained = trainer.train_surrogate()
+        return PysmoSurrogate(trained, input_labels, output_labels)
+
+    @pytest.mark.performance
+    def test_benchmark_batch_vs_row_evaluation(self, rbf_surrogate):
+        rng = np.random.default_rng(1)
+        inputs = pd.DataFrame(rng.uniform(0, 1, size=(2000, 2)), columns=["x1", "x2"])
+
+        # Row-by-row evaluation, as previously used by evaluate_surrogate
+        start = time.perf_counter()
+        inputdata = inputs.to_numpy()
+        rowwise = np.zeros((inputdata.shape[0], 2))
+        for i in range(inputdata.shape[0]):
+            for j, o in enumerate(["z1", "z2"]):
+                rowwise[i, j] = rbf_surrogate._trained.get_result(
+                    o
+                ).model.predict_output(inputdata[i : i + 1, :])[0, 0]
+        t_rowwise = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = rbf_surrogate.evaluate_surrogate(inputs)
+        t_batched = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chunked = rbf_surrogate.evaluate_surrogate(inputs, batch_size=256)
+        t_chunked = time.perf_counter() - start
+
+        print(
+            f"Row-by-row: {t_rowwise:.3f} s, batched: {t_batched:.3f} s, "
+            f"chunked (256 rows): {t_chunked:.3f} s"
+        )
+
+        np.testing.assert_allclose(batched.to_numpy(), rowwise, rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(chunked.to_numpy(), rowwise, rtol=1e-8, atol=1e-10)
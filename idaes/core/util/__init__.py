@@ -13,6 +13,6 @@
 # TODO: Missing doc strings
 # pylint: disable=missing-module-docstring
 
-from .model_serializer import to_json, from_json, StoreSpec
+from .model_serializer import to_json, from_json, to_npz, from_npz, StoreSpec
 from .tags import svg_tag, ModelTag, ModelTagGroup
 from .model_diagnostics import DiagnosticsToolbox
@@ -24,6 +24,13 @@ from pyomo.environ import (
 from pyomo.network import Arc
 from pyomo.dae import ContinuousSet
 from pyomo.core.expr.visitor import identify_variables
+from pyomo.contrib.incidence_analysis import (
+    IncidenceGraphInterface,
+    solve_strongly_connected_components,
+)
+from pyomo.contrib.incidence_analysis.config import IncidenceMethod
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+from pyomo.util.subsystems import create_subsystem_block, TemporarySubsystemManager
 
 from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.model_statistics import degrees_of_freedom
@@ -295,6 +302,240 @@ def solve_indexed_blocks(solver, blocks, **kwds):
     return results
 
 
+def batch_solve_strongly_connected_components(
+    blocks,
+    *,
+    solver=None,
+    solve_kwds=None,
+    use_calc_var=True,
+    calc_var_kwds=None,
+    residual_tolerance=1e-6,
+):
+    """
+    Solve a collection of square BlockDatas by strongly connected components,
+    solving each component for all blocks with identical structure together.
+
+    Blocks are grouped by the structure of their incidence graphs, i.e. the
+    names (relative to the block) of their active equality constraints and
+    unfixed variables and which variables appear in each constraint. The block
+    triangularization of the first block in each group is used for the whole
+    group. Each NxN component is solved for all blocks in the group with a
+    single call to the solver. If this solve does not terminate optimally,
+    blocks with residuals larger than residual_tolerance are re-solved
+    individually from their initial values, and if the solver raises an
+    exception all blocks are re-solved individually. A warning is logged for
+    any individual re-solve which does not terminate optimally. 1x1
+    components are solved using calculate_variable_from_constraint, as in
+    Pyomo's solve_strongly_connected_components.
+
+    Blocks containing unfixed variables from outside the block (which may be
+    shared with other blocks) and blocks with a unique structure are solved
+    using solve_strongly_connected_components.
+
+    Args:
+        blocks: an IndexedBlock or list of BlockDatas to be solved
+        solver: Pyomo solver object to use for NxN components
+        solve_kwds: dict of arguments to be passed to the solver
+        use_calc_var: whether to use calculate_variable_from_constraint for
+            1x1 components
+        calc_var_kwds: dict of arguments to be passed to
+            calculate_variable_from_constraint
+        residual_tolerance: tolerance on the residuals of constraints in a
+            component used to decide whether a block needs to be re-solved
+            individually
+
+    Returns:
+        List of results objects returned by each call to the solver or
+        calculate_variable_from_constraint
+    """
+    if isinstance(blocks, Block) and blocks.is_indexed():
+        blocks = list(blocks.values())
+    if solve_kwds is None:
+        solve_kwds = {}
+    if calc_var_kwds is None:
+        calc_var_kwds = {}
+
+    groups = {}
+    for b in blocks:
+        igraph = IncidenceGraphInterface(
+            b,
+            active=True,
+            include_fixed=False,
+            include_inequality=False,
+            method=IncidenceMethod.ampl_repn,
+        )
+        signature = _incidence_signature(b, igraph)
+        if signature is None:
+            # Block is not self-contained, so cannot be grouped
+            signature = id(b)
+        groups.setdefault(signature, []).append((b, igraph))
+
+    res_list = []
+    for group in groups.values():
+        if len(group) == 1:
+            res_list.extend(
+                solve_strongly_connected_components(
+                    group[0][0],
+                    solver=solver,
+                    solve_kwds=solve_kwds,
+                    use_calc_var=use_calc_var,
+                    calc_var_kwds=calc_var_kwds,
+                )
+            )
+        else:
+            res_list.extend(
+                _solve_group_by_scc(
+                    group,
+                    solver,
+                    solve_kwds,
+                    use_calc_var,
+                    calc_var_kwds,
+                    residual_tolerance,
+                )
+            )
+
+    return res_list
+
+
+def _incidence_signature(block, igraph):
+    """
+    Hashable description of the incidence graph of a block, or None if any of
+    the variables in the graph are not part of the block.
+    """
+    variables = igraph.variables
+    constraints = igraph.constraints
+
+    inside = {id(block)}
+    for v in variables:
+        path = []
+        parent = v.parent_block()
+        while parent is not None and id(parent) not in inside:
+            path.append(id(parent))
+            parent = parent.parent_block()
+        if parent is None:
+            return None
+        inside.update(path)
+
+    position = {id(v): i for i, v in enumerate(variables)}
+    return (
+        tuple(v.getname(fully_qualified=True, relative_to=block) for v in variables),
+        tuple(c.getname(fully_qualified=True, relative_to=block) for c in constraints),
+        tuple(
+            tuple(sorted(position[id(v)] for v in igraph.get_adjacent_to(c)))
+            for c in constraints
+        ),
+    )
+
+
+def _solve_group_by_scc(
+    group, solver, solve_kwds, use_calc_var, calc_var_kwds, residual_tolerance
+):
+    """
+    Solve the strongly connected components of a group of blocks with
+    identical incidence graphs.
+    """
+    members = [(igraph.variables, igraph.constraints) for _, igraph in group]
+    rep_igraph = group[0][1]
+    var_position = {id(v): i for i, v in enumerate(members[0][0])}
+    con_position = {id(c): i for i, c in enumerate(members[0][1])}
+
+    res_list = []
+    var_blocks, con_blocks = rep_igraph.block_triangularize()
+    for vblock, cblock in zip(var_blocks, con_blocks):
+        vidx = [var_position[id(v)] for v in vblock]
+        cidx = [con_position[id(c)] for c in cblock]
+        scc_vars = [[variables[i] for i in vidx] for variables, _ in members]
+        scc_cons = [[constraints[i] for i in cidx] for _, constraints in members]
+
+        N = len(vidx)
+        if N == 1 and use_calc_var:
+            for vs, cs in zip(scc_vars, scc_cons):
+                res_list.append(
+                    calculate_variable_from_constraint(vs[0], cs[0], **calc_var_kwds)
+                )
+            continue
+
+        if solver is None:
+            raise RuntimeError(
+                f"An external solver is required if block has strongly connected "
+                f"components of size greater than one (is not a DAG). Got an SCC "
+                f"of size {N}x{N} including components: "
+                f"{[v.name for v in scc_vars[0]][:10]} "
+                f"{[c.name for c in scc_cons[0]][:10]}"
+            )
+        res_list.extend(
+            _solve_stacked_scc(
+                scc_vars, scc_cons, solver, solve_kwds, residual_tolerance
+            )
+        )
+
+    return res_list
+
+
+def _solve_stacked_scc(scc_vars, scc_cons, solver, solve_kwds, residual_tolerance):
+    """
+    Solve the same strongly connected component of several blocks as one
+    system, then re-solve individually any blocks which did not converge (or
+    all blocks if the stacked solve raised an exception).
+    """
+    variables = [v for vs in scc_vars for v in vs]
+    constraints = [c for cs in scc_cons for c in cs]
+    initial_values = [[v.value for v in vs] for vs in scc_vars]
+
+    subsystem = create_subsystem_block(constraints, variables)
+    inputs = list(subsystem.input_vars.values())
+
+    _log = idaeslog.getLogger(__name__)
+
+    res_list = []
+    with TemporarySubsystemManager(to_fix=inputs, remove_bounds_on_fix=True):
+        try:
+            results = solver.solve(subsystem, **solve_kwds)
+        except Exception as err:  # pylint: disable=W0703
+            _log.warning(
+                f"Stacked solve of {len(scc_vars)} strongly connected components "
+                f"failed ({err}); solving each block individually."
+            )
+            converged = [False] * len(scc_vars)
+        else:
+            res_list.append(results)
+            if check_optimal_termination(results):
+                return res_list
+            converged = [
+                _residuals_converged(cs, residual_tolerance) for cs in scc_cons
+            ]
+
+        for vs, cs, values, done in zip(scc_vars, scc_cons, initial_values, converged):
+            if done:
+                continue
+            # Fall back to solving this block from its initial point
+            for v, val in zip(vs, values):
+                v.set_value(val, skip_validation=True)
+            results = solver.solve(create_subsystem_block(cs, vs), **solve_kwds)
+            res_list.append(results)
+            if not check_optimal_termination(results):
+                _log.warning(
+                    f"Failed to solve strongly connected component including "
+                    f"{[v.name for v in vs][:10]} "
+                    f"(termination condition "
+                    f"{results.solver.termination_condition})."
+                )
+
+    return res_list
+
+
+def _residuals_converged(constraints, tolerance):
+    """
+    Check whether the residuals of a list of equality constraints are all
+    within tolerance.
+    """
+    for c in constraints:
+        body = value(c.body, exception=False)
+        if body is None or not abs(body - value(c.upper)) <= tolerance:
+            return False
+    return True
+
+
 def initialize_by_time_element(fs, time, **kwargs):
     """
     Function to initialize Flowsheet fs element-by-element along
@@ -70,13 +70,19 @@ from pyomo.common.config import (
 )
 from pyomo.util.check_units import identify_inconsistent_units
 from pyomo.contrib.incidence_analysis import IncidenceGraphInterface
-from pyomo.core.expr.visitor import identify_variables, StreamBasedExpressionVisitor
+from pyomo.core.expr.visitor import (
+    identify_mutable_parameters,
+    identify_variables,
+    StreamBasedExpressionVisitor,
+)
 from pyomo.contrib.pynumero.interfaces.pyomo_nlp import PyomoNLP
 from pyomo.contrib.pynumero.asl import AmplInterface
+from pyomo.contrib.pynumero.exceptions import PyNumeroEvaluationError
 from pyomo.contrib.fbbt.fbbt import compute_bounds_on_expr
 from pyomo.contrib.iis import mis
 from pyomo.common.deprecation import deprecation_warning
 from pyomo.common.errors import PyomoException
+from pyomo.common.modeling import unique_component_name
 from pyomo.common.tempfiles import TempfileManager
 
 from idaes.core.solvers.get_solver import get_solver
@@ -94,12 +100,11 @@ from idaes.core.util.model_statistics import (
     degrees_of_freedom,
     large_residuals_set,
     variables_near_bounds_set,
+    _get_incidence_index,
+    _var_values_and_bounds,
 )
 from idaes.core.util.scaling import (
     get_jacobian,
-    extreme_jacobian_columns,
-    extreme_jacobian_rows,
-    extreme_jacobian_entries,
     jacobian_cond,
 )
 from idaes.core.util.parameter_sweep import (
@@ -393,6 +398,358 @@ DHCONFIG.declare(
 )
 
 
+class NLPEvaluationSession:
+    """
+    Cached evaluation of the Jacobian and constraint residuals of a model.
+
+    The PyomoNLP for the model is built the first time it is needed and reused
+    for as long as the structure of the model is unchanged, i.e. the active
+    Constraints and Objectives, the Vars appearing in them, the fixed status
+    and values of the fixed Vars and the values of the mutable Params
+    appearing in them (wherever those Params are declared). If only the
+    values of unfixed Vars have changed, the new values are passed to the
+    existing NLP. The Jacobian, its row and column norms and the constraint
+    residuals are cached until the values of any Vars change.
+
+    The DiagnosticsToolbox shares its session with the SVDToolbox and
+    DegeneracyHunter2 it prepares.
+
+    Args:
+
+        model: model to be evaluated.
+
+    """
+
+    def __init__(self, model: BlockData):
+        self._model = model
+        self._nlp = None
+        self._variables = None
+        self._constraints = None
+        self._constraint_order = None
+        self._structure = None
+        self._values = None
+        self._cache = {}
+
+    @property
+    def model(self):
+        """
+        Model being evaluated.
+        """
+        return self._model
+
+    @property
+    def nlp(self):
+        """
+        PyomoNLP for the model, with primals set to the current values of the
+        Vars.
+        """
+        self._update()
+        return self._get_nlp()
+
+    @property
+    def variables(self):
+        """
+        List of Vars corresponding to the columns of the Jacobian.
+        """
+        self._update()
+        self._get_nlp()
+        return self._variables
+
+    @property
+    def constraints(self):
+        """
+        List of Constraints corresponding to the rows of the Jacobian.
+        """
+        self._update()
+        self._get_nlp()
+        return self._constraints
+
+    def invalidate(self):
+        """
+        Discard the NLP and all cached results, so that they are rebuilt the
+        next time they are needed.
+
+        Returns:
+            None
+        """
+        self._nlp = None
+        self._structure = None
+        self._values = None
+        self._cache = {}
+
+    def get_jacobian(self, equality_constraints_only: bool = False):
+        """
+        Get the (unscaled) Jacobian of the model at the current values of the
+        Vars.
+
+        Args:
+            equality_constraints_only: only include the rows for equality
+                constraints (default = False)
+
+        Returns:
+            Jacobian matrix in Scipy CSR format
+        """
+        self._update()
+        return self._get_jacobian(equality_constraints_only)
+
+    def row_norms(self):
+        """
+        Get the L2 norms of the rows of the Jacobian.
+
+        Returns:
+            NumPy array of row norms, in the order of constraints
+        """
+        self._update()
+        if "row_norms" not in self._cache:
+            self._cache["row_norms"] = norm(self._get_jacobian(False), axis=1)
+        return self._cache["row_norms"]
+
+    def column_norms(self):
+        """
+        Get the L2 norms of the columns of the Jacobian.
+
+        Returns:
+            NumPy array of column norms, in the order of variables
+        """
+        self._update()
+        if "column_norms" not in self._cache:
+            self._cache["column_norms"] = norm(self._get_jacobian(False), axis=0)
+        return self._cache["column_norms"]
+
+    def extreme_jacobian_rows(self, large: float = 1e4, small: float = 1e-4):
+        """
+        Get the constraints associated with rows of the Jacobian with extreme
+        L2 norms.
+
+        Args:
+            large: norms >= this value are considered large
+            small: norms <= this value are considered small
+
+        Returns:
+            list of tuples of row norm and Constraint
+        """
+        norms = self.row_norms()
+        return [
+            (float(norms[i]), self._constraints[i])
+            for i in np.flatnonzero((norms <= small) | (norms >= large))
+        ]
+
+    def extreme_jacobian_columns(self, large: float = 1e4, small: float = 1e-4):
+        """
+        Get the variables associated with columns of the Jacobian with extreme
+        L2 norms.
+
+        Args:
+            large: norms >= this value are considered large
+            small: norms <= this value are considered small
+
+        Returns:
+            list of tuples of column norm and Var
+        """
+        norms = self.column_norms()
+        return [
+            (float(norms[j]), self._variables[j])
+            for j in np.flatnonzero((norms <= small) | (norms >= large))
+        ]
+
+    def extreme_jacobian_entries(
+        self, large: float = 1e4, small: float = 1e-4, zero: float = 1e-10
+    ):
+        """
+        Get the entries of the Jacobian with extreme values.
+
+        Args:
+            large: entries >= this value are considered large
+            small: entries <= this value and > zero are considered small
+            zero: entries <= this value are considered to be zero
+
+        Returns:
+            list of tuples of absolute value of entry, Constraint and Var
+        """
+        jac = self.get_jacobian().tocoo()
+        entries = np.abs(jac.data)
+        return [
+            (
+                float(entries[k]),
+                self._constraints[jac.row[k]],
+                self._variables[jac.col[k]],
+            )
+            for k in np.flatnonzero(
+                ((entries <= small) & (entries > zero)) | (entries >= large)
+            )
+        ]
+
+    def residuals(self):
+        """
+        Get the residuals of all active Constraints in the model, evaluated at
+        once using the NLP. The residual of a Constraint is the amount by which
+        its body violates its bounds, or 0 if the bounds are satisfied.
+
+        Returns:
+            NumPy array of residuals, in the order of constraints, or None if
+            Pynumero is not available, any Var appearing in the Constraints
+            has no value or any Constraint could not be evaluated.
+        """
+        self._update()
+        return self._get_residuals()
+
+    def large_residuals(self, tol: float = 1e-5):
+        """
+        Get the active Constraints in the model with residuals greater than
+        tol.
+
+        The residuals are evaluated using the NLP where possible, and only the
+        Constraints with large residuals are looked up. Otherwise each
+        Constraint is evaluated in turn using large_residuals_set, which gives
+        a residual of None for any Constraint that could not be evaluated.
+
+        Args:
+            tol: residual threshold for inclusion
+
+        Returns:
+            dict with Constraints as keys and residuals as values, in the
+            order the Constraints appear in the model. This is shared between
+            calls and should not be modified.
+        """
+        self._update()
+        key = ("large_residuals", tol)
+        if key not in self._cache:
+            residuals = self._get_residuals()
+            if residuals is None:
+                self._cache[key] = large_residuals_set(
+                    self._model, tol=tol, return_residual_values=True
+                )
+            else:
+                large = np.flatnonzero(residuals > tol)
+                large = large[np.argsort(self._constraint_order[large])]
+                self._cache[key] = {
+                    self._constraints[i]: float(residuals[i]) for i in large
+                }
+        return self._cache[key]
+
+    def _get_state(self):
+        # Structure of the model which the NLP depends on, and the values of
+        # the Vars appearing in the Constraints
+        index = _get_incidence_index(self._model)
+        variables = index.variables
+        values = np.fromiter(
+            (np.nan if v.value is None else v.value for v in variables),
+            float,
+            len(variables),
+        )
+        fixed = np.fromiter((v.fixed for v in variables), bool, len(variables))
+        objectives = list(
+            self._model.component_data_objects(
+                Objective, active=True, descend_into=True
+            )
+        )
+        # Mutable Params are fixed in the NLP, including Params declared
+        # outside the model (e.g. in a property package)
+        parameters = list(index.mutable_parameters())
+        for o in objectives:
+            parameters.extend(identify_mutable_parameters(o.expr))
+        structure = (
+            index.version,
+            index.active_constraints().tobytes(),
+            fixed.tobytes(),
+            values[fixed].tobytes(),
+            tuple((id(o), id(o.expr)) for o in objectives),
+            tuple(p.value for p in parameters),
+        )
+        return structure, values
+
+    def _update(self):
+        structure, values = self._get_state()
+        if structure != self._structure:
+            self._nlp = None
+            self._cache = {}
+        elif not np.array_equal(values, self._values, equal_nan=True):
+            self._cache = {}
+            if self._nlp is not None:
+                self._nlp.set_primals(self._get_primals())
+        self._structure = structure
+        self._values = values
+
+    def _get_nlp(self):
+        if self._nlp is None:
+            if not AmplInterface.available():
+                raise RuntimeError("Pynumero not available.")
+            # PyomoNLP requires an objective, so add a dummy one if needed
+            dummy_objective = None
+            if (
+                next(
+                    self._model.component_data_objects(
+                        Objective, active=True, descend_into=True
+                    ),
+                    None,
+                )
+                is None
+            ):
+                dummy_objective = unique_component_name(self._model, "objective")
+                self._model.add_component(dummy_objective, Objective(expr=0))
+            try:
+                self._nlp = PyomoNLP(self._model)
+            finally:
+                if dummy_objective is not None:
+                    self._model.del_component(dummy_objective)
+            self._variables = self._nlp.get_pyomo_variables()
+            self._constraints = self._nlp.get_pyomo_constraints()
+            # Adding and removing the dummy objective changes the structure
+            # of the model as seen by the incidence index
+            self._structure, self._values = self._get_state()
+            # Position of each row of the NLP in the model, so that results
+            # can be reported in the same order as the model
+            position = {
+                id(c): i
+                for i, c in enumerate(_get_incidence_index(self._model).constraints)
+            }
+            self._constraint_order = np.fromiter(
+                (position[id(c)] for c in self._constraints),
+                int,
+                len(self._constraints),
+            )
+        return self._nlp
+
+    def _get_primals(self):
+        # Vars without a value are written to the NL file without an initial
+        # value, which ASL takes to be 0
+        return np.fromiter(
+            (0.0 if v.value is None else v.value for v in self._variables),
+            float,
+            len(self._variables),
+        )
+
+    def _get_residuals(self):
+        if "residuals" not in self._cache:
+            residuals = None
+            # Vars without a value would be evaluated at 0
+            if AmplInterface.available() and not np.isnan(self._values).any():
+                nlp = self._get_nlp()
+                try:
+                    body = nlp.evaluate_constraints()
+                except PyNumeroEvaluationError:
+                    body = None
+                if body is not None and np.isfinite(body).all():
+                    residuals = np.maximum(
+                        np.maximum(
+                            nlp.constraints_lb() - body, body - nlp.constraints_ub()
+                        ),
+                        0,
+                    )
+            self._cache["residuals"] = residuals
+        return self._cache["residuals"]
+
+    def _get_jacobian(self, equality_constraints_only):
+        key = ("jacobian", equality_constraints_only)
+        if key not in self._cache:
+            nlp = self._get_nlp()
+            if equality_constraints_only:
+                self._cache[key] = nlp.evaluate_jacobian_eq().tocsr()
+            else:
+                self._cache[key] = nlp.evaluate_jacobian().tocsr()
+        return self._cache[key]
+
+
 @document_kwargs_from_configdict(CONFIG)
 class DiagnosticsToolbox:
     """
@@ -449,6 +806,7 @@ class DiagnosticsToolbox:
 
         self._model = model
         self.config = CONFIG(kwargs)
+        self._nlp_session = NLPEvaluationSession(model)
 
     @property
     def model(self):
@@ -717,10 +1075,8 @@ class DiagnosticsToolbox:
         if stream is None:
             stream = sys.stdout
 
-        lrdict = large_residuals_set(
-            self._model,
-            tol=self.config.constraint_residual_tolerance,
-            return_residual_values=True,
+        lrdict = self._nlp_session.large_residuals(
+            tol=self.config.constraint_residual_tolerance
         )
 
         lrs = []
@@ -895,9 +1251,7 @@ class DiagnosticsToolbox:
         if stream is None:
             stream = sys.stdout
 
-        xjc = extreme_jacobian_columns(
-            m=self._model,
-            scaled=False,
+        xjc = self._nlp_session.extreme_jacobian_columns(
             large=self.config.jacobian_large_value_caution,
             small=self.config.jacobian_small_value_caution,
         )
@@ -930,9 +1284,7 @@ class DiagnosticsToolbox:
         if stream is None:
             stream = sys.stdout
 
-        xjr = extreme_jacobian_rows(
-            m=self._model,
-            scaled=False,
+        xjr = self._nlp_session.extreme_jacobian_rows(
             large=self.config.jacobian_large_value_caution,
             small=self.config.jacobian_small_value_caution,
         )
@@ -966,9 +1318,7 @@ class DiagnosticsToolbox:
         if stream is None:
             stream = sys.stdout
 
-        xje = extreme_jacobian_entries(
-            m=self._model,
-            scaled=False,
+        xje = self._nlp_session.extreme_jacobian_entries(
             large=self.config.jacobian_large_value_caution,
             small=self.config.jacobian_small_value_caution,
             zero=0,
@@ -1005,6 +1355,8 @@ class DiagnosticsToolbox:
                 model=self._model,
                 tolerance=self.config.parallel_component_tolerance,
                 direction="row",
+                jac=self._nlp_session.get_jacobian(),
+                nlp=self._nlp_session.nlp,
             )
         ]
 
@@ -1037,6 +1389,8 @@ class DiagnosticsToolbox:
                 model=self._model,
                 tolerance=self.config.parallel_component_tolerance,
                 direction="column",
+                jac=self._nlp_session.get_jacobian(),
+                nlp=self._nlp_session.nlp,
             )
         ]
 
@@ -1148,9 +1502,7 @@ class DiagnosticsToolbox:
 
         return cautions
 
-    def _collect_numerical_warnings(
-        self, jac=None, nlp=None, ignore_parallel_components=False
-    ):
+    def _collect_numerical_warnings(self, ignore_parallel_components=False):
         """
         Runs checks for numerical warnings and returns two lists.
 
@@ -1162,15 +1514,12 @@ class DiagnosticsToolbox:
             next_steps - list of suggested next steps to further investigate warnings
 
         """
-        if jac is None or nlp is None:
-            jac, nlp = get_jacobian(self._model, scaled=False)
-
         warnings = []
         next_steps = []
 
         # Large residuals
-        large_residuals = large_residuals_set(
-            self._model, tol=self.config.constraint_residual_tolerance
+        large_residuals = self._nlp_session.large_residuals(
+            tol=self.config.constraint_residual_tolerance
         )
         if len(large_residuals) > 0:
             cstring = "Constraints"
@@ -1202,9 +1551,7 @@ class DiagnosticsToolbox:
             )
 
         # Extreme Jacobian rows and columns
-        jac_col = extreme_jacobian_columns(
-            jac=jac,
-            nlp=nlp,
+        jac_col = self._nlp_session.extreme_jacobian_columns(
             large=self.config.jacobian_large_value_warning,
             small=self.config.jacobian_small_value_warning,
         )
@@ -1221,9 +1568,7 @@ class DiagnosticsToolbox:
                 self.display_variables_with_extreme_jacobians.__name__ + "()"
             )
 
-        jac_row = extreme_jacobian_rows(
-            jac=jac,
-            nlp=nlp,
+        jac_row = self._nlp_session.extreme_jacobian_rows(
             large=self.config.jacobian_large_value_warning,
             small=self.config.jacobian_small_value_warning,
         )
@@ -1243,6 +1588,8 @@ class DiagnosticsToolbox:
         # Parallel variables and constraints
         if not ignore_parallel_components:
             partol = self.config.parallel_component_tolerance
+            jac = self._nlp_session.get_jacobian()
+            nlp = self._nlp_session.nlp
             par_cons = check_parallel_jacobian(
                 self._model, tolerance=partol, direction="row", jac=jac, nlp=nlp
             )
@@ -1268,7 +1615,7 @@ class DiagnosticsToolbox:
 
         return warnings, next_steps
 
-    def _collect_numerical_cautions(self, jac=None, nlp=None):
+    def _collect_numerical_cautions(self):
         """
         Runs checks for numerical cautions and returns a list.
 
@@ -1276,9 +1623,6 @@ class DiagnosticsToolbox:
             cautions - list of caution messages from numerical analysis
 
         """
-        if jac is None or nlp is None:
-            jac, nlp = get_jacobian(self._model, scaled=False)
-
         cautions = []
 
         # Variables near bounds
@@ -1336,9 +1680,7 @@ class DiagnosticsToolbox:
             cautions.append(f"Caution: {len(none_value)} {cstring} with None value")
 
         # Extreme Jacobian rows and columns
-        jac_col = extreme_jacobian_columns(
-            jac=jac,
-            nlp=nlp,
+        jac_col = self._nlp_session.extreme_jacobian_columns(
             large=self.config.jacobian_large_value_caution,
             small=self.config.jacobian_small_value_caution,
         )
@@ -1352,9 +1694,7 @@ class DiagnosticsToolbox:
                 f">{self.config.jacobian_large_value_caution:.1E})"
             )
 
-        jac_row = extreme_jacobian_rows(
-            jac=jac,
-            nlp=nlp,
+        jac_row = self._nlp_session.extreme_jacobian_rows(
             large=self.config.jacobian_large_value_caution,
             small=self.config.jacobian_small_value_caution,
         )
@@ -1369,9 +1709,7 @@ class DiagnosticsToolbox:
             )
 
         # Extreme Jacobian entries
-        extreme_jac = extreme_jacobian_entries(
-            jac=jac,
-            nlp=nlp,
+        extreme_jac = self._nlp_session.extreme_jacobian_entries(
             large=self.config.jacobian_large_value_caution,
             small=self.config.jacobian_small_value_caution,
             zero=0,
@@ -1496,10 +1834,10 @@ class DiagnosticsToolbox:
         if stream is None:
             stream = sys.stdout
 
-        jac, nlp = get_jacobian(self._model, scaled=False)
+        jac = self._nlp_session.get_jacobian()
 
-        warnings, next_steps = self._collect_numerical_warnings(jac=jac, nlp=nlp)
-        cautions = self._collect_numerical_cautions(jac=jac, nlp=nlp)
+        warnings, next_steps = self._collect_numerical_warnings()
+        cautions = self._collect_numerical_cautions()
 
         stats = []
         try:
@@ -1595,7 +1933,9 @@ class DiagnosticsToolbox:
             Instance of SVDToolbox
 
         """
-        self.svd_toolbox = SVDToolbox(self.model, **kwargs)
+        self.svd_toolbox = SVDToolbox(
+            self.model, nlp_session=self._nlp_session, **kwargs
+        )
 
         return self.svd_toolbox
 
@@ -1612,7 +1952,9 @@ class DiagnosticsToolbox:
             Instance of DegeneracyHunter
 
         """
-        self.degeneracy_hunter = DegeneracyHunter2(self.model, **kwargs)
+        self.degeneracy_hunter = DegeneracyHunter2(
+            self.model, nlp_session=self._nlp_session, **kwargs
+        )
 
         return self.degeneracy_hunter
 
@@ -1629,10 +1971,17 @@ class SVDToolbox:
     Args:
 
         model: model to be diagnosed. The SVDToolbox does not support indexed Blocks.
+        nlp_session: NLPEvaluationSession to use to get the Jacobian of the model
+            (optional). If not provided, a new session is created.
 
     """
 
-    def __init__(self, model: BlockData, **kwargs):
+    def __init__(
+        self,
+        model: BlockData,
+        nlp_session: NLPEvaluationSession = None,
+        **kwargs,
+    ):
         # TODO: In future may want to generalise this to accept indexed blocks
         # However, for now some of the tools do not support indexed blocks
         if not isinstance(model, BlockData):
@@ -1649,9 +1998,10 @@ class SVDToolbox:
         self.v = None
 
         # Get Jacobian and NLP
-        self.jacobian, self.nlp = get_jacobian(
-            self._model, scaled=False, equality_constraints_only=True
-        )
+        if nlp_session is None:
+            nlp_session = NLPEvaluationSession(model)
+        self.jacobian = nlp_session.get_jacobian(equality_constraints_only=True)
+        self.nlp = nlp_session.nlp
 
         # Get list of equality constraint and variable names
         self._eq_con_list = self.nlp.get_pyomo_equality_constraints()
@@ -2071,10 +2421,12 @@ class DegeneracyHunter2:
     Args:
 
         model: model to be diagnosed. The DegeneracyHunter does not support indexed Blocks.
+        nlp_session: NLPEvaluationSession to use to get the Jacobian of the model
+            (optional). If not provided, a new session is created.
 
     """
 
-    def __init__(self, model, **kwargs):
+    def __init__(self, model, nlp_session: NLPEvaluationSession = None, **kwargs):
         # TODO: In future may want to generalise this to accept indexed blocks
         # However, for now some of the tools do not support indexed blocks
         if not isinstance(model, BlockData):
@@ -2087,9 +2439,10 @@ class DegeneracyHunter2:
         self.config = DHCONFIG(kwargs)
 
         # Get Jacobian and NLP
-        self.jacobian, self.nlp = get_jacobian(
-            self._model, scaled=False, equality_constraints_only=True
-        )
+        if nlp_session is None:
+            nlp_session = NLPEvaluationSession(model)
+        self.jacobian = nlp_session.get_jacobian(equality_constraints_only=True)
+        self.nlp = nlp_session.nlp
 
         # Placeholder for solver - deferring construction lets us unit test more easily
         self.solver = None
@@ -3148,6 +3501,15 @@ CACONFIG.declare(
         doc="Parameter sweep workflow runner",
     ),
 )
+CACONFIG.declare(
+    "workflow_runner_options",
+    ConfigValue(
+        default=None,
+        domain=dict,
+        doc="Additional options to pass to the workflow runner (e.g. number_of_workers, "
+        "sample_timeout or result_store).",
+    ),
+)
 CACONFIG.declare(
     "solver_options",
     ConfigValue(
@@ -3191,7 +3553,12 @@ class IpoptConvergenceAnalysis:
         if self.config.solver_options is not None:
             solver.options = self.config.solver_options
 
+        runner_options = self.config.workflow_runner_options
+        if runner_options is None:
+            runner_options = {}
+
         self._psweep = self.config.workflow_runner(
+            **runner_options,
             input_specification=self.config.input_specification,
             build_model=self._build_model,
             rebuild_model=True,
@@ -3759,56 +4126,186 @@ def check_parallel_jacobian(
         jac, nlp = get_jacobian(model, scaled=False)
 
     # Get vectors that we will check, and the Pyomo components
-    # they correspond to.
+    # they correspond to. Vectors are stored as the rows of a CSR matrix.
     if direction == "row":
         components = nlp.get_pyomo_constraints()
-        csrjac = jac.tocsr()
-        # Make everything a column vector (CSC) for consistency
-        vectors = [csrjac[i, :].transpose().tocsc() for i in range(len(components))]
+        vectors = jac.tocsr()
     elif direction == "column":
         components = nlp.get_pyomo_variables()
-        cscjac = jac.tocsc()
-        vectors = [cscjac[:, i] for i in range(len(components))]
-
-    # List to store pairs of parallel components
-    parallel = []
-
-    vectors_by_nz = {}
-    for vecidx, vec in enumerate(vectors):
-        maxval = max(np.abs(vec.data))
-        # Construct tuple of sorted col/row indices that participate
-        # in this vector (with non-negligible coefficient).
-        nz = tuple(
-            sorted(
-                idx
-                for idx, val in zip(vec.indices, vec.data)
-                if abs(val) > tolerance and abs(val) / maxval > tolerance
-            )
-        )
-        if nz in vectors_by_nz:
-            # Store the index as well so we know what component this
-            # correrponds to.
-            vectors_by_nz[nz].append((vec, vecidx))
-        else:
-            vectors_by_nz[nz] = [(vec, vecidx)]
+        vectors = jac.transpose().tocsr()
+
+    parallel = _parallel_vector_pairs(vectors, tolerance)
+    return [(components[uidx], components[vidx]) for uidx, vidx in parallel]
+
+
+# Seed for the random weights and projections used by check_parallel_jacobian,
+# so that results are reproducible
+_PARALLEL_SEED = 1987
+
+# Number of random projections used to screen candidate pairs of vectors
+_PARALLEL_PROJECTIONS = 4
 
-    for vecs in vectors_by_nz.values():
-        for idx, (u, uidx) in enumerate(vecs):
-            # idx is the "local index", uidx is the "global index"
-            # Frobenius norm of the matrix is 2-norm of this column vector
-            unorm = norm(u, ord="fro")
-            for v, vidx in vecs[idx + 1 :]:
-                vnorm = norm(v, ord="fro")
+# Maximum number of candidate pairs of vectors to screen at once
+_PARALLEL_BLOCK_SIZE = 2**20
 
-                # Explicitly multiply a row vector * column vector
-                prod = u.transpose().dot(v)
-                absprod = abs(prod[0, 0])
-                diff = abs(absprod - unorm * vnorm)
-                if diff <= tolerance or diff <= tolerance * max(unorm, vnorm):
-                    parallel.append((uidx, vidx))
 
-    parallel = [(components[uidx], components[vidx]) for uidx, vidx in parallel]
-    return parallel
+def _parallel_vector_pairs(vectors, tolerance):
+    """
+    Find the pairs of near-parallel rows of a CSR matrix.
+
+    Rows are only compared if they have the same set of non-negligible
+    entries (coefficients larger than tolerance, both absolutely and relative
+    to the largest coefficient in the row). Rows u and v are considered
+    parallel if abs(abs(u.v) - |u||v|) is no greater than tolerance, or
+    tolerance*max(|u|, |v|).
+
+    Rows are grouped by hashing the indices of their non-negligible entries.
+    Within each group, rows are sorted by the absolute value of a random
+    projection of the normalized row. As the absolute values of a projection
+    p of two parallel (or anti-parallel) normalized rows can differ by no
+    more than |p|*sqrt(2*(1 - |cos|)), only rows within a window of each other
+    (determined from the tolerance and row norms) need to be compared,
+    without any parallel pairs being missed. Candidate pairs in each window
+    are screened in blocks of bounded size using further random projections,
+    and the remaining pairs are compared using sparse matrix products.
+
+    Args:
+        vectors: scipy.sparse.csr_matrix with the vectors to check as rows
+        tolerance: tolerance to use to determine if vectors are parallel
+
+    Returns:
+        list of 2-tuples of row indices of parallel rows, grouped by set of
+        non-negligible entries and ordered as they appear in the matrix
+    """
+    n_vec, n_dim = vectors.shape
+    if n_vec < 2:
+        return []
+    indptr = vectors.indptr
+    absdata = np.abs(vectors.data)
+
+    # Non-negligible entries of each row
+    maxval = abs(vectors).max(axis=1).toarray().ravel()
+    significant = (absdata > tolerance) & (
+        absdata > tolerance * np.repeat(maxval, np.diff(indptr))
+    )
+
+    # Hash the set of non-negligible indices of each row as the sum of random
+    # 64-bit weights for each index (wrapping on overflow), and group rows
+    # with the same hashes and number of entries.
+    rng = np.random.default_rng(_PARALLEL_SEED)
+    cumsig = np.concatenate([[0], np.cumsum(significant)])
+    counts = (cumsig[indptr[1:]] - cumsig[indptr[:-1]]).astype(np.uint64)
+    keys = [counts]
+    for _ in range(2):
+        weights = rng.integers(
+            0, np.iinfo(np.uint64).max, size=n_dim, dtype=np.uint64, endpoint=True
+        )
+        cumw = np.zeros(cumsig[-1] + 1, dtype=np.uint64)
+        np.cumsum(weights[vectors.indices[significant]], out=cumw[1:])
+        keys.append(cumw[cumsig[indptr[1:]]] - cumw[cumsig[indptr[:-1]]])
+    _, first, group = np.unique(
+        np.stack(keys, axis=1), axis=0, return_index=True, return_inverse=True
+    )
+    group = group.ravel()
+    # Number groups in order of their first row
+    group = np.argsort(np.argsort(first))[group]
+
+    # Norms and projections of normalized rows (zero for zero rows)
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    nonzero = norms > 0
+    p = rng.standard_normal((n_dim, _PARALLEL_PROJECTIONS))
+    proj = np.zeros((n_vec, _PARALLEL_PROJECTIONS))
+    proj[nonzero] = np.abs(vectors @ p)[nonzero] / norms[nonzero, None]
+
+    # Smallest non-zero norm and largest norm of the projection vectors over
+    # the entries of any row in each group
+    pattern = vectors.copy()
+    pattern.data = np.ones_like(pattern.data)
+    pnorm = np.sqrt(pattern @ p**2)
+    by_group = np.argsort(group, kind="stable")
+    starts = np.searchsorted(group[by_group], np.arange(len(first)))
+    nmin = np.minimum.reduceat(np.where(nonzero, norms, np.inf)[by_group], starts)
+    pmax = np.maximum.reduceat(pnorm[by_group], starts, axis=0)
+
+    # Window for each row and projection. For rows u and v in a group with
+    # smallest non-zero norm n_min, parallel rows have
+    # 1 - |cos| <= tolerance*max(1/(|u|*n_min), 1/n_min), and the projection
+    # of u -/+ v involves only the entries of p for the entries of u and v.
+    # Zero rows are parallel to every row in the group.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bound = tolerance * np.maximum(1 / (norms * nmin[group]), 1 / nmin[group])
+    radius = np.full((n_vec, _PARALLEL_PROJECTIONS), np.inf)
+    # Allow for round-off in the comparison of |u.v| with |u||v|, which can
+    # hide differences in 1 - |cos| of several orders above machine epsilon
+    radius[nonzero] = (
+        np.sqrt(pnorm[nonzero] ** 2 + pmax[group[nonzero]] ** 2)
+        * np.sqrt(2 * (bound[nonzero, None] + 1e-12))
+        * (1 + 1e-6)
+    )
+
+    # Sort rows by group and projection, and find the end of the window
+    # for each row by merging the window limits into the sorted rows
+    order = np.lexsort((proj[:, 0], group))
+    sgroup = group[order]
+    sproj = proj[order, 0]
+    is_limit = np.repeat([0, 1], n_vec)
+    merged = np.lexsort(
+        (
+            is_limit,
+            np.concatenate([sproj, sproj + radius[order, 0]]),
+            np.concatenate([sgroup, sgroup]),
+        )
+    )
+    n_before = np.cumsum(is_limit[merged] == 0)
+    limits = is_limit[merged] == 1
+    window_end = np.empty(n_vec, dtype=int)
+    window_end[merged[limits] - n_vec] = n_before[limits]
+
+    # Compare each row with the rows after it in its window, in blocks
+    n_cand = window_end - np.arange(n_vec) - 1
+    cum_cand = np.concatenate([[0], np.cumsum(n_cand)])
+    pairs = []
+    start = 0
+    while start < n_vec:
+        stop = max(
+            start + 1,
+            np.searchsorted(cum_cand, cum_cand[start] + _PARALLEL_BLOCK_SIZE, "right")
+            - 1,
+        )
+        stop = min(stop, n_vec)
+        reps = n_cand[start:stop]
+        ii = np.repeat(np.arange(start, stop), reps)
+        if len(ii) > 0:
+            jj = (
+                ii
+                + 1
+                + np.arange(len(ii))
+                - np.repeat(cum_cand[start:stop] - cum_cand[start], reps)
+            )
+            u = order[ii]
+            v = order[jj]
+            close = np.all(
+                np.abs(proj[u, 1:] - proj[v, 1:]) <= radius[u, 1:],
+                axis=1,
+            )
+            u = u[close]
+            v = v[close]
+            prod = np.abs(
+                np.asarray(vectors[u].multiply(vectors[v]).sum(axis=1)).ravel()
+            )
+            unorm = norms[u]
+            vnorm = norms[v]
+            diff = np.abs(prod - unorm * vnorm)
+            found = (diff <= tolerance) | (diff <= tolerance * np.maximum(unorm, vnorm))
+            pairs.append(np.stack([u[found], v[found]], axis=1))
+        start = stop
+
+    if not pairs:
+        return []
+    pairs = np.concatenate(pairs)
+    pairs.sort(axis=1)
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0], group[pairs[:, 0]]))]
+    return [(int(u), int(v)) for u, v in pairs]
 
 
 def compute_ill_conditioning_certificate(
@@ -3986,15 +4483,12 @@ def _vars_near_zero(model, variable_zero_value_tolerance):
 
 
 def _vars_violating_bounds(model, tolerance):
-    violated_bounds = ComponentSet()
-    for v in model.component_data_objects(Var, descend_into=True):
-        if v.value is not None:
-            if v.lb is not None and v.value <= v.lb - tolerance:
-                violated_bounds.add(v)
-            elif v.ub is not None and v.value >= v.ub + tolerance:
-                violated_bounds.add(v)
+    variables = list(model.component_data_objects(Var, descend_into=True))
+    values, lb, ub = _var_values_and_bounds(variables)
+    # Comparisons with NaN (no value or no bound) are False
+    violated = (values <= lb - tolerance) | (values >= ub + tolerance)
 
-    return violated_bounds
+    return ComponentSet(variables[i] for i in np.flatnonzero(violated))
 
 
 def _vars_with_none_value(model):
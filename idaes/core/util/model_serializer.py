@@ -11,7 +11,7 @@
 # for full copyright and license information.
 #################################################################################
 """
-Functions for saving and loading Pyomo objects to json
+Functions for saving and loading Pyomo objects to json or NumPy NPZ files
 """
 # TODO: Missing docstrings
 # pylint: disable=missing-function-docstring
@@ -24,6 +24,10 @@ import datetime
 import time
 import gzip
 import logging
+import os
+import zipfile
+
+import numpy as np
 
 from pyomo.environ import (
     Param,
@@ -1023,3 +1027,536 @@ def from_json(o, sd=None, fname=None, s=None, wts=None, gz=None, root_name=None)
     pdict["etime_read_dict"] = read_time - dict_time
     pdict["etime_read_suffixes"] = suffix_time - read_time
     return pdict
+
+
+# -------------------------------------------------------------------------
+# Columnar binary format
+# The JSON format repeats the type, index and attribute names of every
+# component data object. For large models it is much faster to write a
+# schema listing each component and index set once, and store the attributes
+# of the component data in one array per attribute, with a row for each
+# component data object. The schema and arrays are stored in a NumPy NPZ
+# archive.
+
+# Type codes for attribute values stored in float arrays. Values of other
+# types are stored in the schema, so they must be JSON serializable.
+_TYPE_NONE = 0
+_TYPE_FLOAT = 1
+_TYPE_INT = 2
+_TYPE_BOOL = 3
+_TYPE_OTHER = 4
+_TYPE_CODES = {
+    type(None): _TYPE_NONE,
+    float: _TYPE_FLOAT,
+    np.float64: _TYPE_FLOAT,
+    int: _TYPE_INT,
+    bool: _TYPE_BOOL,
+    np.bool_: _TYPE_BOOL,
+}
+# Largest integer that can be stored exactly in a float
+_MAX_EXACT_INT = 2**53
+
+
+def _attribute_setter(a):
+    """
+    Get a function to directly set attribute a, in the same form as a read
+    callback.
+    """
+
+    def setter(o, d):
+        setattr(o, a, d)
+
+    return setter
+
+
+def _component_data_items(o):
+    """
+    Iterate over the (key, component data) pairs of a component, in the same
+    way as _write_component_data and _read_component_data.
+    """
+    try:
+        item_keys = o.keys()
+    except AttributeError:
+        item_keys = [None]
+    for key in item_keys:
+        if key is None and isinstance(o, ComponentData):
+            yield key, o
+        else:
+            yield key, o[key]
+
+
+def _encode_values(values):
+    """
+    Encode a list of attribute values as a float array, an array of type codes
+    and a dict of the values which cannot be stored as floats, keyed by the
+    string of their position.
+    """
+    n = len(values)
+    types = np.fromiter(
+        (_TYPE_CODES.get(type(v), _TYPE_OTHER) for v in values), np.int8, n
+    )
+    floats = np.full(n, np.nan)
+    numeric = np.flatnonzero((types != _TYPE_NONE) & (types != _TYPE_OTHER))
+    floats[numeric] = np.fromiter((values[i] for i in numeric), float, len(numeric))
+    types[(types == _TYPE_INT) & (np.abs(floats) > _MAX_EXACT_INT)] = _TYPE_OTHER
+    other = {str(i): values[i] for i in np.flatnonzero(types == _TYPE_OTHER)}
+    return floats, types, other
+
+
+def _decode_values(floats, types, other, start, stop):
+    """
+    Decode the attribute values in rows start to stop encoded by
+    _encode_values.
+    """
+    values = floats[start:stop].tolist()
+    types = np.asarray(types[start:stop])
+    for i in np.flatnonzero(types == _TYPE_NONE).tolist():
+        values[i] = None
+    for i in np.flatnonzero(types == _TYPE_INT).tolist():
+        values[i] = int(values[i])
+    for i in np.flatnonzero(types == _TYPE_BOOL).tolist():
+        values[i] = bool(values[i])
+    for i in np.flatnonzero(types == _TYPE_OTHER).tolist():
+        values[i] = other[str(start + i)]
+    return values
+
+
+class _NPZWriter(object):
+    """
+    Collects the state of a model in the columnar format, following the same
+    rules as _write_component and _write_component_data.
+    """
+
+    def __init__(self, wts):
+        self.wts = wts
+        self.components = []  # schema entry for each component
+        self.index_sets = []  # list of the repr of the keys of each index set
+        self._index_set_ids = {}
+        self.n_rows = 0  # number of component data objects
+        self.columns = {}  # attribute: (list of rows, list of values)
+        self.rows_with_children = []  # component data with sub-components
+        self.lookup = {}  # id of component or data: component id or row
+        self.suffixes = []  # (component id, suffix) delayed until the end
+
+    def write_component(self, o, parent=-1):
+        wts = self.wts
+        alist, _ = wts.get_class_attr_list(o)
+        if alist is None:
+            return  # alist is none means skip this component type
+        k = len(self.components)
+        oname = o.getname(fully_qualified=False)
+        attrs = {}
+        for a in alist:
+            if wts.write_cbs.get(a, None) is None:
+                attrs[a] = getattr(o, a, None)
+            else:
+                attrs[a] = wts.write_cbs[a](o)
+        self.components.append(
+            {"name": oname, "type": str(type(o)), "parent": parent, "attrs": attrs}
+        )
+        # Components are identified by negative ids so they can share a
+        # lookup table with component data, which are identified by row
+        self.lookup[id(o)] = -1 - k
+        if isinstance(o, Suffix):
+            if wts.suffix_filter is None or oname in wts.suffix_filter:
+                self.suffixes.append((k, o))
+        else:
+            self.write_component_data(o, self.components[k])
+
+    def write_component_data(self, o, entry):
+        items = list(_component_data_items(o))
+        if not items:
+            return
+        alist, _ = self.wts.get_data_class_attr_list(items[0][1])
+        if alist is None:
+            return  # if None then skip writing
+
+        keys = tuple(repr(key) for key, _ in items)
+        index_set = self._index_set_ids.get(keys, None)
+        if index_set is None:
+            index_set = self._index_set_ids[keys] = len(self.index_sets)
+            self.index_sets.append(keys)
+        start = self.n_rows
+        self.n_rows += len(items)
+        entry["index_set"] = index_set
+        entry["start"] = start
+        entry["data_attrs"] = list(alist)
+
+        for a in alist:
+            cb = self.wts.write_cbs.get(a, None)
+            if cb is None:
+                values = [getattr(el, a) for _, el in items]
+            else:
+                values = [cb(el) for _, el in items]
+            rows, column = self.columns.setdefault(a, ([], []))
+            rows.extend(range(start, self.n_rows))
+            column.extend(values)
+
+        for row, (_, el) in enumerate(items, start):
+            self.lookup[id(el)] = row
+            if _may_have_subcomponents(el):
+                has_children = False
+                for o2 in el.component_objects(descend_into=False):
+                    if not has_children:
+                        self.rows_with_children.append(row)
+                        has_children = True
+                    self.write_component(o2, parent=row)
+
+    def get_arrays(self):
+        """
+        Get the schema and NumPy arrays to save.
+        """
+        arrays = {}
+        columns = []
+        for i, (a, (rows, values)) in enumerate(self.columns.items()):
+            if all(type(v) is bool for v in values):
+                column = np.zeros(self.n_rows, dtype=bool)
+                column[rows] = values
+                arrays[f"column{i}"] = column
+                columns.append({"name": a, "kind": "bool"})
+            else:
+                full = [None] * self.n_rows
+                for row, v in zip(rows, values):
+                    full[row] = v
+                floats, types, other = _encode_values(full)
+                arrays[f"column{i}"] = floats
+                arrays[f"column{i}_type"] = types
+                columns.append({"name": a, "kind": "value", "other": other})
+
+        suffix_component = []
+        suffix_key = []
+        suffix_values = []
+        for k, s in self.suffixes:
+            for key in s:
+                if id(key) not in self.lookup:
+                    # didn't store these components so can't write suffix.
+                    continue
+                suffix_component.append(k)
+                suffix_key.append(self.lookup[id(key)])
+                suffix_values.append(s[key])
+        floats, types, other = _encode_values(suffix_values)
+        arrays["suffix_component"] = np.array(suffix_component, dtype=np.int64)
+        arrays["suffix_key"] = np.array(suffix_key, dtype=np.int64)
+        arrays["suffix_value"] = floats
+        arrays["suffix_value_type"] = types
+        arrays["rows_with_children"] = np.array(self.rows_with_children, dtype=np.int64)
+
+        schema = {
+            "components": self.components,
+            "index_sets": self.index_sets,
+            "n_rows": self.n_rows,
+            "columns": columns,
+            "suffix_other": other,
+        }
+        return schema, arrays
+
+
+class _NPZReader(object):
+    """
+    Loads a state in the columnar format into a model, following the same
+    rules as _read_component and _read_component_data.
+    """
+
+    def __init__(self, schema, arrays, wts):
+        self.wts = wts
+        self.schema = schema
+        self.arrays = arrays
+        self.components = schema["components"]
+        self.children = {
+            (c["parent"], c["name"]): k for k, c in enumerate(self.components)
+        }
+        self.columns = {}
+        for i, c in enumerate(schema["columns"]):
+            self.columns[c["name"]] = (
+                c,
+                arrays[f"column{i}"],
+                arrays.get(f"column{i}_type", None),
+            )
+        self.rows_with_children = set(arrays["rows_with_children"].tolist())
+        self._index_positions = {}
+        self.lookup = {}
+        self.suffixes = []
+
+    def _get_positions(self, index_set):
+        positions = self._index_positions.get(index_set, None)
+        if positions is None:
+            positions = self._index_positions[index_set] = {
+                key: i for i, key in enumerate(self.schema["index_sets"][index_set])
+            }
+        return positions
+
+    def _get_column(self, entry, a, cache):
+        # Values of attribute a for all the data of a component
+        if a not in cache:
+            if a not in entry["data_attrs"]:
+                raise KeyError(a)
+            c, column, types = self.columns[a]
+            start = entry["start"]
+            stop = start + len(self.schema["index_sets"][entry["index_set"]])
+            if c["kind"] == "bool":
+                cache[a] = column[start:stop].tolist()
+            else:
+                cache[a] = _decode_values(column, types, c["other"], start, stop)
+        return cache[a]
+
+    def read_component(self, o, k):
+        wts = self.wts
+        alist, ff = wts.get_class_attr_list(o)
+        if alist is None:
+            return
+        if k is None:
+            if wts.ignore_missing:
+                return
+            else:
+                raise KeyError(o.getname(fully_qualified=False))
+        entry = self.components[k]
+        odict = dict(entry["attrs"])
+        odict["__type__"] = entry["type"]
+        if ff is not None:
+            alist = ff(o, odict)
+        if Suffix in wts.classes:
+            self.lookup[-1 - k] = o
+        for a in alist:
+            try:
+                if a in wts.read_cbs:
+                    if wts.read_cbs[a] is not None:
+                        wts.read_cbs[a](o, odict[a])
+                else:
+                    setattr(o, a, odict[a])
+            except KeyError as e:
+                if wts.ignore_missing:
+                    return
+                else:
+                    raise e
+        if isinstance(o, Suffix):
+            oname = o.getname(fully_qualified=False)
+            if wts.suffix_filter is None or oname in wts.suffix_filter:
+                self.suffixes.append(k)
+        else:
+            self.read_component_data(o, entry)
+
+    def read_component_data(self, o, entry):
+        wts = self.wts
+        index_set = entry.get("index_set", None)
+        positions = {} if index_set is None else self._get_positions(index_set)
+        cache = {}
+        alist = []
+        columns = None  # (values, setter) for each attribute to read
+        missing = None  # first attribute to read which was not saved
+        c = 0
+        for key, el in _component_data_items(o):
+            if c == 0:  # if first data item assume all items are the same
+                alist, ff = wts.get_data_class_attr_list(el)
+                if alist is None:
+                    return  # skip reading this type
+            c += 1
+            pos = positions.get(repr(key), None)
+            if pos is None:  # data was missing either ignore or raise except
+                if wts.ignore_missing:
+                    return
+                else:
+                    raise KeyError(repr(key))
+            row = entry["start"] + pos
+            if ff is not None:
+                # filter functions take the state of the data as a dict
+                edict = {
+                    a: self._get_column(entry, a, cache)[pos]
+                    for a in entry["data_attrs"]
+                }
+                columns, missing = self._get_columns(entry, ff(el, edict), cache)
+            elif columns is None:
+                columns, missing = self._get_columns(entry, alist, cache)
+            if Suffix in wts.classes:
+                self.lookup[row] = el
+            for values, setter in columns:
+                setter(el, values[pos])
+            if missing is not None:  # attribute missing
+                if wts.ignore_missing:
+                    return
+                else:
+                    raise KeyError(missing)
+            if _may_have_subcomponents(el) and row in self.rows_with_children:
+                for o2 in el.component_objects(descend_into=False):
+                    self.read_component(
+                        o2,
+                        self.children.get(
+                            (row, o2.getname(fully_qualified=False)), None
+                        ),
+                    )
+
+    def _get_columns(self, entry, alist, cache):
+        # Values and setter functions of the attributes in alist up to the
+        # first one which was not saved, and the name of that attribute
+        columns = []
+        for a in alist:
+            try:
+                values = self._get_column(entry, a, cache)
+            except KeyError:
+                return columns, a
+            if a not in self.wts.read_cbs:
+                columns.append((values, _attribute_setter(a)))
+            elif self.wts.read_cbs[a] is not None:
+                columns.append((values, self.wts.read_cbs[a]))
+        return columns, None
+
+    def read_suffixes(self):
+        arrays = self.arrays
+        values = _decode_values(
+            arrays["suffix_value"],
+            arrays["suffix_value_type"],
+            self.schema["suffix_other"],
+            0,
+            len(arrays["suffix_value"]),
+        )
+        # Group the entries by suffix
+        order = np.argsort(arrays["suffix_component"], kind="stable")
+        suffix_component = np.asarray(arrays["suffix_component"])[order]
+        keys = np.asarray(arrays["suffix_key"])[order].tolist()
+        values = [values[i] for i in order]
+        for k in self.suffixes:
+            s = self.lookup[-1 - k]
+            start, stop = np.searchsorted(suffix_component, [k, k + 1])
+            for key, v in zip(keys[start:stop], values[start:stop]):
+                kc = self.lookup.get(key, None)
+                if kc is not None:
+                    s[kc] = v
+
+
+def _mmap_npz(fname):
+    """
+    Open the arrays in an uncompressed NPZ file as read-only memory maps.
+    Arrays which are compressed are read into memory.
+    """
+    arrays = {}
+    with zipfile.ZipFile(fname) as zf, open(fname, "rb") as f:
+        for info in zf.infolist():
+            name = info.filename
+            if name.endswith(".npy"):
+                name = name[:-4]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            # The data of a member follows its local file header, which is 30
+            # bytes plus the file name and extra field
+            f.seek(info.header_offset + 26)
+            name_length = int.from_bytes(f.read(2), "little")
+            extra_length = int.from_bytes(f.read(2), "little")
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    fname,
+                    dtype=dtype,
+                    mode="r",
+                    offset=f.tell(),
+                    shape=shape,
+                    order="F" if fortran else "C",
+                )
+    return arrays
+
+
+def to_npz(o, fname, wts=None, metadata=None, compress=False):
+    """
+    Save the state of a model to a NumPy NPZ file. This stores the same
+    information as to_json, but in a columnar format which is much faster to
+    write and read for large models. The file contains a JSON schema listing
+    the components and their index sets once, and an array for each attribute
+    of the component data (e.g. value, fixed, lb, ub, stale and active) with
+    an entry for each component data object. To load a model state, a model
+    with the same structure must exist.
+
+    Args:
+        o: The Pyomo component object to save.  Usually a Pyomo model, but could
+            also be a sub-component of a model (usually a sub-block).
+        fname: file name or file-like object to save the model state to
+        wts: is What To Save, this is a StoreSpec object that specifies what
+            object types and attributes to save.  If None, the default is used
+            which saves the state of the complete model state.
+        metadata: additional metadata to save beyond the standard format_version,
+            date, and time.
+        compress: if True compress the arrays in the file. Compressed files are
+            smaller, but slower to write and cannot be memory mapped when
+            loading (default = False).
+
+    Returns:
+        None
+    """
+    if metadata is None:
+        metadata = {}
+    if wts is None:
+        wts = StoreSpec()
+
+    start_time = time.time()
+    writer = _NPZWriter(wts)
+    writer.write_component(o)
+    schema, arrays = writer.get_arrays()
+    now = datetime.datetime.now()
+    schema["__metadata__"] = {
+        "format_version": __format_version__,
+        "date": datetime.date.isoformat(now.date()),
+        "time": datetime.time.isoformat(now.time()),
+        "other": metadata,
+        "__performance__": {
+            "n_components": len(writer.components) + writer.n_rows,
+            "etime_make_dict": time.time() - start_time,
+        },
+    }
+    arrays["schema"] = np.frombuffer(json.dumps(schema).encode("utf-8"), np.uint8)
+    savez = np.savez_compressed if compress else np.savez
+    if isinstance(fname, (str, os.PathLike)):
+        # NumPy would add a .npz extension to a file name without one
+        with open(fname, "wb") as f:
+            savez(f, **arrays)
+    else:
+        savez(fname, **arrays)
+
+
+def from_npz(o, fname, wts=None, mmap=False):
+    """
+    Load the state of a Pyomo component from a NumPy NPZ file written by
+    to_npz. This follows the same rules as from_json: if the saved state
+    contains extra information, it is ignored, and if the saved state doesn't
+    contain an entry for a model component that is to be loaded an error will
+    be raised, unless the StoreSpec has ignore_missing = True.
+
+    Args:
+        o: Pyomo component to for which to load state
+        fname: NPZ file name or file-like object to load
+        wts: StoreSpec object specifying what to load
+        mmap: if True, memory map the arrays in the file rather than reading
+            them into memory. fname must be a file name, and any compressed
+            arrays are read into memory (default = False).
+
+    Returns:
+        Dictionary with some performance information. The keys are
+        "etime_load_file", how long in seconds it took to load the file
+        "etime_read_dict", how long in seconds it took to read models state
+        "etime_read_suffixes", how long in seconds it took to read suffixes
+    """
+    start_time = time.time()
+    if mmap:
+        arrays = _mmap_npz(fname)
+    else:
+        with np.load(fname) as f:
+            arrays = {k: f[k] for k in f.files}
+    schema = json.loads(np.asarray(arrays.pop("schema")).tobytes().decode("utf-8"))
+    dict_time = time.time()
+    if wts is None:
+        wts = StoreSpec()
+    reader = _NPZReader(schema, arrays, wts)
+    reader.read_component(o, 0)
+    read_time = time.time()
+    reader.read_suffixes()
+    suffix_time = time.time()
+    pdict = {}
+    pdict["etime_load_file"] = dict_time - start_time
+    pdict["etime_read_dict"] = read_time - dict_time
+    pdict["etime_read_suffixes"] = suffix_time - read_time
+    return pdict
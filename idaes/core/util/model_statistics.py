@@ -20,9 +20,11 @@ __author__ = "Andrew Lee"
 
 import sys
 
+import numpy as np
+
 from pyomo.environ import Block, Constraint, Expression, Objective, Var, value
 from pyomo.dae import DerivativeVar
-from pyomo.core.expr import identify_variables
+from pyomo.core.expr import identify_mutable_parameters, identify_variables
 from pyomo.common.collections import ComponentSet
 from pyomo.common.deprecation import deprecation_warning
 
@@ -49,6 +51,259 @@ def _iter_indexed_block_data_objects(block, ctype, active, descend_into):
             yield c
 
 
+# -------------------------------------------------------------------------
+# Incidence index
+# Walking the expression of every Constraint to find the Vars in it is the
+# most expensive part of most model statistics, so the results are stored on
+# the block being studied and reused as long as the model structure does not
+# change.
+# Constraint kinds used by the incidence index
+_INEQUALITY = 0  # at least one bound is None
+_EQUALITY = 1  # lower and upper bounds are the same expression
+_RANGED = 2  # lower and upper bounds need to be compared
+
+
+class _IncidenceIndex:
+    """
+    Map from the Constraints in a model to the Vars appearing in them.
+
+    The index is checked against the model each time it is used. It is
+    rebuilt if any components or indices have been added to or deleted from
+    the model (including deleting one index and adding another), or the
+    expression of any named Expression has been replaced,
+    and the Vars are identified again only for Constraints whose expression
+    has been replaced. The fixed status of Vars and the active
+    status of Constraints and Blocks are read from the model when needed.
+
+    The version attribute is incremented each time the index is rebuilt or
+    any Constraint is indexed again, so that users of the index can tell
+    when the Vars and mutable Params appearing in the Constraints may have
+    changed.
+
+    The index is not copied when the block is cloned or pickled.
+    """
+
+    def __init__(self):
+        self._signature = None
+        self.version = 0
+        self._parameters = None
+        self._parameters_version = None
+
+    def __reduce__(self):
+        return (self.__class__, ())
+
+    def update(self, block):
+        """
+        Make sure the index reflects the current structure of block.
+        """
+        if (
+            self._signature is None
+            or self._signature != self._get_signature()
+            or not self._data_attached()
+            or any(e.expr is not x for e, x in self._expressions)
+        ):
+            self._build(block)
+        else:
+            changed = [
+                i
+                for i, (c, e) in enumerate(zip(self.constraints, self._exprs))
+                if c.expr is not e
+            ]
+            if changed:
+                for i in changed:
+                    self._index_constraint(i)
+                self._build_incidence()
+
+    def _get_signature(self):
+        # pylint: disable=protected-access
+        return (
+            tuple((len(b._decl), len(b._decl_order)) for b in self.blocks),
+            tuple(len(c) for c in self._indexed_components),
+        )
+
+    def _data_attached(self):
+        # Deleting an index and adding another leaves the lengths in the
+        # signature unchanged, but deleted data objects are detached from
+        # their component
+        return all(
+            c.parent_component() is comp
+            for c, comp in zip(self.constraints, self._constraint_components)
+        ) and all(
+            b.parent_component() is comp
+            for b, comp in zip(self.blocks, self._block_components)
+        )
+
+    def _build(self, block):
+        roots = list(block.values()) if block.is_indexed() else [block]
+
+        # Blocks are listed in the same order Pyomo visits them, so that
+        # Constraints are also listed in the order Pyomo would return them
+        self.blocks = []
+        for r in roots:
+            self.blocks.append(r)
+            self.blocks.extend(
+                r.component_data_objects(Block, active=None, descend_into=True)
+            )
+        block_ids = {id(b): i for i, b in enumerate(self.blocks)}
+        root_ids = set(id(r) for r in roots)
+        self._block_parent = [
+            -1 if id(b) in root_ids else block_ids.get(id(b.parent_block()), -1)
+            for b in self.blocks
+        ]
+        self._block_components = [b.parent_component() for b in self.blocks]
+
+        self.constraints = []
+        self._constraint_block = []
+        self._constraint_components = []
+        self._indexed_components = [c for c in self._block_components if c.is_indexed()]
+        for i, b in enumerate(self.blocks):
+            for comp in b.component_objects(
+                Constraint, active=None, descend_into=False
+            ):
+                if comp.is_indexed():
+                    self._indexed_components.append(comp)
+                for c in comp.values():
+                    self.constraints.append(c)
+                    self._constraint_block.append(i)
+                    self._constraint_components.append(comp)
+        self._constraint_block = np.array(self._constraint_block, dtype=int)
+
+        self._expressions = [
+            (e, e.expr)
+            for e in _iter_indexed_block_data_objects(
+                block, Expression, active=None, descend_into=True
+            )
+        ]
+
+        self.variables = []
+        self._var_ids = {}
+        # Named Expressions are often shared between Constraints
+        self._named_expression_cache = {}
+        self._exprs = [None] * len(self.constraints)
+        self._kinds = np.empty(len(self.constraints), dtype=int)
+        self._constraint_vars = [None] * len(self.constraints)
+        for i in range(len(self.constraints)):
+            self._index_constraint(i)
+        self._build_incidence()
+
+        self._signature = self._get_signature()
+
+    def _index_constraint(self, i):
+        c = self.constraints[i]
+        self._exprs[i] = c.expr
+
+        if c.upper is None or c.lower is None:
+            self._kinds[i] = _INEQUALITY
+        elif c.equality:
+            self._kinds[i] = _EQUALITY
+        else:
+            self._kinds[i] = _RANGED
+
+        var_idx = []
+        for v in identify_variables(
+            c.body, named_expression_cache=self._named_expression_cache
+        ):
+            j = self._var_ids.get(id(v), None)
+            if j is None:
+                j = self._var_ids[id(v)] = len(self.variables)
+                self.variables.append(v)
+            var_idx.append(j)
+        self._constraint_vars[i] = var_idx
+
+    def _build_incidence(self):
+        # Compressed sparse row storage of the Vars in each Constraint
+        lengths = [len(v) for v in self._constraint_vars]
+        self._row_lengths = np.array(lengths, dtype=int)
+        self._var_indices = np.fromiter(
+            (j for v in self._constraint_vars for j in v), int, sum(lengths)
+        )
+        self.version += 1
+
+    def active_constraints(self):
+        """
+        Boolean array indicating which Constraints are active and in active
+        Blocks, as for component_data_objects(Constraint, active=True).
+        """
+        block_active = np.empty(len(self.blocks), dtype=bool)
+        for i, (b, comp, parent) in enumerate(
+            zip(self.blocks, self._block_components, self._block_parent)
+        ):
+            if parent < 0:
+                block_active[i] = b.active
+            else:
+                # parents are always listed before their children
+                block_active[i] = block_active[parent] and comp.active and b.active
+        constraint_active = np.fromiter(
+            (
+                comp.active and c.active
+                for comp, c in zip(self._constraint_components, self.constraints)
+            ),
+            bool,
+            len(self.constraints),
+        )
+        return constraint_active & block_active[self._constraint_block]
+
+    def equalities(self, mask):
+        """
+        Boolean array indicating which of the Constraints selected by mask are
+        equalities.
+        """
+        equalities = mask & (self._kinds == _EQUALITY)
+        for i in np.flatnonzero(mask & (self._kinds == _RANGED)):
+            c = self.constraints[i]
+            equalities[i] = value(c.upper) == value(c.lower)
+        return equalities
+
+    def inequalities(self, mask):
+        """
+        Boolean array indicating which of the Constraints selected by mask are
+        inequalities.
+        """
+        return mask & (self._kinds == _INEQUALITY)
+
+    def constraints_in(self, mask):
+        """
+        List of the Constraints selected by mask.
+        """
+        return [self.constraints[i] for i in np.flatnonzero(mask)]
+
+    def variables_in(self, mask):
+        """
+        List of the Vars appearing in the Constraints selected by mask, in the
+        order they are first found.
+        """
+        idx = self._var_indices[np.repeat(mask, self._row_lengths)]
+        idx, first = np.unique(idx, return_index=True)
+        return [self.variables[j] for j in idx[np.argsort(first)]]
+
+    def mutable_parameters(self):
+        """
+        List of the mutable Params appearing in any of the Constraints,
+        including their bounds. Params declared outside the model are included.
+        """
+        if self._parameters_version != self.version:
+            params = {}
+            for c in self.constraints:
+                for p in identify_mutable_parameters(c.expr):
+                    params.setdefault(id(p), p)
+            self._parameters = list(params.values())
+            self._parameters_version = self.version
+        return self._parameters
+
+
+def _get_incidence_index(block):
+    """
+    Get the incidence index stored on block, creating or updating it as
+    required.
+    """
+    index = getattr(block, "_incidence_index", None)
+    if not isinstance(index, _IncidenceIndex):
+        index = _IncidenceIndex()
+        block._incidence_index = index
+    index.update(block)
+    return index
+
+
 # -------------------------------------------------------------------------
 # Block methods
 def total_blocks_set(block):
@@ -340,15 +595,9 @@ def activated_equalities_generator(block):
         A generator which returns all activated equality Constraint components
         block
     """
-    for c in _iter_indexed_block_data_objects(
-        block, Constraint, active=True, descend_into=True
-    ):
-        if (
-            c.upper is not None
-            and c.lower is not None
-            and value(c.upper) == value(c.lower)
-        ):
-            yield c
+    index = _get_incidence_index(block)
+    for c in index.constraints_in(index.equalities(index.active_constraints())):
+        yield c
 
 
 def activated_equalities_set(block):
@@ -484,11 +733,9 @@ def activated_inequalities_generator(block):
         A generator which returns all activated inequality Constraint
         components block
     """
-    for c in _iter_indexed_block_data_objects(
-        block, Constraint, active=True, descend_into=True
-    ):
-        if c.upper is None or c.lower is None:
-            yield c
+    index = _get_incidence_index(block)
+    for c in index.constraints_in(index.inequalities(index.active_constraints())):
+        yield c
 
 
 def activated_inequalities_set(block):
@@ -686,6 +933,21 @@ def number_unfixed_variables(block):
     return len(unfixed_variables_set(block))
 
 
+def _var_values_and_bounds(variables):
+    # Values and bounds of a list of Vars as arrays, with NaN for None
+    n = len(variables)
+    values = np.fromiter(
+        (np.nan if v.value is None else v.value for v in variables), float, n
+    )
+    lb = np.empty(n)
+    ub = np.empty(n)
+    for i, v in enumerate(variables):
+        lower, upper = v.bounds
+        lb[i] = np.nan if lower is None else lower
+        ub[i] = np.nan if upper is None else upper
+    return values, lb, ub
+
+
 def variables_near_bounds_generator(
     block,
     tol=None,
@@ -727,33 +989,34 @@ def variables_near_bounds_generator(
         abs_tol = tol
         rel_tol = tol
 
-    for v in _iter_indexed_block_data_objects(
-        block, ctype=Var, active=True, descend_into=True
-    ):
-        # To avoid errors, check that v has a value
-        if v.value is None:
-            continue
-
-        # First, magnitude of variable
-        if v.ub is not None and v.lb is not None:
-            # Both upper and lower bounds, apply tol to (upper - lower)
-            mag = value(v.ub - v.lb)
-        elif v.ub is not None:
-            # Only upper bound, apply tol to bound value
-            mag = abs(value(v.ub))
-        elif v.lb is not None:
-            # Only lower bound, apply tol to bound value
-            mag = abs(value(v.lb))
-        else:
-            mag = 0
+    variables = list(
+        _iter_indexed_block_data_objects(
+            block, ctype=Var, active=True, descend_into=True
+        )
+    )
+    values, lb, ub = _var_values_and_bounds(variables)
+
+    # First, magnitude of variable. With both upper and lower bounds, apply
+    # tol to (upper - lower), otherwise apply tol to the bound value. Vars
+    # without a value or bounds are never near a bound, as comparisons with
+    # NaN are False.
+    mag = np.where(
+        np.isnan(lb),
+        np.where(np.isnan(ub), 0, np.abs(ub)),
+        np.where(np.isnan(ub), np.abs(lb), ub - lb),
+    )
 
-        # Calculate largest tolerance from absolute and relative
-        tol = max(abs_tol, mag * rel_tol)
+    # Calculate largest tolerance from absolute and relative
+    tol = np.maximum(abs_tol, mag * rel_tol)
 
-        if v.ub is not None and not skip_ub and value(v.ub - v.value) <= tol:
-            yield v
-        elif v.lb is not None and not skip_lb and value(v.value - v.lb) <= tol:
-            yield v
+    near = np.zeros(len(variables), dtype=bool)
+    if not skip_ub:
+        near |= ub - values <= tol
+    if not skip_lb:
+        near |= values - lb <= tol
+
+    for i in np.flatnonzero(near):
+        yield variables[i]
 
 
 def variables_near_bounds_set(
@@ -819,13 +1082,8 @@ def variables_in_activated_constraints_set(block):
         A ComponentSet including all Var components which appear within
         activated Constraints in block
     """
-    var_set = ComponentSet()
-    for c in _iter_indexed_block_data_objects(
-        block, ctype=Constraint, active=True, descend_into=True
-    ):
-        for v in identify_variables(c.body):
-            var_set.add(v)
-    return var_set
+    index = _get_incidence_index(block)
+    return ComponentSet(index.variables_in(index.active_constraints()))
 
 
 def number_variables_in_activated_constraints(block):
@@ -894,11 +1152,10 @@ def variables_in_activated_equalities_set(block):
         A ComponentSet including all Var components which appear within
         activated equality Constraints in block
     """
-    var_set = ComponentSet()
-    for c in activated_equalities_generator(block):
-        for v in identify_variables(c.body):
-            var_set.add(v)
-    return var_set
+    index = _get_incidence_index(block)
+    return ComponentSet(
+        index.variables_in(index.equalities(index.active_constraints()))
+    )
 
 
 def number_variables_in_activated_equalities(block):
@@ -928,11 +1185,10 @@ def variables_in_activated_inequalities_set(block):
         A ComponentSet including all Var components which appear within
         activated inequality Constraints in block
     """
-    var_set = ComponentSet()
-    for c in activated_inequalities_generator(block):
-        for v in identify_variables(c.body):
-            var_set.add(v)
-    return var_set
+    index = _get_incidence_index(block)
+    return ComponentSet(
+        index.variables_in(index.inequalities(index.active_constraints()))
+    )
 
 
 def number_variables_in_activated_inequalities(block):
@@ -1368,9 +1624,10 @@ def degrees_of_freedom(block):
     Returns:
         Number of degrees of freedom in block.
     """
-    return number_unfixed_variables_in_activated_equalities(
-        block
-    ) - number_activated_equalities(block)
+    index = _get_incidence_index(block)
+    equalities = index.equalities(index.active_constraints())
+    n_unfixed = sum(1 for v in index.variables_in(equalities) if not v.fixed)
+    return n_unfixed - int(equalities.sum())
 
 
 def large_residuals_set(block, tol=1e-5, return_residual_values=False):
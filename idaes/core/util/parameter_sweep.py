@@ -11,31 +11,90 @@
 # for full copyright and license information.
 #################################################################################
 """
-IDAES Parameter Sweep API and sequential workflow runner.
+IDAES Parameter Sweep API and sequential and parallel workflow runners.
 """
 
 import sys
 import json
-
+import os
+from glob import glob, escape as glob_escape
+import signal
+import subprocess
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import ceil
+
+import numpy as np
 from pandas import DataFrame
 
-from pyomo.core import Param, Var
+from pyomo.core import Constraint, Param, Suffix, Var
 from pyomo.environ import check_optimal_termination
-from pyomo.common.config import ConfigDict, ConfigValue, document_kwargs_from_configdict
+from pyomo.opt.solver.shellcmd import SystemCallSolver
+from pyomo.common.config import (
+    ConfigDict,
+    ConfigValue,
+    document_kwargs_from_configdict,
+    In,
+    PositiveFloat,
+    PositiveInt,
+)
 
 import idaes.logger as idaeslog
 from idaes.core.surrogate.pysmo.sampling import SamplingMethods, UniformSampling
 from idaes.core.util.exceptions import ConfigurationError
+from idaes.core.util.convergence.mpi_utils import MPIInterface
 
 __author__ = "Andrew Lee"
 
 # Set up logger
 _log = idaeslog.getLogger(__name__)
 
-# TODO: Timeouts
 # TODO: Re-initialize option/callback
 
 
+class SampleTimeoutError(RuntimeError):
+    """
+    Exception raised when the execution of a sample exceeds the time limit set
+    by the sample_timeout configuration option.
+    """
+
+
+def _time_limit_supported():
+    """
+    Whether time limits can be enforced using SIGALRM in this context, i.e. on
+    platforms which support it and from the main thread of a process (which is
+    always the case in the worker processes of the parallel runners).
+    """
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+@contextmanager
+def _sample_time_limit(timeout):
+    """
+    Context manager which raises a SampleTimeoutError if the code it wraps runs
+    for longer than timeout seconds. This must only be used where
+    _time_limit_supported is True.
+    """
+    if timeout is None:
+        yield
+        return
+
+    def _handler(signum, frame):
+        raise SampleTimeoutError(f"Sample exceeded time limit of {timeout} s.")
+
+    previous = signal.signal(signal.SIGALRM, _handler)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
 class ParameterSweepSpecification(object):
     """Defines a set of input variables/parameters and values to be used in
     a parameter sweep study.
@@ -292,6 +351,453 @@ class ParameterSweepSpecification(object):
         f.close()
 
 
+class InputBinding:
+    """
+    Resolved binding between the sampled inputs of a ParameterSweepSpecification
+    and the corresponding components of an instance of a model.
+
+    The component data objects for each input are located (and validated) once when
+    the binding is created, and the sample values are stored in a NumPy array with
+    one column per input. Loading a sample thus only requires assigning values to
+    the stored component data objects.
+    """
+
+    def __init__(self, model, inputs: dict, samples: DataFrame):
+        """
+        Args:
+            model: instance of model to bind inputs to
+            inputs: dict of input definitions from ParameterSweepSpecification.inputs
+            samples: DataFrame of samples from ParameterSweepSpecification.samples
+
+        Raises:
+            ValueError if an input cannot be found or if it is not a fixed Var or
+            mutable Param
+        """
+        self._model = model
+        self._samples = samples
+
+        self._targets = []
+        for i in inputs.values():
+            self._targets.append(self._resolve_input(model, i["pyomo_path"]))
+
+        # Store sample values as one column per input, and map sample IDs to rows
+        self._values = samples[list(inputs)].to_numpy(dtype=float)
+        self._rows = {sid: r for r, sid in enumerate(samples.index)}
+
+    @property
+    def model(self):
+        """
+        Returns the model instance the inputs are bound to.
+        """
+        return self._model
+
+    @property
+    def samples(self):
+        """
+        Returns the DataFrame of samples used to build the binding.
+        """
+        return self._samples
+
+    @property
+    def values(self):
+        """
+        Returns NumPy array of sample values (one row per sample, one column per input).
+        """
+        return self._values
+
+    @staticmethod
+    def _resolve_input(model, pyomo_path: str):
+        # Locate the component data objects for an input and validate them
+        comp = model.find_component(pyomo_path)
+        try:
+            ctype = comp.ctype
+        except AttributeError:
+            ctype = None
+
+        # TODO: Validate bounds
+
+        if ctype is Param:
+            if not comp.parent_component().mutable:
+                raise ValueError(
+                    f"Convergence testing found an input of type Param that "
+                    f"was not mutable ({comp.name}). Please make sure all "
+                    f"sampled inputs are either mutable params or fixed vars."
+                )
+            if comp.is_indexed():
+                return list(comp.values())
+            return [comp]
+        elif ctype is Var:
+            if not comp.is_indexed():
+                if not comp.is_fixed():
+                    raise ValueError(
+                        f"Convergence testing found an input of type Var that "
+                        f"was not fixed ({comp.name}). Please make sure all "
+                        f"sampled inputs are either mutable params or fixed vars."
+                    )
+                return [comp]
+
+            for i, c in comp.items():
+                if not c.is_fixed():
+                    raise ValueError(
+                        f"Convergence testing found an input of type IndexedVar that "
+                        f"was not fixed ({comp.name}, index {i}). Please make sure all "
+                        f"sampled inputs are either mutable params or fixed vars."
+                    )
+            return list(comp.values())
+
+        raise ValueError(
+            f"Failed to find a valid input component (must be "
+            f"a fixed Var or a mutable Param). Instead, "
+            f"pyomo_path: {pyomo_path} returned: {comp}."
+        )
+
+    def load_sample(self, sample_id: int):
+        """
+        Set values of all bound inputs using values from sample_id.
+
+        Args:
+            sample_id: int representing a row in the samples dataframe
+
+        Returns:
+            None
+        """
+        row = self._values[self._rows[sample_id]].tolist()
+        for v, targets in zip(row, self._targets):
+            for c in targets:
+                c.set_value(v)
+
+
+def _normalized_sample_points(samples: DataFrame, inputs: dict):
+    """
+    Scale sample points to the unit hypercube using the bounds of each input.
+
+    Args:
+        samples: DataFrame of samples
+        inputs: dict of input definitions from ParameterSweepSpecification.inputs
+
+    Returns:
+        NumPy array of scaled points (one row per sample)
+    """
+    points = samples[list(inputs)].to_numpy(dtype=float)
+    lower = np.array([i["lower"] for i in inputs.values()], dtype=float)
+    upper = np.array([i["upper"] for i in inputs.values()], dtype=float)
+    span = upper - lower
+    span[span == 0] = 1.0
+    return (points - lower) / span
+
+
+def nearest_neighbour_order(points):
+    """
+    Order a set of points using a greedy nearest-neighbour path, starting from the
+    first point.
+
+    Args:
+        points: 2-D array of points (one row per point)
+
+    Returns:
+        NumPy array of row positions in path order
+    """
+    points = np.asarray(points, dtype=float)
+    n = points.shape[0]
+    order = np.empty(n, dtype=int)
+    if n == 0:
+        return order
+
+    visited = np.zeros(n, dtype=bool)
+    current = 0
+    for k in range(n):
+        order[k] = current
+        visited[current] = True
+        if k == n - 1:
+            break
+        dist = np.einsum("ij,ij->i", points - points[current], points - points[current])
+        dist[visited] = np.inf
+        current = int(np.argmin(dist))
+
+    return order
+
+
+def space_filling_order(points):
+    """
+    Order a set of points in the unit hypercube along a Z-order (Morton)
+    space-filling curve.
+
+    Args:
+        points: 2-D array of points scaled to the unit hypercube (one row per point)
+
+    Returns:
+        NumPy array of row positions in curve order
+    """
+    points = np.clip(np.asarray(points, dtype=float), 0.0, 1.0)
+    n, ndim = points.shape
+    if n == 0 or ndim == 0:
+        return np.arange(n)
+
+    # Number of bits per dimension such that the interleaved code fits in 63 bits
+    bits = max(1, min(16, 63 // ndim))
+    cells = np.minimum((points * (1 << bits)).astype(np.uint64), (1 << bits) - 1)
+
+    codes = np.zeros(n, dtype=np.uint64)
+    for b in range(bits - 1, -1, -1):
+        for d in range(ndim):
+            codes = (codes << np.uint64(1)) | (
+                (cells[:, d] >> np.uint64(b)) & np.uint64(1)
+            )
+
+    return np.argsort(codes, kind="stable")
+
+
+class WarmStartCache:
+    """
+    Store of solution snapshots from converged samples, used to warm-start
+    subsequent samples from the closest converged sample.
+
+    Snapshots contain the values of all Vars in the model and, if the model has
+    them, the values of the dual, ipopt_zL_out and ipopt_zU_out Suffixes. When
+    restoring a snapshot, only the values of unfixed Vars are changed, and
+    duals are loaded into the dual, ipopt_zL_in and ipopt_zU_in Suffixes if these
+    exist on the model (note that IPOPT must also be told to use a warm start, e.g.
+    by setting warm_start_init_point=yes).
+
+    Snapshots are mapped to models by the order of their component data objects,
+    thus all models must share the same structure (which is the case for models
+    built by the same build_model callback).
+    """
+
+    def __init__(self, history: int = 100):
+        """
+        Args:
+            history: maximum number of snapshots to keep (oldest are dropped first)
+        """
+        self._history = history
+        self._points = []
+        self._snapshots = []
+        self._model = None
+        self._vars = None
+        self._cons = None
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def _bind(self, model):
+        # Collect component data objects in a stable order for this model
+        if model is not self._model:
+            self._model = model
+            self._vars = list(model.component_data_objects(Var, descend_into=True))
+            self._cons = list(
+                model.component_data_objects(Constraint, active=True, descend_into=True)
+            )
+
+    @staticmethod
+    def _get_suffix(model, name):
+        suffix = model.component(name)
+        if suffix is not None and suffix.ctype is Suffix:
+            return suffix
+        return None
+
+    def store(self, model, point):
+        """
+        Take a snapshot of the current state of model.
+
+        Args:
+            model: model to take snapshot of
+            point: location of the sample in (scaled) input space
+
+        Returns:
+            None
+        """
+        self._bind(model)
+
+        snapshot = {
+            "vars": np.array(
+                [v.value if v.value is not None else np.nan for v in self._vars],
+                dtype=float,
+            )
+        }
+        for name, comps in [
+            ("dual", self._cons),
+            ("ipopt_zL_out", self._vars),
+            ("ipopt_zU_out", self._vars),
+        ]:
+            suffix = self._get_suffix(model, name)
+            if suffix is not None and suffix.import_enabled():
+                snapshot[name] = np.array(
+                    [suffix.get(c, np.nan) for c in comps], dtype=float
+                )
+
+        self._points.append(np.asarray(point, dtype=float))
+        self._snapshots.append(snapshot)
+        if len(self._snapshots) > self._history:
+            self._points.pop(0)
+            self._snapshots.pop(0)
+
+    def restore(self, model, point):
+        """
+        Restore the snapshot closest to point into model.
+
+        Args:
+            model: model to restore state into
+            point: location of the sample in (scaled) input space
+
+        Returns:
+            bool indicating whether a snapshot was restored
+        """
+        if len(self._snapshots) == 0:
+            return False
+
+        self._bind(model)
+
+        dist = np.sum((np.stack(self._points) - np.asarray(point)) ** 2, axis=1)
+        snapshot = self._snapshots[int(np.argmin(dist))]
+
+        if len(snapshot["vars"]) != len(self._vars):
+            _log.warning(
+                "Model structure does not match stored snapshot; skipping warm start."
+            )
+            return False
+
+        for v, val in zip(self._vars, snapshot["vars"].tolist()):
+            if not v.fixed and val == val:  # val == val filters out NaNs
+                v.set_value(val, skip_validation=True)
+
+        for out_name, in_name, comps in [
+            ("dual", "dual", self._cons),
+            ("ipopt_zL_out", "ipopt_zL_in", self._vars),
+            ("ipopt_zU_out", "ipopt_zU_in", self._vars),
+        ]:
+            suffix = self._get_suffix(model, in_name)
+            if out_name not in snapshot or suffix is None:
+                continue
+            if not suffix.export_enabled():
+                continue
+            for c, val in zip(comps, snapshot[out_name].tolist()):
+                if val == val:
+                    suffix[c] = val
+
+        return True
+
+    def clear(self):
+        """
+        Remove all stored snapshots.
+        """
+        self._points = []
+        self._snapshots = []
+        self._model = None
+        self._vars = None
+        self._cons = None
+
+
+class JSONLinesResultStore:
+    """
+    Append-only on-disk store for parameter sweep results using the JSON Lines
+    format.
+
+    The first line of the file contains the serialized ParameterSweepSpecification
+    used for the sweep, and each following line contains the results of a
+    single sample (sample ID, success, results and error) written as soon as
+    the sample completes. This allows interrupted sweeps to be resumed, and avoids
+    the need to hold all results in memory.
+    """
+
+    def __init__(self, filename: str):
+        """
+        Args:
+            filename: name of file to store results in
+        """
+        self._filename = filename
+
+    @property
+    def filename(self):
+        """
+        Returns the name of the file used to store results.
+        """
+        return self._filename
+
+    def exists(self):
+        """
+        Returns True if the results file exists.
+        """
+        return os.path.isfile(self._filename)
+
+    def create(self, specification: dict):
+        """
+        Create a new (empty) results file, overwriting any existing file.
+
+        Args:
+            specification: serialized ParameterSweepSpecification (from to_dict)
+
+        Returns:
+            None
+        """
+        with open(self._filename, "w") as fd:
+            fd.write(json.dumps({"specification": specification}) + "\n")
+
+    def append(self, sample_id: int, record: dict):
+        """
+        Append the results of a sample to the results file.
+
+        Args:
+            sample_id: ID of sample
+            record: dict of results for sample (success, results and error)
+
+        Returns:
+            None
+        """
+        line = json.dumps({"sample_id": int(sample_id), **record})
+        with open(self._filename, "a") as fd:
+            fd.write(line + "\n")
+            fd.flush()
+
+    def load(self):
+        """
+        Load specification and results from the results file.
+
+        Incomplete lines (e.g. due to the sweep being interrupted whilst writing a
+        result) are ignored.
+
+        Returns:
+            specification: serialized ParameterSweepSpecification
+            results: dict of results indexed by sample ID
+        """
+        specification = None
+        results = {}
+        with open(self._filename, "r") as fd:
+            for line in fd:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    _log.warning(
+                        f"Ignoring incomplete record in results file {self._filename}."
+                    )
+                    continue
+
+                if "specification" in record:
+                    specification = record["specification"]
+                else:
+                    sample_id = record.pop("sample_id")
+                    results[sample_id] = record
+
+        return specification, results
+
+    def check_specification(self, specification: dict):
+        """
+        Check that the results file was created for the given specification.
+
+        Args:
+            specification: serialized ParameterSweepSpecification (from to_dict)
+
+        Raises:
+            ConfigurationError if the stored specification does not match
+        """
+        stored, _ = self.load()
+        # Round trip through json so both dicts use the same representation
+        if stored != json.loads(json.dumps(specification)):
+            raise ConfigurationError(
+                f"Cannot resume parameter sweep: the specification stored in "
+                f"{self._filename} does not match the current input specification."
+            )
+
+
 def is_psweepspec(val):
     """
     Config validator for ParameterSweepSpecifications
@@ -405,6 +911,78 @@ CONFIG.declare(
         doc="Whether to halt execution of parameter sweep on encountering a solver error (default=False).",
     ),
 )
+CONFIG.declare(
+    "sample_ordering",
+    ConfigValue(
+        default=None,
+        domain=In([None, "nearest_neighbour", "space_filling"]),
+        doc="Order in which to execute samples. None executes samples in the order "
+        "they were generated, nearest_neighbour follows a greedy nearest-neighbour "
+        "path through the samples and space_filling follows a Z-order space filling "
+        "curve (default=None).",
+    ),
+)
+CONFIG.declare(
+    "warm_start",
+    ConfigValue(
+        default=False,
+        domain=bool,
+        doc="Whether to initialize each sample from the solution of the closest "
+        "previously converged sample (default=False).",
+    ),
+)
+CONFIG.declare(
+    "warm_start_history",
+    ConfigValue(
+        default=100,
+        domain=PositiveInt,
+        doc="Maximum number of converged solutions to keep for warm starting "
+        "(default=100).",
+    ),
+)
+CONFIG.declare(
+    "result_store",
+    ConfigValue(
+        default=None,
+        domain=str,
+        doc="Name of JSON Lines file to write results to as each sample completes "
+        "(default=None, results are only stored in memory).",
+    ),
+)
+CONFIG.declare(
+    "resume",
+    ConfigValue(
+        default=False,
+        domain=bool,
+        doc="Whether to resume a previous sweep by skipping samples already present "
+        "in the result_store (default=False).",
+    ),
+)
+CONFIG.declare(
+    "keep_results_in_memory",
+    ConfigValue(
+        default=True,
+        domain=bool,
+        doc="Whether to also keep results in memory when using a result_store. If "
+        "False, results are read back from the result_store when requested "
+        "(default=True).",
+    ),
+)
+CONFIG.declare(
+    "sample_timeout",
+    ConfigValue(
+        default=None,
+        domain=PositiveFloat,
+        doc="Maximum wall-clock time (in seconds) allowed for running each sample. "
+        "Samples exceeding this limit are recorded as failed, and the model is "
+        "rebuilt for the next sample (default=None, no limit). If no run_model "
+        "callback is given and the solver runs as a subprocess (e.g. ipopt), the "
+        "limit is passed to the solver, which kills the subprocess once the limit "
+        "is reached. Otherwise the limit is enforced using SIGALRM, which is only "
+        "possible from the main thread on platforms supporting it, and a "
+        "ConfigurationError is raised if it cannot be enforced.",
+    ),
+)
 CONFIG.declare(
     "input_specification",
     ConfigValue(
@@ -432,18 +1010,117 @@ class ParameterSweepBase:
     the model to be studied using a set of callbacks.
     """
 
+    CONFIG = CONFIG()
+
     def __init__(self, **kwargs):
-        self.config = CONFIG(kwargs)
+        self.config = self.CONFIG(kwargs)
         self._results = {}
         self._model = None  # used to store model instance if rebuild_model is False
+        self._input_binding = None  # resolved inputs for the most recent model
+        self._warm_start_cache = None  # converged solutions if warm_start is True
 
     @property
     def results(self):
         """
         Returns dict containing the results from the parameter sweep.
+
+        If keep_results_in_memory is False, results are loaded from the result_store.
         """
+        if not self.config.keep_results_in_memory and self.config.result_store:
+            return self.load_results_from_store()
         return self._results
 
+    def get_result_store(self, shard: str = None):
+        """
+        Get JSONLinesResultStore to write results to (if result_store is set).
+
+        Args:
+            shard: (optional) suffix to append to the result_store file name, used
+                when several processes write results separately.
+
+        Returns:
+            JSONLinesResultStore or None if result_store is not set
+
+        Raises:
+            ConfigurationError if resume is True but result_store is not set
+        """
+        if self.config.result_store is None:
+            if self.config.resume:
+                raise ConfigurationError(
+                    "Cannot resume parameter sweep as no result_store was specified."
+                )
+            return None
+
+        filename = self.config.result_store
+        if shard is not None:
+            filename = f"{filename}.{shard}"
+        return JSONLinesResultStore(filename)
+
+    def _result_store_files(self):
+        # Main result file plus any shards written by MPI ranks
+        base = self.config.result_store
+        return [base] + sorted(glob(glob_escape(base) + ".rank*"))
+
+    def load_results_from_store(self):
+        """
+        Load results from the result_store file (and any shards of it).
+
+        Returns:
+            dict of results indexed by sample ID, in sample order
+        """
+        loaded = {}
+        for f in self._result_store_files():
+            store = JSONLinesResultStore(f)
+            if store.exists():
+                loaded.update(store.load()[1])
+
+        results = {}
+        for s in self.get_input_samples().index:
+            if int(s) in loaded:
+                results[s] = loaded[int(s)]
+        return results
+
+    def _begin_sweep(self, store):
+        """
+        Reset runner state before executing a sweep and prepare result store.
+
+        Args:
+            store: JSONLinesResultStore to write to (or None)
+
+        Returns:
+            dict of results for samples already present in the store if resuming
+        """
+        self._results = {}
+        self._warm_start_cache = None
+
+        if store is None:
+            return {}
+
+        spec = self.get_input_specification().to_dict()
+        if self.config.resume and store.exists():
+            store.check_specification(spec)
+            return self.load_results_from_store()
+
+        store.create(spec)
+        return {}
+
+    def _record_result(self, store, results: dict, sample_id, record: dict):
+        """
+        Record results of a sample, writing to store if provided.
+        """
+        if store is not None:
+            store.append(sample_id, record)
+        if self.config.keep_results_in_memory or store is None:
+            results[sample_id] = record
+
+    def _finish_sweep(self, sample_ids, results: dict):
+        """
+        Store results of sweep in sample order.
+        """
+        if self.config.keep_results_in_memory or self.config.result_store is None:
+            for s in sample_ids:
+                self._results[s] = results[s]
+
     def execute_parameter_sweep(self):
         """
         Placeholder method for parameter sweep runners.
@@ -470,12 +1147,22 @@ class ParameterSweepBase:
             results: results generated by build_outputs callback
             success: bool indicating whether execution was successful
             error: str if error occurs during solve else None
+
+        Raises:
+            ConfigurationError if the sample_timeout cannot be enforced
         """
         model = self.get_initialized_model()
 
         # Load sample values
         self.set_input_values(model, sample_id)
 
+        if self.config.warm_start:
+            self.get_warm_start_cache().restore(
+                model, self.get_scaled_sample_point(sample_id)
+            )
+
+        self._check_sample_timeout(self.config.solver)
+
         # Try/except to catch any critical failures that occur
         error = None
         try:
@@ -484,12 +1171,22 @@ class ParameterSweepBase:
             if not success:
                 _log.warning(f"Sample {sample_id} did not report success.")
         except Exception as e:  # pylint: disable=broad-except
+            if isinstance(e, SampleTimeoutError):
+                # The run may have been interrupted part way through loading
+                # results into the model, so it must not be reused
+                self._model = None
+
             if self.config.halt_on_error:
                 raise
 
             success = False
             error = str(e)  # Cast to string for storage
 
+        if success and self.config.warm_start:
+            self.get_warm_start_cache().store(
+                model, self.get_scaled_sample_point(sample_id)
+            )
+
         # Compile Results
         if error is None:
             results = self.build_outputs(model, run_stats)
@@ -582,11 +1279,92 @@ class ParameterSweepBase:
 
         return samples.iloc[sample_id]
 
+    def get_sample_order(self):
+        """
+        Get the order in which samples should be executed, based on the
+        sample_ordering configuration option.
+
+        Returns:
+            list of sample IDs in execution order
+        """
+        samples = self.get_input_samples()
+        sample_ids = list(samples.index)
+
+        if self.config.sample_ordering is None or len(sample_ids) == 0:
+            return sample_ids
+
+        points = _normalized_sample_points(
+            samples, self.get_input_specification().inputs
+        )
+        if self.config.sample_ordering == "nearest_neighbour":
+            order = nearest_neighbour_order(points)
+        else:
+            order = space_filling_order(points)
+
+        return [sample_ids[i] for i in order]
+
+    def get_scaled_sample_point(self, sample_id: int):
+        """
+        Get the location of a sample in input space, scaled to the unit hypercube
+        using the bounds of each input.
+
+        Args:
+            sample_id: int representing a row in the specification.samples dataframe
+
+        Returns:
+            NumPy array of scaled input values
+        """
+        inputs = self.get_input_specification().inputs
+        samples = self.get_input_samples()
+        return _normalized_sample_points(samples.loc[[sample_id]], inputs)[0]
+
+    def get_warm_start_cache(self):
+        """
+        Get the WarmStartCache used to store converged solutions, creating it
+        if required.
+
+        Returns:
+            WarmStartCache
+        """
+        if self._warm_start_cache is None:
+            self._warm_start_cache = WarmStartCache(
+                history=self.config.warm_start_history
+            )
+        return self._warm_start_cache
+
+    def get_input_binding(self, model):
+        """
+        Get the InputBinding for an instance of the model, building it if required.
+
+        The binding is cached for the most recent model instance and set of samples,
+        and is rebuilt if either of these changes.
+
+        Args:
+            model: instance of model to be executed
+
+        Returns:
+            InputBinding for model
+        """
+        samples = self.get_input_samples()
+
+        if self._input_binding is not None:
+            binding = self._input_binding
+            if binding.model is model and binding.samples is samples:
+                return binding
+
+        binding = InputBinding(model, self.get_input_specification().inputs, samples)
+        self._input_binding = binding
+
+        return binding
+
     def set_input_values(self, model, sample_id: int):
         """
         Set values of input variables/parameters in instance of model using values
         from sample_id.
 
+        Inputs are resolved and validated once per model instance (see
+        get_input_binding), after which loading a sample only assigns values.
+
         Args:
             model: instance of model to be executed
             sample_id: int representing a row in the specification.samples dataframe
@@ -598,57 +1376,7 @@ class ParameterSweepBase:
             ValueError if an input cannot be found or if it is not a fixed Var or
             mutable Param
         """
-        samples = self.get_input_samples()
-        inputs = self.config.input_specification.inputs
-
-        for k, i in inputs.items():
-            v = samples[k][sample_id]
-
-            # k stores the "name" of the input
-            # need to get the pyomo path of the input from the inputs structure
-            pyomo_path = i["pyomo_path"]
-
-            comp = model.find_component(pyomo_path)
-            try:
-                ctype = comp.ctype
-            except AttributeError:
-                ctype = None
-
-            # TODO: Validate bounds
-
-            if ctype is Param:
-                if comp.is_constant():
-                    raise ValueError(
-                        f"Convergence testing found an input of type Param that "
-                        f"was not mutable ({comp.name}). Please make sure all "
-                        f"sampled inputs are either mutable params or fixed vars."
-                    )
-                comp.set_value(v)
-            elif ctype is Var:
-                try:
-                    if not comp.is_fixed():
-                        raise ValueError(
-                            f"Convergence testing found an input of type Var that "
-                            f"was not fixed ({comp.name}). Please make sure all "
-                            f"sampled inputs are either mutable params or fixed vars."
-                        )
-                    comp.set_value(float(v))
-                except AttributeError:
-                    # Component might be indexed, try iterating and setting value
-                    for i, c in comp.items():
-                        if not c.is_fixed():
-                            raise ValueError(
-                                f"Convergence testing found an input of type IndexedVar that "
-                                f"was not fixed ({comp.name}, index {i}). Please make sure all "
-                                f"sampled inputs are either mutable params or fixed vars."
-                            )
-                        c.set_value(float(v))
-            else:
-                raise ValueError(
-                    f"Failed to find a valid input component (must be "
-                    f"a fixed Var or a mutable Param). Instead, "
-                    f"pyomo_path: {pyomo_path} returned: {comp}."
-                )
+        self.get_input_binding(model).load_sample(sample_id)
 
     def run_model(self, model, solver):
         """
@@ -661,18 +1389,56 @@ class ParameterSweepBase:
         Returns:
             success: bool indicating whether execution was successful or not
             run_stats: output collected by run_model callback (default is Pyomo SolverResults object)
+
+        Raises:
+            SampleTimeoutError if the run exceeds the sample_timeout
+            ConfigurationError if the sample_timeout cannot be enforced
         """
-        if self.config.run_model is None:
-            res = solver.solve(model)
+        timeout = self.config.sample_timeout
+        self._check_sample_timeout(solver)
+
+        if timeout is not None and self._solver_enforces_timeout(solver):
+            try:
+                res = solver.solve(model, timelimit=timeout)
+            except subprocess.TimeoutExpired as e:
+                # The solver subprocess has been killed and no results loaded
+                raise SampleTimeoutError(
+                    f"Sample exceeded time limit of {timeout} s."
+                ) from e
 
             success = check_optimal_termination(res)
             return success, res
 
-        args = self.config.run_model_arguments
-        if args is None:
-            args = {}
+        with _sample_time_limit(timeout):
+            if self.config.run_model is None:
+                res = solver.solve(model)
+
+                success = check_optimal_termination(res)
+                return success, res
+
+            args = self.config.run_model_arguments
+            if args is None:
+                args = {}
+
+            return self.config.run_model(model, solver, **args)
 
-        return self.config.run_model(model, solver, **args)
+    def _solver_enforces_timeout(self, solver):
+        # Solvers run as subprocesses enforce a time limit by killing the
+        # subprocess, which is only used if no run_model callback is given
+        return self.config.run_model is None and isinstance(solver, SystemCallSolver)
+
+    def _check_sample_timeout(self, solver):
+        if (
+            self.config.sample_timeout is not None
+            and not self._solver_enforces_timeout(solver)
+            and not _time_limit_supported()
+        ):
+            raise ConfigurationError(
+                "sample_timeout cannot be enforced in this context. Time limits "
+                "for run_model callbacks and solvers which do not run as a "
+                "subprocess rely on SIGALRM, which is only available from the "
+                "main thread on platforms supporting it."
+            )
 
     def build_outputs(self, model, run_stats):
         """
@@ -815,15 +1581,298 @@ class SequentialSweepRunner(ParameterSweepBase):
         Returns:
             dict of results indexed by sample ID.
         """
-        self._results = {}
         samples = self.get_input_samples()
+        store = self.get_result_store()
+        results = self._begin_sweep(store)
 
-        count = 1
-        for s in samples.index:
+        count = len(results) + 1
+        for s in self.get_sample_order():
+            if s in results:
+                continue
             sresults, success, error = self.execute_single_sample(s)
-            self._results[s] = {"success": success, "results": sresults, "error": error}
+            self._record_result(
+                store,
+                results,
+                s,
+                {"success": success, "results": sresults, "error": error},
+            )
 
             self.progress_bar(float(count) / float(len(samples)), "Complete")
             count += 1
 
+        # Store results in sample order, regardless of execution order
+        self._finish_sweep(samples.index, results)
+
+        return self.results
+
+
+def _chunk_sample_ids(sample_ids, chunk_size):
+    """
+    Split a list of sample IDs into consecutive chunks of (at most) chunk_size.
+    """
+    return [
+        sample_ids[i : i + chunk_size] for i in range(0, len(sample_ids), chunk_size)
+    ]
+
+
+def _execute_sample_chunk(runner, sample_ids):
+    """
+    Execute a chunk of samples using runner and return a list of
+    (sample_id, result record) tuples.
+    """
+    chunk_results = []
+    for s in sample_ids:
+        sresults, success, error = runner.execute_single_sample(s)
+        chunk_results.append(
+            (s, {"success": success, "results": sresults, "error": error})
+        )
+    return chunk_results
+
+
+# Parameter sweep runner held by each worker process of a ParallelSweepRunner
+_worker_runner = None
+
+
+def _initialize_worker(runner):
+    # Store the runner in the worker process so that it is only transferred once
+    global _worker_runner  # pylint: disable=global-statement
+    _worker_runner = runner
+
+
+def _execute_worker_chunk(sample_ids):
+    return _execute_sample_chunk(_worker_runner, sample_ids)
+
+
+PCONFIG = CONFIG()
+PCONFIG.declare(
+    "number_of_workers",
+    ConfigValue(
+        default=None,
+        domain=PositiveInt,
+        doc="Number of worker processes to use (default=None, use the number of "
+        "CPUs available).",
+    ),
+)
+PCONFIG.declare(
+    "chunk_size",
+    ConfigValue(
+        default=None,
+        domain=PositiveInt,
+        doc="Number of samples to send to a worker in each task (default=None, "
+        "split samples into approximately four chunks per worker).",
+    ),
+)
+
+
+@document_kwargs_from_configdict(PCONFIG)
+class ParallelSweepRunner(ParameterSweepBase):
+    """
+    Process-pool runner for parameter sweeps.
+
+    This class executes a parameter sweep by distributing chunks of sample IDs
+    across a pool of worker processes. Each worker receives a copy of the runner
+    when it starts and builds its own model instances using get_initialized_model
+    (thus, if rebuild_model is False, each worker builds one model and reuses it
+    for all the samples it executes). Results are gathered into the results dict
+    in sample order, as for the SequentialSweepRunner.
+
+    Note that the runner (including all callbacks and their arguments) must be
+    picklable in order to be sent to the worker processes.
+    """
+
+    CONFIG = PCONFIG()
+
+    def get_number_of_workers(self):
+        """
+        Get number of worker processes to use.
+
+        Returns:
+            int
+        """
+        if self.config.number_of_workers is None:
+            return os.cpu_count() or 1
+        return self.config.number_of_workers
+
+    def get_chunk_size(self, number_of_samples: int, number_of_workers: int):
+        """
+        Get number of samples to include in each task sent to a worker.
+
+        Args:
+            number_of_samples: total number of samples to execute
+            number_of_workers: number of workers samples will be distributed between
+
+        Returns:
+            int
+        """
+        if self.config.chunk_size is None:
+            return max(1, ceil(number_of_samples / (4 * number_of_workers)))
+        return self.config.chunk_size
+
+    def execute_parameter_sweep(self):
+        """
+        Execute parallel parameter sweep.
+
+        Returns:
+            dict of results indexed by sample ID.
+        """
+        # Generate samples before starting workers so they all see the same set
+        samples = self.get_input_samples()
+        sample_ids = list(samples.index)
+        store = self.get_result_store()
+        results = self._begin_sweep(store)
+        ordered_ids = [s for s in self.get_sample_order() if s not in results]
+        completed = len(results)
+
+        n_workers = min(self.get_number_of_workers(), max(len(sample_ids), 1))
+        chunks = _chunk_sample_ids(
+            ordered_ids, self.get_chunk_size(len(sample_ids), n_workers)
+        )
+
+        # Do not send any cached model instance to the workers
+        model = self._model
+        binding = self._input_binding
+        self._model = None
+        self._input_binding = None
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_initialize_worker,
+                initargs=(self,),
+            ) as executor:
+                futures = [executor.submit(_execute_worker_chunk, c) for c in chunks]
+                try:
+                    for f in as_completed(futures):
+                        for s, record in f.result():
+                            self._record_result(store, results, s, record)
+                            completed += 1
+
+                        self.progress_bar(
+                            float(completed) / float(len(sample_ids)), "Complete"
+                        )
+                except BaseException:
+                    for f in futures:
+                        f.cancel()
+                    raise
+        finally:
+            self._model = model
+            self._input_binding = binding
+
+        self._finish_sweep(sample_ids, results)
+
+        return self.results
+
+
+@document_kwargs_from_configdict(PCONFIG)
+class MPISweepRunner(ParameterSweepBase):
+    """
+    MPI runner for parameter sweeps.
+
+    This class executes a parameter sweep by distributing chunks of sample IDs
+    across the processes of an MPI job (using the MPIInterface from
+    idaes.core.util.convergence.mpi_utils). Chunks are assigned to ranks in a
+    round-robin fashion and each rank builds its own model instances using
+    get_initialized_model. Results from all ranks are gathered on the root process
+    and then broadcast, so that the results dict is complete on every rank.
+
+    The number_of_workers option is ignored, as the number of workers is set by the
+    size of the MPI job. If mpi4py is not available, all samples are run on the
+    current process.
+    """
+
+    CONFIG = PCONFIG()
+
+    def __init__(self, mpi_interface=None, **kwargs):
+        super().__init__(**kwargs)
+
+        if mpi_interface is None:
+            mpi_interface = MPIInterface()
+        self._mpi_interface = mpi_interface
+
+    @property
+    def mpi_interface(self):
+        """
+        Returns the MPIInterface used by the runner.
+        """
+        return self._mpi_interface
+
+    def is_root(self):
+        """
+        Returns True if this is the root process (or MPI is not available).
+        """
+        return not self._mpi_interface.have_mpi or self._mpi_interface.rank == 0
+
+    def execute_parameter_sweep(self):
+        """
+        Execute MPI parameter sweep.
+
+        Returns:
+            dict of results indexed by sample ID.
+        """
+        mpi = self._mpi_interface
+
+        if mpi.have_mpi:
+            size = mpi.size
+            rank = mpi.rank
+        else:
+            size = 1
+            rank = 0
+
+        # Generate samples on the root process and share them, so that all ranks
+        # work with the same set of samples
+        samples = None
+        if rank == 0:
+            samples = self.get_input_samples()
+        if size > 1:
+            samples = mpi.comm.bcast(samples, root=0)
+            self.get_input_specification()._samples = samples
+
+        sample_ids = list(samples.index)
+
+        # Each rank writes results to its own shard of the result store
+        store = self.get_result_store(shard=f"rank{rank}" if size > 1 else None)
+        completed = None
+        if rank == 0:
+            completed = self._begin_sweep(self.get_result_store())
+            if store is not None and size > 1 and not self.config.resume:
+                # Fresh sweep, so remove any results from previous runs
+                for f in self._result_store_files()[1:]:
+                    os.remove(f)
+        if size > 1:
+            # Also ensures root has prepared the result store before ranks write
+            completed = mpi.comm.bcast(completed, root=0)
+            if rank != 0:
+                self._begin_sweep(None)
+            if store is not None and not (self.config.resume and store.exists()):
+                store.create(self.get_input_specification().to_dict())
+
+        chunk_size = self.config.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, ceil(len(sample_ids) / (4 * size)))
+        chunks = _chunk_sample_ids(
+            [s for s in self.get_sample_order() if s not in completed], chunk_size
+        )
+
+        local_results = {}
+        for i in range(rank, len(chunks), size):
+            for s, record in _execute_sample_chunk(self, chunks[i]):
+                self._record_result(store, local_results, s, record)
+
+            if rank == 0:
+                # Progress of the root process only
+                self.progress_bar(
+                    float(min(i + size, len(chunks))) / float(len(chunks)),
+                    "Complete",
+                )
+
+        if size > 1 and (self.config.keep_results_in_memory or store is None):
+            gathered = mpi.comm.gather(local_results, root=0)
+            if rank == 0:
+                for rank_results in gathered:
+                    completed.update(rank_results)
+            completed = mpi.comm.bcast(completed, root=0)
+        else:
+            completed.update(local_results)
+
+        self._finish_sweep(sample_ids, completed)
+
         return self.results
@@ -14,6 +14,9 @@
 Tests for math util methods.
 """
 
+import logging
+
+import numpy as np
 import pytest
 from pyomo.environ import (
     Block,
@@ -31,6 +34,12 @@ from pyomo.environ import (
     check_optimal_termination,
 )
 from pyomo.network import Arc, Port
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.contrib.incidence_analysis import (
+    IncidenceGraphInterface,
+    solve_strongly_connected_components,
+)
 
 from idaes.core import (
     FlowsheetBlock,
@@ -58,6 +67,8 @@ from idaes.core.util.initialization import (
     propagate_state,
     solve_indexed_blocks,
     initialize_by_time_element,
+    batch_solve_strongly_connected_components,
+    _incidence_signature,
 )
 from idaes.core.solvers import get_solver
 
@@ -1090,3 +1101,204 @@ def test_initialize_by_time_element():
 
     results = solver.solve(m.fs)
     assert check_optimal_termination(results)
+
+
+class NewtonSolver:
+    """
+    Minimal dense Newton solver used to test SCC solves without an NLP solver.
+    Systems larger than max_size are left unsolved (or raise an exception if
+    raise_on_fail is True) to emulate solver failures.
+    """
+
+    def __init__(self, max_size=None, raise_on_fail=False):
+        self.max_size = max_size
+        self.raise_on_fail = raise_on_fail
+        self.calls = []
+
+    def solve(self, blk, **kwds):
+        variables = list(blk.vars.values())
+        constraints = list(blk.cons.values())
+        self.calls.append(len(variables))
+
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.maxIterations
+        if self.max_size is not None and len(variables) > self.max_size:
+            if self.raise_on_fail:
+                raise RuntimeError("Solver failed")
+            return results
+
+        for _ in range(50):
+            residual = np.array([value(c.body - c.upper) for c in constraints])
+            if max(abs(residual)) < 1e-12:
+                results.solver.termination_condition = TerminationCondition.optimal
+                break
+            jac = np.array(
+                [[differentiate(c.body, wrt=v) for v in variables] for c in constraints]
+            )
+            step = np.linalg.solve(jac, -residual)
+            for v, dx in zip(variables, step):
+                v.set_value(v.value + dx)
+        return results
+
+
+def build_scc_model(n_blocks=4):
+    m = ConcreteModel()
+    m.b = Block(range(n_blocks))
+    for i, b in m.b.items():
+        b.p = Var(initialize=i + 1)
+        b.p.fix()
+        b.x = Var(initialize=1)
+        b.y = Var(initialize=1)
+        b.z = Var(initialize=1)
+        b.w = Var(initialize=1)
+        b.c1 = Constraint(expr=b.x == 2 * b.p)
+        b.c2 = Constraint(expr=b.y + b.z == 3 * b.x)
+        b.c3 = Constraint(expr=b.y - b.z**2 == 1)
+        b.c4 = Constraint(expr=b.w == b.y * b.z)
+    return m
+
+
+def check_scc_solution(m):
+    for b in m.b.values():
+        for c in b.component_data_objects(Constraint, active=True):
+            assert value(c.body) == pytest.approx(value(c.upper), abs=1e-8)
+
+
+@pytest.mark.unit
+def test_incidence_signature():
+    m = build_scc_model()
+    signatures = [
+        _incidence_signature(b, IncidenceGraphInterface(b, include_inequality=False))
+        for b in m.b.values()
+    ]
+    assert all(sig == signatures[0] for sig in signatures)
+    assert signatures[0][0] == ("x", "y", "z", "w")
+    assert signatures[0][1] == ("c1", "c2", "c3", "c4")
+
+    m.b[3].c4.deactivate()
+    m.b[3].w.fix()
+    assert (
+        _incidence_signature(
+            m.b[3], IncidenceGraphInterface(m.b[3], include_inequality=False)
+        )
+        != signatures[0]
+    )
+
+    # Blocks referencing unfixed variables outside the block cannot be grouped
+    m.ext = Var()
+    m.b[2].c5 = Constraint(expr=m.ext == m.b[2].w)
+    assert (
+        _incidence_signature(
+            m.b[2], IncidenceGraphInterface(m.b[2], include_inequality=False)
+        )
+        is None
+    )
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs():
+    m = build_scc_model()
+    newton = NewtonSolver()
+
+    batch_solve_strongly_connected_components(m.b, solver=newton)
+
+    # The 2x2 components of all blocks are solved together
+    assert newton.calls == [8]
+    check_scc_solution(m)
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs_matches_individual():
+    m1 = build_scc_model()
+    m2 = build_scc_model()
+
+    batch_solve_strongly_connected_components(
+        list(m1.b.values()), solver=NewtonSolver()
+    )
+    for b in m2.b.values():
+        solve_strongly_connected_components(b, solver=NewtonSolver())
+
+    for b1, b2 in zip(m1.b.values(), m2.b.values()):
+        for v in ("x", "y", "z", "w"):
+            assert b1.component(v).value == pytest.approx(b2.component(v).value)
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs_unique_structure():
+    m = build_scc_model()
+    m.b[3].c4.deactivate()
+    m.b[3].w.fix()
+    newton = NewtonSolver()
+
+    batch_solve_strongly_connected_components(m.b, solver=newton)
+
+    assert newton.calls == [6, 2]
+    check_scc_solution(m)
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs_fallback():
+    m = build_scc_model()
+    # Stacked solve "fails", so each block is solved individually
+    newton = NewtonSolver(max_size=2)
+
+    batch_solve_strongly_connected_components(m.b, solver=newton)
+
+    assert newton.calls == [8, 2, 2, 2, 2]
+    check_scc_solution(m)
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs_fallback_converged_blocks():
+    m = build_scc_model()
+    # Block 1 starts at its solution, so only the other blocks are re-solved
+    m.b[1].y.set_value(12 - (-1 + 45**0.5) / 2)
+    m.b[1].z.set_value((-1 + 45**0.5) / 2)
+    newton = NewtonSolver(max_size=2)
+
+    batch_solve_strongly_connected_components(m.b, solver=newton)
+
+    assert newton.calls == [8, 2, 2, 2]
+    check_scc_solution(m)
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs_fallback_on_exception(caplog):
+    m = build_scc_model()
+    # Stacked solve raises, so each block is solved individually
+    newton = NewtonSolver(max_size=2, raise_on_fail=True)
+
+    with caplog.at_level(logging.WARNING):
+        res = batch_solve_strongly_connected_components(m.b, solver=newton)
+
+    assert newton.calls == [8, 2, 2, 2, 2]
+    assert "Stacked solve of 4 strongly connected components failed" in caplog.text
+    assert all(
+        r.solver.termination_condition == TerminationCondition.optimal
+        for r in res
+        if isinstance(r, SolverResults)
+    )
+    check_scc_solution(m)
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs_fallback_failed(caplog):
+    m = build_scc_model()
+    # Neither the stacked solve nor the individual re-solves converge
+    newton = NewtonSolver(max_size=1)
+
+    with caplog.at_level(logging.WARNING):
+        batch_solve_strongly_connected_components(m.b, solver=newton)
+
+    assert newton.calls == [8, 2, 2, 2, 2]
+    assert caplog.text.count("Failed to solve strongly connected component") == 4
+    assert "b[2].y" in caplog.text
+
+
+@pytest.mark.unit
+def test_batch_solve_sccs_no_solver():
+    m = build_scc_model()
+
+    with pytest.raises(RuntimeError, match="An external solver is required"):
+        batch_solve_strongly_connected_components(m.b)
@@ -19,9 +19,11 @@ import numpy as np
 import pytest
 import re
 import os
+import time
 from copy import deepcopy
 
 from pandas import DataFrame
+from scipy.sparse import csr_matrix, random as random_sparse
 
 from pyomo.environ import (
     Block,
@@ -46,7 +48,7 @@ from pyomo.environ import (
     Param,
     Integers,
 )
-from pyomo.common.collections import ComponentSet
+from pyomo.common.collections import ComponentMap, ComponentSet
 from pyomo.contrib.pynumero.asl import AmplInterface
 from pyomo.contrib.pynumero.interfaces.pyomo_nlp import PyomoNLP
 from pyomo.common.fileutils import this_file_dir
@@ -65,6 +67,7 @@ from idaes.core.util.model_diagnostics import (
     DegeneracyHunter,
     IpoptConvergenceAnalysis,
     DegeneracyHunter2,
+    NLPEvaluationSession,
     svd_dense,
     svd_sparse,
     get_valid_range_of_component,
@@ -82,7 +85,9 @@ from idaes.core.util.model_diagnostics import (
     check_parallel_jacobian,
     compute_ill_conditioning_certificate,
 )
+from idaes.core.util.model_statistics import large_residuals_set
 from idaes.core.util.parameter_sweep import (
+    ParallelSweepRunner,
     SequentialSweepRunner,
     ParameterSweepSpecification,
 )
@@ -1514,6 +1519,278 @@ Suggested next steps:
         assert isinstance(dh, DegeneracyHunter2)
 
 
+class TestNLPEvaluationSession:
+    @pytest.fixture
+    def model(self):
+        m = ConcreteModel()
+        m.x = Var(initialize=1)
+        m.y = Var(initialize=2)
+        m.z = Var(initialize=3)
+        m.p = Param(mutable=True, initialize=1)
+
+        m.c1 = Constraint(expr=m.x + 1e-6 * m.y == m.p)
+        m.c2 = Constraint(expr=1e6 * m.x * m.z == 0)
+        m.c3 = Constraint(expr=m.y + m.z <= 10)
+
+        return m
+
+    @pytest.mark.unit
+    def test_large_residuals(self, model):
+        session = NLPEvaluationSession(model)
+
+        res = session.large_residuals(tol=1e-5)
+        assert res == pytest.approx({model.c2: 3e6})
+        # Cached until values change
+        assert session.large_residuals(tol=1e-5) is res
+        assert session.large_residuals(tol=1e-8) is not res
+
+        model.z.set_value(0)
+        assert session.large_residuals(tol=1e-5) == {}
+
+        model.p.set_value(3)
+        res = session.large_residuals(tol=1e-5)
+        assert res == pytest.approx({model.c1: 2 - 2e-6})
+
+        model.c1.deactivate()
+        assert session.large_residuals(tol=1e-5) == {}
+
+    @pytest.mark.unit
+    def test_large_residuals_none_value(self, model):
+        session = NLPEvaluationSession(model)
+
+        model.x.set_value(None)
+        assert session.residuals() is None
+        assert session.large_residuals(tol=1e-5) == {model.c1: None, model.c2: None}
+
+    @pytest.mark.unit
+    def test_structure_params_outside_model(self, model):
+        model.q = Param(mutable=True, initialize=1)
+        model.unused = Param(mutable=True, initialize=1)
+        model.b = Block()
+        model.b.v = Var(initialize=1)
+        model.b.c = Constraint(expr=model.b.v == model.p)
+        model.b.o = Objective(expr=(model.b.v - model.q) ** 2)
+        session = NLPEvaluationSession(model.b)
+
+        structure, _ = session._get_state()
+        model.unused.set_value(2)
+        assert session._get_state()[0] == structure
+
+        # Params declared outside the model are fixed in the NLP
+        model.p.set_value(2)
+        assert session._get_state()[0] != structure
+        structure, _ = session._get_state()
+        model.q.set_value(2)
+        assert session._get_state()[0] != structure
+
+    @pytest.mark.skipif(
+        not AmplInterface.available(), reason="pynumero_ASL is not available"
+    )
+    @pytest.mark.component
+    def test_residuals(self, model):
+        session = NLPEvaluationSession(model)
+
+        residuals = session.residuals()
+        expected = ComponentMap([(model.c1, 2e-6), (model.c2, 3e6), (model.c3, 0)])
+        assert len(residuals) == 3
+        for c, r in zip(session.constraints, residuals):
+            assert r == pytest.approx(expected[c])
+
+        # Residuals are reported in model order
+        model.x.set_value(-1)
+        model.y.set_value(20)
+        res = session.large_residuals(tol=1e-5)
+        assert list(res) == [model.c1, model.c2, model.c3]
+        assert res == pytest.approx({model.c1: 2 - 2e-5, model.c2: 3e6, model.c3: 13})
+        assert res == pytest.approx(
+            large_residuals_set(model, tol=1e-5, return_residual_values=True)
+        )
+
+        # Residuals of Constraints with no free Vars are included
+        model.x.fix(1)
+        model.y.fix(0)
+        assert session.large_residuals(tol=1e-5) == pytest.approx({model.c2: 3e6})
+
+    @pytest.mark.skipif(
+        not AmplInterface.available(), reason="pynumero_ASL is not available"
+    )
+    @pytest.mark.component
+    def test_nlp_reused_for_value_changes(self, model):
+        session = NLPEvaluationSession(model)
+
+        nlp = session.nlp
+        jac = session.get_jacobian()
+        assert jac[1, 2] == pytest.approx(1e6)
+        assert session.get_jacobian() is jac
+        # Dummy objective is removed after building NLP
+        assert len(list(model.component_objects(Objective))) == 0
+
+        model.x.set_value(4)
+        assert session.nlp is nlp
+        jac = session.get_jacobian()
+        assert jac[1, 2] == pytest.approx(4e6)
+        assert session.get_jacobian(equality_constraints_only=True).shape == (2, 3)
+
+    @pytest.mark.skipif(
+        not AmplInterface.available(), reason="pynumero_ASL is not available"
+    )
+    @pytest.mark.component
+    def test_nlp_rebuilt_for_structure_changes(self, model):
+        session = NLPEvaluationSession(model)
+
+        nlp = session.nlp
+        model.z.fix()
+        assert session.nlp is not nlp
+        assert session.get_jacobian().shape == (3, 2)
+
+        nlp = session.nlp
+        model.z.set_value(5)
+        assert session.nlp is not nlp
+
+        nlp = session.nlp
+        model.c3.deactivate()
+        assert session.nlp is not nlp
+        assert session.get_jacobian().shape == (2, 2)
+
+        nlp = session.nlp
+        model.c4 = Constraint(expr=model.x == model.y)
+        assert session.nlp is not nlp
+        assert session.get_jacobian().shape == (3, 2)
+
+        nlp = session.nlp
+        session.invalidate()
+        assert session.nlp is not nlp
+
+    @pytest.mark.skipif(
+        not AmplInterface.available(), reason="pynumero_ASL is not available"
+    )
+    @pytest.mark.component
+    def test_extreme_jacobian(self, model):
+        session = NLPEvaluationSession(model)
+        jac, nlp = iscale.get_jacobian(model, scaled=False)
+
+        assert session.row_norms() == pytest.approx(
+            [np.linalg.norm(jac[i, :].toarray()) for i in range(3)]
+        )
+        assert session.column_norms() == pytest.approx(
+            [np.linalg.norm(jac[:, j].toarray()) for j in range(3)]
+        )
+
+        for xj, expected in [
+            (
+                session.extreme_jacobian_rows(),
+                iscale.extreme_jacobian_rows(jac=jac, nlp=nlp),
+            ),
+            (
+                session.extreme_jacobian_columns(),
+                iscale.extreme_jacobian_columns(jac=jac, nlp=nlp),
+            ),
+            (
+                session.extreme_jacobian_entries(zero=0),
+                iscale.extreme_jacobian_entries(jac=jac, nlp=nlp, zero=0),
+            ),
+        ]:
+            assert len(xj) == len(expected)
+            for i, j in zip(xj, expected):
+                assert i[0] == pytest.approx(j[0])
+                assert i[1:] == j[1:]
+
+    @pytest.mark.skipif(
+        not AmplInterface.available(), reason="pynumero_ASL is not available"
+    )
+    @pytest.mark.component
+    def test_shared_with_toolboxes(self, model):
+        model.c3.deactivate()
+        dt = DiagnosticsToolbox(model)
+        nlp = dt._nlp_session.nlp
+
+        svd = dt.prepare_svd_toolbox()
+        assert svd.nlp is nlp
+        dh = dt.prepare_degeneracy_hunter()
+        assert dh.nlp is nlp
+        assert dh.jacobian is svd.jacobian
+
+
+@pytest.mark.skipif(
+    not AmplInterface.available(), reason="pynumero_ASL is not available"
+)
+@pytest.mark.performance
+def test_benchmark_nlp_evaluation_session():
+    m = ConcreteModel()
+    m.s = Set(initialize=range(2000))
+    m.x = Var(m.s, initialize=1)
+    m.y = Var(m.s, initialize=2)
+    m.c1 = Constraint(m.s, rule=lambda b, i: b.x[i] ** 2 + b.y[i] == 3)
+    m.c2 = Constraint(m.s, rule=lambda b, i: 1e-6 * b.x[i] == b.y[i] - 2)
+
+    def run_displays(dt):
+        stream = StringIO()
+        dt.display_variables_with_extreme_jacobians(stream)
+        dt.display_constraints_with_extreme_jacobians(stream)
+        dt.display_extreme_jacobian_entries(stream)
+        dt.display_near_parallel_constraints(stream)
+        dt.display_near_parallel_variables(stream)
+        return stream.getvalue()
+
+    dt = DiagnosticsToolbox(m)
+    start = time.perf_counter()
+    for _ in range(3):
+        jac, nlp = iscale.get_jacobian(m, scaled=False)
+        iscale.extreme_jacobian_columns(jac=jac, nlp=nlp)
+        iscale.extreme_jacobian_rows(jac=jac, nlp=nlp)
+        iscale.extreme_jacobian_entries(jac=jac, nlp=nlp, zero=0)
+        for _ in range(2):
+            iscale.get_jacobian(m, scaled=False)
+    rebuilt = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(3):
+        run_displays(dt)
+    cached = time.perf_counter() - start
+
+    print(
+        f"Jacobian displays (3 runs): rebuilt NLP {rebuilt:.2f} s, "
+        f"shared session {cached:.2f} s"
+    )
+    assert cached < rebuilt
+
+
+@pytest.mark.skipif(
+    not AmplInterface.available(), reason="pynumero_ASL is not available"
+)
+@pytest.mark.performance
+def test_benchmark_large_residuals():
+    m = ConcreteModel()
+    m.s = Set(initialize=range(20000))
+    m.x = Var(m.s, initialize=1)
+    m.y = Var(m.s, initialize=2)
+    m.c1 = Constraint(m.s, rule=lambda b, i: b.x[i] ** 2 + b.y[i] == 3 + 1e-3 * i)
+    m.c2 = Constraint(m.s, rule=lambda b, i: b.x[i] * b.y[i] <= 2)
+
+    session = NLPEvaluationSession(m)
+    # Build the NLP outside the timed section, as the session keeps it
+    session.nlp
+
+    start = time.perf_counter()
+    for k in range(3):
+        m.x[0].set_value(1 + k)
+        expected = large_residuals_set(m, tol=1e-5, return_residual_values=True)
+    per_constraint = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for k in range(3):
+        m.x[0].set_value(1 + k)
+        res = session.large_residuals(tol=1e-5)
+    vectorized = time.perf_counter() - start
+
+    print(
+        f"Large residuals (3 runs): per Constraint {per_constraint:.2f} s, "
+        f"vectorized {vectorized:.2f} s"
+    )
+    assert res == pytest.approx(expected)
+    assert vectorized < per_constraint
+
+
 def dummy_callback(arg1):
     pass
 
@@ -2258,6 +2535,30 @@ class TestIpoptConvergenceAnalysis:
         assert isinstance(ca.results, dict)
         assert ca.config.input_specification is None
         assert ca.config.solver_options is None
+        assert ca.config.workflow_runner_options is None
+
+    @pytest.mark.unit
+    def test_init_workflow_runner_options(self, model):
+        ca = IpoptConvergenceAnalysis(
+            model,
+            workflow_runner=ParallelSweepRunner,
+            workflow_runner_options={"number_of_workers": 2, "sample_timeout": 60},
+        )
+
+        assert isinstance(ca._psweep, ParallelSweepRunner)
+        assert ca._psweep.config.number_of_workers == 2
+        assert ca._psweep.config.sample_timeout == 60
+        assert ca._psweep.config.build_model == ca._build_model
+
+    @pytest.mark.unit
+    def test_init_result_store(self, model):
+        ca = IpoptConvergenceAnalysis(
+            model,
+            workflow_runner_options={"result_store": "foo.jsonl", "resume": True},
+        )
+
+        assert ca._psweep.config.result_store == "foo.jsonl"
+        assert ca._psweep.config.resume
 
     @pytest.mark.unit
     def test_build_model(self, model):
@@ -3834,6 +4135,133 @@ class TestCheckParallelJacobian:
         for i in pcol:
             assert tuple(sorted([i[0].name, i[1].name])) in expected
 
+    @pytest.mark.unit
+    def test_jacobian_provided(self):
+        jac = csr_matrix(
+            [
+                [1, 2, 0],
+                [-2, -4, 0],
+                [1, 2, 1e-9],
+                [1, 2.1, 0],
+                [0, 0, 3],
+                [0, 0, -1e-3],
+            ]
+        )
+        nlp = _ComponentLists(jac.shape)
+
+        assert check_parallel_jacobian(None, jac=jac, nlp=nlp) == [
+            ("c0", "c1"),
+            ("c0", "c2"),
+            ("c1", "c2"),
+            ("c4", "c5"),
+        ]
+        assert check_parallel_jacobian(None, direction="column", jac=jac, nlp=nlp) == []
+        assert check_parallel_jacobian(
+            None, tolerance=1e-2, direction="column", jac=jac, nlp=nlp
+        ) == [("v0", "v1")]
+
+    @pytest.mark.unit
+    def test_matches_pairwise_comparison(self):
+        rng = np.random.default_rng(42)
+        jac = random_sparse(300, 40, density=0.1, random_state=rng, format="lil")
+        # Rows sharing sparsity patterns, some of which are (near) multiples
+        # of others
+        for i in range(0, 300, 3):
+            jac[i, :4] = rng.standard_normal(4)
+        for i in rng.integers(300, size=60):
+            j = rng.integers(300)
+            factor = rng.choice([-1, 1]) * 10 ** rng.uniform(-3, 3)
+            jac[j, :] = jac[i, :] * factor * (1 + rng.choice([0, 1e-6, 1e-3]))
+        jac = jac.tocsr()
+        nlp = _ComponentLists(jac.shape)
+
+        for tolerance in [1e-8, 1e-4, 1e-2]:
+            for direction, vectors in [("row", jac), ("column", jac.T)]:
+                pairs = check_parallel_jacobian(
+                    None, tolerance=tolerance, direction=direction, jac=jac, nlp=nlp
+                )
+                prefix = "c" if direction == "row" else "v"
+                expected = [
+                    (f"{prefix}{i}", f"{prefix}{j}")
+                    for i, j in _parallel_pairs_pairwise(vectors, tolerance)
+                ]
+                assert pairs == expected
+
+
+class _ComponentLists:
+    """
+    Provides lists of components corresponding to the rows and columns of a
+    Jacobian, as PyomoNLP does.
+    """
+
+    def __init__(self, shape):
+        self._constraints = [f"c{i}" for i in range(shape[0])]
+        self._variables = [f"v{j}" for j in range(shape[1])]
+
+    def get_pyomo_constraints(self):
+        return self._constraints
+
+    def get_pyomo_variables(self):
+        return self._variables
+
+
+def _parallel_pairs_pairwise(vectors, tolerance):
+    """
+    Find parallel rows by comparing every pair of rows with the same set of
+    non-negligible entries.
+    """
+    rows = vectors.toarray()
+    groups = {}
+    for i, row in enumerate(rows):
+        a = np.abs(row)
+        pattern = tuple(np.flatnonzero((a > tolerance) & (a > tolerance * a.max())))
+        groups.setdefault(pattern, []).append(i)
+
+    pairs = []
+    for idx in groups.values():
+        for k, i in enumerate(idx):
+            for j in idx[k + 1 :]:
+                unorm = np.linalg.norm(rows[i])
+                vnorm = np.linalg.norm(rows[j])
+                diff = abs(abs(rows[i] @ rows[j]) - unorm * vnorm)
+                if diff <= tolerance or diff <= tolerance * max(unorm, vnorm):
+                    pairs.append((i, j))
+    return pairs
+
+
+@pytest.mark.performance
+def test_benchmark_check_parallel_jacobian():
+    # Collocation-like Jacobian, with groups of rows sharing a sparsity pattern
+    rng = np.random.default_rng(0)
+    n_groups, group_size, width = 10, 300, 4
+    n_rows = n_groups * group_size
+    group = np.repeat(np.arange(n_groups), group_size)
+    values = rng.standard_normal((n_groups, width))[group] + rng.standard_normal(
+        (n_rows, width)
+    )
+    values[1::50] = 3 * values[::50]
+    columns = 2 * group[:, None] + np.arange(width)
+    jac = csr_matrix(
+        (values.ravel(), columns.ravel(), np.arange(0, n_rows * width + 1, width)),
+        shape=(n_rows, 2 * n_groups + width),
+    )
+    nlp = _ComponentLists(jac.shape)
+
+    start = time.perf_counter()
+    expected = _parallel_pairs_pairwise(jac, 1e-4)
+    pairwise = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = check_parallel_jacobian(None, jac=jac, nlp=nlp)
+    grouped = time.perf_counter() - start
+
+    print(
+        f"Parallel rows ({n_rows} rows): pairwise {pairwise:.2f} s, "
+        f"check_parallel_jacobian {grouped:.2f} s"
+    )
+    assert pairs == [(f"c{i}", f"c{j}") for i, j in expected]
+    assert grouped < pairwise
+
 
 class TestCheckIllConditioning:
     @pytest.mark.unit
@@ -16,9 +16,10 @@ Test for functions to save/load Pyomo model state to a dict or json
 
 import unittest
 import os
+from io import BytesIO
 
 from pyomo.environ import *
-from idaes.core.util import to_json, from_json, StoreSpec
+from idaes.core.util import to_json, from_json, to_npz, from_npz, StoreSpec
 from idaes.core.util.model_serializer import _only_fixed
 from idaes.core.dmf.util import mkdtemp
 import shutil
@@ -32,16 +33,18 @@ class TestModelSerialize(unittest.TestCase):
     def setUpClass(cls):
         cls.dirname = mkdtemp()
         cls.fname = os.path.join(cls.dirname, "crAzYStuff1010202030.json")
+        cls.npz_fname = os.path.join(cls.dirname, "crAzYStuff1010202030.npz")
 
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(cls.dirname)
 
     def tearDown(self):
-        try:
-            os.remove(self.fname)
-        except:
-            pass
+        for fname in (self.fname, self.npz_fname):
+            try:
+                os.remove(fname)
+            except:
+                pass
 
     def setup_model01(self, name=None):
         if name is not None:
@@ -585,6 +588,149 @@ class TestModelSerialize(unittest.TestCase):
         assert value(model.b[1].x[3, 3]) == 1
         assert value(model.b[2].x[3, 3]) == 3
 
+    @pytest.mark.unit
+    def test13(self):
+        """
+        Simple test of load save npz
+        """
+        for mmap in (False, True):
+            model = self.setup_model01()
+            a = model.b[1].a
+            b = model.b[1].b
+            to_npz(model, self.npz_fname)
+            # change variable values
+            a.value = 0.11
+            b.value = 0.11
+            a.unfix()
+            model.b[1].deactivate()
+            b.setlb(2)
+            b.setub(4)
+            model.x = False
+            # reload values
+            from_npz(model, self.npz_fname, mmap=mmap)
+            # make sure they are right
+            assert a.fixed
+            assert model.b[1].active
+            assert value(b) == 20
+            assert value(a) == 2
+            assert b.lb == -100
+            assert b.ub == 100
+            assert value(model.x) == True
+
+    @pytest.mark.unit
+    def test13b(self):
+        """
+        Test of load save compressed npz for a _BlockData in a file object
+        """
+        model = self.setup_model01b()
+        a = model.b["1"].a
+        b = model.b["1"].b
+        f = BytesIO()
+        to_npz(model.b["1"], f, compress=True)
+        # change variable values
+        a.value = 0.11
+        b.value = None
+        a.unfix()
+        model.b["1"].deactivate()
+        b.setlb(2)
+        # reload values
+        f.seek(0)
+        from_npz(model.b["1"], f)
+        # make sure they are right
+        assert a.fixed
+        assert model.b["1"].active
+        assert value(b) == 20
+        assert value(a) == 2
+        assert b.lb == -100
+
+    @pytest.mark.unit
+    def test14(self):
+        """Test npz with suffixes"""
+        model = self.setup_model02()
+        x = model.x
+        model.dual[model.g] = 1
+        model.ipopt_zL_out[x[1]] = 0
+        model.ipopt_zL_out[x[2]] = 0
+        model.suf1[model.e] = 222
+        model.suf1[x] = "a string"
+        to_npz(model, self.npz_fname)
+        model.x[1].value = 10
+        model.suf1[model.e] = 111
+        model.suf1[x] = None
+        model.dual[model.g] = 10
+        model.ipopt_zL_out[x[1]] = 10
+        model.ipopt_zL_out[x[2]] = 10
+        from_npz(model, self.npz_fname, mmap=True)
+        assert model.suf1[model.e] == 222
+        assert model.suf1[x] == "a string"
+        assert value(x[1]) == pytest.approx(1.5)
+        assert model.dual[model.g] == 1
+        assert model.ipopt_zL_out[x[1]] == 0
+        assert model.ipopt_zL_out[x[2]] == 0
+
+        # Only store the dual suffix
+        wts = StoreSpec(suffix_filter="dual")
+        to_npz(model, self.npz_fname, wts=wts)
+        model.ipopt_zL_out[x[1]] = 111
+        model.dual[model.g] = 11
+        from_npz(model, self.npz_fname)
+        assert model.ipopt_zL_out[x[1]] == 111
+        assert model.dual[model.g] == 1
+
+    @pytest.mark.unit
+    def test15(self):
+        """
+        Like test03, with the state stored in a npz file
+        """
+        model = self.setup_model02()
+        x = model.x
+        x[1].fix(1)
+        wts = StoreSpec.value_isfixed_isactive(only_fixed=True)
+        to_npz(model, self.npz_fname, wts=wts)
+        x[1].unfix()
+        x[1].value = 2
+        x[2].value = 10
+        model.g.deactivate()
+        model.a = 5
+        from_npz(model, self.npz_fname, wts=wts)
+        assert x[1].fixed
+        assert value(x[1]) == 1
+        assert value(x[2]) == 10
+        assert model.g.active
+        assert value(model.a) == 1
+        assert type(model.a.value) is int
+
+    @pytest.mark.unit
+    def test16(self):
+        """Test missing components and index sets shared between components"""
+        model = self.setup_model01()
+        model.b[2].y = Var([1, 2, 3], initialize=4)
+        model.b[3].y = Var([1, 2, 3], initialize=5)
+        to_npz(model, self.npz_fname)
+        model.b[2].y[1] = 6
+        model.b[3].y[3] = 7
+        model.b[3].z = Var(initialize=8)
+        from_npz(model, self.npz_fname)
+        assert value(model.b[2].y[1]) == 4
+        assert value(model.b[3].y[3]) == 5
+        assert value(model.b[3].z) == 8
+
+        with pytest.raises(KeyError):
+            from_npz(model, self.npz_fname, wts=StoreSpec(ignore_missing=False))
+
+    @pytest.mark.unit
+    def test17(self):
+        """Test some odd set components with npz"""
+        model = self.setup_model03()
+        model.r[1, 3] = 1
+        model.r[2, 3] = 3
+        to_npz(model, self.npz_fname)
+        model.r[1, 3] = 6
+        model.r[2, 3] = 8
+        from_npz(model, self.npz_fname)
+        assert value(model.b[1].x[3, 3]) == 1
+        assert value(model.b[2].x[3, 3]) == 3
+
 
 if __name__ == "__main__":
     unittest.main()
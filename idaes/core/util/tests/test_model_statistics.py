@@ -20,17 +20,23 @@ from pyomo.environ import (
     Block,
     ConcreteModel,
     Constraint,
+    ConstraintList,
     Expression,
     Objective,
+    Param,
     Set,
     Var,
     TransformationFactory,
+    inequality,
 )
 from pyomo.dae import ContinuousSet, DerivativeVar
 from pyomo.common.collections import ComponentSet
 
 from idaes.core.util.model_statistics import *
-from idaes.core.util.model_statistics import _iter_indexed_block_data_objects
+from idaes.core.util.model_statistics import (
+    _iter_indexed_block_data_objects,
+    _get_incidence_index,
+)
 
 
 @pytest.mark.unit
@@ -736,3 +742,176 @@ def test_number_active_variables_in_deactivated_blocks(m):
 @pytest.mark.unit
 def test_report_statistics(m):
     report_statistics(m)
+
+
+# -------------------------------------------------------------------------
+# Incidence index
+@pytest.fixture()
+def chain():
+    m = ConcreteModel()
+    m.s = Set(initialize=range(4))
+    m.x = Var(m.s, initialize=1)
+    m.b = Block(m.s)
+    for i in m.s:
+        m.b[i].c = Constraint(expr=m.x[i] == 2 * m.x[(i + 1) % 4])
+    return m
+
+
+@pytest.mark.unit
+def test_incidence_index_reused(chain):
+    index = _get_incidence_index(chain)
+    assert len(index.constraints) == 4
+    assert len(index.variables) == 4
+
+    # Fixing and activating are read from the model, index is not rebuilt
+    chain.x[0].fix()
+    chain.b[1].deactivate()
+    assert degrees_of_freedom(chain) == 3 - 3
+    assert len(variables_in_activated_equalities_set(chain)) == 4
+    chain.b[2].c.deactivate()
+    assert degrees_of_freedom(chain) == 2 - 2
+    assert variables_in_activated_constraints_set(chain) == ComponentSet(
+        [chain.x[0], chain.x[1], chain.x[3]]
+    )
+    assert _get_incidence_index(chain) is index
+    assert index.constraints == [chain.b[i].c for i in chain.s]
+
+
+@pytest.mark.unit
+def test_incidence_index_structural_changes(chain):
+    assert degrees_of_freedom(chain) == 0
+    index = _get_incidence_index(chain)
+    signature = index._signature
+
+    # New component
+    chain.y = Var()
+    chain.b[0].c2 = Constraint(expr=chain.y == 1)
+    assert degrees_of_freedom(chain) == 0
+    assert index._signature != signature
+    assert len(index.constraints) == 5
+
+    # Deleted component
+    chain.b[0].del_component(chain.b[0].c2)
+    assert degrees_of_freedom(chain) == 0
+    assert len(index.constraints) == 4
+    assert chain.y in unused_variables_set(chain)
+
+    # New index in indexed component
+    chain.s.add(4)
+    chain.b[4].c = Constraint(expr=chain.y == 3)
+    assert degrees_of_freedom(chain) == 0
+
+    # Modified constraint
+    chain.b[4].c.set_value(chain.y == chain.x[0])
+    assert chain.y in variables_in_activated_equalities_set(chain)
+    chain.x[0].fix()
+    assert degrees_of_freedom(chain) == -1
+
+    # Modified named expression
+    chain.e = Expression(expr=chain.y)
+    chain.b[4].c.set_value(chain.e == 3)
+    assert chain.x[0] not in unfixed_variables_in_activated_equalities_set(chain)
+    chain.e.set_value(chain.x[1] + chain.y)
+    assert chain.x[1] in variables_in_activated_equalities_set(chain)
+
+
+@pytest.mark.unit
+def test_incidence_index_replaced_indices():
+    m = ConcreteModel()
+    m.x = Var([1, 2])
+    m.y = Var()
+    m.cl = ConstraintList()
+    m.cl.add(m.y == m.x[1])
+    m.cl.add(m.x[1] == 1)
+    assert degrees_of_freedom(m) == 0
+
+    # Deleting one index and adding another leaves the number of indices
+    # unchanged
+    del m.cl[1]
+    m.cl.add(m.y == m.x[2] + 1)
+    assert list(activated_equalities_set(m)) == [m.cl[2], m.cl[3]]
+    assert degrees_of_freedom(m) == 1
+
+    # Same for indexed blocks
+    m.s = Set(initialize=[1, 2])
+    m.b = Block(m.s)
+    m.b[2].c = Constraint(expr=m.x[2] == 2)
+    assert degrees_of_freedom(m) == 0
+    del m.b[2]
+    m.s.add(3)
+    m.b[3].c = Constraint(expr=m.y == 2)
+    assert list(activated_equalities_set(m)) == [m.cl[2], m.cl[3], m.b[3].c]
+    assert degrees_of_freedom(m) == 0
+
+
+@pytest.mark.unit
+def test_incidence_index_mutable_parameters():
+    m = ConcreteModel()
+    m.p = Param([1, 2, 3], mutable=True, initialize=1)
+    m.q = Param(initialize=1)
+    m.x = Var()
+    m.b = Block()
+    m.b.c1 = Constraint(expr=m.x == m.p[1] + m.q)
+    m.b.c2 = Constraint(expr=inequality(m.p[2], m.x, m.p[1]))
+
+    index = _get_incidence_index(m.b)
+    assert index.mutable_parameters() == [m.p[1], m.p[2]]
+
+    version = index.version
+    m.b.c1.set_value(m.x == m.p[3])
+    index = _get_incidence_index(m.b)
+    assert index.version != version
+    assert index.mutable_parameters() == [m.p[3], m.p[2], m.p[1]]
+
+
+@pytest.mark.unit
+def test_incidence_index_not_cloned(chain):
+    index = _get_incidence_index(chain)
+    clone = chain.clone()
+    clone_index = _get_incidence_index(clone)
+    assert clone_index is not index
+    assert clone_index.constraints == [clone.b[i].c for i in clone.s]
+
+
+@pytest.mark.unit
+def test_incidence_index_ranged_constraint():
+    m = ConcreteModel()
+    m.x = Var()
+    m.p = Param(initialize=0, mutable=True)
+    m.c = Constraint(expr=inequality(m.p, m.x, 1))
+
+    assert number_activated_equalities(m) == 0
+    assert degrees_of_freedom(m) == 0
+    m.p = 1
+    assert number_activated_equalities(m) == 1
+    assert degrees_of_freedom(m) == 0
+    assert number_activated_inequalities(m) == 0
+
+
+@pytest.mark.performance
+def test_benchmark_incidence_index():
+    import time
+    from pyomo.core.expr import identify_variables
+
+    m = ConcreteModel()
+    m.s = Set(initialize=range(20000))
+    m.x = Var(m.s, initialize=1)
+    m.c = Constraint(m.s, rule=lambda m, i: m.x[i] ** 2 + 3 * m.x[(i + 1) % 20000] == 4)
+
+    start = time.perf_counter()
+    for _ in range(10):
+        n_vars = len(
+            ComponentSet(
+                v
+                for c in m.component_data_objects(Constraint, active=True)
+                for v in identify_variables(c.body)
+            )
+        )
+    t_walk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(10):
+        assert number_variables_in_activated_equalities(m) == n_vars
+    t_index = time.perf_counter() - start
+
+    print(f"Expression walks: {t_walk:.2f} s, incidence index: {t_index:.2f} s")
@@ -17,6 +17,10 @@ Tests for IDAES Parameter Sweep API and sequential workflow runner.
 import pytest
 import re
 import os
+import subprocess
+import threading
+
+import numpy as np
 
 from pandas import DataFrame, Series
 from pandas.testing import assert_frame_equal, assert_series_equal
@@ -24,6 +28,7 @@ from pandas.testing import assert_frame_equal, assert_series_equal
 from pyomo.environ import (
     ConcreteModel,
     Constraint,
+    Suffix,
     Var,
     Param,
     value,
@@ -31,12 +36,21 @@ from pyomo.environ import (
     assert_optimal_termination,
 )
 from pyomo.common.fileutils import this_file_dir
+from pyomo.opt.solver.shellcmd import SystemCallSolver
 from pyomo.common.tempfiles import TempfileManager
 
 from idaes.core.util.parameter_sweep import (
     ParameterSweepSpecification,
     ParameterSweepBase,
     SequentialSweepRunner,
+    ParallelSweepRunner,
+    MPISweepRunner,
+    SampleTimeoutError,
+    InputBinding,
+    JSONLinesResultStore,
+    WarmStartCache,
+    nearest_neighbour_order,
+    space_filling_order,
 )
 from idaes.core.surrogate.pysmo.sampling import (
     LatinHypercubeSampling,
@@ -51,6 +65,61 @@ import idaes.logger as idaeslog
 currdir = this_file_dir()
 
 
+# Callbacks for parallel runners need to be picklable, so define them at module level
+def _parallel_build_model():
+    m = ConcreteModel()
+    m.v1 = Var(initialize=1)
+    m.v2 = Var(initialize=4)
+    m.v2.fix()
+    return m
+
+
+def _parallel_run_model(model, solver):
+    # Dummy run which just evaluates v1 from v2
+    model.v1.set_value(2 * value(model.v2))
+    return True, None
+
+
+def _parallel_build_outputs(model, run_stats):
+    return value(model.v1)
+
+
+def _parallel_run_model_error(model, solver):
+    if value(model.v2) > 4:
+        raise Exception("Test exception")
+    return _parallel_run_model(model, solver)
+
+
+def _parallel_recourse(model):
+    return "foo"
+
+
+def _slow_run_model(model, solver):
+    import time
+
+    time.sleep(5)
+    return True, None
+
+
+class _TimedOutShellSolver(SystemCallSolver):
+    # Stands in for a solver subprocess which reaches its time limit
+    def __init__(self):
+        self.solve_kwds = None
+
+    def solve(self, *args, **kwds):
+        self.solve_kwds = kwds
+        raise subprocess.TimeoutExpired("solver", kwds["timelimit"])
+
+
+def _parallel_spec():
+    spec = ParameterSweepSpecification()
+    spec.set_sampling_method(UniformSampling)
+    spec.add_sampled_input("v2", 2, 6)
+    spec.set_sample_size([9])
+    spec.generate_samples()
+    return spec
+
+
 expected_todict = {
     "inputs": {
         "foo": {
@@ -785,6 +854,78 @@ class TestParameterSweepBase:
             assert value(model.p1) == pytest.approx(1, abs=1e-10)
             assert value(model.p3) == pytest.approx(1, abs=1e-10)
 
+    @pytest.mark.unit
+    def test_get_input_binding(self):
+        psweep = ParameterSweepBase(
+            build_model=self.build_model,
+            input_specification=spec,
+        )
+
+        model = psweep.get_initialized_model()
+        binding = psweep.get_input_binding(model)
+
+        assert isinstance(binding, InputBinding)
+        assert binding.model is model
+        assert binding.samples is spec.samples
+        assert binding.values.shape == (5, 3)
+        assert binding.values[:, 0] == pytest.approx(spec.samples["v1"].to_numpy())
+
+        # Binding should be reused for the same model instance
+        assert psweep.get_input_binding(model) is binding
+
+        # But rebuilt for a new model instance
+        model2 = psweep.get_initialized_model()
+        binding2 = psweep.get_input_binding(model2)
+        assert binding2 is not binding
+        assert binding2.model is model2
+
+    @pytest.mark.unit
+    def test_set_input_values_indexed_param(self):
+        def bm():
+            m = ConcreteModel()
+            m.p1 = Param([1, 2, 3], initialize=1, mutable=True)
+            return m
+
+        spec2 = ParameterSweepSpecification()
+        spec2.set_sampling_method(UniformSampling)
+        spec2.add_sampled_input("p1", 0, 10)
+        spec2.set_sample_size([2])
+
+        psweep = ParameterSweepBase(
+            build_model=bm,
+            input_specification=spec2,
+        )
+
+        model = psweep.get_initialized_model()
+        psweep.set_input_values(model, 1)
+
+        for i in [1, 2, 3]:
+            assert value(model.p1[i]) == pytest.approx(10, abs=1e-10)
+
+    @pytest.mark.unit
+    def test_set_input_values_indexed_param_element(self):
+        def bm():
+            m = ConcreteModel()
+            m.p1 = Param([1, 2, 3], initialize=1, mutable=True)
+            return m
+
+        spec2 = ParameterSweepSpecification()
+        spec2.set_sampling_method(UniformSampling)
+        spec2.add_sampled_input("p1[2]", 0, 10)
+        spec2.set_sample_size([2])
+
+        psweep = ParameterSweepBase(
+            build_model=bm,
+            input_specification=spec2,
+        )
+
+        model = psweep.get_initialized_model()
+        psweep.set_input_values(model, 1)
+
+        assert value(model.p1[1]) == pytest.approx(1, abs=1e-10)
+        assert value(model.p1[2]) == pytest.approx(10, abs=1e-10)
+        assert value(model.p1[3]) == pytest.approx(1, abs=1e-10)
+
     @pytest.mark.unit
     def test_set_input_immutable_param(self):
         def bm():
@@ -1395,3 +1536,669 @@ class TestSequentialSweepRunner:
 
         assert psweep.results[1]["success"]
         assert psweep.results[1]["results"] == pytest.approx(6 - 1e-3, rel=1e-8)
+
+
+class TestSampleTimeout:
+    @pytest.mark.unit
+    def test_sample_timeout_default(self):
+        psweep = SequentialSweepRunner()
+        assert psweep.config.sample_timeout is None
+
+    @pytest.mark.unit
+    def test_sample_timeout(self):
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_slow_run_model,
+            input_specification=_parallel_spec(),
+            sample_timeout=0.1,
+            handle_solver_error=_parallel_recourse,
+        )
+
+        results, success, error = psweep.execute_single_sample(0)
+
+        assert results == "foo"
+        assert not success
+        assert error == "Sample exceeded time limit of 0.1 s."
+
+    @pytest.mark.unit
+    def test_sample_timeout_halt_on_error(self):
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_slow_run_model,
+            input_specification=_parallel_spec(),
+            sample_timeout=0.1,
+            halt_on_error=True,
+        )
+
+        with pytest.raises(SampleTimeoutError):
+            psweep.execute_single_sample(0)
+
+    @pytest.mark.unit
+    def test_sample_timeout_rebuilds_model(self):
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_slow_run_model,
+            input_specification=_parallel_spec(),
+            sample_timeout=0.1,
+            rebuild_model=False,
+        )
+        model = psweep.get_initialized_model()
+
+        _, success, _ = psweep.execute_single_sample(0)
+        assert not success
+        assert psweep.get_initialized_model() is not model
+
+    @pytest.mark.unit
+    def test_sample_timeout_not_enforceable(self):
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_slow_run_model,
+            input_specification=_parallel_spec(),
+            sample_timeout=0.1,
+        )
+
+        errors = []
+
+        def run():
+            try:
+                psweep.execute_single_sample(0)
+            except ConfigurationError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        assert len(errors) == 1
+        assert "sample_timeout cannot be enforced" in str(errors[0])
+
+    @pytest.mark.unit
+    def test_sample_timeout_solver_time_limit(self):
+        solver = _TimedOutShellSolver()
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            input_specification=_parallel_spec(),
+            solver=solver,
+            sample_timeout=0.1,
+        )
+
+        # The solver enforces the limit, so this also works off the main thread
+        outcome = []
+        thread = threading.Thread(
+            target=lambda: outcome.append(psweep.execute_single_sample(0))
+        )
+        thread.start()
+        thread.join()
+
+        assert solver.solve_kwds == {"timelimit": 0.1}
+        results, success, error = outcome[0]
+        assert results is None
+        assert not success
+        assert error == "Sample exceeded time limit of 0.1 s."
+
+
+class TestParallelSweepRunner:
+    @pytest.mark.unit
+    def test_init(self):
+        psweep = ParallelSweepRunner()
+
+        assert psweep.config.number_of_workers is None
+        assert psweep.config.chunk_size is None
+        assert psweep.config.sample_timeout is None
+        assert psweep.get_number_of_workers() == (os.cpu_count() or 1)
+        assert psweep.get_chunk_size(100, 5) == 5
+        assert psweep.get_chunk_size(3, 5) == 1
+
+    @pytest.mark.unit
+    def test_init_options(self):
+        psweep = ParallelSweepRunner(number_of_workers=3, chunk_size=7)
+
+        assert psweep.get_number_of_workers() == 3
+        assert psweep.get_chunk_size(100, 3) == 7
+
+        with pytest.raises(ValueError):
+            ParallelSweepRunner(number_of_workers=0)
+
+    @pytest.mark.component
+    def test_parallel_runner(self):
+        psweep = ParallelSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=_parallel_spec(),
+            number_of_workers=2,
+            chunk_size=2,
+        )
+
+        results = psweep.execute_parameter_sweep()
+
+        assert list(results.keys()) == list(range(9))
+        for k, v in results.items():
+            assert v["success"]
+            assert v["error"] is None
+            assert v["results"] == pytest.approx(2 * (2 + 0.5 * k), rel=1e-8)
+
+    @pytest.mark.component
+    def test_parallel_runner_matches_sequential(self):
+        spec = _parallel_spec()
+        kwargs = dict(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model_error,
+            build_outputs=_parallel_build_outputs,
+            handle_solver_error=_parallel_recourse,
+            input_specification=spec,
+            rebuild_model=False,
+        )
+
+        seq = SequentialSweepRunner(**kwargs)
+        seq.execute_parameter_sweep()
+
+        par = ParallelSweepRunner(number_of_workers=3, **kwargs)
+        par.execute_parameter_sweep()
+
+        assert par.results == seq.results
+        assert par._model is None
+
+    @pytest.mark.component
+    def test_parallel_runner_halt_on_error(self):
+        psweep = ParallelSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model_error,
+            input_specification=_parallel_spec(),
+            halt_on_error=True,
+            number_of_workers=2,
+        )
+
+        with pytest.raises(Exception, match="Test exception"):
+            psweep.execute_parameter_sweep()
+
+    @pytest.mark.component
+    def test_parallel_runner_timeout(self):
+        spec = ParameterSweepSpecification()
+        spec.set_sampling_method(UniformSampling)
+        spec.add_sampled_input("v2", 2, 6)
+        spec.set_sample_size([2])
+        spec.generate_samples()
+
+        psweep = ParallelSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_slow_run_model,
+            input_specification=spec,
+            number_of_workers=2,
+            sample_timeout=0.1,
+        )
+
+        results = psweep.execute_parameter_sweep()
+
+        for v in results.values():
+            assert not v["success"]
+            assert v["error"] == "Sample exceeded time limit of 0.1 s."
+
+    @pytest.mark.component
+    def test_parallel_runner_to_json_file(self):
+        psweep = ParallelSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=_parallel_spec(),
+            number_of_workers=2,
+        )
+        psweep.execute_parameter_sweep()
+
+        temp_context = TempfileManager.new_context()
+        tmpfile = temp_context.create_tempfile(suffix=".json")
+        psweep.to_json_file(tmpfile)
+
+        psweep2 = SequentialSweepRunner()
+        psweep2.from_json_file(tmpfile)
+
+        assert psweep2.results == psweep.results
+
+        temp_context.release(remove=True)
+
+
+class _DummyComm:
+    # Mimics the communicator of an MPI job with two ranks, as seen from
+    # one of the ranks, with the other rank running the remaining chunks
+    def __init__(self, rank, other_results, broadcasts=None):
+        self.rank = rank
+        self.other_results = other_results
+        # Data to be received from root in successive bcast calls on other ranks
+        self.broadcasts = broadcasts
+
+    def bcast(self, data, root=0):
+        if self.rank == 0:
+            return data
+        return self.broadcasts.pop(0)
+
+    def gather(self, data, root=0):
+        if self.rank == 0:
+            return [data, self.other_results]
+        return None
+
+
+class _DummyMPIInterface:
+    def __init__(self, rank, size, other_results=None, broadcasts=None):
+        self.have_mpi = True
+        self.rank = rank
+        self.size = size
+        self.comm = _DummyComm(rank, other_results, broadcasts)
+
+
+class TestMPISweepRunner:
+    @pytest.mark.unit
+    def test_init(self):
+        psweep = MPISweepRunner()
+
+        assert psweep.mpi_interface is not None
+        assert psweep.config.chunk_size is None
+
+    @pytest.mark.component
+    def test_no_mpi(self):
+        mpi = _DummyMPIInterface(0, 1)
+        mpi.have_mpi = False
+
+        psweep = MPISweepRunner(
+            mpi_interface=mpi,
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=_parallel_spec(),
+        )
+
+        assert psweep.is_root()
+
+        results = psweep.execute_parameter_sweep()
+
+        assert list(results.keys()) == list(range(9))
+        for k, v in results.items():
+            assert v["success"]
+            assert v["results"] == pytest.approx(2 * (2 + 0.5 * k), rel=1e-8)
+
+    @pytest.mark.component
+    def test_root_gathers_results(self):
+        # Chunks of 2 samples, round robin over 2 ranks: rank 1 runs 2, 3, 6, 7
+        other = {
+            s: {"success": True, "results": "rank1", "error": None}
+            for s in [2, 3, 6, 7]
+        }
+        mpi = _DummyMPIInterface(0, 2, other_results=other)
+
+        psweep = MPISweepRunner(
+            mpi_interface=mpi,
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=_parallel_spec(),
+            chunk_size=2,
+        )
+
+        assert psweep.is_root()
+
+        results = psweep.execute_parameter_sweep()
+
+        assert list(results.keys()) == list(range(9))
+        for k, v in results.items():
+            if k in [2, 3, 6, 7]:
+                assert v["results"] == "rank1"
+            else:
+                assert v["results"] == pytest.approx(2 * (2 + 0.5 * k), rel=1e-8)
+
+
+class TestSampleOrdering:
+    @pytest.mark.unit
+    def test_nearest_neighbour_order(self):
+        points = np.array([[0.0], [1.0], [0.1], [0.9], [0.5]])
+
+        order = nearest_neighbour_order(points)
+
+        assert list(order) == [0, 2, 4, 3, 1]
+
+    @pytest.mark.unit
+    def test_nearest_neighbour_order_empty(self):
+        assert len(nearest_neighbour_order(np.zeros((0, 2)))) == 0
+
+    @pytest.mark.unit
+    def test_space_filling_order(self):
+        points = np.array([[0.9, 0.9], [0.1, 0.1], [0.9, 0.1], [0.1, 0.9]])
+
+        order = space_filling_order(points)
+
+        # First input is the most significant in the Z-order code
+        assert list(order) == [1, 3, 2, 0]
+
+    @pytest.mark.unit
+    def test_get_sample_order_none(self):
+        psweep = ParameterSweepBase(input_specification=_parallel_spec())
+        assert psweep.get_sample_order() == list(range(9))
+
+    @pytest.mark.unit
+    def test_get_sample_order(self):
+        spec2 = ParameterSweepSpecification()
+        spec2.set_sampling_method(UniformSampling)
+        spec2.add_sampled_input("v2", 2, 6)
+        spec2.set_sample_size([5])
+        spec2.generate_samples()
+        spec2._samples = spec2.samples.iloc[[0, 4, 1, 3, 2]]
+
+        for ordering in ["nearest_neighbour", "space_filling"]:
+            psweep = ParameterSweepBase(
+                input_specification=spec2, sample_ordering=ordering
+            )
+            order = psweep.get_sample_order()
+            assert sorted(order) == list(range(5))
+            assert order in ([0, 1, 2, 3, 4], [4, 3, 2, 1, 0])
+
+        with pytest.raises(ValueError):
+            ParameterSweepBase(sample_ordering="foo")
+
+    @pytest.mark.unit
+    def test_get_scaled_sample_point(self):
+        psweep = ParameterSweepBase(input_specification=_parallel_spec())
+        assert psweep.get_scaled_sample_point(2) == pytest.approx([0.25])
+
+    @pytest.mark.component
+    def test_sequential_runner_ordering(self):
+        executed = []
+
+        def run_model(model, solver):
+            executed.append(value(model.v2))
+            return _parallel_run_model(model, solver)
+
+        spec2 = _parallel_spec()
+        spec2._samples = spec2.samples.iloc[[0, 8, 1, 7, 2, 6, 3, 5, 4]]
+
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=spec2,
+            sample_ordering="nearest_neighbour",
+        )
+        results = psweep.execute_parameter_sweep()
+
+        assert executed == pytest.approx([2 + 0.5 * i for i in range(9)])
+        # Results are still stored in sample order
+        assert list(results.keys()) == [0, 8, 1, 7, 2, 6, 3, 5, 4]
+        for k, v in results.items():
+            assert v["results"] == pytest.approx(2 * (2 + 0.5 * k), rel=1e-8)
+
+
+class TestWarmStartCache:
+    @pytest.fixture
+    def model(self):
+        m = ConcreteModel()
+        m.x = Var(initialize=1)
+        m.y = Var(initialize=2)
+        m.c = Constraint(expr=m.x == m.y)
+        m.y.fix()
+        m.dual = Suffix(direction=Suffix.IMPORT_EXPORT)
+        m.ipopt_zL_out = Suffix(direction=Suffix.IMPORT)
+        m.ipopt_zL_in = Suffix(direction=Suffix.EXPORT)
+        return m
+
+    @pytest.mark.unit
+    def test_restore_empty(self, model):
+        cache = WarmStartCache()
+        assert len(cache) == 0
+        assert not cache.restore(model, [0.5])
+
+    @pytest.mark.unit
+    def test_store_restore(self, model):
+        cache = WarmStartCache()
+
+        model.x.set_value(10)
+        model.dual[model.c] = 3
+        model.ipopt_zL_out[model.x] = 4
+        cache.store(model, [0.0])
+
+        model.x.set_value(20)
+        model.dual[model.c] = 5
+        cache.store(model, [1.0])
+
+        assert len(cache) == 2
+
+        model.x.set_value(0)
+        model.y.fix(30)
+        assert cache.restore(model, [0.2])
+
+        assert value(model.x) == 10
+        # Fixed vars are not changed
+        assert value(model.y) == 30
+        assert model.dual[model.c] == 3
+        assert model.ipopt_zL_in[model.x] == 4
+
+        assert cache.restore(model, [0.9])
+        assert value(model.x) == 20
+        assert model.dual[model.c] == 5
+
+    @pytest.mark.unit
+    def test_history(self, model):
+        cache = WarmStartCache(history=2)
+
+        for i in range(4):
+            cache.store(model, [float(i)])
+
+        assert len(cache) == 2
+
+        cache.clear()
+        assert len(cache) == 0
+
+    @pytest.mark.unit
+    def test_new_model(self, model):
+        cache = WarmStartCache()
+
+        model.x.set_value(10)
+        cache.store(model, [0.0])
+
+        m2 = model.clone()
+        m2.x.set_value(0)
+        assert cache.restore(m2, [0.0])
+        assert value(m2.x) == 10
+
+    @pytest.mark.component
+    def test_sequential_runner_warm_start(self):
+        initial = []
+
+        def run_model(model, solver):
+            initial.append(value(model.v1))
+            return _parallel_run_model(model, solver)
+
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=_parallel_spec(),
+            warm_start=True,
+        )
+        psweep.execute_parameter_sweep()
+
+        # First sample starts from the initial value, others from previous solution
+        assert initial == pytest.approx([1] + [2 * (2 + 0.5 * i) for i in range(8)])
+        assert len(psweep.get_warm_start_cache()) == 9
+
+
+class TestJSONLinesResultStore:
+    @pytest.fixture
+    def tmpfile(self):
+        temp_context = TempfileManager.new_context()
+        tmpfile = temp_context.create_tempfile(suffix=".jsonl")
+        yield tmpfile
+        temp_context.release(remove=True)
+
+    @pytest.mark.unit
+    def test_create_append_load(self, tmpfile):
+        store = JSONLinesResultStore(tmpfile)
+        assert store.filename == tmpfile
+
+        store.create({"foo": [1, 2]})
+        store.append(0, {"success": True, "results": 1, "error": None})
+        store.append(2, {"success": False, "results": None, "error": "bar"})
+
+        spec, results = store.load()
+
+        assert spec == {"foo": [1, 2]}
+        assert results == {
+            0: {"success": True, "results": 1, "error": None},
+            2: {"success": False, "results": None, "error": "bar"},
+        }
+
+    @pytest.mark.unit
+    def test_load_incomplete_record(self, tmpfile, caplog):
+        store = JSONLinesResultStore(tmpfile)
+        store.create({})
+        store.append(0, {"success": True, "results": 1, "error": None})
+        with open(tmpfile, "a") as f:
+            f.write('{"sample_id": 1, "succ')
+
+        _, results = store.load()
+
+        assert list(results.keys()) == [0]
+        assert "Ignoring incomplete record" in caplog.text
+
+    @pytest.mark.unit
+    def test_check_specification(self, tmpfile):
+        store = JSONLinesResultStore(tmpfile)
+        store.create({"foo": (1, 2)})
+
+        store.check_specification({"foo": (1, 2)})
+
+        with pytest.raises(
+            ConfigurationError,
+            match="Cannot resume parameter sweep: the specification stored in",
+        ):
+            store.check_specification({"foo": (1, 3)})
+
+
+class TestResultStoreRunners:
+    @pytest.fixture
+    def tmpfile(self):
+        temp_context = TempfileManager.new_context()
+        tmpfile = temp_context.create_tempfile(suffix=".jsonl")
+        os.remove(tmpfile)
+        yield tmpfile
+        temp_context.release(remove=True)
+
+    @pytest.mark.unit
+    def test_resume_without_store(self):
+        psweep = SequentialSweepRunner(resume=True)
+
+        with pytest.raises(
+            ConfigurationError,
+            match="Cannot resume parameter sweep as no result_store was specified.",
+        ):
+            psweep.get_result_store()
+
+    @pytest.mark.component
+    @pytest.mark.parametrize("runner", [SequentialSweepRunner, ParallelSweepRunner])
+    def test_streaming(self, tmpfile, runner):
+        psweep = runner(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=_parallel_spec(),
+            result_store=tmpfile,
+        )
+        psweep.execute_parameter_sweep()
+
+        spec, stored = JSONLinesResultStore(tmpfile).load()
+
+        assert spec == psweep.get_input_specification().to_dict()
+        assert sorted(stored.keys()) == list(range(9))
+        for k, v in stored.items():
+            assert v == psweep.results[k]
+
+    @pytest.mark.component
+    @pytest.mark.parametrize(
+        "runner", [SequentialSweepRunner, ParallelSweepRunner, MPISweepRunner]
+    )
+    def test_resume(self, tmpfile, runner):
+        spec = _parallel_spec()
+
+        store = JSONLinesResultStore(tmpfile)
+        store.create(spec.to_dict())
+        for i in [0, 4, 5]:
+            store.append(i, {"success": True, "results": "stored", "error": None})
+
+        kwargs = {}
+        if runner is ParallelSweepRunner:
+            kwargs["number_of_workers"] = 2
+
+        psweep = runner(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=spec,
+            result_store=tmpfile,
+            resume=True,
+            **kwargs,
+        )
+        results = psweep.execute_parameter_sweep()
+
+        assert list(results.keys()) == list(range(9))
+        for k, v in results.items():
+            if k in [0, 4, 5]:
+                assert v["results"] == "stored"
+            else:
+                assert v["results"] == pytest.approx(2 * (2 + 0.5 * k), rel=1e-8)
+
+        # All samples should now be in the store
+        _, stored = store.load()
+        assert sorted(stored.keys()) == list(range(9))
+
+    @pytest.mark.component
+    def test_resume_mismatched_specification(self, tmpfile):
+        store = JSONLinesResultStore(tmpfile)
+        store.create({"foo": "bar"})
+
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            input_specification=_parallel_spec(),
+            result_store=tmpfile,
+            resume=True,
+        )
+
+        with pytest.raises(ConfigurationError, match="Cannot resume parameter sweep"):
+            psweep.execute_parameter_sweep()
+
+    @pytest.mark.component
+    def test_not_in_memory(self, tmpfile):
+        psweep = SequentialSweepRunner(
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=_parallel_spec(),
+            result_store=tmpfile,
+            keep_results_in_memory=False,
+        )
+        results = psweep.execute_parameter_sweep()
+
+        assert len(psweep._results) == 0
+        assert list(results.keys()) == list(range(9))
+        for k, v in results.items():
+            assert v["results"] == pytest.approx(2 * (2 + 0.5 * k), rel=1e-8)
+
+    @pytest.mark.component
+    def test_mpi_shards(self, tmpfile):
+        # Rank 1 of a 2 rank job writes to its own shard of the result store
+        spec = _parallel_spec()
+        mpi = _DummyMPIInterface(1, 2, broadcasts=[spec.samples, {}])
+
+        psweep = MPISweepRunner(
+            mpi_interface=mpi,
+            build_model=_parallel_build_model,
+            run_model=_parallel_run_model,
+            build_outputs=_parallel_build_outputs,
+            input_specification=spec,
+            result_store=tmpfile,
+            keep_results_in_memory=False,
+            chunk_size=2,
+        )
+        psweep.execute_parameter_sweep()
+
+        assert not os.path.exists(tmpfile)
+        _, stored = JSONLinesResultStore(tmpfile + ".rank1").load()
+        assert sorted(stored.keys()) == [2, 3, 6, 7]
+
+        assert list(psweep.results.keys()) == [2, 3, 6, 7]
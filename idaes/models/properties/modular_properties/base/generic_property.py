@@ -56,6 +56,7 @@ from idaes.core.util.initialization import (
     fix_state_vars,
     revert_state_vars,
     solve_indexed_blocks,
+    batch_solve_strongly_connected_components,
 )
 from idaes.core.util.model_statistics import (
     degrees_of_freedom,
@@ -1249,6 +1250,21 @@ class ModularPropertiesInitializer(InitializerBase):
             "'diff_mode=differentiate.Modes.reverse_numeric'",
         ),
     )
+    CONFIG.declare(
+        "batch_identical_blocks",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Whether to solve StateBlocks with identical structure "
+            "together",
+            doc="If True, StateBlockDatas with identical incidence structure are "
+            "solved together at each step, with each strongly connected component "
+            "of all blocks solved with a single call to the solver (see "
+            "batch_solve_strongly_connected_components). Blocks which fail to "
+            "converge in the combined solve are re-solved individually. If False, "
+            "each StateBlockData is solved separately.",
+        ),
+    )
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1357,6 +1373,7 @@ class ModularPropertiesInitializer(InitializerBase):
 
         # If StateBlock has active constraints (i.e. has bubble, dew, or critical
         # point calculations), solve the block to converge these
+        blocks = []
         for b in model.values():
             if number_activated_constraints(b) > 0:
                 if not degrees_of_freedom(b) == 0:
@@ -1365,13 +1382,8 @@ class ModularPropertiesInitializer(InitializerBase):
                         f"initialization at bubble, dew, and critical point step: "
                         f"{degrees_of_freedom(b)}."
                     )
-                with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
-                    solve_strongly_connected_components(
-                        b,
-                        solver=solver_obj,
-                        solve_kwds={"tee": slc.tee},
-                        calc_var_kwds=self.config.calculate_variable_options,
-                    )
+                blocks.append(b)
+        self._solve_blocks(blocks, solver_obj, solve_log)
         init_log.info("Bubble, dew, and critical point initialization completed.")
 
         # ---------------------------------------------------------------------
@@ -1454,6 +1466,7 @@ class ModularPropertiesInitializer(InitializerBase):
 
         # ---------------------------------------------------------------------
         Tfix = {}  # In enth based state defs, need to also fix T until later
+        blocks = []
         for k, b in model.items():
             if b.params.config.phase_equilibrium_state is not None and (
                 not b.config.defined_state or b.always_flash
@@ -1495,13 +1508,7 @@ class ModularPropertiesInitializer(InitializerBase):
             if number_activated_constraints(b) > 0:
                 dof = degrees_of_freedom(b)
                 if degrees_of_freedom(b) == 0:
-                    with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
-                        solve_strongly_connected_components(
-                            b,
-                            solver=solver_obj,
-                            solve_kwds={"tee": slc.tee},
-                            calc_var_kwds=self.config.calculate_variable_options,
-                        )
+                    blocks.append(b)
                 elif dof > 0:
                     raise InitializationError(
                         f"{b.name} Unexpected degrees of freedom during "
@@ -1510,10 +1517,13 @@ class ModularPropertiesInitializer(InitializerBase):
                 # Skip solve if DoF < 0 - this is probably due to a
                 # phase-component flow state with flash
 
+        self._solve_blocks(blocks, solver_obj, solve_log)
+
         init_log.info("Phase equilibrium initialization completed.")
 
         # ---------------------------------------------------------------------
         # Initialize other properties
+        blocks = []
         for k, b in model.items():
             for c in b.component_objects(Constraint):
                 # Activate all constraints except flagged do_not_initialize
@@ -1561,13 +1571,7 @@ class ModularPropertiesInitializer(InitializerBase):
             if number_activated_constraints(b) > 0:
                 dof = degrees_of_freedom(b)
                 if degrees_of_freedom(b) == 0:
-                    with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
-                        solve_strongly_connected_components(
-                            b,
-                            solver=solver_obj,
-                            solve_kwds={"tee": slc.tee},
-                            calc_var_kwds=self.config.calculate_variable_options,
-                        )
+                    blocks.append(b)
                 elif dof > 0:
                     raise InitializationError(
                         f"{b.name} Unexpected degrees of freedom during "
@@ -1576,10 +1580,33 @@ class ModularPropertiesInitializer(InitializerBase):
                 # Skip solve if DoF < 0 - this is probably due to a
                 # phase-component flow state with flash
 
+        self._solve_blocks(blocks, solver_obj, solve_log)
+
         init_log.info("Property initialization routine finished.")
 
         return None
 
+    def _solve_blocks(self, blocks, solver_obj, solve_log):
+        """
+        Solve a list of StateBlockDatas by strongly connected components.
+        """
+        with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
+            if self.config.batch_identical_blocks:
+                batch_solve_strongly_connected_components(
+                    blocks,
+                    solver=solver_obj,
+                    solve_kwds={"tee": slc.tee},
+                    calc_var_kwds=self.config.calculate_variable_options,
+                )
+            else:
+                for b in blocks:
+                    solve_strongly_connected_components(
+                        b,
+                        solver=solver_obj,
+                        solve_kwds={"tee": slc.tee},
+                        calc_var_kwds=self.config.calculate_variable_options,
+                    )
+
 
 class _GenericStateBlock(StateBlock):
     """
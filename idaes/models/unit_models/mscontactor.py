@@ -50,9 +50,8 @@ from idaes.core.util.exceptions import (
     PropertyNotSupportedError,
 )
 from idaes.core.initialization import ModularInitializerBase
-from idaes.core.initialization.initializer_base import StoreState
+from idaes.core.initialization.model_state import ModelStateSnapshot
 from idaes.core.solvers import get_solver
-from idaes.core.util.model_serializer import to_json, from_json
 import idaes.logger as idaeslog
 from idaes.core.util.units_of_measurement import report_quantity
 
@@ -119,7 +118,7 @@ class MSContactorInitializer(ModularInitializerBase):
         )
 
         # Get current model state
-        initial_state = to_json(model, wts=StoreState, return_dict=True)
+        initial_state = ModelStateSnapshot(model)
 
         # Isolate streams by fixing inter-stream variables
         model.material_transfer_term.fix()
@@ -168,7 +167,7 @@ class MSContactorInitializer(ModularInitializerBase):
         init_log.info("Stream Initialization Completed.")
 
         # Revert state
-        from_json(model, sd=initial_state, wts=StoreState)
+        initial_state.restore()
 
         # Solve full model
         with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
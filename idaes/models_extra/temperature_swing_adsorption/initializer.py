@@ -28,9 +28,8 @@ from pyomo.util.calc_var_value import calculate_variable_from_constraint
 
 # import IDAES core libraries
 from idaes.core.initialization import ModularInitializerBase
-from idaes.core.initialization.initializer_base import StoreState
+from idaes.core.initialization.model_state import ModelStateSnapshot
 from idaes.core.util.exceptions import InitializationError
-from idaes.core.util.model_serializer import to_json, from_json
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.solvers import get_solver
 
@@ -115,7 +114,7 @@ class FixedBedTSA0DInitializer(ModularInitializerBase):
         # initialization of fixed bed TSA model unit
         init_log.info("Starting fixed bed TSA initialization")
 
-        tsa_state = to_json(blk, wts=StoreState, return_dict=True)
+        tsa_state = ModelStateSnapshot(blk)
 
         # 1 - solve heating step
 
@@ -291,7 +290,7 @@ class FixedBedTSA0DInitializer(ModularInitializerBase):
 
         # 5.1) unfix variables and activate constraints that were fixed and
         # deactivated during individual steps
-        from_json(blk, sd=tsa_state, wts=StoreState)
+        tsa_state.restore()
 
         if blk.calculate_beds:
             calculate_variable_from_constraint(blk.velocity_in, blk.pressure_drop_eq)